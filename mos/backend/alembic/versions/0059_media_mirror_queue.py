@@ -0,0 +1,41 @@
+"""Track mirror attempts and retry schedule on media assets
+
+Revision ID: 0059_media_mirror_queue
+Revises: 0058_meta_publish_runs
+Create Date: 2026-10-16 09:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0059_media_mirror_queue"
+down_revision = "0058_meta_publish_runs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "media_assets",
+        sa.Column("mirror_attempts", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+    op.add_column(
+        "media_assets",
+        sa.Column("mirror_next_attempt_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "idx_media_assets_mirror_queue",
+        "media_assets",
+        ["mirror_next_attempt_at"],
+        unique=False,
+        postgresql_where=sa.text("mirror_status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_media_assets_mirror_queue", table_name="media_assets")
+    op.drop_column("media_assets", "mirror_next_attempt_at")
+    op.drop_column("media_assets", "mirror_attempts")
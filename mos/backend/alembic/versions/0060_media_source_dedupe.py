@@ -0,0 +1,43 @@
+"""Add normalized source URL and ETag columns for pre-download media dedupe
+
+Revision ID: 0060_media_source_dedupe
+Revises: 0059_media_mirror_queue
+Create Date: 2026-10-16 10:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0060_media_source_dedupe"
+down_revision = "0059_media_mirror_queue"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("media_assets", sa.Column("source_url_normalized", sa.Text(), nullable=True))
+    op.add_column("media_assets", sa.Column("source_etag", sa.Text(), nullable=True))
+    op.create_index(
+        "idx_media_assets_source_url_normalized",
+        "media_assets",
+        ["source_url_normalized"],
+        unique=False,
+        postgresql_where=sa.text("source_url_normalized IS NOT NULL"),
+    )
+    op.create_index(
+        "idx_media_assets_source_etag",
+        "media_assets",
+        ["source_etag", "size_bytes"],
+        unique=False,
+        postgresql_where=sa.text("source_etag IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_media_assets_source_etag", table_name="media_assets")
+    op.drop_index("idx_media_assets_source_url_normalized", table_name="media_assets")
+    op.drop_column("media_assets", "source_etag")
+    op.drop_column("media_assets", "source_url_normalized")
@@ -0,0 +1,76 @@
+"""Add brand_ad_stats rollup for explore brand listing
+
+Revision ID: 0061_brand_ad_stats
+Revises: 0060_media_source_dedupe
+Create Date: 2026-10-16 11:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0061_brand_ad_stats"
+down_revision = "0060_media_source_dedupe"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    ad_channel_enum = postgresql.ENUM(name="ad_channel", create_type=False)
+    op.create_table(
+        "brand_ad_stats",
+        sa.Column(
+            "brand_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("brands.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("org_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("orgs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("ad_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("active_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("inactive_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("unknown_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("first_seen_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_seen_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "channels",
+            postgresql.ARRAY(ad_channel_enum),
+            nullable=False,
+            server_default=sa.text("'{}'"),
+        ),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("idx_brand_ad_stats_org_last_seen", "brand_ad_stats", ["org_id", "last_seen_at"])
+    op.create_index("idx_brand_ad_stats_org_ad_count", "brand_ad_stats", ["org_id", "ad_count"])
+
+    op.execute(
+        """
+        INSERT INTO brand_ad_stats (
+            brand_id, org_id, ad_count, active_count, inactive_count, unknown_count,
+            first_seen_at, last_seen_at, channels, refreshed_at
+        )
+        SELECT
+            ads.brand_id,
+            brands.org_id,
+            count(*),
+            count(*) FILTER (WHERE ads.ad_status = 'active'),
+            count(*) FILTER (WHERE ads.ad_status = 'inactive'),
+            count(*) FILTER (WHERE ads.ad_status = 'unknown'),
+            min(ads.first_seen_at),
+            max(ads.last_seen_at),
+            array_agg(DISTINCT ads.channel),
+            now()
+        FROM ads
+        JOIN brands ON brands.id = ads.brand_id
+        GROUP BY ads.brand_id, brands.org_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_brand_ad_stats_org_ad_count", table_name="brand_ad_stats")
+    op.drop_index("idx_brand_ad_stats_org_last_seen", table_name="brand_ad_stats")
+    op.drop_table("brand_ad_stats")
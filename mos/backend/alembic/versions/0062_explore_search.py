@@ -0,0 +1,116 @@
+"""Add trigger-maintained search columns and trigram/full-text indexes for explore search
+
+Revision ID: 0062_explore_search
+Revises: 0061_brand_ad_stats
+Create Date: 2026-10-16 12:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0062_explore_search"
+down_revision = "0061_brand_ad_stats"
+branch_labels = None
+depends_on = None
+
+_BACKFILL_BATCH_SIZE = 5000
+
+# Search expressions over a row reference (`NEW` in the triggers, the table itself in the backfill).
+_BRAND_SEARCH_TEXT_SQL = (
+    "lower(coalesce({row}.canonical_name, '') || ' ' || "
+    "coalesce({row}.normalized_name::text, '') || ' ' || "
+    "coalesce({row}.primary_domain::text, '') || ' ' || "
+    "coalesce({row}.primary_website_url, ''))"
+)
+_AD_SEARCH_TSV_SQL = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce({row}.headline, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce({row}.body_text, '')), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce({row}.cta_text, '')), 'C') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce({row}.destination_domain::text, '')), 'D')"
+)
+
+# (table, column, expression, source columns)
+_SEARCH_COLUMNS = (
+    (
+        "brands",
+        "search_text",
+        _BRAND_SEARCH_TEXT_SQL,
+        "canonical_name, normalized_name, primary_domain, primary_website_url",
+    ),
+    ("ads", "search_tsv", _AD_SEARCH_TSV_SQL, "headline, body_text, cta_text, destination_domain"),
+)
+
+
+def _backfill(table: str, column: str, expression: str) -> None:
+    # Short autocommitted batches keep row locks brief instead of one table-wide transaction.
+    statement = sa.text(
+        f"""
+        WITH batch AS (
+            SELECT id FROM {table} WHERE id > CAST(:after_id AS uuid) ORDER BY id LIMIT :batch_size
+        ), updated AS (
+            UPDATE {table} SET {column} = {expression.format(row=table)}
+            FROM batch
+            WHERE {table}.id = batch.id
+        )
+        SELECT id FROM batch ORDER BY id DESC LIMIT 1
+        """
+    )
+    bind = op.get_bind()
+    after_id = "00000000-0000-0000-0000-000000000000"
+    while True:
+        params = {"after_id": after_id, "batch_size": _BACKFILL_BATCH_SIZE}
+        last_id = bind.execute(statement, params).scalar()
+        if last_id is None:
+            return
+        after_id = str(last_id)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    # Plain nullable columns are catalog-only additions; a GENERATED STORED column would rewrite the
+    # table under ACCESS EXCLUSIVE.
+    op.add_column("brands", sa.Column("search_text", sa.Text(), nullable=True))
+    op.add_column("ads", sa.Column("search_tsv", postgresql.TSVECTOR(), nullable=True))
+    # Triggers go in before the backfill so rows written meanwhile are already populated.
+    for table, column, expression, source_columns in _SEARCH_COLUMNS:
+        op.execute(
+            f"""
+            CREATE OR REPLACE FUNCTION {table}_{column}_refresh() RETURNS trigger AS $$
+            BEGIN
+                NEW.{column} := {expression.format(row="NEW")};
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+        )
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_{column} "
+            f"BEFORE INSERT OR UPDATE OF {source_columns} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {table}_{column}_refresh();"
+        )
+
+    with op.get_context().autocommit_block():
+        for table, column, expression, _ in _SEARCH_COLUMNS:
+            _backfill(table, column, expression)
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_brands_search_text_trgm "
+            "ON brands USING gin (search_text gin_trgm_ops);"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ads_search_tsv ON ads USING gin (search_tsv);"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_ads_search_tsv;")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_brands_search_text_trgm;")
+    for table, column, _, _ in _SEARCH_COLUMNS:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_{column} ON {table};")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_{column}_refresh();")
+    op.drop_column("ads", "search_tsv")
+    op.drop_column("brands", "search_text")
@@ -0,0 +1,30 @@
+"""Key ad_scores by (ad_id, score_version) so several scoring versions can coexist
+
+Revision ID: 0063_ad_score_versions
+Revises: 0062_explore_search
+Create Date: 2026-10-16 12:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0063_ad_score_versions"
+down_revision = "0062_explore_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_constraint("ad_scores_pkey", "ad_scores", type_="primary")
+    op.create_primary_key("ad_scores_pkey", "ad_scores", ["ad_id", "score_version"])
+    op.create_index("idx_ad_scores_version_org", "ad_scores", ["score_version", "org_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_ad_scores_version_org", table_name="ad_scores")
+    # Keep the live default version only; other versions cannot share the single-column key.
+    op.execute("DELETE FROM ad_scores WHERE score_version <> 'v1'")
+    op.drop_constraint("ad_scores_pkey", "ad_scores", type_="primary")
+    op.create_primary_key("ad_scores_pkey", "ad_scores", ["ad_id"])
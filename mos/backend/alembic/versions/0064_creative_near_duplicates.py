@@ -0,0 +1,86 @@
+"""Add perceptual hashes, copy MinHash and LSH bands for near-duplicate creative clustering
+
+Revision ID: 0064_creative_near_duplicates
+Revises: 0063_ad_score_versions
+Create Date: 2026-10-16 13:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0064_creative_near_duplicates"
+down_revision = "0063_ad_score_versions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    uuid = postgresql.UUID(as_uuid=True)
+    op.add_column("media_assets", sa.Column("phash", sa.BigInteger(), nullable=True))
+    op.add_column("media_assets", sa.Column("dhash", sa.BigInteger(), nullable=True))
+
+    op.add_column("ad_creatives", sa.Column("copy_minhash", postgresql.ARRAY(sa.Integer()), nullable=True))
+    op.add_column("ad_creatives", sa.Column("media_phash", sa.BigInteger(), nullable=True))
+    op.add_column(
+        "ad_creatives",
+        sa.Column("cluster_id", uuid, sa.ForeignKey("ad_creatives.id", ondelete="SET NULL"), nullable=True),
+    )
+    op.add_column("ad_creatives", sa.Column("clustered_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("idx_ad_creatives_cluster", "ad_creatives", ["cluster_id"])
+    op.create_index(
+        "idx_ad_creatives_unclustered",
+        "ad_creatives",
+        ["created_at"],
+        postgresql_where=sa.text("clustered_at IS NULL"),
+    )
+
+    op.create_table(
+        "ad_creative_lsh_bands",
+        sa.Column("creative_id", uuid, sa.ForeignKey("ad_creatives.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("kind", sa.Text(), primary_key=True),
+        sa.Column("band", sa.SmallInteger(), primary_key=True),
+        sa.Column("bucket", sa.BigInteger(), nullable=False),
+        sa.Column("org_id", uuid, sa.ForeignKey("orgs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("brand_id", uuid, sa.ForeignKey("brands.id", ondelete="CASCADE"), nullable=False),
+    )
+    op.create_index(
+        "idx_ad_creative_lsh_bands_lookup",
+        "ad_creative_lsh_bands",
+        ["org_id", "brand_id", "kind", "band", "bucket"],
+    )
+
+    op.add_column(
+        "brand_ad_stats",
+        sa.Column("creative_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+    # Until clustering runs, every exact-fingerprint creative counts as its own cluster.
+    op.execute(
+        """
+        UPDATE brand_ad_stats AS s
+        SET creative_count = c.creative_count
+        FROM (
+            SELECT brand_id, count(*) AS creative_count
+            FROM ad_creatives
+            GROUP BY brand_id
+        ) AS c
+        WHERE s.brand_id = c.brand_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("brand_ad_stats", "creative_count")
+    op.drop_index("idx_ad_creative_lsh_bands_lookup", table_name="ad_creative_lsh_bands")
+    op.drop_table("ad_creative_lsh_bands")
+    op.drop_index("idx_ad_creatives_unclustered", table_name="ad_creatives")
+    op.drop_index("idx_ad_creatives_cluster", table_name="ad_creatives")
+    op.drop_column("ad_creatives", "clustered_at")
+    op.drop_column("ad_creatives", "cluster_id")
+    op.drop_column("ad_creatives", "media_phash")
+    op.drop_column("ad_creatives", "copy_minhash")
+    op.drop_column("media_assets", "dhash")
+    op.drop_column("media_assets", "phash")
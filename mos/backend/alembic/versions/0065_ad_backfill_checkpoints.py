@@ -0,0 +1,38 @@
+"""Add resumable checkpoints for set-based ad backfills
+
+Revision ID: 0065_ad_backfill_checkpoints
+Revises: 0064_creative_near_duplicates
+Create Date: 2026-10-16 14:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0065_ad_backfill_checkpoints"
+down_revision = "0064_creative_near_duplicates"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    uuid = postgresql.UUID(as_uuid=True)
+    op.create_table(
+        "ad_backfill_checkpoints",
+        sa.Column("job_key", sa.Text(), primary_key=True),
+        sa.Column("partition", sa.Integer(), primary_key=True),
+        sa.Column("after_ad_id", uuid, nullable=True),
+        sa.Column("through_ad_id", uuid, nullable=True),
+        sa.Column("last_ad_id", uuid, nullable=True),
+        sa.Column("processed", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ad_backfill_checkpoints")
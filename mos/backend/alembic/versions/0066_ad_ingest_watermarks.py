@@ -0,0 +1,49 @@
+"""Add per-identity watermarks for incremental ad ingestion
+
+Revision ID: 0066_ad_ingest_watermarks
+Revises: 0065_ad_backfill_checkpoints
+Create Date: 2026-10-16 16:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0066_ad_ingest_watermarks"
+down_revision = "0065_ad_backfill_checkpoints"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    uuid = postgresql.UUID(as_uuid=True)
+    ad_channel_enum = postgresql.ENUM(name="ad_channel", create_type=False)
+    op.create_table(
+        "ad_ingest_watermarks",
+        sa.Column(
+            "brand_channel_identity_id",
+            uuid,
+            sa.ForeignKey("brand_channel_identities.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("channel", ad_channel_enum, nullable=False),
+        sa.Column(
+            "last_ingest_run_id",
+            uuid,
+            sa.ForeignKey("ad_ingest_runs.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("last_full_refresh_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("seen_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("upserted_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("max_ad_last_seen_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ad_ingest_watermarks")
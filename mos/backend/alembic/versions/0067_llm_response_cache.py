@@ -0,0 +1,36 @@
+"""Add content-addressed LLM response cache
+
+Revision ID: 0067_llm_response_cache
+Revises: 0066_ad_ingest_watermarks
+Create Date: 2026-10-16 18:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0067_llm_response_cache"
+down_revision = "0066_ad_ingest_watermarks"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_response_cache",
+        sa.Column("cache_key", sa.Text(), primary_key=True),
+        sa.Column("provider", sa.Text(), nullable=False),
+        sa.Column("model", sa.Text(), nullable=False),
+        sa.Column("response_text", sa.Text(), nullable=False),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("idx_llm_response_cache_expires_at", "llm_response_cache", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_llm_response_cache_expires_at", table_name="llm_response_cache")
+    op.drop_table("llm_response_cache")
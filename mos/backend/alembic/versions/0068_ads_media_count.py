@@ -0,0 +1,65 @@
+"""Store ads.media_count and index the explore ads keyset orders
+
+Revision ID: 0068_ads_media_count
+Revises: 0067_llm_response_cache
+Create Date: 2026-10-16 20:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0068_ads_media_count"
+down_revision = "0067_llm_response_cache"
+branch_labels = None
+depends_on = None
+
+_BACKFILL_BATCH_SIZE = 5000
+
+_BACKFILL_SQL = sa.text(
+    """
+    WITH batch AS (
+        SELECT id FROM ads WHERE id > CAST(:after_id AS uuid) ORDER BY id LIMIT :batch_size
+    ), counted AS (
+        UPDATE ads AS a
+        SET media_count = (SELECT count(*) FROM ad_asset_links AS l WHERE l.ad_id = a.id)
+        FROM batch
+        WHERE a.id = batch.id AND EXISTS (SELECT 1 FROM ad_asset_links AS l WHERE l.ad_id = a.id)
+    )
+    SELECT id FROM batch ORDER BY id DESC LIMIT 1
+    """
+)
+
+
+def upgrade() -> None:
+    # A constant default is a catalog-only change; no table rewrite.
+    op.add_column("ads", sa.Column("media_count", sa.Integer(), nullable=False, server_default="0"))
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        after_id = "00000000-0000-0000-0000-000000000000"
+        while True:
+            params = {"after_id": after_id, "batch_size": _BACKFILL_BATCH_SIZE}
+            last_id = bind.execute(_BACKFILL_SQL, params).scalar()
+            if last_id is None:
+                break
+            after_id = str(last_id)
+
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ads_explore_last_seen "
+            "ON ads (media_count DESC, last_seen_at DESC NULLS LAST, id DESC)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ads_explore_started "
+            "ON ads (media_count DESC, started_running_at DESC NULLS LAST, "
+            "last_seen_at DESC NULLS LAST, id DESC)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_ads_explore_started")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_ads_explore_last_seen")
+    op.drop_column("ads", "media_count")
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import json
 import os
+import threading
 import time
-from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
 from urllib.parse import quote
 
 import httpx
 
 
 _TRANSIENT_HTTP_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+_TERMINAL_RUN_STATUSES = {"SUCCEEDED", "FAILED", "TIMED_OUT", "ABORTED"}
 
 
 def _parse_positive_int_env(name: str, default: int) -> int:
@@ -37,8 +43,60 @@ def _parse_positive_float_env(name: str, default: float) -> float:
     return value
 
 
+def _http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=_parse_positive_int_env("APIFY_HTTP_MAX_CONNECTIONS", 64),
+        max_keepalive_connections=_parse_positive_int_env("APIFY_HTTP_MAX_KEEPALIVE_CONNECTIONS", 16),
+    )
+
+
+def _http2_enabled() -> bool:
+    return os.getenv("APIFY_HTTP2", "true").strip().lower() not in {"0", "false", "no", "off"}
+
+
+_shared_http_client: Optional[httpx.Client] = None
+_shared_http_client_lock = threading.Lock()
+
+
+def _get_shared_http_client() -> httpx.Client:
+    """
+    Process-wide keep-alive pool (HTTP/2 unless APIFY_HTTP2=false) shared by every ApifyClient.
+
+    httpx.Client is thread-safe, so ingestion threads reuse connections instead of opening a new
+    TCP+TLS connection per poll and page.
+    """
+    global _shared_http_client
+    with _shared_http_client_lock:
+        if _shared_http_client is None or _shared_http_client.is_closed:
+            _shared_http_client = httpx.Client(http2=_http2_enabled(), limits=_http_limits())
+        return _shared_http_client
+
+
+def completion_webhook(request_url: str, *, secret: str) -> Dict[str, Any]:
+    """
+    Ad-hoc webhook spec that POSTs Apify's default payload (which embeds the run as `resource`) to
+    `request_url` when a run reaches a terminal state; `secret` is sent as X-Apify-Webhook-Secret.
+    """
+    return {
+        "eventTypes": [f"ACTOR.RUN.{status}" for status in sorted(_TERMINAL_RUN_STATUSES)],
+        "requestUrl": request_url,
+        "headersTemplate": json.dumps({"X-Apify-Webhook-Secret": secret}),
+    }
+
+
+def _encode_webhooks(webhooks: List[Dict[str, Any]]) -> str:
+    return base64.b64encode(json.dumps(webhooks).encode("utf-8")).decode("ascii")
+
+
 class ApifyClient:
-    """Minimal Apify REST client for actor runs and dataset fetches."""
+    """
+    Minimal Apify REST client for actor runs and dataset fetches.
+
+    Sync methods share one pooled httpx.Client per process. The `a`-prefixed coroutines use an
+    httpx.AsyncClient owned by this instance (an AsyncClient is bound to the event loop that first
+    uses it), so one loop can start, poll and fetch many actor runs concurrently; close it with
+    `aclose()` or `async with ApifyClient() as client`.
+    """
 
     def __init__(
         self,
@@ -46,6 +104,8 @@ class ApifyClient:
         token: Optional[str] = None,
         base_url: str | None = None,
         timeout_seconds: int = 30,
+        http_client: Optional[httpx.Client] = None,
+        async_http_client: Optional[httpx.AsyncClient] = None,
     ) -> None:
         self.token = token or os.getenv("APIFY_API_TOKEN") or ""
         self.base_url = base_url or os.getenv("APIFY_API_URL", "https://api.apify.com/v2")
@@ -53,15 +113,42 @@ class ApifyClient:
         self.http_max_attempts = _parse_positive_int_env("APIFY_HTTP_MAX_ATTEMPTS", 5)
         self.http_retry_base_seconds = _parse_positive_float_env("APIFY_HTTP_RETRY_BASE_SECONDS", 1.0)
         self.http_retry_max_seconds = _parse_positive_float_env("APIFY_HTTP_RETRY_MAX_SECONDS", 8.0)
+        self.dataset_page_size = _parse_positive_int_env("APIFY_DATASET_PAGE_SIZE", 1000)
         if not self.token:
             raise RuntimeError("APIFY_API_TOKEN is required for Apify client")
+        self._http_client = http_client
+        self._async_http_client = async_http_client
+        self._owns_async_http_client = async_http_client is None
+
+    @property
+    def http_client(self) -> httpx.Client:
+        return self._http_client or _get_shared_http_client()
+
+    @property
+    def async_http_client(self) -> httpx.AsyncClient:
+        if self._async_http_client is None:
+            self._async_http_client = httpx.AsyncClient(http2=_http2_enabled(), limits=_http_limits())
+        return self._async_http_client
+
+    async def aclose(self) -> None:
+        if self._async_http_client is not None and self._owns_async_http_client:
+            await self._async_http_client.aclose()
+            self._async_http_client = None
+
+    async def __aenter__(self) -> "ApifyClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
 
     def _headers(self) -> Dict[str, str]:
         return {"Content-Type": "application/json"}
 
+    def _retry_seconds(self, attempt: int) -> float:
+        return min(self.http_retry_base_seconds * (2 ** max(attempt - 1, 0)), self.http_retry_max_seconds)
+
     def _sleep_for_retry(self, attempt: int) -> None:
-        retry_seconds = min(self.http_retry_base_seconds * (2 ** max(attempt - 1, 0)), self.http_retry_max_seconds)
-        time.sleep(retry_seconds)
+        time.sleep(self._retry_seconds(attempt))
 
     def _request_data(
         self,
@@ -73,7 +160,7 @@ class ApifyClient:
     ) -> Any:
         for attempt in range(1, self.http_max_attempts + 1):
             try:
-                response = httpx.request(
+                response = self.http_client.request(
                     method,
                     url,
                     headers=self._headers(),
@@ -99,22 +186,68 @@ class ApifyClient:
                 raise
         raise RuntimeError("Apify request retry loop exited unexpectedly.")
 
-    def start_actor_run(self, actor_id: str, *, input_payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def _arequest_data(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json_payload: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        for attempt in range(1, self.http_max_attempts + 1):
+            try:
+                response = await self.async_http_client.request(
+                    method,
+                    url,
+                    headers=self._headers(),
+                    params=params,
+                    json=json_payload,
+                    timeout=self.timeout_seconds,
+                )
+                if response.status_code in _TRANSIENT_HTTP_STATUS_CODES and attempt < self.http_max_attempts:
+                    await asyncio.sleep(self._retry_seconds(attempt))
+                    continue
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPStatusError as exc:
+                status_code = exc.response.status_code if exc.response is not None else None
+                if status_code in _TRANSIENT_HTTP_STATUS_CODES and attempt < self.http_max_attempts:
+                    await asyncio.sleep(self._retry_seconds(attempt))
+                    continue
+                raise
+            except httpx.RequestError:
+                if attempt < self.http_max_attempts:
+                    await asyncio.sleep(self._retry_seconds(attempt))
+                    continue
+                raise
+        raise RuntimeError("Apify request retry loop exited unexpectedly.")
+
+    @staticmethod
+    def _data_field(body: Any) -> Dict[str, Any]:
+        if not isinstance(body, dict):
+            return {}
+        return body.get("data", {}) if isinstance(body.get("data"), dict) else {}
+
+    def start_actor_run(
+        self,
+        actor_id: str,
+        *,
+        input_payload: Dict[str, Any],
+        webhooks: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
         encoded_actor_id = quote(actor_id, safe="~")
         url = f"{self.base_url}/acts/{encoded_actor_id}/runs"
         params = {"token": self.token}
+        if webhooks:
+            params["webhooks"] = _encode_webhooks(webhooks)
         body = self._request_data("POST", url, params=params, json_payload=input_payload)
-        if not isinstance(body, dict):
-            return {}
-        return body.get("data", {}) if isinstance(body.get("data"), dict) else {}
+        return self._data_field(body)
 
     def fetch_run(self, run_id: str) -> Dict[str, Any]:
         url = f"{self.base_url}/actor-runs/{run_id}"
         params = {"token": self.token}
         body = self._request_data("GET", url, params=params)
-        if not isinstance(body, dict):
-            return {}
-        return body.get("data", {}) if isinstance(body.get("data"), dict) else {}
+        return self._data_field(body)
 
     def poll_run_until_terminal(
         self,
@@ -136,16 +269,140 @@ class ApifyClient:
                         "elapsed_seconds": max(time.time() - start, 0.0),
                     }
                 )
-            if status in {"SUCCEEDED", "FAILED", "TIMED_OUT", "ABORTED"}:
+            if status in _TERMINAL_RUN_STATUSES:
                 return data
             if time.time() - start > max_wait_seconds:
                 raise TimeoutError(f"Apify run {run_id} did not complete in time")
             time.sleep(poll_interval_seconds)
 
-    def fetch_dataset_items(self, dataset_id: str, *, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def _fetch_dataset_page(self, dataset_id: str, *, offset: int, limit: int) -> List[Dict[str, Any]]:
         url = f"{self.base_url}/datasets/{dataset_id}/items"
-        params: Dict[str, Any] = {"token": self.token, "format": "json"}
-        if limit:
-            params["limit"] = limit
+        params: Dict[str, Any] = {"token": self.token, "format": "json", "offset": offset, "limit": limit}
         data = self._request_data("GET", url, params=params)
         return data if isinstance(data, list) else []
+
+    def iter_dataset_items(
+        self,
+        dataset_id: str,
+        *,
+        page_size: Optional[int] = None,
+        limit: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield dataset items page by page (offset/limit) instead of downloading the whole dataset.
+
+        With `prefetch` the next page is requested on a background thread while the caller processes
+        the current one, so normalization and DB writes overlap with the transfer. Each page is retried
+        like any other request; a page shorter than requested ends the dataset.
+        """
+        page_size = page_size or self.dataset_page_size
+        if page_size <= 0:
+            raise ValueError(f"page_size must be > 0, got {page_size}.")
+
+        def _page_limit(offset: int) -> int:
+            return page_size if not limit else max(min(page_size, limit - offset), 0)
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="apify-dataset") if prefetch else None
+        try:
+            offset = 0
+            requested = _page_limit(offset)
+            future: Optional[Future] = None
+            if executor is not None and requested:
+                future = executor.submit(self._fetch_dataset_page, dataset_id, offset=offset, limit=requested)
+            while requested:
+                if future is not None:
+                    page = future.result()
+                else:
+                    page = self._fetch_dataset_page(dataset_id, offset=offset, limit=requested)
+                offset += len(page)
+                requested = _page_limit(offset) if len(page) >= requested else 0
+                future = None
+                if executor is not None and requested:
+                    future = executor.submit(self._fetch_dataset_page, dataset_id, offset=offset, limit=requested)
+                yield from page
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def fetch_dataset_items(self, dataset_id: str, *, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return list(self.iter_dataset_items(dataset_id, limit=limit, prefetch=False))
+
+    async def astart_actor_run(
+        self,
+        actor_id: str,
+        *,
+        input_payload: Dict[str, Any],
+        webhooks: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        encoded_actor_id = quote(actor_id, safe="~")
+        url = f"{self.base_url}/acts/{encoded_actor_id}/runs"
+        params = {"token": self.token}
+        if webhooks:
+            params["webhooks"] = _encode_webhooks(webhooks)
+        body = await self._arequest_data("POST", url, params=params, json_payload=input_payload)
+        return self._data_field(body)
+
+    async def afetch_run(self, run_id: str) -> Dict[str, Any]:
+        url = f"{self.base_url}/actor-runs/{run_id}"
+        body = await self._arequest_data("GET", url, params={"token": self.token})
+        return self._data_field(body)
+
+    async def apoll_run_until_terminal(
+        self,
+        run_id: str,
+        *,
+        poll_interval_seconds: int = 5,
+        max_wait_seconds: int = 300,
+        on_poll: Callable[[Dict[str, Any]], None] | None = None,
+    ) -> Dict[str, Any]:
+        """Async poll loop: waiting runs cost a timer on the event loop rather than a sleeping thread."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        while True:
+            data = await self.afetch_run(run_id)
+            status = (data.get("status") or "").upper()
+            if on_poll is not None:
+                on_poll(
+                    {
+                        "run_id": run_id,
+                        "status": status or "UNKNOWN",
+                        "elapsed_seconds": max(loop.time() - start, 0.0),
+                    }
+                )
+            if status in _TERMINAL_RUN_STATUSES:
+                return data
+            if loop.time() - start > max_wait_seconds:
+                raise TimeoutError(f"Apify run {run_id} did not complete in time")
+            await asyncio.sleep(poll_interval_seconds)
+
+    async def _afetch_dataset_page(self, dataset_id: str, *, offset: int, limit: int) -> List[Dict[str, Any]]:
+        url = f"{self.base_url}/datasets/{dataset_id}/items"
+        params: Dict[str, Any] = {"token": self.token, "format": "json", "offset": offset, "limit": limit}
+        data = await self._arequest_data("GET", url, params=params)
+        return data if isinstance(data, list) else []
+
+    async def aiter_dataset_items(
+        self,
+        dataset_id: str,
+        *,
+        page_size: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        page_size = page_size or self.dataset_page_size
+        if page_size <= 0:
+            raise ValueError(f"page_size must be > 0, got {page_size}.")
+        offset = 0
+        while True:
+            requested = page_size if not limit else min(page_size, limit - offset)
+            if requested <= 0:
+                return
+            page = await self._afetch_dataset_page(dataset_id, offset=offset, limit=requested)
+            for item in page:
+                yield item
+            offset += len(page)
+            if len(page) < requested:
+                return
+
+    async def afetch_dataset_items(self, dataset_id: str, *, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return [item async for item in self.aiter_dataset_items(dataset_id, limit=limit)]
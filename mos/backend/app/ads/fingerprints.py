@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from typing import Iterable, Optional, Sequence
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
+from app.ads.near_duplicates import minhash_signature
 from app.db.enums import MediaAssetTypeEnum
 
 FINGERPRINT_ALGO = "adcopy+media-sha256-set-v1"
@@ -38,6 +39,8 @@ class CreativeFingerprintResult:
     copy_tokens: list[str]
     primary_media_asset_id: Optional[str]
     fingerprint_algo: str = FINGERPRINT_ALGO
+    # Near-duplicate signature of the ad copy (see app.ads.near_duplicates); not part of the exact fingerprint.
+    copy_minhash: Optional[list[int]] = None
 
 
 def _sha256(value: str) -> str:
@@ -158,6 +161,14 @@ def compute_creative_fingerprint(
     media_tokens, media_fingerprint, primary_media_asset_id = _build_media_tokens(assets)
     copy_tokens, copy_fingerprint = _build_copy_tokens(copy_fields)
 
+    copy_text = " ".join(
+        text
+        for text in (
+            canonicalize_text(copy_fields.get(key)) for key in ("headline", "primary_text", "description")
+        )
+        if text
+    )
+
     token_union = sorted(set(media_tokens).union(copy_tokens))
     creative_fingerprint = _sha256("|".join(token_union)) if token_union else _sha256("empty")
 
@@ -169,4 +180,5 @@ def compute_creative_fingerprint(
         copy_tokens=copy_tokens,
         primary_media_asset_id=primary_media_asset_id,
         fingerprint_algo=FINGERPRINT_ALGO,
+        copy_minhash=minhash_signature(copy_text),
     )
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.ads.types import AdChangeKey
+from app.db.enums import AdStatusEnum
+
+
+@dataclass(frozen=True)
+class KnownAdState:
+    """Stored columns of an ad that incremental ingestion compares a fresh scrape against."""
+
+    ad_id: str
+    ad_status: AdStatusEnum
+    ended_running_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
+
+
+def ad_needs_upsert(key: AdChangeKey, known: Optional[KnownAdState]) -> bool:
+    """
+    True when `key` is a new ad or would change the stored row under upsert_ads_batch merge rules.
+
+    A missing end date or last-seen date in the scrape never counts as a change: the upsert keeps the
+    stored end date, and the last-seen bump is applied by AdsRepository.touch_ads_last_seen instead.
+    """
+    if known is None:
+        return True
+    if key.ad_status != known.ad_status:
+        return True
+    if key.ended_running_at is not None and key.ended_running_at != known.ended_running_at:
+        return True
+    if key.last_seen_at is not None and key.last_seen_at != known.last_seen_at:
+        return True
+    return False
+
+
+def needs_full_refresh(
+    last_full_refresh_at: Optional[datetime],
+    *,
+    now: datetime,
+    max_age: timedelta,
+) -> bool:
+    """Identities without a watermark, or whose last full pass is older than `max_age`, re-upsert everything."""
+    return last_full_refresh_at is None or now - last_full_refresh_at >= max_age
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List, Optional
 
-from app.ads.types import IngestRequest, NormalizedAdWithAssets, RawAdItem, NormalizeContext
+from app.ads.types import AdChangeKey, IngestRequest, NormalizedAdWithAssets, RawAdItem, NormalizeContext
 from app.db.enums import AdChannelEnum
 from app.db.models import BrandChannelIdentity
 
@@ -19,6 +19,18 @@ class ChannelIngestor(ABC):
     def run(self, request: IngestRequest) -> list[RawAdItem]:
         raise NotImplementedError
 
+    def iter_items(self, request: IngestRequest) -> Iterator[RawAdItem]:
+        """Stream the items of `request`; ingestors that can page their provider override this."""
+        yield from self.run(request)
+
     @abstractmethod
     def normalize(self, raw: RawAdItem, ctx: NormalizeContext) -> NormalizedAdWithAssets:
         raise NotImplementedError
+
+    def change_key(self, raw: RawAdItem) -> Optional[AdChangeKey]:
+        """
+        Cheap identity/status read of `raw` for incremental ingestion, without a full normalize.
+
+        Returning None (the default) means the item cannot be compared and is always normalized.
+        """
+        return None
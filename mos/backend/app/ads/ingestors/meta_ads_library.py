@@ -2,14 +2,17 @@ from __future__ import annotations
 
 import os
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Tuple
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Tuple
 
 from app.ads.apify_client import ApifyClient
 from app.ads.ingestors.base import ChannelIngestor
 from app.ads.normalization import normalize_facebook_page_url
-from app.ads.types import IngestRequest, NormalizedAdWithAssets, NormalizedAsset, RawAdItem, NormalizeContext
+from app.ads.types import AdChangeKey, IngestRequest, NormalizedAdWithAssets, NormalizedAsset, RawAdItem, NormalizeContext
+from app.config import settings
 from app.db.enums import AdChannelEnum, AdStatusEnum, MediaAssetTypeEnum
 from app.db.models import BrandChannelIdentity
+from app.services.apify_run_completion import completion_webhooks, wait_for_run_completion
 
 
 def _parse_datetime(value: Any) -> datetime | None:
@@ -61,39 +64,37 @@ class MetaAdsLibraryIngestor(ChannelIngestor):
         return requests
 
     def run(self, request: IngestRequest) -> list[RawAdItem]:
+        return list(self.iter_items(request))
+
+    def iter_items(self, request: IngestRequest) -> Iterator[RawAdItem]:
         active_status = os.getenv("APIFY_META_ACTIVE_STATUS", "active")
         items, meta = self._run_actor(request.url, request.limit, active_status=active_status)
-
-        has_ads = self._has_ad_payload(items)
+        # Only read until the first real ad: that is enough to decide on the fallback below.
+        head, has_ads = self._read_until_ad(items)
         combined_meta = {**meta, **(request.metadata or {}), "requested_url": request.url, "active_status": active_status}
 
         # Fallback: if nothing came back and we asked for active ads only, retry once with all statuses.
         if not has_ads and active_status.lower() == "active":
             retry_status = "all"
             retry_items, retry_meta = self._run_actor(request.url, request.limit, active_status=retry_status)
-            retry_has_ads = self._has_ad_payload(retry_items)
-            if retry_has_ads or not items:
-                items, meta = retry_items, retry_meta
-                combined_meta.update(meta)
+            retry_head, retry_has_ads = self._read_until_ad(retry_items)
+            if retry_has_ads or not head:
+                head, items = retry_head, retry_items
+                combined_meta.update(retry_meta)
                 combined_meta["active_status"] = retry_status
             else:
                 combined_meta.update(retry_meta)
 
-        # Always return at least one RawAdItem so provider_run_id/dataset_id are preserved even when no ads.
-        wrapped: List[RawAdItem] = []
-        if items:
-            for item in items:
-                wrapped.append(RawAdItem(payload=item, metadata=combined_meta))
-        else:
-            wrapped.append(
-                RawAdItem(
-                    payload={"error": "no_items_returned"},
-                    metadata=combined_meta,
-                )
-            )
-        return wrapped
+        # Always yield at least one RawAdItem so provider_run_id/dataset_id are preserved even when no ads.
+        if not head:
+            yield RawAdItem(payload={"error": "no_items_returned"}, metadata=combined_meta)
+            return
+        for item in chain(head, items):
+            yield RawAdItem(payload=item, metadata=combined_meta)
 
-    def _run_actor(self, url: str, limit: int | None, *, active_status: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    def _run_actor(
+        self, url: str, limit: int | None, *, active_status: str
+    ) -> Tuple[Iterator[Dict[str, Any]], Dict[str, Any]]:
         limit_per_source = limit or int(os.getenv("APIFY_META_LIMIT_PER_SOURCE", "50"))
         payload: Dict[str, Any] = {
             "urls": [{"url": url}],
@@ -105,30 +106,42 @@ class MetaAdsLibraryIngestor(ChannelIngestor):
             payload["limitPerSource"] = limit_per_source
             payload["count"] = limit_per_source
             payload["maxItems"] = limit_per_source
-        run = self.apify_client.start_actor_run(self.actor_id, input_payload=payload)
+        webhooks = completion_webhooks()
+        if webhooks:
+            run = self.apify_client.start_actor_run(self.actor_id, input_payload=payload, webhooks=webhooks)
+        else:
+            run = self.apify_client.start_actor_run(self.actor_id, input_payload=payload)
         run_id = run.get("id") or run.get("runId")
         if not run_id:
             raise RuntimeError("Apify actor run did not return an id")
-        final_run = self.apify_client.poll_run_until_terminal(run_id)
+        max_wait_seconds = int(settings.APIFY_META_MAX_WAIT_SECONDS)
+        if webhooks:
+            final_run = wait_for_run_completion(run_id, max_wait_seconds=max_wait_seconds)
+        else:
+            final_run = self.apify_client.poll_run_until_terminal(run_id, max_wait_seconds=max_wait_seconds)
         dataset_id = final_run.get("defaultDatasetId")
-        items: List[Dict[str, Any]] = []
+        items: Iterator[Dict[str, Any]] = iter(())
         if dataset_id:
-            items = self.apify_client.fetch_dataset_items(dataset_id, limit=limit)
+            items = self.apify_client.iter_dataset_items(dataset_id, limit=limit)
 
         meta = {"provider_run_id": run_id, "dataset_id": dataset_id, "actor_id": self.actor_id, "actor_input": payload}
         return items, meta
 
+    @classmethod
+    def _read_until_ad(cls, items: Iterator[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+        """Consume `items` up to and including the first ad row; the rest stays in the iterator."""
+        head: List[Dict[str, Any]] = []
+        for item in items:
+            head.append(item)
+            if cls._has_ad_payload([item]):
+                return head, True
+        return head, False
+
     def normalize(self, raw: RawAdItem, ctx: NormalizeContext) -> NormalizedAdWithAssets | None:
         data = raw.payload or {}
         if data.get("error"):
             return None
-        external_id = (
-            data.get("adArchiveId")
-            or data.get("ad_archive_id")
-            or data.get("ad_snapshot_id")
-            or data.get("id")
-            or ""
-        )
+        external_id = self._external_ad_id(data)
         snapshot: Dict[str, Any] = data.get("snapshot") or {}
         body_text = (
             snapshot.get("body", {}) or {}
@@ -234,8 +247,8 @@ class MetaAdsLibraryIngestor(ChannelIngestor):
             )
 
         return NormalizedAdWithAssets(
-            external_ad_id=str(external_id),
-            ad_status=self._map_status(data.get("status") or ("active" if data.get("is_active") else "inactive")),
+            external_ad_id=external_id,
+            ad_status=self._ad_status(data),
             started_running_at=_parse_datetime(data.get("startDate") or data.get("start_date")),
             ended_running_at=_parse_datetime(data.get("endDate") or data.get("end_date")),
             first_seen_at=_parse_datetime(data.get("firstSeenDate") or data.get("start_date")),
@@ -249,6 +262,34 @@ class MetaAdsLibraryIngestor(ChannelIngestor):
             assets=assets,
         )
 
+    def change_key(self, raw: RawAdItem) -> AdChangeKey | None:
+        data = raw.payload or {}
+        if data.get("error"):
+            return None
+        external_id = self._external_ad_id(data)
+        if not external_id:
+            return None
+        return AdChangeKey(
+            external_ad_id=external_id,
+            ad_status=self._ad_status(data),
+            ended_running_at=_parse_datetime(data.get("endDate") or data.get("end_date")),
+            last_seen_at=_parse_datetime(data.get("lastSeenDate") or data.get("end_date")),
+        )
+
+    @staticmethod
+    def _external_ad_id(data: Dict[str, Any]) -> str:
+        return str(
+            data.get("adArchiveId")
+            or data.get("ad_archive_id")
+            or data.get("ad_snapshot_id")
+            or data.get("id")
+            or ""
+        )
+
+    @classmethod
+    def _ad_status(cls, data: Dict[str, Any]) -> AdStatusEnum:
+        return cls._map_status(data.get("status") or ("active" if data.get("is_active") else "inactive"))
+
     @staticmethod
     def _map_status(status: Any) -> AdStatusEnum:
         text = str(status or "").lower()
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Hashable, Iterable, Optional
+
+import numpy as np
+from PIL import Image
+
+# Perceptual hashes are 64-bit and stored as signed BIGINT. pHash is banded 8 x 8 bits for LSH, so any
+# two hashes within 7 bits of each other share at least one band (pigeonhole).
+PHASH_BANDS = 8
+_PHASH_BAND_BITS = 64 // PHASH_BANDS
+
+# Copy MinHash: word 3-gram shingles, 64 permutations of a universal hash mod the Mersenne prime 2^31-1
+# (values fit in INTEGER). 16 bands x 4 rows puts the LSH candidate threshold near Jaccard 0.5.
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16
+_MINHASH_ROWS = MINHASH_PERMUTATIONS // MINHASH_BANDS
+_MINHASH_PRIME = (1 << 31) - 1
+_SHINGLE_WORDS = 3
+_rng = np.random.default_rng(0x5EED)
+_MINHASH_A = _rng.integers(1, _MINHASH_PRIME, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+_MINHASH_B = _rng.integers(0, _MINHASH_PRIME, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+_DCT_SIZE = 32
+_dct_index = np.arange(_DCT_SIZE)
+_DCT_MATRIX = np.cos(np.pi * (2 * _dct_index[None, :] + 1) * _dct_index[:, None] / (2 * _DCT_SIZE))
+
+
+def _to_signed64(value: int) -> int:
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    value = 0
+    for bit in bits.ravel().tolist():
+        value = (value << 1) | int(bit)
+    return _to_signed64(value)
+
+
+def _grayscale(img: Image.Image, size: tuple[int, int]) -> np.ndarray:
+    return np.asarray(img.convert("L").resize(size, Image.LANCZOS), dtype=np.float64)
+
+
+def phash(img: Image.Image) -> int:
+    """DCT perceptual hash: low 8x8 frequencies of a 32x32 grayscale image compared to their median."""
+    pixels = _grayscale(img, (_DCT_SIZE, _DCT_SIZE))
+    low = (_DCT_MATRIX @ pixels @ _DCT_MATRIX.T)[:8, :8]
+    return _bits_to_int(low > np.median(low))
+
+
+def dhash(img: Image.Image) -> int:
+    """Gradient hash: each bit says whether a pixel is brighter than its right neighbour (9x8 grayscale)."""
+    pixels = _grayscale(img, (9, 8))
+    return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+
+def image_hashes(data: bytes) -> Optional[tuple[int, int]]:
+    """(phash, dhash) of an encoded image, or None when it cannot be decoded."""
+    try:
+        with Image.open(BytesIO(data)) as img:
+            return phash(img), dhash(img)
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def hamming_distance(left: int, right: int) -> int:
+    return ((left ^ right) & 0xFFFFFFFFFFFFFFFF).bit_count()
+
+
+def phash_bands(value: int) -> list[int]:
+    unsigned = value & 0xFFFFFFFFFFFFFFFF
+    mask = (1 << _PHASH_BAND_BITS) - 1
+    return [(unsigned >> (band * _PHASH_BAND_BITS)) & mask for band in range(PHASH_BANDS)]
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big") % _MINHASH_PRIME
+
+
+def minhash_signature(text: Optional[str]) -> Optional[list[int]]:
+    """MinHash of the word 3-gram shingles of already canonicalized copy, or None for empty copy."""
+    words = (text or "").split()
+    if not words:
+        return None
+    width = min(_SHINGLE_WORDS, len(words))
+    shingles = {" ".join(words[idx : idx + width]) for idx in range(len(words) - width + 1)}
+    hashes = np.array([_shingle_hash(shingle) for shingle in shingles], dtype=np.uint64)
+    # a, x < 2^31 so a*x + b stays below 2^63 in uint64.
+    permuted = (_MINHASH_A[:, None] * hashes[None, :] + _MINHASH_B[:, None]) % _MINHASH_PRIME
+    return permuted.min(axis=1).astype(np.int64).tolist()
+
+
+def minhash_similarity(left: Iterable[int], right: Iterable[int]) -> float:
+    """Estimated Jaccard similarity: the fraction of permutations whose minimum agrees."""
+    left_arr = np.asarray(list(left), dtype=np.int64)
+    right_arr = np.asarray(list(right), dtype=np.int64)
+    if left_arr.shape != right_arr.shape or not left_arr.size:
+        return 0.0
+    return float(np.mean(left_arr == right_arr))
+
+
+def minhash_bands(signature: list[int]) -> list[int]:
+    bands = []
+    for band in range(MINHASH_BANDS):
+        rows = signature[band * _MINHASH_ROWS : (band + 1) * _MINHASH_ROWS]
+        digest = hashlib.blake2b(",".join(str(value) for value in rows).encode("ascii"), digest_size=8).digest()
+        bands.append(_to_signed64(int.from_bytes(digest, "big")))
+    return bands
+
+
+@dataclass(frozen=True)
+class CreativeSignature:
+    creative_id: str
+    media_phash: Optional[int]
+    copy_minhash: Optional[list[int]]
+
+
+def is_near_duplicate(
+    left: CreativeSignature,
+    right: CreativeSignature,
+    *,
+    max_phash_distance: int,
+    min_copy_similarity: float,
+) -> bool:
+    """
+    Creatives match when their primary media is perceptually close and their copy (if both have any)
+    is similar. Creatives without media match on copy alone; a hashed/unhashed pair never matches.
+    """
+    if (left.media_phash is None) != (right.media_phash is None):
+        return False
+    if left.media_phash is not None and right.media_phash is not None:
+        if hamming_distance(left.media_phash, right.media_phash) > max_phash_distance:
+            return False
+        if left.copy_minhash is None or right.copy_minhash is None:
+            return True
+    elif left.copy_minhash is None or right.copy_minhash is None:
+        return False
+    return minhash_similarity(left.copy_minhash, right.copy_minhash) >= min_copy_similarity
+
+
+def connected_components(nodes: Iterable[Hashable], edges: Iterable[tuple[Hashable, Hashable]]) -> list[set]:
+    """Union-find over `edges`; every node ends up in exactly one component."""
+    parent: dict[Hashable, Hashable] = {node: node for node in nodes}
+
+    def _find(node: Hashable) -> Hashable:
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for left, right in edges:
+        left_root, right_root = _find(left), _find(right)
+        if left_root != right_root:
+            parent[right_root] = left_root
+
+    components: dict[Hashable, set] = {}
+    for node in list(parent):
+        components.setdefault(_find(node), set()).add(node)
+    return list(components.values())
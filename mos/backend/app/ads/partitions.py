@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+AdIdRange = tuple[Optional[str], Optional[str]]
+
+
+def partition_ranges(bounds: list[str]) -> list[AdIdRange]:
+    """Turn ascending partition bounds into disjoint (after, through] ranges covering every ad id."""
+    lowers: list[Optional[str]] = [None, *bounds]
+    uppers: list[Optional[str]] = [*bounds, None]
+    return list(zip(lowers, uppers, strict=True))
+
+
+def run_in_worker_processes(
+    task: Callable[..., Any],
+    calls: Iterable[tuple[Any, ...]],
+    *,
+    workers: int,
+) -> Iterator[Any]:
+    """
+    Run `task(*args)` for every args tuple on a pool of `workers` processes, yielding results as they finish.
+
+    `task` must be a module-level function; each worker opens its own DB session.
+    """
+    # Spawn (not fork) so workers never inherit the parent's pooled DB connections.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(task, *args) for args in calls]
+        for future in as_completed(futures):
+            yield future.result()
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
 from math import exp, log1p
-from typing import Any, Optional
+from typing import Any, Optional, Protocol, Sequence
 
+import numpy as np
+
+from app.config import settings
 from app.db.enums import AdStatusEnum
 from app.db.models import Ad
 
@@ -20,66 +24,265 @@ def _normalize(val: float, cap: float) -> float:
     return max(min(val / cap, 1.0), 0.0)
 
 
+def _day_array(values: Sequence[Optional[date]]) -> np.ndarray:
+    return np.array([np.datetime64(value, "D") if value else np.datetime64("NaT") for value in values], dtype="datetime64[D]")
+
+
+def _optional_number(value: float) -> Optional[int]:
+    return None if value != value else int(value)
+
+
+class AdScorer(Protocol):
+    """
+    A scoring model stored under its own `score_version` in ad_scores.
+
+    `score` scores one ad (ingestion); `score_columns` scores a batch from column arrays (bulk rescoring
+    and shadow scoring) and must return `performance_score`, `performance_stars`, `winning_score`,
+    `confidence` and `score_breakdown` (one JSON-able dict per ad).
+    """
+
+    version: str
+
+    def score(self, *, ad: Ad, facts: dict[str, Any] | None, media_count: int) -> dict[str, Any]: ...
+
+    def score_columns(
+        self,
+        *,
+        as_of: date,
+        days_active: Sequence[Optional[int]],
+        start_dates: Sequence[Optional[date]],
+        last_seen_dates: Sequence[Optional[date]],
+        media_counts: Sequence[int],
+        statuses: Sequence[AdStatusEnum | str],
+    ) -> dict[str, Any]: ...
+
+
+@dataclass(frozen=True)
+class WeightedAdScorer:
+    """Weighted blend of longevity, recency (exponential decay), media presence and status."""
+
+    version: str
+    weights: dict[str, float] = field(
+        default_factory=lambda: {"longevity": 0.35, "recency": 0.25, "media": 0.15, "status": 0.25}
+    )
+    # Longevity saturates at `longevity_cap_days` active; recency decays with `recency_decay_days` time constant.
+    longevity_cap_days: int = 90
+    recency_decay_days: float = 21
+    status_values: dict[AdStatusEnum, float] = field(
+        default_factory=lambda: {AdStatusEnum.active: 1.0, AdStatusEnum.unknown: 0.5, AdStatusEnum.inactive: 0.25}
+    )
+
+    def _status_value(self, status: AdStatusEnum) -> float:
+        return self.status_values.get(status, self.status_values[AdStatusEnum.inactive])
+
+    def score(self, *, ad: Ad, facts: dict[str, Any] | None, media_count: int) -> dict[str, Any]:
+        facts = facts or {}
+        now = datetime.now(timezone.utc)
+        days_active = facts.get("days_active")
+        if days_active is None:
+            days_active = _safe_days_between(ad.started_running_at or ad.first_seen_at, ad.last_seen_at or now)
+
+        days_since_last_seen = None
+        if ad.last_seen_at:
+            days_since_last_seen = max((now.date() - ad.last_seen_at.date()).days, 0)
+
+        components: dict[str, dict[str, Any]] = {}
+        weights = self.weights
+
+        longevity_val = _normalize(log1p(days_active or 0), log1p(self.longevity_cap_days))
+        components["longevity"] = {"value": longevity_val, "weight": weights["longevity"], "raw": {"days_active": days_active}}
+
+        recency_val = 0.0
+        if days_since_last_seen is not None:
+            recency_val = exp(-days_since_last_seen / self.recency_decay_days)
+        components["recency"] = {
+            "value": recency_val,
+            "weight": weights["recency"],
+            "raw": {"days_since_last_seen": days_since_last_seen},
+        }
+
+        media_val = 1.0 if media_count > 0 else 0.0
+        components["media"] = {"value": media_val, "weight": weights["media"], "raw": {"media_count": media_count}}
+
+        status = ad.ad_status if isinstance(ad.ad_status, AdStatusEnum) else AdStatusEnum(str(ad.ad_status))
+        status_val = self._status_value(status)
+        components["status"] = {"value": status_val, "weight": weights["status"], "raw": {"status": status.value}}
+
+        weighted_sum = sum(c["value"] * c["weight"] for c in components.values())
+        total_weight = sum(weights.values())
+        score_0_1 = weighted_sum / total_weight if total_weight else 0.0
+
+        performance_score = round(score_0_1 * 100)
+        performance_stars = min(max(round(score_0_1 * 5), 1), 5)
+        winning_score = round(score_0_1 * 5000)
+
+        present = [c for c in components.values() if c["raw"].get("days_active") is not None or c["raw"].get("days_since_last_seen") is not None or c["raw"].get("media_count") is not None or c["raw"].get("status")]
+        confidence = _normalize(len(present), len(components))
+
+        return {
+            "score_version": self.version,
+            "performance_score": performance_score,
+            "performance_stars": performance_stars,
+            "winning_score": winning_score,
+            "confidence": confidence,
+            "score_breakdown": {"components": components},
+        }
+
+    def score_columns(
+        self,
+        *,
+        as_of: date,
+        days_active: Sequence[Optional[int]],
+        start_dates: Sequence[Optional[date]],
+        last_seen_dates: Sequence[Optional[date]],
+        media_counts: Sequence[int],
+        statuses: Sequence[AdStatusEnum | str],
+    ) -> dict[str, Any]:
+        """
+        Array form of `score`: one entry per ad, same components and rounding.
+
+        `days_active` comes from ad_facts (None falls back to start..last_seen like the scalar path);
+        `start_dates` is started_running_at or first_seen_at. Day differences are taken against `as_of`,
+        so rescoring a stored row re-applies recency decay without reloading the ad.
+        """
+        today = np.datetime64(as_of, "D")
+        facts_days = np.array([np.nan if value is None else float(value) for value in days_active], dtype=np.float64)
+        start = _day_array(start_dates)
+        last_seen = _day_array(last_seen_dates)
+
+        has_last_seen = ~np.isnat(last_seen)
+        end = np.where(has_last_seen, last_seen, today)
+        span_days = np.maximum((end - start).astype("timedelta64[D]").astype(np.float64) + 1, 1)
+        span_days[np.isnat(start)] = np.nan
+        days_active_arr = np.where(np.isnan(facts_days), span_days, facts_days)
+        has_days_active = ~np.isnan(days_active_arr)
+
+        days_since_last_seen = np.full(len(last_seen), np.nan)
+        days_since_last_seen[has_last_seen] = np.maximum(
+            (today - last_seen[has_last_seen]).astype(np.float64), 0
+        )
+
+        longevity = np.clip(
+            np.log1p(np.nan_to_num(days_active_arr, nan=0.0)) / log1p(self.longevity_cap_days), 0.0, 1.0
+        )
+        recency = np.where(
+            has_last_seen, np.exp(-np.nan_to_num(days_since_last_seen, nan=0.0) / self.recency_decay_days), 0.0
+        )
+        media_count_arr = np.asarray(media_counts, dtype=np.int64)
+        media = (media_count_arr > 0).astype(np.float64)
+        status_codes = [status.value if isinstance(status, AdStatusEnum) else str(status) for status in statuses]
+        status_val = np.array([self._status_value(AdStatusEnum(code)) for code in status_codes], dtype=np.float64)
+
+        weights = self.weights
+        weighted_sum = (
+            longevity * weights["longevity"]
+            + recency * weights["recency"]
+            + media * weights["media"]
+            + status_val * weights["status"]
+        )
+        total_weight = sum(weights.values())
+        score_0_1 = weighted_sum / total_weight if total_weight else np.zeros(len(weighted_sum))
+
+        breakdowns = [
+            {
+                "components": {
+                    "longevity": {"value": lon, "weight": weights["longevity"], "raw": {"days_active": _optional_number(days)}},
+                    "recency": {
+                        "value": rec,
+                        "weight": weights["recency"],
+                        "raw": {"days_since_last_seen": _optional_number(since)},
+                    },
+                    "media": {"value": med, "weight": weights["media"], "raw": {"media_count": count}},
+                    "status": {"value": sta, "weight": weights["status"], "raw": {"status": code}},
+                }
+            }
+            for lon, days, rec, since, med, count, sta, code in zip(
+                longevity.tolist(),
+                days_active_arr.tolist(),
+                recency.tolist(),
+                days_since_last_seen.tolist(),
+                media.tolist(),
+                media_count_arr.tolist(),
+                status_val.tolist(),
+                status_codes,
+                strict=True,
+            )
+        ]
+
+        # np.rint rounds half to even, matching round() in the scalar path.
+        return {
+            "performance_score": np.rint(score_0_1 * 100).astype(np.int64),
+            "performance_stars": np.clip(np.rint(score_0_1 * 5), 1, 5).astype(np.int64),
+            "winning_score": np.rint(score_0_1 * 5000).astype(np.int64),
+            # Media and status are always present; longevity/recency only when their inputs are known.
+            "confidence": (2 + has_days_active.astype(np.int64) + has_last_seen.astype(np.int64)) / len(weights),
+            "score_breakdown": breakdowns,
+            "longevity": longevity,
+            "recency": recency,
+            "media": media,
+            "status": status_val,
+        }
+
+
+_SCORERS: dict[str, AdScorer] = {}
+
+
+def register_scorer(scorer: AdScorer, *, replace: bool = False) -> AdScorer:
+    """
+    Make `scorer` available under `scorer.version`.
+
+    Register at import time (here or in a module imported by app.ads) so shadow-scoring worker
+    processes, which import this module fresh, see the same registry.
+    """
+    if scorer.version in _SCORERS and not replace:
+        raise ValueError(f"Ad scorer version already registered: {scorer.version}")
+    _SCORERS[scorer.version] = scorer
+    return scorer
+
+
+def get_scorer(version: Optional[str] = None) -> AdScorer:
+    """Scorer for `version`, defaulting to the live version (AD_SCORE_LIVE_VERSION)."""
+    version = version or settings.AD_SCORE_LIVE_VERSION
+    try:
+        return _SCORERS[version]
+    except KeyError:
+        raise ValueError(
+            f"Unknown ad score version: {version}. Registered versions: {', '.join(sorted(_SCORERS))}"
+        ) from None
+
+
+def score_versions() -> list[str]:
+    return sorted(_SCORERS)
+
+
+register_scorer(WeightedAdScorer(version="v1"))
+
+
 def compute_ad_score(
     *,
     ad: Ad,
     facts: dict[str, Any] | None,
     media_count: int,
-    version: str = "v1",
+    version: Optional[str] = None,
+) -> dict[str, Any]:
+    return get_scorer(version).score(ad=ad, facts=facts, media_count=media_count)
+
+
+def compute_ad_score_columns(
+    *,
+    as_of: date,
+    days_active: Sequence[Optional[int]],
+    start_dates: Sequence[Optional[date]],
+    last_seen_dates: Sequence[Optional[date]],
+    media_counts: Sequence[int],
+    statuses: Sequence[AdStatusEnum | str],
+    version: Optional[str] = None,
 ) -> dict[str, Any]:
-    facts = facts or {}
-    now = datetime.now(timezone.utc)
-    days_active = facts.get("days_active")
-    if days_active is None:
-        days_active = _safe_days_between(ad.started_running_at or ad.first_seen_at, ad.last_seen_at or now)
-
-    days_since_last_seen = None
-    if ad.last_seen_at:
-        days_since_last_seen = max((now.date() - ad.last_seen_at.date()).days, 0)
-
-    components: dict[str, dict[str, Any]] = {}
-    weights = {
-        "longevity": 0.35,
-        "recency": 0.25,
-        "media": 0.15,
-        "status": 0.25,
-    }
-
-    longevity_val = _normalize(log1p(days_active or 0), log1p(90))
-    components["longevity"] = {"value": longevity_val, "weight": weights["longevity"], "raw": {"days_active": days_active}}
-
-    recency_val = 0.0
-    if days_since_last_seen is not None:
-        recency_val = exp(-days_since_last_seen / 21)
-    components["recency"] = {
-        "value": recency_val,
-        "weight": weights["recency"],
-        "raw": {"days_since_last_seen": days_since_last_seen},
-    }
-
-    media_val = 1.0 if media_count > 0 else 0.0
-    components["media"] = {"value": media_val, "weight": weights["media"], "raw": {"media_count": media_count}}
-
-    status = ad.ad_status if isinstance(ad.ad_status, AdStatusEnum) else AdStatusEnum(str(ad.ad_status))
-    status_val = 1.0 if status == AdStatusEnum.active else 0.5 if status == AdStatusEnum.unknown else 0.25
-    components["status"] = {"value": status_val, "weight": weights["status"], "raw": {"status": status.value}}
-
-    weighted_sum = sum(c["value"] * c["weight"] for c in components.values())
-    total_weight = sum(weights.values())
-    score_0_1 = weighted_sum / total_weight if total_weight else 0.0
-
-    performance_score = round(score_0_1 * 100)
-    performance_stars = min(max(round(score_0_1 * 5), 1), 5)
-    winning_score = round(score_0_1 * 5000)
-
-    present = [c for c in components.values() if c["raw"].get("days_active") is not None or c["raw"].get("days_since_last_seen") is not None or c["raw"].get("media_count") is not None or c["raw"].get("status")]
-    confidence = _normalize(len(present), len(components))
-
-    return {
-        "score_version": version,
-        "performance_score": performance_score,
-        "performance_stars": performance_stars,
-        "winning_score": winning_score,
-        "confidence": confidence,
-        "score_breakdown": {"components": components},
-    }
+    return get_scorer(version).score_columns(
+        as_of=as_of,
+        days_active=days_active,
+        start_dates=start_dates,
+        last_seen_dates=last_seen_dates,
+        media_counts=media_counts,
+        statuses=statuses,
+    )
@@ -59,3 +59,13 @@ class NormalizeContext:
     brand_channel_identity_id: str
     research_run_id: str
     ingest_run_id: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class AdChangeKey:
+    """Fields of a raw item that incremental ingestion compares against the stored ad."""
+
+    external_ad_id: str
+    ad_status: AdStatusEnum = AdStatusEnum.unknown
+    ended_running_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
@@ -78,6 +78,12 @@ class Settings(BaseSettings):
     STRATEGY_V2_APIFY_YOUTUBE_ACTOR_ID: str = "streamers/youtube-scraper"
     STRATEGY_V2_APIFY_REDDIT_ACTOR_ID: str = "practicaltools/apify-reddit-api"
     STRATEGY_V2_APIFY_WEB_ACTOR_ID: str = "apify/web-scraper"
+    # Webhook completion for Apify runs: when set, runs register a webhook to
+    # {APIFY_WEBHOOK_BASE_URL}/api/apify/webhook and waiters are woken by a Temporal signal instead of polling.
+    APIFY_WEBHOOK_BASE_URL: str | None = None
+    APIFY_WEBHOOK_SECRET: str | None = None
+    # How long Meta Ads Library ingestion waits for one actor run (webhook or polling).
+    APIFY_META_MAX_WAIT_SECONDS: int = 300
     STRATEGY_V2_VOC_MERGED_CORPUS_MAX_ROWS: int = 400
     STRATEGY_V2_VOC_PROMPT_CORPUS_ROWS: int = 80
     STRATEGY_V2_VOC_PROMPT_STEP4_ROWS: int = 40
@@ -182,11 +188,43 @@ class Settings(BaseSettings):
     MEDIA_STORAGE_PRESIGN_TTL_SECONDS: int = 60 * 60 * 24 * 7
     MEDIA_STORAGE_USE_SSL: bool = True
     MEDIA_STORAGE_FORCE_PATH_STYLE: bool = True
+    # Files above the threshold are uploaded as S3 multipart uploads streamed from disk.
+    MEDIA_STORAGE_MULTIPART_THRESHOLD_BYTES: int = 8 * 1024 * 1024
+    MEDIA_STORAGE_MULTIPART_CHUNK_BYTES: int = 8 * 1024 * 1024
+    MEDIA_STORAGE_MULTIPART_MAX_CONCURRENCY: int = 2
+    # Shared S3 client/connection pool and IO threads used for batched HEADs and uploads.
+    MEDIA_STORAGE_MAX_POOL_CONNECTIONS: int = 50
+    MEDIA_STORAGE_IO_CONCURRENCY: int = 16
+    MEDIA_STORAGE_KNOWN_KEYS_CACHE_SIZE: int = 100_000
+    # Batch existence checks list a whole `<sha[:2]>` shard once it has this many pending keys.
+    MEDIA_STORAGE_SHARD_LIST_MIN_KEYS: int = 3
+    # Presigned URLs are reused for this fraction of their TTL (0 disables the cache).
+    MEDIA_STORAGE_PRESIGN_CACHE_REUSE_FRACTION: float = 0.5
+    MEDIA_STORAGE_PRESIGN_CACHE_SIZE: int = 50_000
+    # Public/CDN origin for the preview bucket; when set, previews are served unsigned.
+    MEDIA_STORAGE_PREVIEW_PUBLIC_BASE_URL: str | None = None
 
     MEDIA_MIRROR_MAX_BYTES: int = 50 * 1024 * 1024
     MEDIA_MIRROR_TIMEOUT_SECONDS: float = 15.0
     MEDIA_MIRROR_MAX_CONCURRENCY: int = 3
     MEDIA_MIRROR_PREVIEW_MAX_DIMENSION: int = 512
+    MEDIA_MIRROR_PER_HOST_CONCURRENCY: int = 2
+    MEDIA_MIRROR_MAX_ATTEMPTS: int = 4
+    MEDIA_MIRROR_RETRY_BASE_SECONDS: float = 30.0
+    MEDIA_MIRROR_RETRY_MAX_SECONDS: float = 900.0
+    MEDIA_MIRROR_CLAIM_LEASE_SECONDS: int = 600
+    # Issue a HEAD before downloading and reuse a mirrored asset with the same ETag + size.
+    MEDIA_MIRROR_HEAD_DEDUPE: bool = False
+
+    # ad_scores holds one row per (ad, score_version); explore, ad selection and ingestion use this one.
+    AD_SCORE_LIVE_VERSION: str = "v1"
+    AD_SCORE_SHADOW_WORKERS: int = 4
+    AD_BACKFILL_WORKERS: int = 4
+
+    # Near-duplicate creative clustering: max pHash Hamming distance (keep below 8 so the 8-bit LSH bands
+    # guarantee recall) and min estimated copy Jaccard similarity.
+    AD_CREATIVE_CLUSTER_PHASH_MAX_DISTANCE: int = 6
+    AD_CREATIVE_CLUSTER_COPY_MIN_SIMILARITY: float = 0.8
 
     PUBLIC_ASSET_BASE_URL: str | None = None
     TESTIMONIAL_RENDERER_URL: str | None = None
@@ -18,7 +18,7 @@ from sqlalchemy import (
     UniqueConstraint,
     func,
 )
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID, CITEXT
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR, UUID, CITEXT
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -1635,6 +1635,12 @@ class Brand(Base):
             unique=True,
             postgresql_where=sa.text("primary_domain IS NULL"),
         ),
+        sa.Index(
+            "idx_brands_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
     )
 
     id: Mapped[str] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
@@ -1643,6 +1649,14 @@ class Brand(Base):
     normalized_name: Mapped[str] = mapped_column(CITEXT(), nullable=False)
     primary_website_url: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     primary_domain: Mapped[Optional[str]] = mapped_column(CITEXT(), nullable=True)
+    # Maintained by the trg_brands_search_text trigger (migration 0062).
+    search_text: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+        server_default=sa.FetchedValue(),
+        server_onupdate=sa.FetchedValue(),
+        deferred=True,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -2331,6 +2345,37 @@ class AdIngestRun(Base):
     finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
 
+class AdIngestWatermark(Base):
+    """
+    Per-identity state of the last successful ad ingestion, used by incremental refreshes.
+
+    Per-ad state (status, end date, last seen) is read from `ads` itself; this row records when the
+    identity was last fully re-upserted and what the last run saw.
+    """
+
+    __tablename__ = "ad_ingest_watermarks"
+
+    brand_channel_identity_id: Mapped[str] = mapped_column(
+        ForeignKey("brand_channel_identities.id", ondelete="CASCADE"), primary_key=True
+    )
+    channel: Mapped[AdChannelEnum] = mapped_column(
+        Enum(AdChannelEnum, name="ad_channel"), nullable=False
+    )
+    last_ingest_run_id: Mapped[Optional[str]] = mapped_column(
+        ForeignKey("ad_ingest_runs.id", ondelete="SET NULL"), nullable=True
+    )
+    last_full_refresh_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    seen_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    upserted_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    max_ad_last_seen_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
 class AdLibraryPageTotal(Base):
     __tablename__ = "ad_library_page_totals"
     __table_args__ = (
@@ -2386,6 +2431,21 @@ class Ad(Base):
         sa.Index("idx_ads_brand_channel_identity", "brand_channel_identity_id"),
         sa.Index("idx_ads_brand", "brand_id"),
         sa.Index("idx_ads_last_seen", "last_seen_at"),
+        sa.Index("idx_ads_search_tsv", "search_tsv", postgresql_using="gin"),
+        # Explore ads keyset orders (media_count DESC first, then the requested key, then id).
+        sa.Index(
+            "idx_ads_explore_last_seen",
+            sa.text("media_count DESC"),
+            sa.text("last_seen_at DESC NULLS LAST"),
+            sa.text("id DESC"),
+        ),
+        sa.Index(
+            "idx_ads_explore_started",
+            sa.text("media_count DESC"),
+            sa.text("started_running_at DESC NULLS LAST"),
+            sa.text("last_seen_at DESC NULLS LAST"),
+            sa.text("id DESC"),
+        ),
     )
 
     id: Mapped[str] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
@@ -2411,6 +2471,17 @@ class Ad(Base):
     landing_url: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     destination_domain: Mapped[Optional[str]] = mapped_column(CITEXT(), nullable=True)
     raw_json: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    # Number of ad_asset_links rows; kept in sync by AdsRepository/MediaMirrorService link writes.
+    media_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    # Maintained by the trg_ads_search_tsv trigger (migration 0062); deferred so regular Ad loads
+    # don't ship the tsvector.
+    search_tsv: Mapped[Optional[Any]] = mapped_column(
+        TSVECTOR,
+        nullable=True,
+        server_default=sa.FetchedValue(),
+        server_onupdate=sa.FetchedValue(),
+        deferred=True,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -2467,11 +2538,14 @@ class AdFacts(Base):
 
 
 class AdScore(Base):
+    """One row per (ad, score_version); readers filter on settings.AD_SCORE_LIVE_VERSION."""
+
     __tablename__ = "ad_scores"
     __table_args__ = (
         sa.Index("idx_ad_scores_org", "org_id"),
         sa.Index("idx_ad_scores_brand", "brand_id"),
         sa.Index("idx_ad_scores_channel", "channel"),
+        sa.Index("idx_ad_scores_version_org", "score_version", "org_id"),
     )
 
     ad_id: Mapped[str] = mapped_column(ForeignKey("ads.id", ondelete="CASCADE"), primary_key=True)
@@ -2480,7 +2554,7 @@ class AdScore(Base):
     channel: Mapped[AdChannelEnum] = mapped_column(
         Enum(AdChannelEnum, name="ad_channel"), nullable=False
     )
-    score_version: Mapped[str] = mapped_column(Text, nullable=False, server_default="v1")
+    score_version: Mapped[str] = mapped_column(Text, primary_key=True, server_default="v1")
     performance_score: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     performance_stars: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     winning_score: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
@@ -2497,6 +2571,35 @@ class AdScore(Base):
     )
 
 
+class BrandAdStats(Base):
+    """Per-brand ad rollup read by /explore/brands; refreshed by AdsRepository.refresh_brand_ad_stats."""
+
+    __tablename__ = "brand_ad_stats"
+    __table_args__ = (
+        sa.Index("idx_brand_ad_stats_org_last_seen", "org_id", "last_seen_at"),
+        sa.Index("idx_brand_ad_stats_org_ad_count", "org_id", "ad_count"),
+    )
+
+    brand_id: Mapped[str] = mapped_column(ForeignKey("brands.id", ondelete="CASCADE"), primary_key=True)
+    org_id: Mapped[str] = mapped_column(ForeignKey("orgs.id", ondelete="CASCADE"), nullable=False)
+    ad_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    active_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    inactive_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    unknown_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    # Distinct creatives after near-duplicate clustering.
+    creative_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    first_seen_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_seen_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    channels: Mapped[list[AdChannelEnum]] = mapped_column(
+        ARRAY(Enum(AdChannelEnum, name="ad_channel")),
+        nullable=False,
+        server_default=sa.text("'{}'"),
+    )
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
 class MediaAsset(Base):
     __tablename__ = "media_assets"
     __table_args__ = (
@@ -2519,6 +2622,22 @@ class MediaAsset(Base):
             unique=True,
             postgresql_where=sa.text("storage_key IS NOT NULL"),
         ),
+        sa.Index(
+            "idx_media_assets_mirror_queue",
+            "mirror_next_attempt_at",
+            postgresql_where=sa.text("mirror_status = 'pending'"),
+        ),
+        sa.Index(
+            "idx_media_assets_source_url_normalized",
+            "source_url_normalized",
+            postgresql_where=sa.text("source_url_normalized IS NOT NULL"),
+        ),
+        sa.Index(
+            "idx_media_assets_source_etag",
+            "source_etag",
+            "size_bytes",
+            postgresql_where=sa.text("source_etag IS NOT NULL"),
+        ),
     )
 
     id: Mapped[str] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
@@ -2529,6 +2648,9 @@ class MediaAsset(Base):
         Enum(MediaAssetTypeEnum, name="media_asset_type"), nullable=False
     )
     source_url: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Source URL without CDN signature/expiry params; used to dedupe before downloading.
+    source_url_normalized: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    source_etag: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     stored_url: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     storage_key: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     preview_storage_key: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -2542,7 +2664,13 @@ class MediaAsset(Base):
     )
     mirror_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     mirrored_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    mirror_attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    # Claim lease while a worker holds the asset, retry-after time once an attempt fails.
+    mirror_next_attempt_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     sha256: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # 64-bit perceptual hashes of the preview image (signed), set by the mirror; see app.ads.near_duplicates.
+    phash: Mapped[Optional[int]] = mapped_column(sa.BigInteger, nullable=True)
+    dhash: Mapped[Optional[int]] = mapped_column(sa.BigInteger, nullable=True)
     mime_type: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     size_bytes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     width: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
@@ -2601,6 +2729,12 @@ class AdCreative(Base):
             postgresql_where=sa.text("copy_fingerprint IS NOT NULL"),
         ),
         sa.Index("idx_ad_creatives_org_creative_fp", "org_id", "creative_fingerprint"),
+        sa.Index("idx_ad_creatives_cluster", "cluster_id"),
+        sa.Index(
+            "idx_ad_creatives_unclustered",
+            "created_at",
+            postgresql_where=sa.text("clustered_at IS NULL"),
+        ),
     )
 
     id: Mapped[str] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
@@ -2616,6 +2750,14 @@ class AdCreative(Base):
     )
     media_fingerprint: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     copy_fingerprint: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    copy_minhash: Mapped[Optional[list[int]]] = mapped_column(ARRAY(Integer), nullable=True)
+    # pHash of the primary media asset as of the last clustering pass.
+    media_phash: Mapped[Optional[int]] = mapped_column(sa.BigInteger, nullable=True)
+    # Near-duplicate cluster: the representative (oldest) creative of the cluster; itself when alone.
+    cluster_id: Mapped[Optional[str]] = mapped_column(
+        ForeignKey("ad_creatives.id", ondelete="SET NULL"), nullable=True
+    )
+    clustered_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     metadata_json: Mapped[dict[str, Any]] = mapped_column(
         "metadata", JSONB, nullable=False, server_default=sa.text("'{}'::jsonb")
     )
@@ -2627,6 +2769,24 @@ class AdCreative(Base):
     )
 
 
+class AdCreativeLshBand(Base):
+    """LSH buckets of a creative's pHash / copy MinHash; creatives sharing a bucket are clustering candidates."""
+
+    __tablename__ = "ad_creative_lsh_bands"
+    __table_args__ = (
+        sa.Index("idx_ad_creative_lsh_bands_lookup", "org_id", "brand_id", "kind", "band", "bucket"),
+    )
+
+    creative_id: Mapped[str] = mapped_column(
+        ForeignKey("ad_creatives.id", ondelete="CASCADE"), primary_key=True
+    )
+    kind: Mapped[str] = mapped_column(Text, primary_key=True)
+    band: Mapped[int] = mapped_column(sa.SmallInteger, primary_key=True)
+    bucket: Mapped[int] = mapped_column(sa.BigInteger, nullable=False)
+    org_id: Mapped[str] = mapped_column(ForeignKey("orgs.id", ondelete="CASCADE"), nullable=False)
+    brand_id: Mapped[str] = mapped_column(ForeignKey("brands.id", ondelete="CASCADE"), nullable=False)
+
+
 class AdCreativeMembership(Base):
     __tablename__ = "ad_creative_memberships"
     __table_args__ = (
@@ -2646,6 +2806,32 @@ class AdCreativeMembership(Base):
     )
 
 
+class AdBackfillCheckpoint(Base):
+    """
+    Progress of one ad-id partition of a backfill job (see app.services.ad_backfill).
+
+    `last_ad_id` is written in the same transaction as the chunk it covers, so a restarted job
+    resumes after the last committed chunk.
+    """
+
+    __tablename__ = "ad_backfill_checkpoints"
+
+    job_key: Mapped[str] = mapped_column(Text, primary_key=True)
+    partition: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Partition covers ad ids in (after_ad_id, through_ad_id]; NULL bounds are open.
+    after_ad_id: Mapped[Optional[str]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    through_ad_id: Mapped[Optional[str]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    last_ad_id: Mapped[Optional[str]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    processed: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
 class AdTeardown(Base):
     __tablename__ = "ad_teardowns"
     __table_args__ = (
@@ -2884,3 +3070,20 @@ class AdTeardownAssertionEvidence(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+
+
+class LLMResponseCacheEntry(Base):
+    """Content-addressed LLM output (see app.llm.response_cache); `cache_key` hashes the full request."""
+
+    __tablename__ = "llm_response_cache"
+    __table_args__ = (sa.Index("idx_llm_response_cache_expires_at", "expires_at"),)
+
+    cache_key: Mapped[str] = mapped_column(Text, primary_key=True)
+    provider: Mapped[str] = mapped_column(Text, nullable=False)
+    model: Mapped[str] = mapped_column(Text, nullable=False)
+    response_text: Mapped[str] = mapped_column(Text, nullable=False)
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -1,22 +1,34 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+import json
 import mimetypes
-from typing import Any, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Iterable, List, Optional, Tuple
 
-from sqlalchemy import select, update, func
-from sqlalchemy.orm import Session
+from sqlalchemy import case, delete, exists, func, or_, select, text, tuple_, update
+from sqlalchemy.orm import Session, aliased
 from sqlalchemy.dialects.postgresql import insert
 
 from app.ads.fingerprints import (
+    FINGERPRINT_ALGO,
     CreativeFingerprintResult,
     MediaAssetInput,
     compute_creative_fingerprint,
 )
 from app.ads.facts import build_ad_facts_payload
-from app.ads.score import compute_ad_score
+from app.ads.incremental import KnownAdState
+from app.ads.near_duplicates import (
+    CreativeSignature,
+    connected_components,
+    is_near_duplicate,
+    minhash_bands,
+    phash_bands,
+)
+from app.ads.score import compute_ad_score, get_scorer
 from app.ads.normalization import derive_primary_domain, normalize_url
+from app.ads.partitions import partition_ranges
 from app.ads.types import NormalizedAdWithAssets, NormalizedAsset
+from app.config import settings
 from app.db.enums import (
     AdChannelEnum,
     AdIngestStatusEnum,
@@ -31,13 +43,18 @@ from app.db.enums import (
 from app.db.models import (
     Ad,
     AdAssetLink,
+    AdBackfillCheckpoint,
     AdIngestRun,
+    AdIngestWatermark,
     AdLibraryPageTotal,
     AdCreative,
+    AdCreativeLshBand,
     AdCreativeMembership,
     AdFacts,
     AdScore,
+    AdTeardown,
     Brand,
+    BrandAdStats,
     BrandChannelIdentity,
     MediaAsset,
     ProductBrandRelationship,
@@ -47,6 +64,137 @@ from app.db.models import (
 from app.db.repositories.base import Repository
 
 
+def _guess_media_mime(asset: NormalizedAsset) -> Optional[str]:
+    for url in (asset.stored_url, asset.source_url):
+        if not url:
+            continue
+        mime, _ = mimetypes.guess_type(url)
+        if mime:
+            return mime
+    if asset.asset_type == MediaAssetTypeEnum.VIDEO:
+        return "video/mp4"
+    if asset.asset_type in (MediaAssetTypeEnum.IMAGE, MediaAssetTypeEnum.SCREENSHOT):
+        return "image/jpeg"
+    return None
+
+
+# Outputs the ad backfill engine can (re)build; "scores" also writes the facts they are computed from.
+BACKFILL_STEPS = ("creatives", "facts", "scores")
+
+# Bulk write-backs for rescore_ad_scores / score_ads_range: one statement per batch of column arrays.
+_SCORE_COLUMNS_SQL = """
+        CAST(:performance_score AS integer[]),
+        CAST(:performance_stars AS integer[]),
+        CAST(:winning_score AS integer[]),
+        CAST(:confidence AS numeric[]),
+        CAST(:score_breakdown AS jsonb[])"""
+
+_RESCORE_AD_SCORES_SQL = text(
+    f"""
+    UPDATE ad_scores AS s
+    SET performance_score = v.performance_score,
+        performance_stars = v.performance_stars,
+        winning_score = v.winning_score,
+        confidence = v.confidence,
+        score_breakdown = v.score_breakdown,
+        computed_at = now(),
+        updated_at = now()
+    FROM unnest(
+        CAST(:ad_ids AS uuid[]),{_SCORE_COLUMNS_SQL}
+    ) AS v(ad_id, performance_score, performance_stars, winning_score, confidence, score_breakdown)
+    WHERE s.ad_id = v.ad_id AND s.score_version = :score_version
+    """
+)
+
+_UPSERT_AD_SCORES_SQL = text(
+    f"""
+    INSERT INTO ad_scores (
+        ad_id, org_id, brand_id, channel, score_version,
+        performance_score, performance_stars, winning_score, confidence, score_breakdown
+    )
+    SELECT
+        v.ad_id, v.org_id, v.brand_id, CAST(v.channel AS ad_channel), :score_version,
+        v.performance_score, v.performance_stars, v.winning_score, v.confidence, v.score_breakdown
+    FROM unnest(
+        CAST(:ad_ids AS uuid[]),
+        CAST(:org_ids AS uuid[]),
+        CAST(:brand_ids AS uuid[]),
+        CAST(:channels AS text[]),{_SCORE_COLUMNS_SQL}
+    ) AS v(
+        ad_id, org_id, brand_id, channel,
+        performance_score, performance_stars, winning_score, confidence, score_breakdown
+    )
+    ON CONFLICT (ad_id, score_version) DO UPDATE SET
+        performance_score = EXCLUDED.performance_score,
+        performance_stars = EXCLUDED.performance_stars,
+        winning_score = EXCLUDED.winning_score,
+        confidence = EXCLUDED.confidence,
+        score_breakdown = EXCLUDED.score_breakdown,
+        computed_at = now(),
+        updated_at = now()
+    """
+)
+
+
+# The facts update mirrors app.ads.facts._days_active for the bumped last_seen_at, so days_active
+# (explore sort/filter, score longevity) advances with the touch.
+_TOUCH_ADS_LAST_SEEN_SQL = text(
+    """
+    WITH touched AS (
+        UPDATE ads AS a
+        SET last_seen_at = COALESCE(v.last_seen_at, now())
+        FROM unnest(
+            CAST(:external_ad_ids AS text[]),
+            CAST(:last_seen_ats AS timestamptz[])
+        ) AS v(external_ad_id, last_seen_at)
+        WHERE a.channel = CAST(:channel AS ad_channel) AND a.external_ad_id = v.external_ad_id
+        RETURNING a.id, COALESCE(a.started_running_at, a.first_seen_at) AS start_at,
+            COALESCE(a.ended_running_at, a.last_seen_at) AS end_at
+    ), facts AS (
+        UPDATE ad_facts AS f
+        SET days_active = CASE
+                WHEN t.start_at IS NULL THEN NULL
+                ELSE GREATEST(
+                    (timezone('UTC', t.end_at))::date - (timezone('UTC', t.start_at))::date + 1, 1
+                )
+            END,
+            updated_at = now()
+        FROM touched AS t
+        WHERE f.ad_id = t.id
+    )
+    SELECT id FROM touched
+    """
+)
+
+
+_SYNC_AD_MEDIA_COUNTS_SQL = text(
+    """
+    UPDATE ads AS a
+    SET media_count = (SELECT count(*) FROM ad_asset_links AS l WHERE l.ad_id = a.id)
+    WHERE a.id = ANY(CAST(:ad_ids AS uuid[]))
+    """
+)
+
+
+def sync_ad_media_counts(session: Session, ad_ids: Iterable[Any]) -> None:
+    """Recount ads.media_count (the stored explore sort key) for ads whose asset links changed."""
+    ids = list(dict.fromkeys(str(ad_id) for ad_id in ad_ids))
+    if ids:
+        session.execute(_SYNC_AD_MEDIA_COUNTS_SQL, {"ad_ids": ids})
+
+
+def _score_column_params(version: str, ad_ids: Iterable[Any], columns: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "score_version": version,
+        "ad_ids": [str(ad_id) for ad_id in ad_ids],
+        "performance_score": columns["performance_score"].tolist(),
+        "performance_stars": columns["performance_stars"].tolist(),
+        "winning_score": columns["winning_score"].tolist(),
+        "confidence": columns["confidence"].tolist(),
+        "score_breakdown": [json.dumps(breakdown) for breakdown in columns["score_breakdown"]],
+    }
+
+
 class AdsRepository(Repository):
     """Helpers for brand + ad ingestion workflows."""
 
@@ -287,6 +435,92 @@ class AdsRepository(Repository):
         self.session.execute(update(AdIngestRun).where(AdIngestRun.id == ingest_run_id).values(**values))
         self.session.commit()
 
+    def ingest_watermark(self, brand_channel_identity_id: str) -> Optional[AdIngestWatermark]:
+        return self.session.get(AdIngestWatermark, brand_channel_identity_id)
+
+    def known_ad_states(
+        self, *, brand_channel_identity_id: str, channel: AdChannelEnum
+    ) -> dict[str, KnownAdState]:
+        """Stored status/end/last-seen per external_ad_id for one identity, for incremental ingestion."""
+        rows = self.session.execute(
+            select(Ad.external_ad_id, Ad.id, Ad.ad_status, Ad.ended_running_at, Ad.last_seen_at).where(
+                Ad.brand_channel_identity_id == brand_channel_identity_id,
+                Ad.channel == channel,
+            )
+        )
+        return {
+            external_ad_id: KnownAdState(
+                ad_id=str(ad_id),
+                ad_status=ad_status,
+                ended_running_at=ended_running_at,
+                last_seen_at=last_seen_at,
+            )
+            for external_ad_id, ad_id, ad_status, ended_running_at, last_seen_at in rows
+        }
+
+    def touch_ads_last_seen(
+        self,
+        *,
+        channel: AdChannelEnum,
+        last_seen_by_external_id: dict[str, Optional[datetime]],
+    ) -> list[str]:
+        """
+        Bump last_seen_at for ads an incremental refresh saw unchanged, in one UPDATE ... FROM unnest
+        that also advances the ad_facts.days_active derived from it.
+
+        A None date means "seen now", matching what upsert_ads_batch writes. The touched ads' live scores
+        are recomputed in the same transaction, since longevity and recency feed the score. Brand ad stats
+        are left to the caller, which refreshes them once per identity. Returns the touched ad ids.
+        """
+        if not last_seen_by_external_id:
+            return []
+        rows = self.session.execute(
+            _TOUCH_ADS_LAST_SEEN_SQL,
+            {
+                "channel": channel.value,
+                "external_ad_ids": list(last_seen_by_external_id),
+                "last_seen_ats": list(last_seen_by_external_id.values()),
+            },
+        )
+        ad_ids = [str(ad_id) for (ad_id,) in rows]
+        if ad_ids:
+            self.rescore_ad_scores(ad_ids=ad_ids, batch_size=len(ad_ids))
+        # Commits the touch when there was nothing to rescore; otherwise the rescore already did.
+        self.session.commit()
+        return ad_ids
+
+    def record_ingest_watermark(
+        self,
+        *,
+        brand_channel_identity_id: str,
+        channel: AdChannelEnum,
+        ingest_run_id: str,
+        full_refresh: bool,
+        seen_count: int,
+        upserted_count: int,
+        max_ad_last_seen_at: Optional[datetime],
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        values: dict[str, Any] = {
+            "brand_channel_identity_id": brand_channel_identity_id,
+            "channel": channel,
+            "last_ingest_run_id": ingest_run_id,
+            "seen_count": seen_count,
+            "upserted_count": upserted_count,
+            "max_ad_last_seen_at": max_ad_last_seen_at,
+            "updated_at": now,
+        }
+        if full_refresh:
+            values["last_full_refresh_at"] = now
+        stmt = insert(AdIngestWatermark).values(**values)
+        set_ = {key: stmt.excluded[key] for key in values if key != "brand_channel_identity_id"}
+        set_["max_ad_last_seen_at"] = func.greatest(
+            AdIngestWatermark.max_ad_last_seen_at, stmt.excluded.max_ad_last_seen_at
+        )
+        stmt = stmt.on_conflict_do_update(index_elements=[AdIngestWatermark.brand_channel_identity_id], set_=set_)
+        self.session.execute(stmt)
+        self.session.commit()
+
     def upsert_ad_library_page_total(
         self,
         *,
@@ -380,7 +614,14 @@ class AdsRepository(Repository):
         brand_channel_identity_id: str,
         channel: AdChannelEnum,
         normalized: NormalizedAdWithAssets,
+        refresh_brand_stats: bool = True,
     ) -> tuple[Ad, list[MediaAsset]]:
+        """
+        Upsert one ad with its media, links, creative membership, facts and score.
+
+        Refreshes the brand's brand_ad_stats row unless `refresh_brand_stats` is False; callers
+        upserting many ads in a loop should pass False and call refresh_brand_ad_stats once.
+        """
         now = datetime.now(timezone.utc)
         ad = self.session.scalar(
             select(Ad).where(Ad.channel == channel, Ad.external_ad_id == normalized.external_ad_id)
@@ -410,7 +651,9 @@ class AdsRepository(Repository):
         else:
             ad.brand_id = brand_id
             ad.brand_channel_identity_id = brand_channel_identity_id
-            ad.ad_status = normalized.ad_status or ad.ad_status or AdStatusEnum.unknown
+            # `unknown` is what a scrape without a status normalizes to; it never replaces a known status.
+            if normalized.ad_status and normalized.ad_status != AdStatusEnum.unknown:
+                ad.ad_status = normalized.ad_status
             ad.started_running_at = ad.started_running_at or normalized.started_running_at
             ad.ended_running_at = normalized.ended_running_at or ad.ended_running_at
             ad.first_seen_at = ad.first_seen_at or normalized.first_seen_at or normalized.last_seen_at or now
@@ -435,29 +678,378 @@ class AdsRepository(Repository):
             media_assets.append(media_asset)
 
         self.session.flush()
+        sync_ad_media_counts(self.session, [ad.id])
         self._ensure_creative_membership(ad)
         facts_payload, media_count = self._upsert_ad_facts(ad)
         self._upsert_ad_score(ad=ad, facts_payload=facts_payload, media_count=media_count)
-        self.session.commit()
+        if refresh_brand_stats:
+            # refresh_brand_ad_stats commits.
+            self.refresh_brand_ad_stats(brand_ids=[brand_id])
+        else:
+            self.session.commit()
         self.session.refresh(ad)
         return ad, media_assets
 
+    def upsert_ads_batch(
+        self,
+        *,
+        brand_id: str,
+        brand_channel_identity_id: str,
+        channel: AdChannelEnum,
+        normalized: list[NormalizedAdWithAssets],
+        chunk_size: int = 200,
+    ) -> list[tuple[Ad, list[MediaAsset]]]:
+        """
+        Set-based counterpart of upsert_ad_with_assets for a whole dataset.
+
+        Each chunk is written with one multi-row INSERT ... ON CONFLICT per table (ads, media assets,
+        links, creatives, memberships, facts, scores) and committed once. Merge semantics match the
+        single-ad path. Rows repeated within a chunk are collapsed by external_ad_id (last one wins,
+        assets are unioned) because Postgres cannot upsert the same row twice in one statement.
+        brand_ad_stats is not refreshed here; callers run refresh_brand_ad_stats once per brand when
+        they are done so a dataset's batches don't each recompute the whole brand rollup.
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be > 0, got {chunk_size}.")
+        brand = self.session.get(Brand, brand_id)
+        results: list[tuple[Ad, list[MediaAsset]]] = []
+        for start in range(0, len(normalized), chunk_size):
+            results.extend(
+                self._upsert_ads_chunk(
+                    brand=brand,
+                    brand_id=brand_id,
+                    brand_channel_identity_id=brand_channel_identity_id,
+                    channel=channel,
+                    normalized=normalized[start : start + chunk_size],
+                )
+            )
+        return results
+
+    def _upsert_ads_chunk(
+        self,
+        *,
+        brand: Optional[Brand],
+        brand_id: str,
+        brand_channel_identity_id: str,
+        channel: AdChannelEnum,
+        normalized: list[NormalizedAdWithAssets],
+    ) -> list[tuple[Ad, list[MediaAsset]]]:
+        if not normalized:
+            return []
+        now = datetime.now(timezone.utc)
+
+        by_external_id: dict[str, NormalizedAdWithAssets] = {}
+        assets_by_external_id: dict[str, list[NormalizedAsset]] = {}
+        for item in normalized:
+            by_external_id[item.external_ad_id] = item
+            assets_by_external_id.setdefault(item.external_ad_id, []).extend(item.assets)
+
+        ad_rows: list[dict[str, Any]] = []
+        for external_ad_id, item in by_external_id.items():
+            landing_url = normalize_url(item.landing_url)
+            ad_rows.append(
+                {
+                    "brand_id": brand_id,
+                    "brand_channel_identity_id": brand_channel_identity_id,
+                    "channel": channel,
+                    "external_ad_id": external_ad_id,
+                    "ad_status": item.ad_status or AdStatusEnum.unknown,
+                    "started_running_at": item.started_running_at,
+                    "ended_running_at": item.ended_running_at,
+                    "first_seen_at": item.first_seen_at or item.last_seen_at or now,
+                    "last_seen_at": item.last_seen_at or now,
+                    "body_text": item.body_text,
+                    "headline": item.headline,
+                    "cta_type": item.cta_type,
+                    "cta_text": item.cta_text,
+                    "landing_url": landing_url,
+                    "destination_domain": item.destination_domain or derive_primary_domain(landing_url),
+                    "raw_json": item.raw_json or {},
+                }
+            )
+        ad_insert = insert(Ad).values(ad_rows)
+        excluded = ad_insert.excluded
+        ad_stmt = (
+            ad_insert.on_conflict_do_update(
+                index_elements=[Ad.channel, Ad.external_ad_id],
+                set_={
+                    "brand_id": excluded.brand_id,
+                    "brand_channel_identity_id": excluded.brand_channel_identity_id,
+                    "ad_status": case(
+                        (excluded.ad_status == AdStatusEnum.unknown, Ad.ad_status), else_=excluded.ad_status
+                    ),
+                    "started_running_at": func.coalesce(Ad.started_running_at, excluded.started_running_at),
+                    "ended_running_at": func.coalesce(excluded.ended_running_at, Ad.ended_running_at),
+                    "first_seen_at": func.coalesce(Ad.first_seen_at, excluded.first_seen_at),
+                    "last_seen_at": excluded.last_seen_at,
+                    "body_text": func.coalesce(excluded.body_text, Ad.body_text),
+                    "headline": func.coalesce(excluded.headline, Ad.headline),
+                    "cta_type": func.coalesce(excluded.cta_type, Ad.cta_type),
+                    "cta_text": func.coalesce(excluded.cta_text, Ad.cta_text),
+                    "landing_url": func.coalesce(excluded.landing_url, Ad.landing_url),
+                    "destination_domain": func.coalesce(excluded.destination_domain, Ad.destination_domain),
+                    "raw_json": func.coalesce(func.nullif(excluded.raw_json, text("'{}'::jsonb")), Ad.raw_json),
+                    "updated_at": func.now(),
+                },
+            )
+            .returning(Ad)
+            .execution_options(populate_existing=True)
+        )
+        ads_by_external_id = {ad.external_ad_id: ad for ad in self.session.scalars(ad_stmt).all()}
+
+        media_by_asset_key = self._upsert_media_assets_batch(
+            channel=channel,
+            assets=[asset for assets in assets_by_external_id.values() for asset in assets],
+        )
+
+        link_rows: dict[tuple[str, str], dict[str, Any]] = {}
+        media_for_ad: dict[str, list[MediaAsset]] = {}
+        for external_ad_id, assets in assets_by_external_id.items():
+            ad = ads_by_external_id[external_ad_id]
+            linked: list[MediaAsset] = []
+            for asset in assets:
+                media = media_by_asset_key[self._asset_batch_key(asset)]
+                linked.append(media)
+                link_rows.setdefault(
+                    (str(ad.id), str(media.id)),
+                    {"ad_id": ad.id, "media_asset_id": media.id, "role": asset.role},
+                )
+            media_for_ad[external_ad_id] = linked
+        if link_rows:
+            self.session.execute(
+                insert(AdAssetLink)
+                .values(list(link_rows.values()))
+                .on_conflict_do_nothing(index_elements=[AdAssetLink.ad_id, AdAssetLink.media_asset_id])
+            )
+            sync_ad_media_counts(self.session, [row["ad_id"] for row in link_rows.values()])
+
+        if brand is not None:
+            ads = list(ads_by_external_id.values())
+            linked_media = self._linked_media_for_ads([ad.id for ad in ads])
+            brands = {str(brand.id): brand}
+            self._upsert_creative_memberships_batch(brands=brands, ads=ads, linked_media=linked_media)
+            self._upsert_facts_and_scores_batch(brands=brands, ads=ads, linked_media=linked_media)
+
+        ad_ids = [ad.id for ad in ads_by_external_id.values()]
+        media_ids = list({media.id for linked in media_for_ad.values() for media in linked})
+        self.session.commit()
+        # Repopulate the expired instances with two queries instead of one refresh per row.
+        self.session.scalars(select(Ad).where(Ad.id.in_(ad_ids))).all()
+        if media_ids:
+            self.session.scalars(select(MediaAsset).where(MediaAsset.id.in_(media_ids))).all()
+
+        results: list[tuple[Ad, list[MediaAsset]]] = []
+        for external_ad_id in by_external_id:
+            results.append((ads_by_external_id[external_ad_id], media_for_ad.get(external_ad_id, [])))
+        return results
+
+    @staticmethod
+    def _asset_batch_key(asset: NormalizedAsset) -> tuple[Optional[str], Optional[str], int]:
+        if asset.sha256 or not asset.source_url:
+            return asset.sha256, asset.source_url, id(asset)
+        return None, asset.source_url, 0
+
+    def _upsert_media_assets_batch(
+        self, *, channel: AdChannelEnum, assets: list[NormalizedAsset]
+    ) -> dict[tuple[Optional[str], Optional[str], int], MediaAsset]:
+        """
+        Upsert media assets keyed by (channel, source_url) in one statement.
+
+        Assets that carry a sha256 or lack a source_url go through _get_or_create_media_asset, which
+        owns the sha256-first lookup; ingestors only provide source URLs, so that path is rare.
+        """
+        resolved: dict[tuple[Optional[str], Optional[str], int], MediaAsset] = {}
+        rows_by_source_url: dict[str, dict[str, Any]] = {}
+        for asset in assets:
+            key = self._asset_batch_key(asset)
+            if key in resolved:
+                continue
+            if key[2]:
+                resolved[key] = self._get_or_create_media_asset(channel=channel, asset=asset)
+                continue
+            source_url = key[1]
+            # First occurrence wins, matching the sequential path where later rows only fill gaps.
+            if source_url in rows_by_source_url:
+                continue
+            rows_by_source_url[source_url] = {
+                "channel": channel,
+                "asset_type": asset.asset_type or MediaAssetTypeEnum.OTHER,
+                "source_url": source_url,
+                "stored_url": asset.stored_url,
+                "mirror_status": MediaMirrorStatusEnum.pending,
+                "sha256": None,
+                "mime_type": asset.mime_type or _guess_media_mime(asset),
+                "size_bytes": asset.size_bytes,
+                "width": asset.width,
+                "height": asset.height,
+                "duration_ms": asset.duration_ms,
+                "metadata_json": asset.metadata or {},
+            }
+        if rows_by_source_url:
+            media_insert = insert(MediaAsset).values(list(rows_by_source_url.values()))
+            excluded = media_insert.excluded
+            media_stmt = (
+                media_insert.on_conflict_do_update(
+                    index_elements=[MediaAsset.channel, MediaAsset.source_url],
+                    index_where=MediaAsset.source_url.isnot(None),
+                    set_={
+                        # jsonb || keeps the right-hand (existing) keys, like the per-ad merge.
+                        MediaAsset.__table__.c["metadata"]: excluded["metadata"].op("||")(
+                            MediaAsset.metadata_json
+                        ),
+                        "mime_type": func.coalesce(MediaAsset.mime_type, excluded.mime_type),
+                        "size_bytes": func.coalesce(MediaAsset.size_bytes, excluded.size_bytes),
+                        "width": func.coalesce(MediaAsset.width, excluded.width),
+                        "height": func.coalesce(MediaAsset.height, excluded.height),
+                        "duration_ms": func.coalesce(MediaAsset.duration_ms, excluded.duration_ms),
+                        "stored_url": func.coalesce(MediaAsset.stored_url, excluded.stored_url),
+                        "updated_at": func.now(),
+                    },
+                )
+                .returning(MediaAsset)
+                .execution_options(populate_existing=True)
+            )
+            for media in self.session.scalars(media_stmt).all():
+                resolved[(None, media.source_url, 0)] = media
+        return resolved
+
+    def _linked_media_for_ads(self, ad_ids: list[str]) -> dict[str, list[tuple[MediaAsset, Optional[str]]]]:
+        linked: dict[str, list[tuple[MediaAsset, Optional[str]]]] = {str(ad_id): [] for ad_id in ad_ids}
+        if not ad_ids:
+            return linked
+        stmt = (
+            select(AdAssetLink.ad_id, MediaAsset, AdAssetLink.role)
+            .join(AdAssetLink, MediaAsset.id == AdAssetLink.media_asset_id)
+            .where(AdAssetLink.ad_id.in_(ad_ids))
+        )
+        for ad_id, media, role in self.session.execute(stmt).all():
+            linked[str(ad_id)].append((media, role))
+        return linked
+
+    def _upsert_creative_memberships_batch(
+        self,
+        *,
+        brands: dict[str, Brand],
+        ads: list[Ad],
+        linked_media: dict[str, list[tuple[MediaAsset, Optional[str]]]],
+    ) -> None:
+        fingerprints: dict[str, CreativeFingerprintResult] = {}
+        creative_rows: dict[tuple[Any, ...], dict[str, Any]] = {}
+        for ad in ads:
+            fp = compute_creative_fingerprint(
+                copy_fields=self._creative_copy_fields(ad),
+                assets=[self._media_asset_input(media, role) for media, role in linked_media[str(ad.id)]],
+            )
+            fingerprints[str(ad.id)] = fp
+            creative_rows[(ad.brand_id, ad.channel, fp.fingerprint_algo, fp.creative_fingerprint)] = {
+                "org_id": brands[str(ad.brand_id)].org_id,
+                "brand_id": ad.brand_id,
+                "channel": ad.channel,
+                "fingerprint_algo": fp.fingerprint_algo,
+                "creative_fingerprint": fp.creative_fingerprint,
+                "primary_media_asset_id": fp.primary_media_asset_id,
+                "media_fingerprint": fp.media_fingerprint,
+                "copy_fingerprint": fp.copy_fingerprint,
+                "copy_minhash": fp.copy_minhash,
+                "metadata_json": {},
+            }
+        if not creative_rows:
+            return
+        creative_insert = insert(AdCreative).values(list(creative_rows.values()))
+        excluded = creative_insert.excluded
+        creative_stmt = creative_insert.on_conflict_do_update(
+            index_elements=[
+                AdCreative.org_id,
+                AdCreative.brand_id,
+                AdCreative.channel,
+                AdCreative.fingerprint_algo,
+                AdCreative.creative_fingerprint,
+            ],
+            set_={
+                "primary_media_asset_id": excluded.primary_media_asset_id,
+                "media_fingerprint": excluded.media_fingerprint,
+                "copy_fingerprint": excluded.copy_fingerprint,
+                "copy_minhash": excluded.copy_minhash,
+                "updated_at": func.now(),
+            },
+        ).returning(
+            AdCreative.id,
+            AdCreative.brand_id,
+            AdCreative.channel,
+            AdCreative.fingerprint_algo,
+            AdCreative.creative_fingerprint,
+        )
+        creative_ids: dict[tuple[Any, ...], Any] = {}
+        for creative_id, creative_brand_id, creative_channel, algo, fingerprint in self.session.execute(
+            creative_stmt
+        ).all():
+            creative_ids[(str(creative_brand_id), creative_channel, algo, fingerprint)] = creative_id
+
+        membership_rows = []
+        for ad in ads:
+            fp = fingerprints[str(ad.id)]
+            creative_id = creative_ids[(str(ad.brand_id), ad.channel, fp.fingerprint_algo, fp.creative_fingerprint)]
+            membership_rows.append({"ad_id": ad.id, "creative_id": creative_id})
+        membership_insert = insert(AdCreativeMembership).values(membership_rows)
+        self.session.execute(
+            membership_insert.on_conflict_do_update(
+                index_elements=[AdCreativeMembership.ad_id],
+                set_={"creative_id": membership_insert.excluded.creative_id, "created_at": func.now()},
+            )
+        )
+
+    def _upsert_facts_and_scores_batch(
+        self,
+        *,
+        brands: dict[str, Brand],
+        ads: list[Ad],
+        linked_media: dict[str, list[tuple[MediaAsset, Optional[str]]]],
+        scores: bool = True,
+    ) -> None:
+        facts_rows: list[dict[str, Any]] = []
+        score_rows: list[dict[str, Any]] = []
+        for ad in ads:
+            brand = brands[str(ad.brand_id)]
+            media_assets = [media for media, _role in linked_media[str(ad.id)]]
+            facts_payload = build_ad_facts_payload(ad=ad, brand=brand, media_assets=media_assets)
+            facts_rows.append(facts_payload)
+            score_payload = compute_ad_score(ad=ad, facts=facts_payload, media_count=len(media_assets))
+            score_rows.append(
+                {
+                    "ad_id": ad.id,
+                    "org_id": brand.org_id,
+                    "brand_id": ad.brand_id,
+                    "channel": ad.channel,
+                    **score_payload,
+                }
+            )
+        if not facts_rows:
+            return
+
+        facts_insert = insert(AdFacts).values(facts_rows)
+        self.session.execute(
+            facts_insert.on_conflict_do_update(
+                index_elements=[AdFacts.ad_id],
+                set_={key: facts_insert.excluded[key] for key in facts_rows[0] if key != "ad_id"}
+                | {"updated_at": func.now()},
+            )
+        )
+        if not scores:
+            return
+        score_insert = insert(AdScore).values(score_rows)
+        score_keys = [
+            key for key in score_rows[0] if key not in {"ad_id", "org_id", "brand_id", "channel", "score_version"}
+        ]
+        self.session.execute(
+            score_insert.on_conflict_do_update(
+                index_elements=[AdScore.ad_id, AdScore.score_version],
+                set_={key: score_insert.excluded[key] for key in score_keys} | {"updated_at": func.now()},
+            )
+        )
+
     def _get_or_create_media_asset(
         self, *, channel: AdChannelEnum, asset: NormalizedAsset
     ) -> MediaAsset:
-        def _guess_mime(asset: NormalizedAsset) -> Optional[str]:
-            for url in (asset.stored_url, asset.source_url):
-                if not url:
-                    continue
-                mime, _ = mimetypes.guess_type(url)
-                if mime:
-                    return mime
-            if asset.asset_type == MediaAssetTypeEnum.VIDEO:
-                return "video/mp4"
-            if asset.asset_type in (MediaAssetTypeEnum.IMAGE, MediaAssetTypeEnum.SCREENSHOT):
-                return "image/jpeg"
-            return None
-
         media: Optional[MediaAsset] = None
         if asset.sha256:
             media = self.session.scalar(select(MediaAsset).where(MediaAsset.sha256 == asset.sha256))
@@ -473,7 +1065,7 @@ class AdsRepository(Repository):
             # Merge metadata but keep existing precedence.
             merged_metadata = {**asset.metadata, **(media.metadata_json or {})}
             media.metadata_json = merged_metadata
-            inferred_mime = _guess_mime(asset)
+            inferred_mime = _guess_media_mime(asset)
             media.mime_type = media.mime_type or asset.mime_type or inferred_mime
             media.size_bytes = media.size_bytes or asset.size_bytes
             media.width = media.width or asset.width
@@ -481,7 +1073,7 @@ class AdsRepository(Repository):
             media.duration_ms = media.duration_ms or asset.duration_ms
             media.stored_url = media.stored_url or asset.stored_url
         else:
-            inferred_mime = _guess_mime(asset)
+            inferred_mime = _guess_media_mime(asset)
             media = MediaAsset(
                 channel=channel,
                 asset_type=asset.asset_type or MediaAssetTypeEnum.OTHER,
@@ -519,15 +1111,9 @@ class AdsRepository(Repository):
             return None
 
         assets = self._media_assets_for_ad(ad.id)
-        copy_fields = {
-            "primary_text": ad.body_text,
-            "headline": ad.headline,
-            "description": None,
-            "cta_type": ad.cta_type,
-            "cta_label": ad.cta_text,
-            "destination_url": ad.landing_url,
-        }
-        fp: CreativeFingerprintResult = compute_creative_fingerprint(copy_fields=copy_fields, assets=assets)
+        fp: CreativeFingerprintResult = compute_creative_fingerprint(
+            copy_fields=self._creative_copy_fields(ad), assets=assets
+        )
 
         creative = self._upsert_creative(
             org_id=brand.org_id,
@@ -544,24 +1130,34 @@ class AdsRepository(Repository):
             .join(AdAssetLink, MediaAsset.id == AdAssetLink.media_asset_id)
             .where(AdAssetLink.ad_id == ad_id)
         )
-        assets: list[MediaAssetInput] = []
-        for media, role in self.session.execute(stmt).all():
-            assets.append(
-                MediaAssetInput(
-                    id=str(media.id),
-                    asset_type=media.asset_type,
-                    role=role,
-                    sha256=media.sha256,
-                    storage_key=media.storage_key,
-                    preview_storage_key=media.preview_storage_key,
-                    stored_url=media.stored_url,
-                    source_url=media.source_url,
-                    size_bytes=media.size_bytes,
-                    width=media.width,
-                    height=media.height,
-                )
-            )
-        return assets
+        return [self._media_asset_input(media, role) for media, role in self.session.execute(stmt).all()]
+
+    @staticmethod
+    def _creative_copy_fields(ad: Ad) -> dict[str, Optional[str]]:
+        return {
+            "primary_text": ad.body_text,
+            "headline": ad.headline,
+            "description": None,
+            "cta_type": ad.cta_type,
+            "cta_label": ad.cta_text,
+            "destination_url": ad.landing_url,
+        }
+
+    @staticmethod
+    def _media_asset_input(media: MediaAsset, role: Optional[str]) -> MediaAssetInput:
+        return MediaAssetInput(
+            id=str(media.id),
+            asset_type=media.asset_type,
+            role=role,
+            sha256=media.sha256,
+            storage_key=media.storage_key,
+            preview_storage_key=media.preview_storage_key,
+            stored_url=media.stored_url,
+            source_url=media.source_url,
+            size_bytes=media.size_bytes,
+            width=media.width,
+            height=media.height,
+        )
 
     def _upsert_creative(self, *, org_id: str, brand_id: str, channel: AdChannelEnum, fp: CreativeFingerprintResult) -> AdCreative:
         stmt = (
@@ -575,6 +1171,7 @@ class AdsRepository(Repository):
                 primary_media_asset_id=fp.primary_media_asset_id,
                 media_fingerprint=fp.media_fingerprint,
                 copy_fingerprint=fp.copy_fingerprint,
+                copy_minhash=fp.copy_minhash,
                 metadata_json={},
             )
             .on_conflict_do_update(
@@ -589,6 +1186,7 @@ class AdsRepository(Repository):
                     "primary_media_asset_id": fp.primary_media_asset_id,
                     "media_fingerprint": fp.media_fingerprint,
                     "copy_fingerprint": fp.copy_fingerprint,
+                    "copy_minhash": fp.copy_minhash,
                     "updated_at": func.now(),
                 },
             )
@@ -646,26 +1244,9 @@ class AdsRepository(Repository):
         self.session.commit()
 
     def backfill_ad_creatives(self, *, batch_size: int = 500) -> dict[str, int]:
-        """Attach creatives + memberships for ads missing one. Idempotent."""
-        updated_memberships = 0
-        while True:
-            batch = (
-                self.session.query(Ad)
-                .outerjoin(AdCreativeMembership, AdCreativeMembership.ad_id == Ad.id)
-                .filter(AdCreativeMembership.id.is_(None))
-                .limit(batch_size)
-                .all()
-            )
-            if not batch:
-                break
-
-            for ad in batch:
-                creative = self._ensure_creative_membership(ad)
-                if creative:
-                    updated_memberships += 1
-            self.session.commit()
-
-        return {"memberships_updated": updated_memberships}
+        """Attach creatives + memberships for ads missing one (or fingerprinted by an older algo). Idempotent."""
+        stats = self.backfill_ads(steps=("creatives",), batch_size=batch_size)
+        return {"memberships_updated": stats["processed"]}
 
     def _upsert_ad_score(self, *, ad: Ad, facts_payload: dict[str, Any], media_count: int) -> None:
         brand = self.session.get(Brand, ad.brand_id)
@@ -682,7 +1263,7 @@ class AdsRepository(Repository):
                 **score_payload,
             )
             .on_conflict_do_update(
-                index_elements=[AdScore.ad_id],
+                index_elements=[AdScore.ad_id, AdScore.score_version],
                 set_={**score_payload, "updated_at": func.now()},
             )
         )
@@ -690,47 +1271,711 @@ class AdsRepository(Repository):
         self.session.flush()
 
     def backfill_ad_facts(self, *, org_id: Optional[str] = None, batch_size: int = 500) -> dict[str, int]:
-        created = 0
+        stats = self.backfill_ads(steps=("facts",), org_id=org_id, batch_size=batch_size)
+        return {"facts_created": stats["processed"]}
+
+    def backfill_ad_scores(self, *, org_id: Optional[str] = None, batch_size: int = 500) -> dict[str, int]:
+        stats = self.backfill_ads(steps=("scores",), org_id=org_id, batch_size=batch_size)
+        return {"scores_created": stats["processed"]}
+
+    @staticmethod
+    def _backfill_pending_filter(steps: Iterable[str]) -> Any:
+        """Ads still missing the output of any of `steps` ("creatives", "facts", "scores")."""
+        steps = set(steps)
+        unknown = steps - set(BACKFILL_STEPS)
+        if unknown or not steps:
+            raise ValueError(f"Unknown backfill steps: {sorted(unknown) or 'none given'}. Expected {BACKFILL_STEPS}.")
+        pending = []
+        if "creatives" in steps:
+            # Memberships pointing at a creative of an older FINGERPRINT_ALGO are re-fingerprinted.
+            pending.append(
+                ~exists()
+                .where(AdCreativeMembership.ad_id == Ad.id)
+                .where(AdCreative.id == AdCreativeMembership.creative_id)
+                .where(AdCreative.fingerprint_algo == FINGERPRINT_ALGO)
+            )
+        if "facts" in steps or "scores" in steps:
+            pending.append(~exists().where(AdFacts.ad_id == Ad.id))
+        if "scores" in steps:
+            pending.append(
+                ~exists().where(AdScore.ad_id == Ad.id, AdScore.score_version == settings.AD_SCORE_LIVE_VERSION)
+            )
+        return or_(*pending)
+
+    def _backfill_ads_chunk(self, ad_ids: list[Any], *, steps: Iterable[str]) -> int:
+        """
+        Run `steps` for one chunk of ads with set-based statements: one query for the ads and their
+        brands, one for all linked media, then one multi-row upsert per output table. Not committed.
+        """
+        steps = set(steps)
+        rows = self.session.execute(
+            select(Ad, Brand).join(Brand, Brand.id == Ad.brand_id).where(Ad.id.in_(ad_ids))
+        ).all()
+        if not rows:
+            return 0
+        ads = [ad for ad, _brand in rows]
+        brands = {str(brand.id): brand for _ad, brand in rows}
+        linked_media = self._linked_media_for_ads([ad.id for ad in ads])
+        if "creatives" in steps:
+            self._upsert_creative_memberships_batch(brands=brands, ads=ads, linked_media=linked_media)
+        if "facts" in steps or "scores" in steps:
+            self._upsert_facts_and_scores_batch(
+                brands=brands, ads=ads, linked_media=linked_media, scores="scores" in steps
+            )
+        return len(ads)
+
+    def _backfill_ad_id_page(
+        self,
+        *,
+        steps: Iterable[str],
+        org_id: Optional[str],
+        after_ad_id: Optional[Any],
+        through_ad_id: Optional[Any],
+        batch_size: int,
+        only_missing: bool,
+    ) -> list[Any]:
+        stmt = select(Ad.id).order_by(Ad.id).limit(batch_size)
+        if only_missing:
+            stmt = stmt.where(self._backfill_pending_filter(steps))
+        if org_id:
+            stmt = stmt.join(Brand, Brand.id == Ad.brand_id).where(Brand.org_id == org_id)
+        if after_ad_id is not None:
+            stmt = stmt.where(Ad.id > after_ad_id)
+        if through_ad_id is not None:
+            stmt = stmt.where(Ad.id <= through_ad_id)
+        return list(self.session.execute(stmt).scalars())
+
+    def backfill_ads(
+        self,
+        *,
+        steps: Iterable[str] = BACKFILL_STEPS,
+        org_id: Optional[str] = None,
+        batch_size: int = 500,
+        only_missing: bool = True,
+    ) -> dict[str, int]:
+        """
+        In-process backfill of `steps` over every ad (or one org), keyset-paged by ad id.
+
+        For large corpora use app.services.ad_backfill.run_backfill, which splits the id space across
+        worker processes and checkpoints each partition.
+        """
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be > 0, got {batch_size}.")
+        steps = tuple(steps)
+        self._backfill_pending_filter(steps)
+        processed = 0
+        last_ad_id: Optional[Any] = None
         while True:
-            query = (
-                self.session.query(Ad)
-                .join(Brand, Brand.id == Ad.brand_id)
-                .outerjoin(AdFacts, AdFacts.ad_id == Ad.id)
-                .filter(AdFacts.ad_id.is_(None))
-                .order_by(Ad.created_at)
-            )
-            if org_id:
-                query = query.filter(Brand.org_id == org_id)
-            ads = query.limit(batch_size).all()
-            if not ads:
+            ad_ids = self._backfill_ad_id_page(
+                steps=steps,
+                org_id=org_id,
+                after_ad_id=last_ad_id,
+                through_ad_id=None,
+                batch_size=batch_size,
+                only_missing=only_missing,
+            )
+            if not ad_ids:
                 break
-            for ad in ads:
-                self._upsert_ad_facts(ad)
-                created += 1
+            processed += self._backfill_ads_chunk(ad_ids, steps=steps)
             self.session.commit()
-        return {"facts_created": created}
+            last_ad_id = ad_ids[-1]
+        return {"processed": processed}
 
-    def backfill_ad_scores(self, *, org_id: Optional[str] = None, batch_size: int = 500) -> dict[str, int]:
-        created = 0
+    def start_backfill_job(
+        self,
+        *,
+        job_key: str,
+        org_id: Optional[str] = None,
+        partition_size: int = 50_000,
+        restart: bool = False,
+    ) -> list[AdBackfillCheckpoint]:
+        """
+        Checkpoint rows for `job_key`, one per ad-id partition.
+
+        An unfinished job is resumed as-is (its partition bounds are fixed when it is first created).
+        A finished one is re-partitioned and run again: ad ids are random, so ads ingested since it ran
+        can fall in any partition. `restart` discards an unfinished job's progress the same way.
+        """
+        checkpoints = list(
+            self.session.scalars(
+                select(AdBackfillCheckpoint)
+                .where(AdBackfillCheckpoint.job_key == job_key)
+                .order_by(AdBackfillCheckpoint.partition)
+            )
+        )
+        finished = bool(checkpoints) and all(checkpoint.completed_at is not None for checkpoint in checkpoints)
+        if checkpoints and not (restart or finished):
+            self.session.commit()
+            return checkpoints
+        if checkpoints:
+            self.session.execute(delete(AdBackfillCheckpoint).where(AdBackfillCheckpoint.job_key == job_key))
+        bounds = self.ad_id_partition_bounds(org_id=org_id, partition_size=partition_size)
+        checkpoints = [
+            AdBackfillCheckpoint(job_key=job_key, partition=index, after_ad_id=lower, through_ad_id=upper)
+            for index, (lower, upper) in enumerate(partition_ranges(bounds))
+        ]
+        self.session.add_all(checkpoints)
+        self.session.commit()
+        return checkpoints
+
+    def backfill_partition(
+        self,
+        *,
+        job_key: str,
+        partition: int,
+        steps: Iterable[str],
+        org_id: Optional[str] = None,
+        batch_size: int = 500,
+        only_missing: bool = True,
+    ) -> dict[str, int]:
+        """Process one checkpointed partition from where it left off; each chunk commits with its checkpoint."""
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be > 0, got {batch_size}.")
+        steps = tuple(steps)
+        checkpoint = self.session.get(AdBackfillCheckpoint, (job_key, partition))
+        if checkpoint is None:
+            raise ValueError(f"No backfill checkpoint for job {job_key!r} partition {partition}.")
+        processed = 0
+        while checkpoint.completed_at is None:
+            ad_ids = self._backfill_ad_id_page(
+                steps=steps,
+                org_id=org_id,
+                after_ad_id=checkpoint.last_ad_id or checkpoint.after_ad_id,
+                through_ad_id=checkpoint.through_ad_id,
+                batch_size=batch_size,
+                only_missing=only_missing,
+            )
+            if ad_ids:
+                count = self._backfill_ads_chunk(ad_ids, steps=steps)
+                processed += count
+                checkpoint.last_ad_id = ad_ids[-1]
+                checkpoint.processed += count
+            else:
+                checkpoint.completed_at = datetime.now(timezone.utc)
+            checkpoint.updated_at = datetime.now(timezone.utc)
+            self.session.commit()
+        return {"partition": partition, "processed": processed, "total_processed": checkpoint.processed}
+
+    def prune_superseded_creatives(self, *, org_id: Optional[str] = None) -> int:
+        """
+        Delete creatives of an older FINGERPRINT_ALGO that lost all their memberships to a re-fingerprint.
+
+        Creatives with teardowns are kept (teardowns cascade with their creative).
+        """
+        stmt = delete(AdCreative).where(
+            AdCreative.fingerprint_algo != FINGERPRINT_ALGO,
+            ~exists().where(AdCreativeMembership.creative_id == AdCreative.id),
+            ~exists().where(AdTeardown.creative_id == AdCreative.id),
+        )
+        if org_id:
+            stmt = stmt.where(AdCreative.org_id == org_id)
+        deleted = self.session.execute(stmt).rowcount or 0
+        self.session.commit()
+        return deleted
+
+    @staticmethod
+    def _score_input_columns(ad_id_col: Any) -> list[Any]:
+        """Column batch fed to AdScorer.score_columns: days_active, start date, last-seen date, media count, status."""
+        media_count = (
+            select(func.count())
+            .select_from(AdAssetLink)
+            .where(AdAssetLink.ad_id == ad_id_col)
+            .correlate(ad_id_col.table)
+            .scalar_subquery()
+        )
+        return [
+            AdFacts.days_active,
+            func.date(func.timezone("UTC", func.coalesce(Ad.started_running_at, Ad.first_seen_at))),
+            func.date(func.timezone("UTC", Ad.last_seen_at)),
+            media_count,
+            Ad.ad_status,
+        ]
+
+    def rescore_ad_scores(
+        self,
+        *,
+        org_id: Optional[str] = None,
+        version: Optional[str] = None,
+        batch_size: int = 5000,
+        as_of: Optional[datetime] = None,
+        after_ad_id: Optional[str] = None,
+        ad_ids: Optional[list[str]] = None,
+        on_progress: Optional[Callable[[dict[str, Any]], None]] = None,
+    ) -> dict[str, int]:
+        """
+        Recompute stored ad_scores rows of `version` (default live) against `as_of` (default now) so recency
+        decay stays current. `ad_ids` limits the pass to those ads.
+
+        Rows are read in keyset-ordered column batches (ad, facts and media-link count in one query),
+        scored with the version's AdScorer.score_columns, and written back with one UPDATE ... FROM
+        unnest(...) per batch. Only existing rows are rescored; backfill_ad_scores creates missing ones.
+        Each batch commits and reports `last_ad_id` to `on_progress`; pass it back as `after_ad_id` to
+        resume after an interruption.
+        """
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be > 0, got {batch_size}.")
+        scorer = get_scorer(version)
+        as_of_day = (as_of or datetime.now(timezone.utc)).astimezone(timezone.utc).date()
+        base = (
+            select(AdScore.ad_id, *self._score_input_columns(AdScore.ad_id))
+            .join(Ad, Ad.id == AdScore.ad_id)
+            .outerjoin(AdFacts, AdFacts.ad_id == AdScore.ad_id)
+            .where(AdScore.score_version == scorer.version)
+            .order_by(AdScore.ad_id)
+            .limit(batch_size)
+        )
+        if org_id:
+            base = base.where(AdScore.org_id == org_id)
+        if ad_ids is not None:
+            base = base.where(AdScore.ad_id.in_(ad_ids))
+
+        rescored = 0
+        last_ad_id = after_ad_id
+        while True:
+            stmt = base if last_ad_id is None else base.where(AdScore.ad_id > last_ad_id)
+            rows = self.session.execute(stmt).all()
+            if not rows:
+                break
+            batch_ad_ids, days_active, start_dates, last_seen_dates, media_counts, statuses = zip(*rows, strict=True)
+            columns = scorer.score_columns(
+                as_of=as_of_day,
+                days_active=days_active,
+                start_dates=start_dates,
+                last_seen_dates=last_seen_dates,
+                media_counts=media_counts,
+                statuses=statuses,
+            )
+            self.session.execute(
+                _RESCORE_AD_SCORES_SQL, _score_column_params(scorer.version, batch_ad_ids, columns)
+            )
+            self.session.commit()
+            rescored += len(rows)
+            last_ad_id = batch_ad_ids[-1]
+            if on_progress:
+                on_progress({"rescored": rescored, "last_ad_id": str(last_ad_id)})
+        return {"scores_rescored": rescored}
+
+    def ad_id_partition_bounds(self, *, org_id: Optional[str] = None, partition_size: int = 50_000) -> list[str]:
+        """
+        Every `partition_size`-th ad id (ascending), used to split the corpus into (lower, upper] ranges.
+
+        The ranges are disjoint and cover every ad, so shadow-scoring workers never contend on rows.
+        """
+        if partition_size <= 0:
+            raise ValueError(f"partition_size must be > 0, got {partition_size}.")
+        numbered = select(Ad.id.label("ad_id"), func.row_number().over(order_by=Ad.id).label("rn"))
+        if org_id:
+            numbered = numbered.join(Brand, Brand.id == Ad.brand_id).where(Brand.org_id == org_id)
+        numbered_sq = numbered.subquery()
+        rows = self.session.execute(
+            select(numbered_sq.c.ad_id)
+            .where(numbered_sq.c.rn % partition_size == 0)
+            .order_by(numbered_sq.c.ad_id)
+        ).scalars()
+        return [str(ad_id) for ad_id in rows]
+
+    def score_ads_range(
+        self,
+        *,
+        version: str,
+        org_id: Optional[str] = None,
+        after_ad_id: Optional[str] = None,
+        through_ad_id: Optional[str] = None,
+        batch_size: int = 5000,
+        as_of: Optional[datetime] = None,
+    ) -> int:
+        """
+        Score every ad with after_ad_id < id <= through_ad_id under `version`, inserting or replacing its
+        ad_scores rows with one INSERT ... SELECT FROM unnest(...) ON CONFLICT per batch.
+
+        Only rows of `version` are written, so scoring a shadow version never touches live-version rows.
+        """
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be > 0, got {batch_size}.")
+        scorer = get_scorer(version)
+        as_of_day = (as_of or datetime.now(timezone.utc)).astimezone(timezone.utc).date()
+        base = (
+            select(Ad.id, Brand.org_id, Ad.brand_id, Ad.channel, *self._score_input_columns(Ad.id))
+            .join(Brand, Brand.id == Ad.brand_id)
+            .outerjoin(AdFacts, AdFacts.ad_id == Ad.id)
+            .order_by(Ad.id)
+            .limit(batch_size)
+        )
+        if org_id:
+            base = base.where(Brand.org_id == org_id)
+        if through_ad_id is not None:
+            base = base.where(Ad.id <= through_ad_id)
+
+        scored = 0
+        last_ad_id = after_ad_id
         while True:
-            query = (
-                self.session.query(Ad)
-                .join(Brand, Brand.id == Ad.brand_id)
-                .outerjoin(AdScore, AdScore.ad_id == Ad.id)
-                .filter(AdScore.ad_id.is_(None))
-                .order_by(Ad.created_at)
-            )
-            if org_id:
-                query = query.filter(Brand.org_id == org_id)
-            ads = query.limit(batch_size).all()
-            if not ads:
+            stmt = base if last_ad_id is None else base.where(Ad.id > last_ad_id)
+            rows = self.session.execute(stmt).all()
+            if not rows:
                 break
-            for ad in ads:
-                facts_payload, media_count = self._upsert_ad_facts(ad)
-                self._upsert_ad_score(ad=ad, facts_payload=facts_payload, media_count=media_count)
-                created += 1
+            ad_ids, org_ids, brand_ids, channels, days_active, start_dates, last_seen_dates, media_counts, statuses = zip(
+                *rows, strict=True
+            )
+            columns = scorer.score_columns(
+                as_of=as_of_day,
+                days_active=days_active,
+                start_dates=start_dates,
+                last_seen_dates=last_seen_dates,
+                media_counts=media_counts,
+                statuses=statuses,
+            )
+            params = _score_column_params(scorer.version, ad_ids, columns)
+            params["org_ids"] = [str(value) for value in org_ids]
+            params["brand_ids"] = [str(value) for value in brand_ids]
+            params["channels"] = [getattr(value, "value", str(value)) for value in channels]
+            self.session.execute(_UPSERT_AD_SCORES_SQL, params)
             self.session.commit()
-        return {"scores_created": created}
+            scored += len(rows)
+            last_ad_id = str(ad_ids[-1])
+        return scored
+
+    def compare_score_versions(
+        self,
+        *,
+        baseline: str,
+        candidate: str,
+        org_id: Optional[str] = None,
+        top_n: int = 1000,
+    ) -> dict[str, Any]:
+        """
+        Side-by-side summary of two stored score versions over the ads scored under both.
+
+        Reports the Spearman rank correlation of performance_score, mean absolute score change, the share
+        of ads whose stars changed, and the overlap of each version's top `top_n` ads.
+        """
+        base = aliased(AdScore)
+        cand = aliased(AdScore)
+        paired = (
+            select(
+                base.ad_id.label("ad_id"),
+                base.performance_score.label("base_score"),
+                cand.performance_score.label("cand_score"),
+                base.performance_stars.label("base_stars"),
+                cand.performance_stars.label("cand_stars"),
+                func.rank().over(order_by=base.performance_score.desc()).label("base_rank"),
+                func.rank().over(order_by=cand.performance_score.desc()).label("cand_rank"),
+                func.row_number().over(order_by=(base.performance_score.desc(), base.ad_id)).label("base_pos"),
+                func.row_number().over(order_by=(cand.performance_score.desc(), cand.ad_id)).label("cand_pos"),
+            )
+            .join(cand, (cand.ad_id == base.ad_id) & (cand.score_version == candidate))
+            .where(base.score_version == baseline)
+        )
+        if org_id:
+            paired = paired.where(base.org_id == org_id)
+        paired_sq = paired.subquery()
+        row = self.session.execute(
+            select(
+                func.count(),
+                func.corr(paired_sq.c.base_rank, paired_sq.c.cand_rank),
+                func.avg(func.abs(paired_sq.c.cand_score - paired_sq.c.base_score)),
+                func.avg(paired_sq.c.cand_score - paired_sq.c.base_score),
+                func.count().filter(paired_sq.c.base_stars != paired_sq.c.cand_stars),
+                func.count().filter(paired_sq.c.base_pos <= top_n),
+                func.count().filter((paired_sq.c.base_pos <= top_n) & (paired_sq.c.cand_pos <= top_n)),
+            )
+        ).one()
+        paired_count, rank_corr, mean_abs_delta, mean_delta, stars_changed, top_size, top_overlap = row
+        return {
+            "baseline": baseline,
+            "candidate": candidate,
+            "paired_ads": int(paired_count or 0),
+            "spearman_rank_correlation": float(rank_corr) if rank_corr is not None else None,
+            "mean_abs_score_delta": float(mean_abs_delta) if mean_abs_delta is not None else None,
+            "mean_score_delta": float(mean_delta) if mean_delta is not None else None,
+            "stars_changed_fraction": (stars_changed / paired_count) if paired_count else None,
+            "top_n": top_n,
+            "top_n_overlap_fraction": (top_overlap / top_size) if top_size else None,
+        }
+
+    def creative_ids_for_ads(self, ad_ids: Iterable[str]) -> list[str]:
+        ids = list(dict.fromkeys(str(ad_id) for ad_id in ad_ids))
+        if not ids:
+            return []
+        rows = self.session.execute(
+            select(AdCreativeMembership.creative_id).where(AdCreativeMembership.ad_id.in_(ids)).distinct()
+        ).scalars()
+        return [str(creative_id) for creative_id in rows]
+
+    def cluster_creatives(self, *, creative_ids: Iterable[str]) -> dict[str, int]:
+        """
+        Assign near-duplicate clusters to `creative_ids` incrementally.
+
+        Each creative's pHash (from its primary media) and copy MinHash are written as LSH band rows;
+        candidates are the creatives of the same brand sharing a bucket (an index lookup, so cost grows
+        with the batch, not the library). Verified pairs are merged with the candidates' existing
+        clusters; the oldest creative of a merged cluster becomes its `cluster_id`. Clusters only ever
+        merge, so re-clustering is idempotent.
+        """
+        ids = list(dict.fromkeys(str(creative_id) for creative_id in creative_ids))
+        if not ids:
+            return {"creatives": 0, "matched": 0, "clusters_merged": 0}
+
+        target_rows = self.session.execute(
+            select(
+                AdCreative.id,
+                AdCreative.org_id,
+                AdCreative.brand_id,
+                MediaAsset.phash,
+                AdCreative.copy_minhash,
+            )
+            .outerjoin(MediaAsset, MediaAsset.id == AdCreative.primary_media_asset_id)
+            .where(AdCreative.id.in_(ids))
+        ).all()
+        band_rows: list[dict[str, Any]] = []
+        phash_rows: list[dict[str, Any]] = []
+        for creative_id, org_id, brand_id, media_phash, copy_minhash in target_rows:
+            phash_rows.append({"creative_id": creative_id, "media_phash": media_phash})
+            bands: list[tuple[str, int, int]] = []
+            if media_phash is not None:
+                bands.extend(("phash", band, bucket) for band, bucket in enumerate(phash_bands(media_phash)))
+            if copy_minhash:
+                bands.extend(("copy", band, bucket) for band, bucket in enumerate(minhash_bands(copy_minhash)))
+            band_rows.extend(
+                {
+                    "creative_id": creative_id,
+                    "kind": kind,
+                    "band": band,
+                    "bucket": bucket,
+                    "org_id": org_id,
+                    "brand_id": brand_id,
+                }
+                for kind, band, bucket in bands
+            )
+        self.session.execute(delete(AdCreativeLshBand).where(AdCreativeLshBand.creative_id.in_(ids)))
+        if band_rows:
+            self.session.execute(insert(AdCreativeLshBand).values(band_rows))
+        if phash_rows:
+            self.session.execute(
+                text(
+                    """
+                    UPDATE ad_creatives AS c SET media_phash = v.media_phash
+                    FROM unnest(CAST(:ids AS uuid[]), CAST(:phashes AS bigint[])) AS v(id, media_phash)
+                    WHERE c.id = v.id
+                    """
+                ),
+                {
+                    "ids": [str(row["creative_id"]) for row in phash_rows],
+                    "phashes": [row["media_phash"] for row in phash_rows],
+                },
+            )
+
+        mine = aliased(AdCreativeLshBand)
+        other = aliased(AdCreativeLshBand)
+        candidate_pairs = self.session.execute(
+            select(mine.creative_id, other.creative_id)
+            .join(
+                other,
+                (other.org_id == mine.org_id)
+                & (other.brand_id == mine.brand_id)
+                & (other.kind == mine.kind)
+                & (other.band == mine.band)
+                & (other.bucket == mine.bucket)
+                & (other.creative_id != mine.creative_id),
+            )
+            .where(mine.creative_id.in_(ids))
+            .distinct()
+        ).all()
+
+        involved = set(ids) | {str(other_id) for _, other_id in candidate_pairs}
+        signatures: dict[str, CreativeSignature] = {}
+        current_cluster: dict[str, str] = {}
+        for creative_id, media_phash, copy_minhash, cluster_id in self.session.execute(
+            select(AdCreative.id, AdCreative.media_phash, AdCreative.copy_minhash, AdCreative.cluster_id).where(
+                AdCreative.id.in_(involved)
+            )
+        ).all():
+            key = str(creative_id)
+            signatures[key] = CreativeSignature(key, media_phash, list(copy_minhash) if copy_minhash else None)
+            if cluster_id is not None:
+                current_cluster[key] = str(cluster_id)
+
+        matched = [
+            (str(left), str(right))
+            for left, right in candidate_pairs
+            if str(left) in signatures
+            and str(right) in signatures
+            and is_near_duplicate(
+                signatures[str(left)],
+                signatures[str(right)],
+                max_phash_distance=settings.AD_CREATIVE_CLUSTER_PHASH_MAX_DISTANCE,
+                min_copy_similarity=settings.AD_CREATIVE_CLUSTER_COPY_MIN_SIMILARITY,
+            )
+        ]
+        # Existing memberships are edges too, so a new match joins (or merges) whole clusters.
+        edges = matched + [(creative_id, root) for creative_id, root in current_cluster.items()]
+        components = connected_components(ids, edges)
+        nodes = {node for component in components for node in component}
+        created_at = {
+            str(creative_id): created
+            for creative_id, created in self.session.execute(
+                select(AdCreative.id, AdCreative.created_at).where(AdCreative.id.in_(nodes))
+            ).all()
+        }
+
+        target_set = set(ids)
+        existing_roots = set(current_cluster.values())
+        target_ids: list[str] = []
+        target_roots: list[str] = []
+        merged_from: list[str] = []
+        merged_into: list[str] = []
+        for component in components:
+            present = [node for node in component if node in created_at]
+            if not component & target_set or not present:
+                continue
+            # Roots are always the oldest member, so the oldest node here is the merged cluster's root.
+            root = min(present, key=lambda node: (created_at[node], node))
+            for node in component:
+                if node in target_set:
+                    target_ids.append(node)
+                    target_roots.append(root)
+                unclustered_candidate = node not in target_set and node not in current_cluster
+                if node != root and (node in existing_roots or unclustered_candidate):
+                    # Re-point a whole existing cluster (or an unclustered candidate) at the new root.
+                    merged_from.append(node)
+                    merged_into.append(root)
+
+        if merged_from:
+            self.session.execute(
+                text(
+                    """
+                    UPDATE ad_creatives AS c SET cluster_id = v.root, updated_at = now()
+                    FROM unnest(CAST(:old AS uuid[]), CAST(:new AS uuid[])) AS v(old_root, root)
+                    WHERE c.cluster_id = v.old_root OR c.id = v.old_root
+                    """
+                ),
+                {"old": merged_from, "new": merged_into},
+            )
+        if target_ids:
+            self.session.execute(
+                text(
+                    """
+                    UPDATE ad_creatives AS c SET cluster_id = v.root, clustered_at = now()
+                    FROM unnest(CAST(:ids AS uuid[]), CAST(:roots AS uuid[])) AS v(id, root)
+                    WHERE c.id = v.id
+                    """
+                ),
+                {"ids": target_ids, "roots": target_roots},
+            )
+        self.session.commit()
+        return {"creatives": len(target_ids), "matched": len(matched), "clusters_merged": len(merged_from)}
+
+    def cluster_pending_creatives(
+        self,
+        *,
+        org_id: Optional[str] = None,
+        batch_size: int = 1000,
+        recluster: bool = False,
+    ) -> dict[str, int]:
+        """Cluster creatives never clustered before (or all of them with `recluster`), oldest first."""
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be > 0, got {batch_size}.")
+        base = select(AdCreative.id, AdCreative.created_at).order_by(AdCreative.created_at, AdCreative.id)
+        if org_id:
+            base = base.where(AdCreative.org_id == org_id)
+        if not recluster:
+            base = base.where(AdCreative.clustered_at.is_(None))
+        totals = {"creatives": 0, "matched": 0, "clusters_merged": 0}
+        brand_ids: set[str] = set()
+        last_key: Optional[tuple[Any, Any]] = None
+        while True:
+            stmt = base
+            if recluster and last_key is not None:
+                stmt = stmt.where(tuple_(AdCreative.created_at, AdCreative.id) > tuple_(*last_key))
+            rows = self.session.execute(stmt.limit(batch_size)).all()
+            if not rows:
+                break
+            stats = self.cluster_creatives(creative_ids=[str(row.id) for row in rows])
+            for key, value in stats.items():
+                totals[key] += value
+            last_key = (rows[-1].created_at, rows[-1].id)
+            brand_ids.update(
+                str(brand_id)
+                for brand_id in self.session.execute(
+                    select(AdCreative.brand_id).where(AdCreative.id.in_([row.id for row in rows])).distinct()
+                ).scalars()
+            )
+            if not recluster and stats["creatives"] == 0:
+                break
+        if brand_ids:
+            self.refresh_brand_ad_stats(brand_ids=brand_ids)
+        return totals
+
+    def refresh_brand_ad_stats(
+        self,
+        *,
+        brand_ids: Optional[Iterable[str]] = None,
+        org_id: Optional[str] = None,
+    ) -> int:
+        """
+        Recompute brand_ad_stats rows from ads with one INSERT ... SELECT ... ON CONFLICT.
+
+        Pass `brand_ids` after ingesting a brand's ads (cost scales with those brands' ads only);
+        omit both arguments for a full refresh. Rows for brands that no longer have ads are removed.
+        """
+        brand_filters = []
+        if brand_ids is not None:
+            ids = list(dict.fromkeys(str(brand_id) for brand_id in brand_ids))
+            if not ids:
+                return 0
+            brand_filters.append(Brand.id.in_(ids))
+        if org_id:
+            brand_filters.append(Brand.org_id == org_id)
+
+        # Near-duplicate clusters count once; unclustered creatives count individually.
+        creative_count = (
+            select(func.count(func.distinct(func.coalesce(AdCreative.cluster_id, AdCreative.id))))
+            .where(AdCreative.org_id == Brand.org_id, AdCreative.brand_id == Ad.brand_id)
+            .scalar_subquery()
+        )
+        aggregate = (
+            select(
+                Ad.brand_id,
+                Brand.org_id,
+                func.count(),
+                func.count().filter(Ad.ad_status == AdStatusEnum.active),
+                func.count().filter(Ad.ad_status == AdStatusEnum.inactive),
+                func.count().filter(Ad.ad_status == AdStatusEnum.unknown),
+                creative_count,
+                func.min(Ad.first_seen_at),
+                func.max(Ad.last_seen_at),
+                func.array_agg(func.distinct(Ad.channel)),
+                func.now(),
+            )
+            .join(Brand, Brand.id == Ad.brand_id)
+            .where(*brand_filters)
+            .group_by(Ad.brand_id, Brand.org_id)
+        )
+        stat_columns = [
+            "brand_id",
+            "org_id",
+            "ad_count",
+            "active_count",
+            "inactive_count",
+            "unknown_count",
+            "creative_count",
+            "first_seen_at",
+            "last_seen_at",
+            "channels",
+            "refreshed_at",
+        ]
+        stmt = insert(BrandAdStats).from_select(stat_columns, aggregate)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BrandAdStats.brand_id],
+            set_={column: stmt.excluded[column] for column in stat_columns if column != "brand_id"},
+        )
+        refreshed = self.session.execute(stmt).rowcount or 0
+
+        stale = delete(BrandAdStats).where(~exists().where(Ad.brand_id == BrandAdStats.brand_id))
+        if brand_filters:
+            stale = stale.where(BrandAdStats.brand_id.in_(select(Brand.id).where(*brand_filters)))
+        self.session.execute(stale.execution_options(synchronize_session=False))
+        self.session.commit()
+        return refreshed
 
     def latest_research_run_for_product(
         self, *, org_id: str, client_id: str, product_id: str
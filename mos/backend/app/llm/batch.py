@@ -0,0 +1,458 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping, Optional
+
+from temporalio import activity as temporal_activity
+
+from app.llm.client import (
+    _ANTHROPIC_DEFAULT_MAX_TOKENS,
+    LLMClient,
+    LLMClientConfigError,
+    LLMGenerationParams,
+    _ResolvedModelTarget,
+)
+from app.llm.response_cache import get_llm_response_cache
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_POLL_INTERVAL_SECONDS = float(os.getenv("LLM_BATCH_POLL_INTERVAL_SECONDS", "30"))
+_DEFAULT_TIMEOUT_SECONDS = float(os.getenv("LLM_BATCH_TIMEOUT_SECONDS", str(24 * 3600)))
+_OPENAI_COMPLETION_WINDOW = "24h"
+_OPENAI_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+_OPENAI_RESPONSES_ENDPOINT = "/v1/responses"
+_OPENAI_CHAT_COMPLETIONS_ENDPOINT = "/v1/chat/completions"
+_BATCH_PROVIDERS = {"openai", "anthropic"}
+
+
+class LLMBatchRequestError(RuntimeError):
+    def __init__(self, *, custom_id: str, batch_id: str, message: str) -> None:
+        super().__init__(f"LLM batch request {custom_id} failed (batch_id={batch_id}): {message}")
+        self.custom_id = custom_id
+        self.batch_id = batch_id
+
+
+class LLMBatchTimeoutError(RuntimeError):
+    def __init__(self, *, batch_ids: Mapping[str, str], waited_seconds: float) -> None:
+        super().__init__(
+            f"LLM batch still running after {int(waited_seconds)}s (batch_ids={dict(batch_ids)})"
+        )
+        self.batch_ids = dict(batch_ids)
+        self.waited_seconds = waited_seconds
+
+
+def _field(obj: Any, name: str) -> Any:
+    if isinstance(obj, Mapping):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def _request_counts(obj: Any) -> dict[str, int]:
+    counts = _field(obj, "request_counts")
+    if counts is None:
+        return {}
+    if not isinstance(counts, Mapping):
+        counts = getattr(counts, "__dict__", {}) or {}
+    return {str(key): value for key, value in counts.items() if isinstance(value, int)}
+
+
+@dataclass(frozen=True)
+class _BatchOutcome:
+    text: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class _PendingRequest:
+    custom_id: str
+    body: dict[str, Any]
+    future: Future[str]
+    cache_key: Optional[str] = None
+    cache_ttl_seconds: Optional[int] = None
+
+
+@dataclass
+class _BatchGroup:
+    """Requests sharing one provider batch: a provider, model and (for OpenAI) endpoint."""
+
+    target: _ResolvedModelTarget
+    endpoint: Optional[str]
+    requests: list[_PendingRequest] = field(default_factory=list)
+    batch_id: Optional[str] = None
+    status: Optional[str] = None
+    counts: dict[str, int] = field(default_factory=dict)
+    result_file_ids: list[str] = field(default_factory=list)
+    done: bool = False
+
+    @property
+    def key(self) -> str:
+        return f"{self.target.provider}:{self.endpoint or 'messages'}:{self.target.model_name}"
+
+
+class LLMBatch:
+    """
+    Runs many generate_text-style requests through the OpenAI and Anthropic Batch APIs.
+
+    `add` returns a Future per request; `run` submits one provider batch per (provider, model,
+    endpoint), polls until every batch ends and resolves the futures with the output text or an
+    LLMBatchRequestError. Batches trade latency (up to 24h) for half-price tokens and a separate
+    rate-limit pool, so this is for offline work (scoring, backfills), not interactive calls.
+
+    Inside a Temporal activity pass `on_poll=heartbeat_llm_batch` so the activity heartbeats
+    while the batch runs. The heartbeat carries `batch_ids`; a retried activity that re-adds the
+    same requests in the same order can pass `existing_batch_ids=batch_ids_from_heartbeat()` to
+    resume polling instead of paying for a second batch.
+    """
+
+    def __init__(
+        self,
+        client: LLMClient,
+        *,
+        poll_interval_seconds: float = _DEFAULT_POLL_INTERVAL_SECONDS,
+        timeout_seconds: float = _DEFAULT_TIMEOUT_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if poll_interval_seconds < 0:
+            raise ValueError("poll_interval_seconds must be >= 0.")
+        if timeout_seconds <= 0:
+            raise ValueError("timeout_seconds must be positive.")
+        self.client = client
+        self.poll_interval_seconds = poll_interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._groups: dict[str, _BatchGroup] = {}
+        self._request_count = 0
+        self._submitted = False
+
+    def __len__(self) -> int:
+        return self._request_count
+
+    @property
+    def batch_ids(self) -> dict[str, str]:
+        return {key: group.batch_id for key, group in self._groups.items() if group.batch_id}
+
+    def add(self, prompt: str, params: Optional[LLMGenerationParams] = None) -> Future[str]:
+        if self._submitted:
+            raise RuntimeError("LLM batch was already submitted; start a new batch for more requests.")
+        params = params or LLMGenerationParams(model=self.client.default_model)
+        target = self.client._resolve_model_target(params.model or self.client.default_model)
+        if target.provider not in _BATCH_PROVIDERS:
+            raise LLMClientConfigError(
+                f"Provider '{target.provider}' has no Batch API support (model={target.model_name})."
+            )
+        if params.use_web_search or params.existing_openai_response_id:
+            raise RuntimeError("Batch requests do not support web search or resuming an OpenAI response.")
+        if target.model_name.lower().startswith("o3-deep-research"):
+            raise RuntimeError(f"Model {target.model_name} must run through generate_text, not a batch.")
+
+        future: Future[str] = Future()
+        custom_id = f"req-{self._request_count:06d}"
+        self._request_count += 1
+
+        response_cache = LLMClient._response_cache_for(params)
+        cache_key: Optional[str] = None
+        if response_cache is not None:
+            cache_key = LLMClient._response_cache_key(prompt, target, params)
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                future.set_result(cached.text)
+                return future
+
+        if target.provider == "anthropic":
+            endpoint, body = None, _anthropic_batch_params(prompt, target.model_name, params)
+        else:
+            endpoint, body = _openai_batch_body(LLMClient._prompt_with_system(prompt, params), target.model_name, params)
+        group = _BatchGroup(target=target, endpoint=endpoint)
+        group = self._groups.setdefault(group.key, group)
+        group.requests.append(
+            _PendingRequest(
+                custom_id=custom_id,
+                body=body,
+                future=future,
+                cache_key=cache_key,
+                cache_ttl_seconds=params.cache_ttl_seconds,
+            )
+        )
+        return future
+
+    def submit(self, *, existing_batch_ids: Optional[Mapping[str, str]] = None) -> dict[str, str]:
+        """Create one provider batch per group (or adopt `existing_batch_ids`); returns group key -> batch id."""
+        self._submitted = True
+        existing_batch_ids = existing_batch_ids or {}
+        for key, group in self._groups.items():
+            if group.batch_id or not group.requests:
+                continue
+            existing = existing_batch_ids.get(key)
+            if existing:
+                group.batch_id = existing
+                logger.info("llm_batch_resumed", extra={"batch_key": key, "batch_id": existing})
+                continue
+            if group.target.provider == "anthropic":
+                group.batch_id = self._submit_anthropic(group)
+            else:
+                group.batch_id = self._submit_openai(group)
+            logger.info(
+                "llm_batch_submitted",
+                extra={"batch_key": key, "batch_id": group.batch_id, "request_count": len(group.requests)},
+            )
+        return self.batch_ids
+
+    def wait(self, *, on_poll: Optional[Callable[[dict[str, Any]], None]] = None) -> None:
+        """Poll until every submitted batch ends, resolving futures as each batch's results arrive."""
+        if not self._submitted:
+            raise RuntimeError("LLM batch must be submitted before waiting on it.")
+        started_at = self._clock()
+        while True:
+            for group in self._groups.values():
+                if group.done or not group.requests:
+                    continue
+                if group.target.provider == "anthropic":
+                    finished = self._poll_anthropic(group)
+                else:
+                    finished = self._poll_openai(group)
+                if finished:
+                    self._resolve_group(group)
+            pending = [group for group in self._groups.values() if group.requests and not group.done]
+            elapsed = self._clock() - started_at
+            if on_poll is not None:
+                on_poll(self._progress_payload(elapsed_seconds=elapsed))
+            if not pending:
+                return
+            if elapsed >= self.timeout_seconds:
+                raise LLMBatchTimeoutError(batch_ids=self.batch_ids, waited_seconds=elapsed)
+            self._sleep(self.poll_interval_seconds)
+
+    def run(
+        self,
+        *,
+        on_poll: Optional[Callable[[dict[str, Any]], None]] = None,
+        existing_batch_ids: Optional[Mapping[str, str]] = None,
+    ) -> dict[str, str]:
+        batch_ids = self.submit(existing_batch_ids=existing_batch_ids)
+        if on_poll is not None:
+            on_poll(self._progress_payload(elapsed_seconds=0.0))
+        self.wait(on_poll=on_poll)
+        return batch_ids
+
+    def _progress_payload(self, *, elapsed_seconds: float) -> dict[str, Any]:
+        groups = [group for group in self._groups.values() if group.requests]
+        return {
+            "status": "completed" if all(group.done for group in groups) else "in_progress",
+            "progress_event": "llm_batch",
+            "batch_ids": self.batch_ids,
+            "batch_statuses": {group.key: group.status for group in groups if group.status},
+            "batch_request_counts": {group.key: group.counts for group in groups if group.counts},
+            "request_count": self._request_count,
+            "completed_batches": sum(1 for group in groups if group.done),
+            "total_batches": len(groups),
+            "elapsed_seconds": round(elapsed_seconds, 3),
+        }
+
+    def _resolve_group(self, group: _BatchGroup) -> None:
+        if group.target.provider == "anthropic":
+            outcomes = self._anthropic_results(group)
+        else:
+            outcomes = self._openai_results(group)
+        response_cache = get_llm_response_cache()
+        succeeded = 0
+        for request in group.requests:
+            if request.future.done():
+                continue
+            outcome = outcomes.get(request.custom_id)
+            if outcome is not None and outcome.text:
+                request.future.set_result(outcome.text)
+                succeeded += 1
+                if response_cache is not None and request.cache_key is not None:
+                    response_cache.put(
+                        request.cache_key,
+                        provider=group.target.provider,
+                        model=group.target.model_name,
+                        text=outcome.text,
+                        ttl_seconds=request.cache_ttl_seconds,
+                    )
+                continue
+            if outcome is None:
+                message = f"no result returned (batch status={group.status})"
+            else:
+                message = outcome.error or "completed without text content"
+            request.future.set_exception(
+                LLMBatchRequestError(custom_id=request.custom_id, batch_id=group.batch_id or "", message=message)
+            )
+        group.done = True
+        logger.info(
+            "llm_batch_completed",
+            extra={
+                "batch_key": group.key,
+                "batch_id": group.batch_id,
+                "status": group.status,
+                "succeeded": succeeded,
+                "failed": len(group.requests) - succeeded,
+            },
+        )
+
+    # Anthropic Message Batches
+
+    def _anthropic_sdk(self) -> Any:
+        self.client._ensure_anthropic_client()
+        return self.client._anthropic_client
+
+    def _submit_anthropic(self, group: _BatchGroup) -> str:
+        batch = self._anthropic_sdk().messages.batches.create(
+            requests=[{"custom_id": request.custom_id, "params": request.body} for request in group.requests]
+        )
+        return str(_field(batch, "id"))
+
+    def _poll_anthropic(self, group: _BatchGroup) -> bool:
+        batch = self._anthropic_sdk().messages.batches.retrieve(group.batch_id)
+        group.status = str(_field(batch, "processing_status"))
+        group.counts = _request_counts(batch)
+        return group.status == "ended"
+
+    def _anthropic_results(self, group: _BatchGroup) -> dict[str, _BatchOutcome]:
+        outcomes: dict[str, _BatchOutcome] = {}
+        for entry in self._anthropic_sdk().messages.batches.results(group.batch_id):
+            custom_id = str(_field(entry, "custom_id"))
+            result = _field(entry, "result")
+            result_type = _field(result, "type")
+            if result_type == "succeeded":
+                outcomes[custom_id] = _BatchOutcome(text=self.client._extract_anthropic_text(_field(result, "message")))
+            else:
+                outcomes[custom_id] = _BatchOutcome(error=f"{result_type}: {_field(result, 'error')}")
+        return outcomes
+
+    # OpenAI Batch API
+
+    def _openai_sdk(self, group: _BatchGroup) -> Any:
+        return self.client._ensure_openai_compatible_client(target=group.target)
+
+    def _submit_openai(self, group: _BatchGroup) -> str:
+        lines = [
+            json.dumps(
+                {"custom_id": request.custom_id, "method": "POST", "url": group.endpoint, "body": request.body},
+                ensure_ascii=False,
+            )
+            for request in group.requests
+        ]
+        input_file_id = self.client.upload_openai_file_bytes(
+            filename=f"llm-batch-{group.target.model_name}.jsonl",
+            content_bytes=("\n".join(lines) + "\n").encode("utf-8"),
+            purpose="batch",
+        )
+        batch = self._openai_sdk(group).batches.create(
+            input_file_id=input_file_id,
+            endpoint=group.endpoint,
+            completion_window=_OPENAI_COMPLETION_WINDOW,
+        )
+        return str(_field(batch, "id"))
+
+    def _poll_openai(self, group: _BatchGroup) -> bool:
+        batch = self._openai_sdk(group).batches.retrieve(group.batch_id)
+        group.status = str(_field(batch, "status"))
+        group.counts = _request_counts(batch)
+        if group.status not in _OPENAI_TERMINAL_STATUSES:
+            return False
+        group.result_file_ids = [
+            file_id for file_id in (_field(batch, "output_file_id"), _field(batch, "error_file_id")) if file_id
+        ]
+        return True
+
+    def _openai_results(self, group: _BatchGroup) -> dict[str, _BatchOutcome]:
+        """Parse the output and error JSONL files; both key lines by custom_id."""
+        sdk = self._openai_sdk(group)
+        outcomes: dict[str, _BatchOutcome] = {}
+        for file_id in group.result_file_ids:
+            content = sdk.files.content(file_id)
+            raw_text = _field(content, "text")
+            if callable(raw_text):
+                raw_text = raw_text()
+            for line in str(raw_text or "").splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                custom_id = str(entry.get("custom_id"))
+                response = entry.get("response") or {}
+                status_code = response.get("status_code")
+                body = response.get("body")
+                if entry.get("error") or status_code != 200 or not isinstance(body, dict):
+                    error = entry.get("error") or (body.get("error") if isinstance(body, dict) else body)
+                    outcomes[custom_id] = _BatchOutcome(error=f"status_code={status_code}: {error}")
+                elif group.endpoint == _OPENAI_RESPONSES_ENDPOINT:
+                    outcomes[custom_id] = _BatchOutcome(text=self.client._extract_response_text(body))
+                else:
+                    outcomes[custom_id] = _BatchOutcome(text=self.client._extract_chat_completion_text(body))
+        return outcomes
+
+
+def _anthropic_batch_params(prompt: str, model: str, params: LLMGenerationParams) -> dict[str, Any]:
+    return {
+        "model": model,
+        "max_tokens": params.max_tokens or _ANTHROPIC_DEFAULT_MAX_TOKENS,
+        "temperature": params.temperature,
+        **LLMClient._anthropic_message_kwargs(prompt, params),
+    }
+
+
+def _openai_batch_body(prompt: str, model: str, params: LLMGenerationParams) -> tuple[str, dict[str, Any]]:
+    """Mirror generate_text's endpoint choice: Responses for reasoning/o-models, Chat Completions otherwise."""
+    if params.use_reasoning or model.lower().startswith("o"):
+        body: dict[str, Any] = {"model": model, "input": prompt}
+        if params.max_tokens:
+            body["max_output_tokens"] = params.max_tokens
+        if params.openai_tools:
+            body["tools"] = list(params.openai_tools)
+        if params.openai_tool_choice is not None:
+            body["tool_choice"] = params.openai_tool_choice
+        if params.openai_context_management is not None:
+            body["context_management"] = params.openai_context_management
+        if params.use_reasoning:
+            body["reasoning"] = {"effort": params.reasoning_effort or "medium"}
+        if params.response_format:
+            body["text"] = {"format": LLMClient._openai_text_format_from_response_format(params.response_format)}
+        return _OPENAI_RESPONSES_ENDPOINT, body
+
+    if params.openai_context_management is not None:
+        raise RuntimeError(
+            "openai_context_management is only supported for providers that expose the OpenAI Responses API."
+        )
+    body = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": params.temperature,
+    }
+    if params.max_tokens:
+        body["max_tokens"] = params.max_tokens
+    if params.response_format:
+        body["response_format"] = params.response_format
+    if params.openai_tools:
+        body["tools"] = list(params.openai_tools)
+    if params.openai_tool_choice is not None:
+        body["tool_choice"] = params.openai_tool_choice
+    return _OPENAI_CHAT_COMPLETIONS_ENDPOINT, body
+
+
+def heartbeat_llm_batch(payload: Mapping[str, Any]) -> None:
+    """`on_poll` callback that heartbeats the current Temporal activity; a no-op outside one."""
+    try:
+        temporal_activity.heartbeat(dict(payload))
+    except RuntimeError:
+        return
+
+
+def batch_ids_from_heartbeat() -> dict[str, str]:
+    """Batch ids recorded by heartbeat_llm_batch on a previous attempt of the current activity."""
+    try:
+        details = temporal_activity.info().heartbeat_details
+    except RuntimeError:
+        return {}
+    for detail in reversed(list(details or [])):
+        batch_ids = detail.get("batch_ids") if isinstance(detail, Mapping) else None
+        if isinstance(batch_ids, Mapping):
+            return {str(key): str(value) for key, value in batch_ids.items() if value}
+    return {}
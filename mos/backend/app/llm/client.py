@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 from collections.abc import Iterator
+from contextlib import contextmanager
 import io
 import logging
 import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional
 from urllib.parse import urlparse
 
 from anthropic import Anthropic
@@ -19,12 +20,19 @@ except Exception as exc:  # pragma: no cover - environment-specific dependency i
     _GENAI_IMPORT_ERROR = exc
 
 from app.env_loader import load_backend_env_files
+from app.llm.client_pool import configure_gemini_once, get_pooled_client
+from app.llm.prompt_cache import anthropic_cache_usage, anthropic_system, anthropic_user_blocks
+from app.llm.rate_limiter import RateLimitLease, estimate_tokens, get_rate_limiter, rate_limiter_enabled
+from app.llm.response_cache import LLMResponseCache, get_llm_response_cache, llm_request_hash
 from app.observability import (
     get_openai_client_class,
     start_langfuse_generation,
     start_langfuse_span,
 )
 
+if TYPE_CHECKING:
+    from app.llm.batch import LLMBatch
+
 # Ensure API keys in .env are loaded even if app.config hasn't been imported yet.
 _backend_root = Path(__file__).resolve().parents[2]
 load_backend_env_files(_backend_root)
@@ -109,17 +117,30 @@ class LLMGenerationParams:
     openai_context_management: Optional[list[dict[str, Any]]] = None
     progress_callback: Optional[Callable[[dict[str, Any]], None]] = None
     existing_openai_response_id: Optional[str] = None
+    # Admission order in the shared rate limiter when a provider bucket is saturated; lower goes first.
+    priority: int = 0
+    # Response cache (app.llm.response_cache): None caches temperature-0 calls without web search,
+    # True caches regardless of temperature, False bypasses the cache for this call.
+    cache: Optional[bool] = None
+    cache_ttl_seconds: Optional[int] = None
+    # Sent as the Anthropic `system` field (cached once it reaches ANTHROPIC_PROMPT_CACHE_MIN_CHARS);
+    # other providers receive it inline ahead of the prompt.
+    system_prompt: Optional[str] = None
+    # Stable leading part of the prompt (prompt assets, VOC evidence, brand context) marked as an
+    # Anthropic cache breakpoint; must be an exact prefix of the prompt. Ignored by other providers.
+    cacheable_prompt_prefix: Optional[str] = None
 
 
 class LLMClient:
     """
     Lightweight wrapper for LLM calls used by activities.
     Routes to the appropriate provider client based on the requested model.
+    Provider SDK clients are borrowed from the process-wide pool in app.llm.client_pool, so
+    instances are cheap to create per call site.
     """
 
     def __init__(self, default_model: Optional[str] = None) -> None:
         self.default_model = default_model or _DEFAULT_MODEL
-        self._gemini_configured = False
         self._anthropic_client: Optional[Anthropic] = None
         self._openai_client: Optional[Any] = None
         self._openai_compatible_clients: dict[str, Any] = {}
@@ -133,14 +154,15 @@ class LLMClient:
         if self._openai_client:
             return
 
-        client_kwargs = {
-            "api_key": api_key,
-            "timeout": float(_DEFAULT_TIMEOUT),
-            "max_retries": _MAX_RETRIES,
+        self._openai_client = get_pooled_client(
+            "openai",
+            client_class=self._openai_client_class,
+            api_key=api_key,
             # Explicitly set base_url so wrappers cannot inherit malformed env defaults.
-            "base_url": self._openai_base_url(),
-        }
-        self._openai_client = self._openai_client_class(**client_kwargs)
+            base_url=self._openai_base_url(),
+            timeout=float(_DEFAULT_TIMEOUT),
+            max_retries=_MAX_RETRIES,
+        )
 
     def _ensure_openai_compatible_client(self, *, target: _ResolvedModelTarget) -> Any:
         if target.client_family != "openai_compatible":
@@ -160,13 +182,14 @@ class LLMClient:
         if not api_key:
             raise LLMClientConfigError(f"{api_key_env} not configured")
 
-        client_kwargs = {
-            "api_key": api_key,
-            "timeout": float(_DEFAULT_TIMEOUT),
-            "max_retries": _MAX_RETRIES,
-            "base_url": target.base_url or self._openai_base_url(),
-        }
-        client = self._openai_client_class(**client_kwargs)
+        client = get_pooled_client(
+            target.provider,
+            client_class=self._openai_client_class,
+            api_key=api_key,
+            base_url=target.base_url or self._openai_base_url(),
+            timeout=float(_DEFAULT_TIMEOUT),
+            max_retries=_MAX_RETRIES,
+        )
         if target.provider == "openai":
             self._openai_client = client
         self._openai_compatible_clients[target.provider] = client
@@ -344,11 +367,35 @@ class LLMClient:
         if self._anthropic_client:
             return
 
-        self._anthropic_client = Anthropic(
+        self._anthropic_client = get_pooled_client(
+            "anthropic",
+            client_class=Anthropic,
             api_key=api_key,
             base_url=self._anthropic_base_url(),
         )
 
+    @contextmanager
+    def _rate_limited(
+        self,
+        *,
+        provider: str,
+        model: str,
+        prompt: str,
+        max_tokens: Optional[int],
+        params: Optional[LLMGenerationParams],
+    ) -> Iterator[Optional[RateLimitLease]]:
+        """Wait for RPM/TPM budget in the process-wide limiter (app.llm.rate_limiter) before dispatch."""
+        if not rate_limiter_enabled():
+            yield None
+            return
+        with get_rate_limiter().acquire(
+            provider,
+            model,
+            estimated_tokens=estimate_tokens(prompt, max_output_tokens=max_tokens),
+            priority=params.priority if params else 0,
+        ) as lease:
+            yield lease
+
     def _langfuse_metadata(
         self,
         *,
@@ -394,8 +441,36 @@ class LLMClient:
             usage_details["input"] = input_tokens
         if isinstance(output_tokens, int):
             usage_details["output"] = output_tokens
+        usage_details.update(anthropic_cache_usage(usage))
         return usage_details or None
 
+    @staticmethod
+    def _anthropic_message_kwargs(prompt: str, params: Optional[LLMGenerationParams]) -> dict[str, Any]:
+        """`messages` (and `system`) for a single-turn Messages API call, with prompt-cache breakpoints applied."""
+        kwargs: dict[str, Any] = {
+            "messages": [
+                {
+                    "role": "user",
+                    "content": anthropic_user_blocks(
+                        prompt,
+                        cacheable_prefix=params.cacheable_prompt_prefix if params else None,
+                    ),
+                }
+            ]
+        }
+        system = anthropic_system(params.system_prompt if params else None)
+        if system is not None:
+            kwargs["system"] = system
+        return kwargs
+
+    @staticmethod
+    def _prompt_with_system(prompt: str, params: Optional[LLMGenerationParams]) -> str:
+        # Non-Anthropic providers get the system prompt inline; keeping it first preserves their
+        # automatic prefix caching.
+        if params is None or not params.system_prompt:
+            return prompt
+        return f"{params.system_prompt}\n\n{prompt}"
+
     @staticmethod
     def _extract_anthropic_text(response: Any) -> str | None:
         content_blocks = getattr(response, "content", None)
@@ -437,10 +512,55 @@ class LLMClient:
             usage_details["output"] = output_tokens
         return usage_details or None
 
+    @staticmethod
+    def _response_cache_for(params: Optional[LLMGenerationParams]) -> Optional[LLMResponseCache]:
+        if params is None or params.cache is False or params.existing_openai_response_id:
+            return None
+        if params.cache is None and (params.temperature != 0 or params.use_web_search):
+            return None
+        return get_llm_response_cache()
+
+    @staticmethod
+    def _response_cache_key(prompt: str, target: _ResolvedModelTarget, params: LLMGenerationParams) -> str:
+        return llm_request_hash(
+            provider=target.provider,
+            model=target.model_name,
+            prompt=prompt,
+            request={
+                "max_tokens": params.max_tokens,
+                "temperature": params.temperature,
+                "use_reasoning": params.use_reasoning,
+                "reasoning_effort": params.reasoning_effort,
+                "use_web_search": params.use_web_search,
+                "response_format": params.response_format,
+                "openai_tools": params.openai_tools,
+                "openai_tool_choice": params.openai_tool_choice,
+                "openai_context_management": params.openai_context_management,
+                "system_prompt": params.system_prompt,
+            },
+        )
+
+    def batch(self, **batch_kwargs: Any) -> LLMBatch:
+        """Collect generate_text-style requests for the provider Batch APIs (see app.llm.batch)."""
+        from app.llm.batch import LLMBatch
+
+        return LLMBatch(self, **batch_kwargs)
+
     def generate_text(self, prompt: str, params: Optional[LLMGenerationParams] = None) -> str:
         model = params.model if params and params.model else self.default_model
         model = model or _DEFAULT_MODEL
         target = self._resolve_model_target(model)
+        response_cache = self._response_cache_for(params)
+        cache_key: str | None = None
+        if response_cache is not None and params is not None:
+            cache_key = self._response_cache_key(prompt, target, params)
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(
+                    "llm_response_cache_hit",
+                    extra={"provider": target.provider, "model": target.model_name, "cache_key": cache_key},
+                )
+                return cached.text
         metadata = self._langfuse_metadata(
             operation="generate_text",
             model=model,
@@ -455,10 +575,20 @@ class LLMClient:
             trace_name="llm.workflow",
         ):
             if target.client_family == "openai_compatible":
-                return self._generate_with_openai_compatible(prompt, target, params)
-            if target.client_family == "anthropic":
-                return self._generate_with_anthropic(prompt, target.model_name, params)
-            return self._generate_with_gemini(prompt, target.model_name, params)
+                text = self._generate_with_openai_compatible(self._prompt_with_system(prompt, params), target, params)
+            elif target.client_family == "anthropic":
+                text = self._generate_with_anthropic(prompt, target.model_name, params)
+            else:
+                text = self._generate_with_gemini(self._prompt_with_system(prompt, params), target.model_name, params)
+        if response_cache is not None and cache_key is not None:
+            response_cache.put(
+                cache_key,
+                provider=target.provider,
+                model=target.model_name,
+                text=text,
+                ttl_seconds=params.cache_ttl_seconds if params else None,
+            )
+        return text
 
     def stream_text(self, prompt: str, params: Optional[LLMGenerationParams] = None) -> Iterator[str]:
         model = params.model if params and params.model else self.default_model
@@ -478,7 +608,7 @@ class LLMClient:
             trace_name="llm.workflow",
         ):
             if target.client_family == "openai_compatible":
-                yield from self._stream_with_openai_compatible(prompt, target, params)
+                yield from self._stream_with_openai_compatible(self._prompt_with_system(prompt, params), target, params)
                 return
             if target.client_family == "anthropic":
                 yield from self._stream_with_anthropic(prompt, target.model_name, params)
@@ -805,6 +935,8 @@ class LLMClient:
     @staticmethod
     def _extract_chat_completion_text(completion: Any) -> str | None:
         choices = getattr(completion, "choices", None)
+        if choices is None and isinstance(completion, dict):
+            choices = completion.get("choices")
         if not isinstance(choices, list) or not choices:
             return None
         message = getattr(choices[0], "message", None)
@@ -1013,7 +1145,14 @@ class LLMClient:
 
             max_attempts = max(1, _MAX_RETRIES)
             for attempt in range(1, max_attempts + 1):
-                response = client.responses.create(**request_kwargs)
+                with self._rate_limited(
+                    provider=target.provider,
+                    model=model,
+                    prompt=prompt,
+                    max_tokens=max_tokens,
+                    params=params,
+                ):
+                    response = client.responses.create(**request_kwargs)
                 response_id = getattr(response, "id", None)
                 logger.warning(
                     "OpenAI responses request created "
@@ -1100,7 +1239,14 @@ class LLMClient:
                 "continuous_usage_stats": True,
             }
             try:
-                stream = client.chat.completions.create(**completion_kwargs)
+                with self._rate_limited(
+                    provider=target.provider,
+                    model=model,
+                    prompt=prompt,
+                    max_tokens=max_tokens,
+                    params=params,
+                ) as lease:
+                    stream = client.chat.completions.create(**completion_kwargs)
             except Exception:
                 logger.exception("OpenAI chat completion stream failed", extra={"model": model})
                 raise
@@ -1119,6 +1265,8 @@ class LLMClient:
                     text_parts.append(delta_text)
 
             text = "".join(text_parts)
+            if lease is not None and usage_payload:
+                lease.record_usage(usage_payload.get("total_tokens"))
             if params and params.progress_callback is not None:
                 progress_payload: dict[str, Any] = {"status": "completed"}
                 if request_id:
@@ -1131,10 +1279,19 @@ class LLMClient:
             raise RuntimeError(f"OpenAI chat completion stream returned no content for model {model}")
 
         try:
-            completion = client.chat.completions.create(**completion_kwargs)
+            with self._rate_limited(
+                provider=target.provider,
+                model=model,
+                prompt=prompt,
+                max_tokens=max_tokens,
+                params=params,
+            ) as lease:
+                completion = client.chat.completions.create(**completion_kwargs)
         except Exception:
             logger.exception("OpenAI chat completion failed", extra={"model": model})
             raise
+        if lease is not None:
+            lease.record_usage((self._extract_chat_completion_usage(completion) or {}).get("total_tokens"))
 
         if params and params.progress_callback is not None:
             progress_payload: dict[str, Any] = {"status": "completed"}
@@ -1353,9 +1510,7 @@ class LLMClient:
         if not api_key:
             raise LLMClientConfigError("GEMINI_API_KEY not configured")
 
-        if not self._gemini_configured:
-            genai.configure(api_key=api_key)
-            self._gemini_configured = True
+        configure_gemini_once(genai, api_key=api_key)
 
         generation_config = {
             "temperature": params.temperature if params else 0.2,
@@ -1380,7 +1535,18 @@ class LLMClient:
             trace_name="llm.workflow",
         ) as generation:
             try:
-                result = model_client.generate_content(prompt, request_options={"timeout": 120})
+                with self._rate_limited(
+                    provider="gemini",
+                    model=model,
+                    prompt=prompt,
+                    max_tokens=params.max_tokens if params else None,
+                    params=params,
+                ) as lease:
+                    result = model_client.generate_content(prompt, request_options={"timeout": 120})
+                if lease is not None:
+                    gemini_usage = self._extract_gemini_usage(result) or {}
+                    if "input" in gemini_usage or "output" in gemini_usage:
+                        lease.record_usage(gemini_usage.get("input", 0) + gemini_usage.get("output", 0))
                 text = None
                 if result and getattr(result, "candidates", None):
                     first = result.candidates[0]
@@ -1456,16 +1622,25 @@ class LLMClient:
         ) as generation:
             for _ in range(max(1, _MAX_RETRIES)):
                 try:
-                    response = self._anthropic_client.messages.create(
+                    with self._rate_limited(
+                        provider="anthropic",
                         model=model,
+                        prompt=prompt,
                         max_tokens=max_tokens,
-                        temperature=temperature,
-                        messages=[{"role": "user", "content": prompt}],
-                        timeout=timeout,
-                    )
+                        params=params,
+                    ) as lease:
+                        response = self._anthropic_client.messages.create(
+                            model=model,
+                            max_tokens=max_tokens,
+                            temperature=temperature,
+                            timeout=timeout,
+                            **self._anthropic_message_kwargs(prompt, params),
+                        )
                     text = self._extract_anthropic_text(response)
                     request_id = self._extract_anthropic_request_id(response)
                     usage_details = self._extract_anthropic_usage(response) or {}
+                    if lease is not None and usage_details:
+                        lease.record_usage(usage_details.get("input", 0) + usage_details.get("output", 0))
                     if text:
                         elapsed_seconds = round(time.monotonic() - call_started_at, 3)
                         logger.info(
@@ -1476,12 +1651,16 @@ class LLMClient:
                                 "elapsed_seconds": elapsed_seconds,
                                 "input_tokens": usage_details.get("input"),
                                 "output_tokens": usage_details.get("output"),
+                                "cache_read_input_tokens": usage_details.get("cache_read_input_tokens"),
+                                "cache_creation_input_tokens": usage_details.get("cache_creation_input_tokens"),
                                 "output_chars": len(text),
                             },
                         )
                         progress_payload: dict[str, Any] = {
                             "request_id": request_id,
                             "elapsed_seconds": elapsed_seconds,
+                            "cache_read_input_tokens": usage_details.get("cache_read_input_tokens"),
+                            "cache_creation_input_tokens": usage_details.get("cache_creation_input_tokens"),
                         }
                         input_tokens = usage_details.get("input")
                         output_tokens = usage_details.get("output")
@@ -1572,8 +1751,8 @@ class LLMClient:
                     model=model,
                     max_tokens=max_tokens,
                     temperature=temperature,
-                    messages=[{"role": "user", "content": prompt}],
                     timeout=timeout,
+                    **self._anthropic_message_kwargs(prompt, params),
                 ) as stream:
                     for text in stream.text_stream:
                         if text:
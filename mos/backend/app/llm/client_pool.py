@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Callable, Optional
+
+import httpx
+
+from app.llm.rate_limiter import rate_limit_response_hook
+
+
+def _parse_positive_int_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        value = int(raw.strip())
+    except ValueError as exc:
+        raise RuntimeError(f"{name} must be an integer, got {raw!r}.") from exc
+    if value <= 0:
+        raise RuntimeError(f"{name} must be > 0, got {value}.")
+    return value
+
+
+def _http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=_parse_positive_int_env("LLM_HTTP_MAX_CONNECTIONS", 100),
+        max_keepalive_connections=_parse_positive_int_env("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", 20),
+        keepalive_expiry=float(_parse_positive_int_env("LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS", 60)),
+    )
+
+
+def _http2_enabled() -> bool:
+    return os.getenv("LLM_HTTP2", "true").strip().lower() not in {"0", "false", "no", "off"}
+
+
+_PoolKey = tuple[str, Optional[str], str, Callable[..., Any]]
+
+_pooled_clients: dict[_PoolKey, tuple[Any, httpx.Client]] = {}
+_pooled_clients_lock = threading.Lock()
+_gemini_api_key: Optional[str] = None
+
+
+def get_pooled_client(
+    provider: str,
+    *,
+    client_class: Callable[..., Any],
+    api_key: str,
+    base_url: Optional[str],
+    **client_kwargs: Any,
+) -> Any:
+    """
+    Process-wide SDK client for (provider, base_url, api_key), built once over a pooled httpx.Client.
+
+    The OpenAI and Anthropic SDK clients are thread-safe, so every LLMClient (and every activity
+    thread) reuses the same keep-alive connections instead of paying a TLS handshake per instance.
+    HTTP/2 is on unless LLM_HTTP2=false; pool sizes come from LLM_HTTP_MAX_CONNECTIONS and
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS. `client_class` is part of the key so a Langfuse-wrapped
+    OpenAI class and the plain one never share an instance.
+    """
+    key: _PoolKey = (provider, base_url, api_key, client_class)
+    with _pooled_clients_lock:
+        pooled = _pooled_clients.get(key)
+        if pooled is not None and not pooled[1].is_closed:
+            return pooled[0]
+        http_client = httpx.Client(
+            http2=_http2_enabled(),
+            limits=_http_limits(),
+            # Lets the shared rate limiter adapt to x-ratelimit-* / anthropic-ratelimit-* headers and 429s.
+            event_hooks={"response": [rate_limit_response_hook]},
+        )
+        try:
+            client = client_class(api_key=api_key, base_url=base_url, http_client=http_client, **client_kwargs)
+        except Exception:
+            http_client.close()
+            raise
+        _pooled_clients[key] = (client, http_client)
+        return client
+
+
+def configure_gemini_once(genai_module: Any, *, api_key: str) -> None:
+    """google.generativeai keeps one process-global configuration; only reconfigure when the key changes."""
+    global _gemini_api_key
+    with _pooled_clients_lock:
+        if _gemini_api_key == api_key:
+            return
+        genai_module.configure(api_key=api_key)
+        _gemini_api_key = api_key
+
+
+def close_pooled_clients() -> None:
+    """Close every pooled connection (worker shutdown, tests); later calls build fresh clients."""
+    global _gemini_api_key
+    with _pooled_clients_lock:
+        pooled = list(_pooled_clients.values())
+        _pooled_clients.clear()
+        _gemini_api_key = None
+    for _client, http_client in pooled:
+        http_client.close()
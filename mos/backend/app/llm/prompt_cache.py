@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Mapping, Optional
+
+# Anthropic only caches prefixes of at least ~1024 tokens (2048 on Haiku); ~4 chars per token.
+_DEFAULT_MIN_CACHEABLE_CHARS = 4096
+_CACHE_CONTROL: dict[str, str] = {"type": "ephemeral"}
+
+
+def prompt_cache_enabled() -> bool:
+    return os.getenv("ANTHROPIC_PROMPT_CACHE_ENABLED", "true").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def prompt_cache_min_chars() -> int:
+    raw = os.getenv("ANTHROPIC_PROMPT_CACHE_MIN_CHARS")
+    if raw is None or not raw.strip():
+        return _DEFAULT_MIN_CACHEABLE_CHARS
+    try:
+        value = int(raw.strip())
+    except ValueError as exc:
+        raise RuntimeError(f"ANTHROPIC_PROMPT_CACHE_MIN_CHARS must be an integer, got {raw!r}.") from exc
+    if value < 0:
+        raise RuntimeError(f"ANTHROPIC_PROMPT_CACHE_MIN_CHARS must be >= 0, got {value}.")
+    return value
+
+
+def cacheable_text_block(text: str) -> dict[str, Any]:
+    """A Messages API text block carrying a cache breakpoint: everything up to and including it is cached."""
+    return {"type": "text", "text": text, "cache_control": dict(_CACHE_CONTROL)}
+
+
+def anthropic_system(system: Optional[str]) -> str | list[dict[str, Any]] | None:
+    """
+    Value for the Messages API `system` field.
+
+    System prompts at or above ANTHROPIC_PROMPT_CACHE_MIN_CHARS become a single cached text block,
+    so repeated calls with the same instructions read them from the cache instead of re-encoding.
+    """
+    if not system:
+        return None
+    if prompt_cache_enabled() and len(system) >= prompt_cache_min_chars():
+        return [cacheable_text_block(system)]
+    return system
+
+
+def anthropic_user_blocks(prompt: str, *, cacheable_prefix: Optional[str] = None) -> list[dict[str, Any]]:
+    """
+    User-turn content blocks for `prompt`, with its stable leading `cacheable_prefix` as a cache breakpoint.
+
+    Callers pass the part of the prompt that repeats across calls (rendered prompt assets, VOC
+    evidence, brand context) so only the per-call tail is billed as fresh input. Prefixes shorter
+    than ANTHROPIC_PROMPT_CACHE_MIN_CHARS are sent unmarked since Anthropic would not cache them.
+    """
+    if not cacheable_prefix:
+        return [{"type": "text", "text": prompt}]
+    if not prompt.startswith(cacheable_prefix):
+        raise ValueError("cacheable_prefix must be a leading substring of the prompt.")
+    if not prompt_cache_enabled() or len(cacheable_prefix) < prompt_cache_min_chars():
+        return [{"type": "text", "text": prompt}]
+    blocks = [cacheable_text_block(cacheable_prefix)]
+    remainder = prompt[len(cacheable_prefix):]
+    if remainder:
+        blocks.append({"type": "text", "text": remainder})
+    return blocks
+
+
+def anthropic_cache_usage(usage: Any) -> dict[str, int]:
+    """cache_read_input_tokens / cache_creation_input_tokens from an SDK usage object or raw payload dict."""
+    details: dict[str, int] = {}
+    for key in ("cache_read_input_tokens", "cache_creation_input_tokens"):
+        value = usage.get(key) if isinstance(usage, Mapping) else getattr(usage, key, None)
+        if isinstance(value, int):
+            details[key] = value
+    return details
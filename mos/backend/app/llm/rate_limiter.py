@@ -0,0 +1,422 @@
+from __future__ import annotations
+
+import contextvars
+import heapq
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Rough prompt-size estimate (~4 characters per token) used to reserve token budget before dispatch;
+# the reservation is corrected with the provider-reported usage once the call returns.
+_CHARS_PER_TOKEN = 4
+_DEFAULT_RETRY_AFTER_SECONDS = 1.0
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+
+
+def estimate_tokens(prompt: str, *, max_output_tokens: Optional[int]) -> int:
+    """Input estimate from prompt length plus the requested output budget (what providers meter against)."""
+    return max(1, len(prompt) // _CHARS_PER_TOKEN) + max(0, int(max_output_tokens or 0))
+
+
+def _parse_duration_seconds(value: str) -> Optional[float]:
+    """Parse OpenAI-style reset durations such as '20ms', '1s' or '6m0.5s'."""
+    text = value.strip()
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(text)
+    if not parts or "".join(number + unit for number, unit in parts) != text:
+        return None
+    scale = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    return sum(float(number) * scale[unit] for number, unit in parts)
+
+
+def _parse_reset_seconds(value: Optional[str], *, now: datetime) -> Optional[float]:
+    """Reset headers are durations (OpenAI) or RFC 3339 timestamps (Anthropic)."""
+    if not value:
+        return None
+    duration = _parse_duration_seconds(value)
+    if duration is not None:
+        return duration
+    try:
+        reset_at = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if reset_at.tzinfo is None:
+        reset_at = reset_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (reset_at - now).total_seconds())
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(float(value.strip()))
+    except ValueError:
+        return None
+
+
+@dataclass
+class RateLimitSnapshot:
+    """Rate-limit state reported by one provider response."""
+
+    requests_limit: Optional[int] = None
+    requests_remaining: Optional[int] = None
+    requests_reset_seconds: Optional[float] = None
+    tokens_limit: Optional[int] = None
+    tokens_remaining: Optional[int] = None
+    tokens_reset_seconds: Optional[float] = None
+    retry_after_seconds: Optional[float] = None
+
+
+def parse_rate_limit_headers(headers: Mapping[str, str], *, now: Optional[datetime] = None) -> RateLimitSnapshot:
+    """Read OpenAI (x-ratelimit-*) and Anthropic (anthropic-ratelimit-*) rate-limit response headers."""
+    lowered = {str(key).lower(): str(value) for key, value in headers.items()}
+    now = now or datetime.now(timezone.utc)
+
+    def _first(*names: str) -> Optional[str]:
+        for name in names:
+            if name in lowered:
+                return lowered[name]
+        return None
+
+    retry_after: Optional[float] = None
+    retry_after_ms = _parse_int(lowered.get("retry-after-ms"))
+    if retry_after_ms is not None:
+        retry_after = retry_after_ms / 1000.0
+    elif "retry-after" in lowered:
+        retry_after = _parse_duration_seconds(lowered["retry-after"])
+
+    return RateLimitSnapshot(
+        requests_limit=_parse_int(_first("x-ratelimit-limit-requests", "anthropic-ratelimit-requests-limit")),
+        requests_remaining=_parse_int(
+            _first("x-ratelimit-remaining-requests", "anthropic-ratelimit-requests-remaining")
+        ),
+        requests_reset_seconds=_parse_reset_seconds(
+            _first("x-ratelimit-reset-requests", "anthropic-ratelimit-requests-reset"), now=now
+        ),
+        tokens_limit=_parse_int(
+            _first(
+                "x-ratelimit-limit-tokens",
+                "anthropic-ratelimit-tokens-limit",
+                "anthropic-ratelimit-input-tokens-limit",
+            )
+        ),
+        tokens_remaining=_parse_int(
+            _first(
+                "x-ratelimit-remaining-tokens",
+                "anthropic-ratelimit-tokens-remaining",
+                "anthropic-ratelimit-input-tokens-remaining",
+            )
+        ),
+        tokens_reset_seconds=_parse_reset_seconds(
+            _first(
+                "x-ratelimit-reset-tokens",
+                "anthropic-ratelimit-tokens-reset",
+                "anthropic-ratelimit-input-tokens-reset",
+            ),
+            now=now,
+        ),
+        retry_after_seconds=retry_after,
+    )
+
+
+class _TokenBucket:
+    """Per-minute budget refilled continuously; `capacity=None` means unlimited until learned."""
+
+    def __init__(self, capacity: Optional[int], *, now: float) -> None:
+        self.capacity = capacity
+        self.level = float(capacity or 0)
+        self.updated_at = now
+
+    def refill(self, now: float) -> None:
+        if self.capacity is None:
+            return
+        elapsed = max(0.0, now - self.updated_at)
+        self.level = min(float(self.capacity), self.level + elapsed * self.capacity / 60.0)
+        self.updated_at = now
+
+    def cost(self, amount: float) -> float:
+        # A request larger than the whole budget would never fit; let it through once the bucket is full.
+        return amount if self.capacity is None else min(amount, float(self.capacity))
+
+    def seconds_until(self, amount: float) -> float:
+        if self.capacity is None:
+            return 0.0
+        missing = self.cost(amount) - self.level
+        return 0.0 if missing <= 0 else missing * 60.0 / self.capacity
+
+    def take(self, amount: float) -> None:
+        if self.capacity is not None:
+            self.level -= self.cost(amount)
+
+    def give_back(self, amount: float) -> None:
+        if self.capacity is not None:
+            self.level = min(float(self.capacity), self.level + amount)
+
+    def learn(self, *, limit: Optional[int], remaining: Optional[int], configured: Optional[int]) -> None:
+        if limit is not None and limit > 0:
+            learned = limit if configured is None else min(limit, configured)
+            if self.capacity is None:
+                self.level = float(learned)
+            self.capacity = learned
+        if remaining is not None and self.capacity is not None:
+            # The provider also counts other processes' traffic, so its remaining budget wins when lower.
+            self.level = min(self.level, float(remaining))
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    tokens: int = field(compare=False)
+
+
+class _Bucket:
+    def __init__(self, limit: RateLimit, *, now: float) -> None:
+        self.configured = limit
+        self.requests = _TokenBucket(limit.requests_per_minute, now=now)
+        self.tokens = _TokenBucket(limit.tokens_per_minute, now=now)
+        self.blocked_until = 0.0
+        self.waiters: list[_Waiter] = []
+
+    def seconds_until_ready(self, tokens: int, now: float) -> float:
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        return max(
+            self.blocked_until - now,
+            self.requests.seconds_until(1),
+            self.tokens.seconds_until(tokens),
+        )
+
+
+class RateLimitLease:
+    """One admitted call; report actual usage and provider headers through it."""
+
+    def __init__(self, limiter: "LLMRateLimiter", key: tuple[str, str], reserved_tokens: int) -> None:
+        self._limiter = limiter
+        self.key = key
+        self.reserved_tokens = reserved_tokens
+        self.waited_seconds = 0.0
+
+    def record_usage(self, total_tokens: Optional[int]) -> None:
+        if isinstance(total_tokens, int) and total_tokens >= 0:
+            self._limiter._settle(self.key, reserved=self.reserved_tokens, actual=total_tokens)
+            self.reserved_tokens = total_tokens
+
+    def observe_response(self, status_code: int, headers: Mapping[str, str]) -> None:
+        self._limiter._observe(self.key, status_code=status_code, headers=headers)
+
+
+_active_lease: contextvars.ContextVar[Optional[RateLimitLease]] = contextvars.ContextVar(
+    "llm_rate_limit_lease", default=None
+)
+
+
+class LLMRateLimiter:
+    """
+    Shared requests-per-minute / tokens-per-minute scheduler keyed by (provider, model).
+
+    Callers block in `acquire` until their bucket has budget for one request plus the estimated
+    tokens; waiters on a bucket are admitted strictly in (priority, arrival) order, lower priority
+    values first. Buckets start from LLM_RATE_LIMITS (or unlimited) and adapt to the rate-limit
+    headers of every response seen while a lease is active; a 429 pauses the whole bucket for the
+    provider's retry-after instead of letting each caller retry on its own.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Mapping[str, RateLimit]] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._limits = dict(limits or {})
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._buckets: dict[tuple[str, str], _Bucket] = {}
+        self._seq = itertools.count()
+
+    def _configured_limit(self, provider: str, model: str) -> RateLimit:
+        return self._limits.get(f"{provider}:{model}") or self._limits.get(provider) or RateLimit()
+
+    def _bucket(self, key: tuple[str, str]) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _Bucket(self._configured_limit(*key), now=self._clock())
+            self._buckets[key] = bucket
+        return bucket
+
+    def waiting(self, provider: str, model: str) -> int:
+        with self._cond:
+            bucket = self._buckets.get((provider, model))
+            return len(bucket.waiters) if bucket else 0
+
+    @contextmanager
+    def acquire(
+        self,
+        provider: str,
+        model: str,
+        *,
+        estimated_tokens: int,
+        priority: int = 0,
+    ) -> Iterator[RateLimitLease]:
+        key = (provider, model)
+        started_at = self._clock()
+        with self._cond:
+            bucket = self._bucket(key)
+            waiter = _Waiter(priority=priority, seq=next(self._seq), tokens=max(0, int(estimated_tokens)))
+            heapq.heappush(bucket.waiters, waiter)
+            try:
+                while True:
+                    now = self._clock()
+                    delay = bucket.seconds_until_ready(waiter.tokens, now)
+                    if bucket.waiters[0] is waiter and delay <= 0:
+                        break
+                    self._cond.wait(timeout=delay if delay > 0 else None)
+            finally:
+                bucket.waiters.remove(waiter)
+                heapq.heapify(bucket.waiters)
+                self._cond.notify_all()
+            bucket.requests.take(1)
+            bucket.tokens.take(waiter.tokens)
+        lease = RateLimitLease(self, key, waiter.tokens)
+        lease.waited_seconds = self._clock() - started_at
+        if lease.waited_seconds >= 1.0:
+            logger.info(
+                "llm_rate_limiter_waited",
+                extra={"provider": provider, "model": model, "waited_seconds": round(lease.waited_seconds, 3)},
+            )
+        token = _active_lease.set(lease)
+        try:
+            yield lease
+        finally:
+            _active_lease.reset(token)
+
+    def _settle(self, key: tuple[str, str], *, reserved: int, actual: int) -> None:
+        with self._cond:
+            bucket = self._bucket(key)
+            if actual < reserved:
+                bucket.tokens.give_back(reserved - actual)
+                self._cond.notify_all()
+            else:
+                bucket.tokens.take(actual - reserved)
+
+    def _observe(self, key: tuple[str, str], *, status_code: int, headers: Mapping[str, str]) -> None:
+        snapshot = parse_rate_limit_headers(headers)
+        with self._cond:
+            bucket = self._bucket(key)
+            now = self._clock()
+            bucket.requests.refill(now)
+            bucket.tokens.refill(now)
+            bucket.requests.learn(
+                limit=snapshot.requests_limit,
+                remaining=snapshot.requests_remaining,
+                configured=bucket.configured.requests_per_minute,
+            )
+            bucket.tokens.learn(
+                limit=snapshot.tokens_limit,
+                remaining=snapshot.tokens_remaining,
+                configured=bucket.configured.tokens_per_minute,
+            )
+            pause: Optional[float] = None
+            if status_code == 429:
+                pause = snapshot.retry_after_seconds
+                if pause is None:
+                    pause = max(
+                        snapshot.requests_reset_seconds or 0.0,
+                        snapshot.tokens_reset_seconds or 0.0,
+                    ) or _DEFAULT_RETRY_AFTER_SECONDS
+            elif snapshot.requests_remaining == 0 and snapshot.requests_reset_seconds:
+                pause = snapshot.requests_reset_seconds
+            elif snapshot.tokens_remaining == 0 and snapshot.tokens_reset_seconds:
+                pause = snapshot.tokens_reset_seconds
+            if pause is not None:
+                bucket.blocked_until = max(bucket.blocked_until, now + pause)
+                logger.warning(
+                    "llm_rate_limiter_paused",
+                    extra={
+                        "provider": key[0],
+                        "model": key[1],
+                        "status_code": status_code,
+                        "pause_seconds": round(pause, 3),
+                    },
+                )
+            self._cond.notify_all()
+
+
+def observe_rate_limit_response(status_code: int, headers: Mapping[str, str]) -> None:
+    """Feed a provider HTTP response to the lease active on this thread/context, if any."""
+    lease = _active_lease.get()
+    if lease is not None:
+        lease.observe_response(status_code, headers)
+
+
+def _load_limits_from_env() -> dict[str, RateLimit]:
+    """
+    LLM_RATE_LIMITS is a JSON object keyed by provider or provider:model, e.g.
+    {"anthropic": {"rpm": 4000, "tpm": 2000000}, "openai:gpt-5.2": {"rpm": 500}}.
+    """
+    raw = os.getenv("LLM_RATE_LIMITS")
+    if raw is None or not raw.strip():
+        return {}
+    try:
+        payload = json.loads(raw)
+    except json.JSONDecodeError as exc:
+        raise RuntimeError(f"LLM_RATE_LIMITS must be a JSON object, got {raw!r}.") from exc
+    if not isinstance(payload, dict):
+        raise RuntimeError(f"LLM_RATE_LIMITS must be a JSON object, got {raw!r}.")
+    limits: dict[str, RateLimit] = {}
+    for key, value in payload.items():
+        if not isinstance(value, dict):
+            raise RuntimeError(f"LLM_RATE_LIMITS[{key!r}] must be an object with rpm/tpm.")
+        rpm = value.get("rpm")
+        tpm = value.get("tpm")
+        for name, number in (("rpm", rpm), ("tpm", tpm)):
+            if number is not None and (not isinstance(number, int) or number <= 0):
+                raise RuntimeError(f"LLM_RATE_LIMITS[{key!r}].{name} must be a positive integer.")
+        limits[str(key)] = RateLimit(requests_per_minute=rpm, tokens_per_minute=tpm)
+    return limits
+
+
+_rate_limiter: Optional[LLMRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def rate_limiter_enabled() -> bool:
+    return os.getenv("LLM_RATE_LIMITER_ENABLED", "true").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def get_rate_limiter() -> LLMRateLimiter:
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = LLMRateLimiter(_load_limits_from_env())
+        return _rate_limiter
+
+
+def reset_rate_limiter() -> None:
+    global _rate_limiter
+    with _rate_limiter_lock:
+        _rate_limiter = None
+
+
+def rate_limit_response_hook(response: Any) -> None:
+    """httpx response event hook installed on the pooled provider clients (app.llm.client_pool)."""
+    observe_rate_limit_response(response.status_code, response.headers)
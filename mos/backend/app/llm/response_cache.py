@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+_CACHE_KEY_VERSION = "v1"
+_DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+def llm_request_hash(*, provider: str, model: str, prompt: str, request: Mapping[str, Any]) -> str:
+    """
+    sha256 of the provider, model, prompt and every output-affecting request parameter.
+
+    `request` holds the LLMGenerationParams fields that change the output (temperature, token
+    budget, reasoning, tools, response format, ...); callbacks and resume ids are left out.
+    """
+    canonical = json.dumps(
+        {"v": _CACHE_KEY_VERSION, "provider": provider, "model": model, "prompt": prompt, "request": request},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedLLMResponse:
+    key: str
+    text: str
+    cached_at: datetime
+
+
+class LLMCacheBackend(Protocol):
+    def get(self, key: str, *, now: datetime) -> Optional[CachedLLMResponse]: ...
+
+    def put(
+        self,
+        key: str,
+        *,
+        provider: str,
+        model: str,
+        text: str,
+        now: datetime,
+        expires_at: datetime,
+    ) -> None: ...
+
+
+class DiskLLMCacheBackend:
+    """Gzipped JSON entries under `<root>/<sha[:2]>/<sha>.json.gz`, written atomically via rename."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json.gz"
+
+    def get(self, key: str, *, now: datetime) -> Optional[CachedLLMResponse]:
+        try:
+            data = self.path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        entry = json.loads(gzip.decompress(data))
+        if datetime.fromisoformat(str(entry["expires_at"])) <= now:
+            return None
+        return CachedLLMResponse(
+            key=key,
+            text=str(entry["text"]),
+            cached_at=datetime.fromisoformat(str(entry["cached_at"])),
+        )
+
+    def put(
+        self,
+        key: str,
+        *,
+        provider: str,
+        model: str,
+        text: str,
+        now: datetime,
+        expires_at: datetime,
+    ) -> None:
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "provider": provider,
+            "model": model,
+            "text": text,
+            "cached_at": now.isoformat(),
+            "expires_at": expires_at.isoformat(),
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(gzip.compress(json.dumps(entry, ensure_ascii=False).encode("utf-8")))
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+
+class PostgresLLMCacheBackend:
+    """Rows in llm_response_cache; shared by every worker that talks to the same database."""
+
+    def __init__(self, session_factory: Optional[Callable[[], Any]] = None) -> None:
+        if session_factory is None:
+            from app.db.base import SessionLocal
+
+            session_factory = SessionLocal
+        self._session_factory = session_factory
+
+    def get(self, key: str, *, now: datetime) -> Optional[CachedLLMResponse]:
+        from sqlalchemy import update
+
+        from app.db.models import LLMResponseCacheEntry
+
+        session = self._session_factory()
+        try:
+            row = session.execute(
+                update(LLMResponseCacheEntry)
+                .where(LLMResponseCacheEntry.cache_key == key, LLMResponseCacheEntry.expires_at > now)
+                .values(hit_count=LLMResponseCacheEntry.hit_count + 1)
+                .returning(LLMResponseCacheEntry.response_text, LLMResponseCacheEntry.created_at)
+            ).first()
+            session.commit()
+        finally:
+            session.close()
+        if row is None:
+            return None
+        return CachedLLMResponse(key=key, text=row[0], cached_at=row[1])
+
+    def put(
+        self,
+        key: str,
+        *,
+        provider: str,
+        model: str,
+        text: str,
+        now: datetime,
+        expires_at: datetime,
+    ) -> None:
+        from sqlalchemy.dialects.postgresql import insert
+
+        from app.db.models import LLMResponseCacheEntry
+
+        stmt = insert(LLMResponseCacheEntry).values(
+            cache_key=key,
+            provider=provider,
+            model=model,
+            response_text=text,
+            created_at=now,
+            expires_at=expires_at,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LLMResponseCacheEntry.cache_key],
+            set_={
+                "response_text": stmt.excluded.response_text,
+                "created_at": stmt.excluded.created_at,
+                "expires_at": stmt.excluded.expires_at,
+                "hit_count": 0,
+            },
+        )
+        session = self._session_factory()
+        try:
+            session.execute(stmt)
+            session.commit()
+        finally:
+            session.close()
+
+
+class LLMResponseCache:
+    """
+    Opt-in memo of generate_text outputs keyed by llm_request_hash.
+
+    Backend failures never fail a call: a failed read counts as an error and a miss, a failed write
+    is logged and dropped. Counters are process-local and exposed through `stats()`.
+    """
+
+    def __init__(
+        self,
+        backend: LLMCacheBackend,
+        *,
+        ttl_seconds: int = _DEFAULT_TTL_SECONDS,
+        clock: Optional[Callable[[], datetime]] = None,
+    ) -> None:
+        self.backend = backend
+        self.ttl_seconds = max(1, int(ttl_seconds))
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def get(self, key: str) -> Optional[CachedLLMResponse]:
+        try:
+            cached = self.backend.get(key, now=self._clock())
+        except Exception:  # noqa: BLE001
+            logger.warning("llm_response_cache_read_failed", extra={"cache_key": key}, exc_info=True)
+            self._count("errors")
+            cached = None
+        self._count("hits" if cached is not None else "misses")
+        return cached
+
+    def put(self, key: str, *, provider: str, model: str, text: str, ttl_seconds: Optional[int] = None) -> None:
+        now = self._clock()
+        ttl = self.ttl_seconds if ttl_seconds is None else max(1, int(ttl_seconds))
+        try:
+            self.backend.put(
+                key,
+                provider=provider,
+                model=model,
+                text=text,
+                now=now,
+                expires_at=now + timedelta(seconds=ttl),
+            )
+        except Exception:  # noqa: BLE001
+            logger.warning("llm_response_cache_write_failed", extra={"cache_key": key}, exc_info=True)
+            self._count("errors")
+            return
+        self._count("stores")
+
+
+def _build_cache_from_env() -> Optional[LLMResponseCache]:
+    backend_name = (os.getenv("LLM_RESPONSE_CACHE_BACKEND") or "").strip().lower()
+    if backend_name in {"", "off", "none", "false"}:
+        return None
+    raw_ttl = os.getenv("LLM_RESPONSE_CACHE_TTL_SECONDS")
+    try:
+        ttl_seconds = int(raw_ttl) if raw_ttl and raw_ttl.strip() else _DEFAULT_TTL_SECONDS
+    except ValueError as exc:
+        raise RuntimeError(f"LLM_RESPONSE_CACHE_TTL_SECONDS must be an integer, got {raw_ttl!r}.") from exc
+    if ttl_seconds <= 0:
+        raise RuntimeError(f"LLM_RESPONSE_CACHE_TTL_SECONDS must be > 0, got {ttl_seconds}.")
+    if backend_name == "disk":
+        root = os.getenv("LLM_RESPONSE_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "mos-llm-cache")
+        return LLMResponseCache(DiskLLMCacheBackend(root), ttl_seconds=ttl_seconds)
+    if backend_name == "postgres":
+        return LLMResponseCache(PostgresLLMCacheBackend(), ttl_seconds=ttl_seconds)
+    raise RuntimeError(
+        f"LLM_RESPONSE_CACHE_BACKEND must be one of 'disk', 'postgres' or empty, got {backend_name!r}."
+    )
+
+
+_response_cache: Optional[LLMResponseCache] = None
+_response_cache_loaded = False
+_response_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """Process-wide cache configured by LLM_RESPONSE_CACHE_BACKEND; None when caching is off."""
+    global _response_cache, _response_cache_loaded
+    with _response_cache_lock:
+        if not _response_cache_loaded:
+            _response_cache = _build_cache_from_env()
+            _response_cache_loaded = True
+        return _response_cache
+
+
+def set_llm_response_cache(cache: Optional[LLMResponseCache]) -> None:
+    """Install (or clear, with None) the process-wide cache; mainly for tests and scripts."""
+    global _response_cache, _response_cache_loaded
+    with _response_cache_lock:
+        _response_cache = cache
+        _response_cache_loaded = True
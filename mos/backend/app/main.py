@@ -32,6 +32,7 @@ from app.routers import (
     deep_research,
     experiments,
     openai_webhooks,
+    apify_webhooks,
     stripe_webhooks,
     swipes,
     teardowns,
@@ -164,6 +165,7 @@ def create_app() -> FastAPI:
     app.include_router(workflows.router)
     app.include_router(deep_research.router)
     app.include_router(openai_webhooks.router)
+    app.include_router(apify_webhooks.router)
     app.include_router(stripe_webhooks.router)
     app.include_router(claude.router)
     app.include_router(gemini.router)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import hmac
+from datetime import timedelta
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Request, status
+
+from app.config import settings
+from app.temporal.client import get_temporal_client
+from app.temporal.workflows.apify_runs import (
+    APIFY_RUN_FINISHED_SIGNAL,
+    ApifyRunCompletionInput,
+    ApifyRunCompletionWorkflow,
+    apify_run_workflow_id,
+)
+
+router = APIRouter(prefix="/api/apify", tags=["apify"])
+
+
+def _run_id_from_payload(payload: dict[str, Any]) -> str | None:
+    resource = payload.get("resource") if isinstance(payload.get("resource"), dict) else {}
+    event_data = payload.get("eventData") if isinstance(payload.get("eventData"), dict) else {}
+    run_id = resource.get("id") or event_data.get("actorRunId")
+    return str(run_id) if run_id else None
+
+
+@router.post("/webhook")
+async def apify_webhook(request: Request):
+    webhook_secret = settings.APIFY_WEBHOOK_SECRET
+    if not webhook_secret:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="APIFY_WEBHOOK_SECRET not configured",
+        )
+    provided = request.headers.get("x-apify-webhook-secret") or ""
+    if not hmac.compare_digest(provided.encode("utf-8"), webhook_secret.encode("utf-8")):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Apify webhook secret")
+
+    try:
+        payload = await request.json()
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON payload") from exc
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Webhook payload must be an object")
+    run_id = _run_id_from_payload(payload)
+    if not run_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Webhook payload is missing the run id")
+
+    # Signal-with-start: wakes the waiter if it is already running, otherwise records the result for it.
+    max_wait_seconds = settings.STRATEGY_V2_APIFY_MAX_WAIT_SECONDS
+    client = await get_temporal_client()
+    await client.start_workflow(
+        ApifyRunCompletionWorkflow.run,
+        ApifyRunCompletionInput(run_id=run_id, max_wait_seconds=max_wait_seconds),
+        id=apify_run_workflow_id(run_id),
+        task_queue=settings.TEMPORAL_TASK_QUEUE,
+        execution_timeout=timedelta(seconds=max_wait_seconds, minutes=10),
+        start_signal=APIFY_RUN_FINISHED_SIGNAL,
+        start_signal_args=[payload],
+    )
+    return {"ok": True, "run_id": run_id, "event_type": payload.get("eventType")}
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
+import base64
 from collections import defaultdict
+from decimal import Decimal
 from functools import lru_cache
-from datetime import date
+from datetime import date, datetime
+import json
 import re
 from typing import Any
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import func, literal, or_, select
+from sqlalchemy import and_, false, func, literal, or_, select
 from sqlalchemy.orm import Session
 
 from app.auth.dependencies import AuthContext, get_current_user
+from app.config import settings
 from app.db.deps import get_session
 from app.db.enums import AdChannelEnum, AdStatusEnum, MediaAssetTypeEnum
 from app.db.models import (
@@ -20,12 +25,14 @@ from app.db.models import (
     AdAssetLink,
     AdScore,
     Brand,
+    BrandAdStats,
     BrandUserPreference,
     MediaAsset,
     ResearchRun,
     ResearchRunBrand,
 )
 from app.db.repositories.ads import AdsRepository
+from app.services.explore_search import ad_copy_matches, parse_search_query, search_ads, search_brands
 from app.services.media_storage import MediaStorage
 
 router = APIRouter(prefix="/explore", tags=["explore"])
@@ -99,33 +106,9 @@ def explore_brands(
         filters.append(Brand.id.in_(scoped_brand_ids))
     if not include_hidden and hidden_brand_ids:
         filters.append(~Brand.id.in_(hidden_brand_ids))
-    if q:
-        pattern = f"%{q}%"
-        filters.append(
-            or_(
-                Brand.canonical_name.ilike(pattern),
-                Brand.normalized_name.ilike(pattern),
-                Brand.primary_domain.ilike(pattern),
-                Brand.primary_website_url.ilike(pattern),
-            )
-        )
-
-    brand_stats = (
-        select(
-            Ad.brand_id.label("brand_id"),
-            func.count().label("ad_count"),
-            func.count().filter(Ad.ad_status == AdStatusEnum.active).label("active_count"),
-            func.count().filter(Ad.ad_status == AdStatusEnum.inactive).label("inactive_count"),
-            func.count().filter(Ad.ad_status == AdStatusEnum.unknown).label("unknown_count"),
-            func.max(Ad.last_seen_at).label("last_seen_at"),
-            func.min(Ad.first_seen_at).label("first_seen_at"),
-            func.array_agg(func.distinct(Ad.channel)).label("channels"),
-        )
-        .join(Brand, Brand.id == Ad.brand_id)
-        .where(*filters)
-        .group_by(Ad.brand_id)
-        .subquery()
-    )
+    if q and q.strip():
+        # brands.search_text is the lowercased name/domain/website, covered by a trigram index.
+        filters.append(Brand.search_text.contains(" ".join(q.split()).lower(), autoescape=True))
 
     hidden_expr = Brand.id.in_(hidden_brand_ids) if hidden_brand_ids else literal(False)
 
@@ -135,17 +118,20 @@ def explore_brands(
             Brand.canonical_name.label("brand_name"),
             Brand.primary_domain.label("primary_domain"),
             Brand.primary_website_url.label("primary_website_url"),
-            func.coalesce(brand_stats.c.ad_count, 0).label("ad_count"),
-            func.coalesce(brand_stats.c.active_count, 0).label("active_count"),
-            func.coalesce(brand_stats.c.inactive_count, 0).label("inactive_count"),
-            func.coalesce(brand_stats.c.unknown_count, 0).label("unknown_count"),
-            brand_stats.c.channels.label("channels"),
-            brand_stats.c.first_seen_at.label("first_seen_at"),
-            brand_stats.c.last_seen_at.label("last_seen_at"),
+            func.coalesce(BrandAdStats.ad_count, 0).label("ad_count"),
+            func.coalesce(BrandAdStats.active_count, 0).label("active_count"),
+            func.coalesce(BrandAdStats.inactive_count, 0).label("inactive_count"),
+            func.coalesce(BrandAdStats.unknown_count, 0).label("unknown_count"),
+            func.coalesce(BrandAdStats.creative_count, 0).label("creative_count"),
+            BrandAdStats.channels.label("channels"),
+            BrandAdStats.first_seen_at.label("first_seen_at"),
+            BrandAdStats.last_seen_at.label("last_seen_at"),
             hidden_expr.label("hidden"),
         )
         .select_from(Brand)
-        .outerjoin(brand_stats, brand_stats.c.brand_id == Brand.id)
+        # Aggregates come from the brand_ad_stats rollup (refreshed on ingest) so listing cost
+        # scales with the number of brands rather than ads.
+        .outerjoin(BrandAdStats, BrandAdStats.brand_id == Brand.id)
         .where(*filters)
     )
 
@@ -156,17 +142,17 @@ def explore_brands(
         return col.desc().nulls_last() if desc_first else col.asc().nulls_last()
 
     if sort in ("ad_count", "ads"):
-        order_expr = order(brand_stats.c.ad_count)
+        order_expr = order(BrandAdStats.ad_count)
     elif sort in ("active", "active_count"):
-        order_expr = order(brand_stats.c.active_count)
+        order_expr = order(BrandAdStats.active_count)
     elif sort in ("first_seen", "first_seen_at"):
-        order_expr = order(brand_stats.c.first_seen_at)
+        order_expr = order(BrandAdStats.first_seen_at)
     elif sort == "name":
         order_expr = order(Brand.canonical_name)
     else:
-        order_expr = order(brand_stats.c.last_seen_at)
+        order_expr = order(BrandAdStats.last_seen_at)
 
-    total_count = session.execute(select(func.count()).select_from(base_query.subquery())).scalar_one()
+    total_count = session.execute(select(func.count()).select_from(Brand).where(*filters)).scalar_one()
 
     rows = (
         session.execute(
@@ -187,6 +173,7 @@ def explore_brands(
                 "active_count": row.active_count or 0,
                 "inactive_count": row.inactive_count or 0,
                 "unknown_count": row.unknown_count or 0,
+                "creative_count": row.creative_count or 0,
                 "channels": channels,
                 "first_seen_at": row.first_seen_at.isoformat() if row.first_seen_at else None,
                 "last_seen_at": row.last_seen_at.isoformat() if row.last_seen_at else None,
@@ -197,7 +184,7 @@ def explore_brands(
     return jsonable_encoder({"items": items, "count": total_count, "limit": limit, "offset": offset})
 
 
-def _order_clauses(
+def _sort_keys(
     sort: str,
     direction: str,
     *,
@@ -210,16 +197,14 @@ def _order_clauses(
     performance_col=None,
     winning_col=None,
     confidence_col=None,
-):
+) -> list[tuple[Any, bool]]:
+    """Ordered (column, descending) pairs for an explore sort; every column sorts NULLS LAST."""
     direction = (direction or "desc").lower()
     desc_first = direction != "asc"
 
-    def apply(col):
-        return col.desc().nulls_last() if desc_first else col.asc().nulls_last()
-
-    clauses = []
+    keys: list[tuple[Any, bool]] = []
     if has_media_col is not None:
-        clauses.append(has_media_col.desc().nulls_last())
+        keys.append((has_media_col, True))
     if sort in ("performance_score", "performance"):
         primary = performance_col or last_seen_col
     elif sort in ("winning_score", "winning"):
@@ -234,8 +219,100 @@ def _order_clauses(
         primary = started_col
     else:
         primary = last_seen_col
-    clauses.extend([apply(primary), apply(last_seen_col), apply(ad_id_col)])
-    return clauses
+    keys.append((primary, desc_first))
+    if primary is not last_seen_col:
+        keys.append((last_seen_col, desc_first))
+    keys.append((ad_id_col, desc_first))
+    return keys
+
+
+def _order_clauses(keys: list[tuple[Any, bool]]):
+    return [col.desc().nulls_last() if descending else col.asc().nulls_last() for col, descending in keys]
+
+
+def _is_not_null(col: Any) -> bool:
+    return getattr(getattr(col, "expression", col), "nullable", True) is False
+
+
+def _keyset_after(keys: list[tuple[Any, bool]], values: list[Any]):
+    """
+    Predicate selecting rows strictly after `values` in the (col, descending) NULLS LAST ordering.
+
+    Expands the row comparison lexicographically because mixed directions and NULLS LAST
+    cannot be expressed as a single tuple comparison. The leading key is also bounded on its
+    own so an index led by that column can start the scan at the cursor instead of filtering
+    every earlier row.
+    """
+    if not keys:
+        return false()
+    lead_col, lead_descending = keys[0]
+    lead_value = values[0]
+    if lead_value is None:
+        lead_bound = lead_col.is_(None)
+    else:
+        lead_bound = lead_col <= lead_value if lead_descending else lead_col >= lead_value
+        if not _is_not_null(lead_col):
+            lead_bound = or_(lead_bound, lead_col.is_(None))
+
+    branches = []
+    equal_prefix: list[Any] = []
+    for (col, descending), value in zip(keys, values, strict=True):
+        if value is None:
+            # NULLs sort last, so nothing is strictly after a NULL in this column.
+            after = false()
+            same = col.is_(None)
+        else:
+            after = or_(col < value if descending else col > value, col.is_(None))
+            same = col == value
+        branches.append(and_(*equal_prefix, after))
+        equal_prefix.append(same)
+    return and_(lead_bound, or_(*branches))
+
+
+def _encode_cursor_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    return value
+
+
+def _decode_cursor_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "n" in value:
+            return Decimal(value["n"])
+        if "u" in value:
+            return UUID(value["u"])
+    return value
+
+
+def _encode_cursor(*, sort: str, direction: str, values: list[Any]) -> str:
+    payload = {"s": sort, "d": direction, "v": [_encode_cursor_value(value) for value in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, *, sort: str, direction: str, key_count: int) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = [_decode_cursor_value(value) for value in payload["v"]]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+    if payload.get("s") != sort or payload.get("d") != direction or len(values) != key_count:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not match the requested sort; restart pagination without a cursor",
+        )
+    return values
 
 
 def _serialize_media_rows(ad_id: str, media_rows: list[tuple[MediaAsset, str | None]]) -> list[dict[str, Any]]:
@@ -253,8 +330,13 @@ def _serialize_media_rows(ad_id: str, media_rows: list[tuple[MediaAsset, str | N
         media_key = getattr(media, "storage_key", None)
         preview_bucket = getattr(media, "preview_bucket", None) or getattr(media, "bucket", None) or storage.preview_bucket
         media_bucket = getattr(media, "bucket", None) or storage.bucket
-        preview_url = storage.presign_get(bucket=preview_bucket, key=preview_key) if preview_key else None
-        media_url = storage.presign_get(bucket=media_bucket, key=media_key) if media_key else None
+        preview_url = None
+        if preview_key:
+            # Generated previews are content-addressed and immutable, so a CDN URL can skip signing.
+            if preview_key == getattr(media, "preview_storage_key", None):
+                preview_url = storage.public_preview_url(bucket=preview_bucket, key=preview_key)
+            preview_url = preview_url or storage.presign_get_cached(bucket=preview_bucket, key=preview_key)
+        media_url = storage.presign_get_cached(bucket=media_bucket, key=media_key) if media_key else None
         mirror_status_raw = getattr(media, "mirror_status", None)
         mirror_status = (
             getattr(mirror_status_raw, "value", None)
@@ -429,12 +511,36 @@ def explore_ads(
     limit_per_brand: int | None = Query(default=None, ge=1, le=50),
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None),
+    include_count: bool = Query(default=True, alias="includeCount"),
+    score_version: str | None = Query(default=None, alias="scoreVersion"),
     sort: str = Query(default="last_seen"),
     direction: str = Query(default="desc"),
     auth: AuthContext = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
+    """
+    List ads for the explore grid.
+
+    Pass the returned `next_cursor` as `cursor` to page with a keyset predicate instead of
+    OFFSET (`offset` is ignored when a cursor is given). Set `includeCount=false` to skip the
+    total count query; `has_more` still reports whether another page exists. `scoreVersion`
+    ranks and annotates with a stored shadow score version instead of the live one.
+    """
     repo = AdsRepository(session)
+    score_version = score_version or settings.AD_SCORE_LIVE_VERSION
+
+    def _empty_response() -> dict[str, Any]:
+        return jsonable_encoder(
+            {
+                "items": [],
+                "count": 0 if include_count else None,
+                "limit": limit,
+                "offset": offset,
+                "next_cursor": None,
+                "has_more": False,
+            }
+        )
 
     scoped_brand_ids: set[str] | None = None
     run: ResearchRun | None = None
@@ -454,7 +560,7 @@ def explore_ads(
             product_id=product_id,
         )
         if not run:
-            return jsonable_encoder({"items": [], "count": 0, "limit": limit, "offset": offset})
+            return _empty_response()
 
     if run:
         scoped_brand_ids = {
@@ -464,7 +570,7 @@ def explore_ads(
             ).all()
         }
         if not scoped_brand_ids:
-            return jsonable_encoder({"items": [], "count": 0, "limit": limit, "offset": offset})
+            return _empty_response()
 
     hidden_brand_ids = {
         str(row[0])
@@ -484,16 +590,9 @@ def explore_ads(
         filters.append(~Ad.brand_id.in_(hidden_brand_ids))
     if brand_ids:
         filters.append(Ad.brand_id.in_(brand_ids))
-    if q:
-        pattern = f"%{q}%"
-        filters.append(
-            or_(
-                Ad.headline.ilike(pattern),
-                Ad.body_text.ilike(pattern),
-                Ad.destination_domain.ilike(pattern),
-                Brand.canonical_name.ilike(pattern),
-            )
-        )
+    search_query = parse_search_query(q)
+    if search_query is not None:
+        filters.append(ad_copy_matches(search_query))
     if channels:
         filters.append(Ad.channel.in_(channels))
     if status:
@@ -529,32 +628,9 @@ def explore_ads(
     if max_video_length is not None:
         filters.append(AdFacts.video_length_seconds <= max_video_length)
 
-    media_counts = (
-        select(AdAssetLink.ad_id, func.count().label("media_count"))
-        .group_by(AdAssetLink.ad_id)
-        .subquery()
-    )
-    media_count_col = func.coalesce(media_counts.c.media_count, 0)
-
-    base_columns = [
-        Ad.id.label("ad_id"),
-        Ad.brand_id.label("brand_id"),
-        Ad.last_seen_at.label("last_seen_at"),
-        Ad.started_running_at.label("started_running_at"),
-        Ad.first_seen_at.label("first_seen_at"),
-        Ad.ended_running_at.label("ended_running_at"),
-        AdFacts.start_date.label("fact_start_date"),
-        AdFacts.days_active.label("fact_days_active"),
-        media_count_col.label("media_count"),
-        AdScore.performance_score.label("performance_score"),
-        AdScore.performance_stars.label("performance_stars"),
-        AdScore.winning_score.label("winning_score"),
-        AdScore.confidence.label("score_confidence"),
-        AdScore.score_breakdown.label("score_breakdown"),
-        AdScore.score_version.label("score_version"),
-    ]
-
-    order_exprs_base = _order_clauses(
+    # Every sort key is a stored column (ads.media_count is maintained on link writes), so the
+    # default orders are served by the idx_ads_explore_* composite indexes on ads.
+    keys = _sort_keys(
         sort,
         direction,
         last_seen_col=Ad.last_seen_at,
@@ -562,62 +638,61 @@ def explore_ads(
         days_active_col=AdFacts.days_active,
         started_col=Ad.started_running_at,
         ad_id_col=Ad.id,
-        has_media_col=media_count_col,
+        has_media_col=Ad.media_count,
         performance_col=AdScore.performance_score,
         winning_col=AdScore.winning_score,
         confidence_col=AdScore.confidence,
     )
 
-    base_select = (
-        select(*base_columns)
+    filtered = (
+        select(Ad.id.label("ad_id"))
         .join(AdFacts, AdFacts.ad_id == Ad.id)
         .join(Brand, Brand.id == Ad.brand_id)
-        .outerjoin(media_counts, media_counts.c.ad_id == Ad.id)
-        .outerjoin(AdScore, AdScore.ad_id == Ad.id)
+        .outerjoin(AdScore, (AdScore.ad_id == Ad.id) & (AdScore.score_version == score_version))
         .where(*filters)
     )
 
     if limit_per_brand:
-        base_select = base_select.add_columns(
-            func.row_number()
-            .over(partition_by=Ad.brand_id, order_by=order_exprs_base)
-            .label("rn")
-        )
-
-    ranked = base_select.subquery()
-
-    filtered = select(ranked.c.ad_id).select_from(ranked)
-    if limit_per_brand:
-        filtered = filtered.where(ranked.c.rn <= limit_per_brand)
-
-    order_exprs_ranked = _order_clauses(
-        sort,
-        direction,
-        last_seen_col=ranked.c.last_seen_at,
-        start_date_col=ranked.c.fact_start_date,
-        days_active_col=ranked.c.fact_days_active,
-        started_col=ranked.c.started_running_at,
-        ad_id_col=ranked.c.ad_id,
-        has_media_col=ranked.c.media_count,
-        performance_col=ranked.c.performance_score,
-        winning_col=ranked.c.winning_score,
-        confidence_col=ranked.c.score_confidence,
+        # The per-brand cap is a window over the filtered set, so this path pages the ranked subquery.
+        ranked = filtered.add_columns(
+            *[col.label(f"sort_key_{idx}") for idx, (col, _) in enumerate(keys)],
+            func.row_number().over(partition_by=Ad.brand_id, order_by=_order_clauses(keys)).label("rn"),
+        ).subquery()
+        keys = [(ranked.c[f"sort_key_{idx}"], descending) for idx, (_, descending) in enumerate(keys)]
+        filtered = select(ranked.c.ad_id).where(ranked.c.rn <= limit_per_brand)
+
+    total_count: int | None = None
+    if include_count:
+        total_count = session.execute(
+            select(func.count()).select_from(filtered.subquery())
+        ).scalar_one()
+
+    page_query = filtered.add_columns(*[col for col, _ in keys]).order_by(*_order_clauses(keys))
+    if cursor:
+        cursor_values = _decode_cursor(cursor, sort=sort, direction=direction, key_count=len(keys))
+        page_query = page_query.where(_keyset_after(keys, cursor_values))
+    else:
+        page_query = page_query.offset(offset)
+    # Fetch one extra row to learn whether another page exists without counting.
+    id_rows = session.execute(page_query.limit(limit + 1)).all()
+    has_more = len(id_rows) > limit
+    id_rows = id_rows[:limit]
+    next_cursor = (
+        _encode_cursor(sort=sort, direction=direction, values=list(id_rows[-1][1:]))
+        if has_more and id_rows
+        else None
     )
-
-    total_count = session.execute(
-        select(func.count()).select_from(filtered.subquery())
-    ).scalar_one()
-
-    id_rows = session.execute(
-        filtered.order_by(*order_exprs_ranked).limit(limit).offset(offset)
-    ).all()
     ad_ids = [str(row[0]) for row in id_rows]
     if not ad_ids:
-        return jsonable_encoder({"items": [], "count": 0, "limit": limit, "offset": offset})
+        return _empty_response()
 
     ads = session.query(Ad).filter(Ad.id.in_(ad_ids)).all()
     facts = session.query(AdFacts).filter(AdFacts.ad_id.in_(ad_ids)).all()
-    scores = session.query(AdScore).filter(AdScore.ad_id.in_(ad_ids)).all()
+    scores = (
+        session.query(AdScore)
+        .filter(AdScore.ad_id.in_(ad_ids), AdScore.score_version == score_version)
+        .all()
+    )
     brands = session.query(Brand).filter(Brand.id.in_({ad.brand_id for ad in ads})).all()
 
     media_rows = (
@@ -687,7 +762,77 @@ def explore_ads(
             }
         )
 
-    return jsonable_encoder({"items": results, "count": total_count, "limit": limit, "offset": offset})
+    return jsonable_encoder(
+        {
+            "items": results,
+            "count": total_count,
+            "limit": limit,
+            "offset": offset,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        }
+    )
+
+
+@router.get("/search")
+def explore_search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: list[str] = Query(default_factory=lambda: ["brands", "ads"]),
+    channels: list[AdChannelEnum] = Query(default_factory=list),
+    brand_ids: list[str] = Query(default_factory=list, alias="brandIds"),
+    include_hidden: bool = Query(default=False, alias="includeHidden"),
+    limit: int = Query(default=20, ge=1, le=100),
+    auth: AuthContext = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """
+    Ranked search across brands (trigram similarity on name/domain) and ad copy (full-text).
+
+    Ad snippets are plain text with matched terms wrapped in `[[ ]]`.
+    """
+    query = parse_search_query(q)
+    requested = {value.strip().lower() for value in types if value and value.strip()}
+    unsupported = sorted(requested - {"brands", "ads"})
+    if unsupported:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported types values: {', '.join(unsupported)}. Allowed values: ads, brands",
+        )
+    if query is None:
+        return jsonable_encoder({"query": q, "brands": [], "ads": []})
+
+    hidden_brand_ids: list[str] = []
+    if not include_hidden:
+        hidden_brand_ids = [
+            str(row[0])
+            for row in session.execute(
+                select(BrandUserPreference.brand_id).where(
+                    BrandUserPreference.org_id == auth.org_id,
+                    BrandUserPreference.user_external_id == auth.user_id,
+                    BrandUserPreference.hidden.is_(True),
+                )
+            ).all()
+        ]
+
+    brands = (
+        search_brands(session, org_id=auth.org_id, query=query, limit=limit, exclude_brand_ids=hidden_brand_ids)
+        if "brands" in requested
+        else []
+    )
+    ads = (
+        search_ads(
+            session,
+            org_id=auth.org_id,
+            query=query,
+            limit=limit,
+            channels=channels,
+            brand_ids=brand_ids,
+            exclude_brand_ids=hidden_brand_ids,
+        )
+        if "ads" in requested
+        else []
+    )
+    return jsonable_encoder({"query": query.text, "brands": brands, "ads": ads})
 
 
 @router.post("/brands/{brand_id}/hide", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Iterable, Optional
+
+from app.ads.fingerprints import FINGERPRINT_ALGO
+from app.ads.partitions import run_in_worker_processes
+from app.config import settings
+from app.db.base import SessionLocal
+from app.db.repositories.ads import BACKFILL_STEPS, AdsRepository
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_job_key(steps: Iterable[str], *, org_id: Optional[str] = None, only_missing: bool = True) -> str:
+    """
+    Checkpoint key of a backfill run.
+
+    It embeds FINGERPRINT_ALGO and the live score version, so changing either starts a fresh job
+    instead of resuming one whose completed partitions were built by the previous algorithm.
+    """
+    steps = sorted(set(steps))
+    unknown = set(steps) - set(BACKFILL_STEPS)
+    if unknown or not steps:
+        raise ValueError(f"Unknown backfill steps: {sorted(unknown) or 'none given'}. Expected {BACKFILL_STEPS}.")
+    mode = "missing" if only_missing else "all"
+    return ":".join(
+        ["ads", "+".join(steps), mode, FINGERPRINT_ALGO, settings.AD_SCORE_LIVE_VERSION, org_id or "*"]
+    )
+
+
+def _backfill_partition(
+    job_key: str,
+    partition: int,
+    steps: tuple[str, ...],
+    org_id: Optional[str],
+    batch_size: int,
+    only_missing: bool,
+) -> dict[str, int]:
+    # Runs in a spawned worker process with its own engine/session.
+    session = SessionLocal()
+    try:
+        return AdsRepository(session).backfill_partition(
+            job_key=job_key,
+            partition=partition,
+            steps=steps,
+            org_id=org_id,
+            batch_size=batch_size,
+            only_missing=only_missing,
+        )
+    finally:
+        session.close()
+
+
+def run_backfill(
+    *,
+    steps: Iterable[str] = BACKFILL_STEPS,
+    org_id: Optional[str] = None,
+    workers: Optional[int] = None,
+    partition_size: int = 50_000,
+    batch_size: int = 500,
+    only_missing: bool = True,
+    restart: bool = False,
+    on_progress: Optional[Callable[[dict[str, Any]], None]] = None,
+) -> dict[str, Any]:
+    """
+    Rebuild creatives/memberships, facts and/or scores for every ad (or one org) in parallel.
+
+    The ad id space is split into partitions recorded in ad_backfill_checkpoints; worker processes
+    drain partitions in chunks of `batch_size` ads, each chunk a handful of set-based statements
+    committed together with its checkpoint. Re-running an interrupted job resumes its unfinished
+    partitions; re-running a finished one starts it over (see AdsRepository.start_backfill_job). With `only_missing` (the default) only ads lacking an output are touched, which after a
+    FINGERPRINT_ALGO bump means every ad whose creative was fingerprinted by the old algorithm.
+    """
+    steps = tuple(sorted(set(steps)))
+    job_key = backfill_job_key(steps, org_id=org_id, only_missing=only_missing)
+    workers = max(1, workers or settings.AD_BACKFILL_WORKERS)
+
+    session = SessionLocal()
+    try:
+        checkpoints = AdsRepository(session).start_backfill_job(
+            job_key=job_key,
+            org_id=org_id,
+            partition_size=partition_size,
+            restart=restart,
+        )
+        pending = [checkpoint.partition for checkpoint in checkpoints if checkpoint.completed_at is None]
+    finally:
+        session.close()
+
+    logger.info(
+        "ad_backfill.start",
+        extra={
+            "job_key": job_key,
+            "partitions": len(checkpoints),
+            "pending_partitions": len(pending),
+            "workers": workers,
+        },
+    )
+    processed = 0
+    completed = len(checkpoints) - len(pending)
+    calls = [(job_key, partition, steps, org_id, batch_size, only_missing) for partition in pending]
+    for stats in run_in_worker_processes(_backfill_partition, calls, workers=workers):
+        processed += stats["processed"]
+        completed += 1
+        if on_progress:
+            on_progress({"partitions_done": completed, "partitions": len(checkpoints), "processed": processed})
+
+    session = SessionLocal()
+    try:
+        repo = AdsRepository(session)
+        pruned = repo.prune_superseded_creatives(org_id=org_id) if "creatives" in steps else 0
+        # Creative counts and membership changes feed the explore brand rollup.
+        repo.refresh_brand_ad_stats(org_id=org_id)
+    finally:
+        session.close()
+
+    result = {
+        "job_key": job_key,
+        "partitions": len(checkpoints),
+        "resumed_partitions": len(checkpoints) - len(pending),
+        "processed": processed,
+        "creatives_pruned": pruned,
+    }
+    logger.info("ad_backfill.done", extra=result)
+    return result
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from app.ads.partitions import AdIdRange, partition_ranges, run_in_worker_processes
+from app.ads.score import get_scorer
+from app.config import settings
+from app.db.base import SessionLocal
+from app.db.repositories.ads import AdsRepository
+
+logger = logging.getLogger(__name__)
+
+def _score_partition(
+    version: str,
+    org_id: Optional[str],
+    id_range: AdIdRange,
+    batch_size: int,
+    as_of: datetime,
+) -> int:
+    # Runs in a spawned worker process: it opens its own engine/session and imports the scorer registry.
+    session = SessionLocal()
+    try:
+        return AdsRepository(session).score_ads_range(
+            version=version,
+            org_id=org_id,
+            after_ad_id=id_range[0],
+            through_ad_id=id_range[1],
+            batch_size=batch_size,
+            as_of=as_of,
+        )
+    finally:
+        session.close()
+
+
+def run_shadow_scoring(
+    *,
+    version: str,
+    org_id: Optional[str] = None,
+    workers: Optional[int] = None,
+    partition_size: int = 50_000,
+    batch_size: int = 5000,
+    as_of: Optional[datetime] = None,
+    on_progress: Optional[Callable[[dict[str, Any]], None]] = None,
+) -> dict[str, Any]:
+    """
+    Score the whole corpus (or one org) under a non-live `version`, writing its own ad_scores rows.
+
+    The ad id space is split into disjoint ranges scored by parallel worker processes, each writing
+    its batches with set-based upserts. Live-version rows are never read or locked, so explore keeps
+    serving while a candidate version is computed; compare the result with
+    AdsRepository.compare_score_versions.
+    """
+    scorer = get_scorer(version)
+    if scorer.version == settings.AD_SCORE_LIVE_VERSION:
+        raise ValueError(
+            f"{scorer.version} is the live score version; use AdsRepository.rescore_ad_scores to refresh it."
+        )
+    as_of = as_of or datetime.now(timezone.utc)
+    workers = max(1, workers or settings.AD_SCORE_SHADOW_WORKERS)
+
+    session = SessionLocal()
+    try:
+        bounds = AdsRepository(session).ad_id_partition_bounds(org_id=org_id, partition_size=partition_size)
+    finally:
+        session.close()
+    ranges = partition_ranges(bounds)
+
+    logger.info(
+        "ad_score_shadow.start",
+        extra={"version": scorer.version, "org_id": org_id, "partitions": len(ranges), "workers": workers},
+    )
+    scored = 0
+    completed = 0
+    calls = [(scorer.version, org_id, id_range, batch_size, as_of) for id_range in ranges]
+    for partition_scored in run_in_worker_processes(_score_partition, calls, workers=workers):
+        scored += partition_scored
+        completed += 1
+        if on_progress:
+            on_progress({"partitions_done": completed, "partitions": len(ranges), "scored": scored})
+
+    result = {"version": scorer.version, "org_id": org_id, "partitions": len(ranges), "scored": scored}
+    logger.info("ad_score_shadow.done", extra=result)
+    return result
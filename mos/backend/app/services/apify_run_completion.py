@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from temporalio.client import Client, WorkflowHandle
+from temporalio.common import WorkflowIDConflictPolicy, WorkflowIDReusePolicy
+from temporalio.exceptions import WorkflowAlreadyStartedError
+
+from app.ads.apify_client import completion_webhook
+from app.config import settings
+from app.temporal.workflows.apify_runs import (
+    ApifyRunCompletionInput,
+    ApifyRunCompletionWorkflow,
+    apify_run_workflow_id,
+)
+
+APIFY_WEBHOOK_PATH = "/api/apify/webhook"
+_TERMINAL_STATUSES = {"SUCCEEDED", "FAILED", "TIMED_OUT", "ABORTED"}
+# Headroom over max_wait for the workflow's fallback poll.
+_WORKFLOW_TIMEOUT_MARGIN = timedelta(minutes=10)
+
+# Blocking waiters share one event loop thread and one Temporal connection per process.
+_waiter_loop: Optional[asyncio.AbstractEventLoop] = None
+_waiter_loop_lock = threading.Lock()
+_waiter_client: Optional["asyncio.Future[Client]"] = None
+
+
+def webhook_completion_enabled() -> bool:
+    return bool(settings.APIFY_WEBHOOK_BASE_URL and settings.APIFY_WEBHOOK_SECRET)
+
+
+def completion_webhooks() -> Optional[List[Dict[str, Any]]]:
+    """Webhook specs to pass to ApifyClient.start_actor_run, or None when webhook completion is off."""
+    if not webhook_completion_enabled():
+        return None
+    base_url = str(settings.APIFY_WEBHOOK_BASE_URL).rstrip("/")
+    return [completion_webhook(f"{base_url}{APIFY_WEBHOOK_PATH}", secret=str(settings.APIFY_WEBHOOK_SECRET))]
+
+
+async def _completion_handle(client: Client, run_id: str, *, max_wait_seconds: int) -> WorkflowHandle:
+    workflow_id = apify_run_workflow_id(run_id)
+    try:
+        return await client.start_workflow(
+            ApifyRunCompletionWorkflow.run,
+            ApifyRunCompletionInput(run_id=run_id, max_wait_seconds=max_wait_seconds),
+            id=workflow_id,
+            task_queue=settings.TEMPORAL_TASK_QUEUE,
+            execution_timeout=timedelta(seconds=max_wait_seconds) + _WORKFLOW_TIMEOUT_MARGIN,
+            # Join an execution the webhook already started; a closed one already holds the result.
+            id_conflict_policy=WorkflowIDConflictPolicy.USE_EXISTING,
+            id_reuse_policy=WorkflowIDReusePolicy.REJECT_DUPLICATE,
+        )
+    except WorkflowAlreadyStartedError:
+        return client.get_workflow_handle(workflow_id)
+
+
+async def await_run_completion(client: Client, run_id: str, *, max_wait_seconds: int) -> Dict[str, Any]:
+    """Wait for `run_id` to finish via its completion workflow; raises TimeoutError like the poll loop."""
+    handle = await _completion_handle(client, run_id, max_wait_seconds=max_wait_seconds)
+    run = await handle.result()
+    status = str((run or {}).get("status") or "").upper()
+    if status not in _TERMINAL_STATUSES:
+        raise TimeoutError(f"Apify run {run_id} did not complete in time")
+    return run
+
+
+def _completion_loop() -> asyncio.AbstractEventLoop:
+    global _waiter_loop
+    with _waiter_loop_lock:
+        if _waiter_loop is None or _waiter_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="apify-run-completion", daemon=True).start()
+            _waiter_loop = loop
+        return _waiter_loop
+
+
+async def _shared_client() -> Client:
+    # Only ever awaited on the completion loop, so the check-and-set below cannot race.
+    global _waiter_client
+    if _waiter_client is None or (_waiter_client.done() and _waiter_client.exception() is not None):
+        _waiter_client = asyncio.ensure_future(
+            Client.connect(settings.TEMPORAL_ADDRESS, namespace=settings.TEMPORAL_NAMESPACE)
+        )
+    return await _waiter_client
+
+
+def wait_for_run_completion(
+    run_id: str,
+    *,
+    max_wait_seconds: int,
+    on_wait: Callable[[Dict[str, Any]], None] | None = None,
+    wait_interval_seconds: float = 5,
+) -> Dict[str, Any]:
+    """
+    Blocking form of await_run_completion for sync activities and their worker threads.
+
+    The wait runs as a coroutine on a process-wide completion loop with one shared Temporal client,
+    so concurrent waiters cost one gRPC connection instead of an event loop and connection each.
+    `on_wait` is called every `wait_interval_seconds` while the run is in flight, like
+    ApifyClient.poll_run_until_terminal's `on_poll`, so callers can keep heartbeating.
+    """
+
+    async def _wait() -> Dict[str, Any]:
+        client = await _shared_client()
+        return await await_run_completion(client, run_id, max_wait_seconds=max_wait_seconds)
+
+    future = asyncio.run_coroutine_threadsafe(_wait(), _completion_loop())
+    start = time.time()
+    while True:
+        done, _ = concurrent.futures.wait([future], timeout=wait_interval_seconds)
+        if done:
+            return future.result()
+        if on_wait is not None:
+            on_wait({"run_id": run_id, "status": "RUNNING", "elapsed_seconds": max(time.time() - start, 0.0)})
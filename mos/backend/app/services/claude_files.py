@@ -14,6 +14,7 @@ import httpx
 from app.db.base import session_scope
 from app.db.enums import ClaudeContextFileStatusEnum
 from app.db.repositories.claude_context_files import ClaudeContextFilesRepository
+from app.llm.prompt_cache import anthropic_cache_usage, anthropic_system
 from app.observability import start_langfuse_generation
 
 
@@ -385,6 +386,7 @@ def _extract_anthropic_usage_from_payload(payload: Any) -> Dict[str, int] | None
         usage_details["input"] = input_tokens
     if isinstance(output_tokens, int):
         usage_details["output"] = output_tokens
+    usage_details.update(anthropic_cache_usage(usage))
     return usage_details or None
 
 
@@ -546,7 +548,8 @@ def call_claude_structured_message(
         "output_format": {"type": "json_schema", "schema": safe_schema},
     }
     if system:
-        body["system"] = system
+        # Large system prompts become a cached block; see app.llm.prompt_cache.
+        body["system"] = anthropic_system(system)
 
     schema_json = json.dumps(safe_schema, ensure_ascii=False, sort_keys=True)
     schema_sha256 = hashlib.sha256(schema_json.encode("utf-8")).hexdigest()
@@ -778,6 +781,12 @@ def call_claude_structured_message(
                 "elapsed_seconds": elapsed_seconds,
                 "input_tokens": usage_details.get("input") if isinstance(usage_details, dict) else None,
                 "output_tokens": usage_details.get("output") if isinstance(usage_details, dict) else None,
+                "cache_read_input_tokens": (
+                    usage_details.get("cache_read_input_tokens") if isinstance(usage_details, dict) else None
+                ),
+                "cache_creation_input_tokens": (
+                    usage_details.get("cache_creation_input_tokens") if isinstance(usage_details, dict) else None
+                ),
                 "output_chars": len(text_content) if text_content else len(json.dumps(parsed, ensure_ascii=False)),
             },
         )
@@ -795,6 +804,9 @@ def call_claude_structured_message(
                 progress_payload["output_tokens"] = output_tokens
             if isinstance(input_tokens, int) and isinstance(output_tokens, int):
                 progress_payload["total_tokens"] = input_tokens + output_tokens
+            for cache_key in ("cache_read_input_tokens", "cache_creation_input_tokens"):
+                if isinstance(usage_details.get(cache_key), int):
+                    progress_payload[cache_key] = usage_details[cache_key]
         _emit_progress("completed", **progress_payload)
         if generation is not None:
             generation.update(
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import func, literal, literal_column, or_, select
+from sqlalchemy.orm import Session
+
+from app.db.enums import AdChannelEnum
+from app.db.models import Ad, Brand
+
+# Search columns are maintained by Postgres triggers (migration 0062): `brands.search_text` is
+# covered by a trigram GIN index, `ads.search_tsv` (weighted headline > body > CTA > domain) by a
+# tsvector GIN index.
+_TS_CONFIG = literal_column("'simple'::regconfig")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_MAX_QUERY_TOKENS = 8
+# Snippets are returned as plain text (ad copy is untrusted); matches are wrapped in [[ ]].
+_SNIPPET_OPTIONS = "MaxWords=30, MinWords=12, MaxFragments=2, StartSel=[[, StopSel=]]"
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    text: str
+    tokens: tuple[str, ...]
+
+    @property
+    def prefix_tsquery(self) -> str:
+        """`tok1:* & tok2:*` so the last word matches while it is still being typed."""
+        return " & ".join(f"{token}:*" for token in self.tokens)
+
+
+def parse_search_query(raw: str | None) -> Optional[SearchQuery]:
+    text = " ".join((raw or "").split()).lower()
+    tokens = tuple(dict.fromkeys(_TOKEN_RE.findall(text)))[:_MAX_QUERY_TOKENS]
+    if not tokens:
+        return None
+    return SearchQuery(text=text, tokens=tokens)
+
+
+def ad_copy_matches(query: SearchQuery) -> Any:
+    """Index-backed filter for ads whose copy (or brand name/domain) matches every query token."""
+    return or_(
+        Ad.search_tsv.op("@@")(func.to_tsquery(_TS_CONFIG, query.prefix_tsquery)),
+        Brand.search_text.contains(query.text, autoescape=True),
+    )
+
+
+def search_brands(
+    session: Session,
+    *,
+    org_id: str,
+    query: SearchQuery,
+    limit: int,
+    exclude_brand_ids: Sequence[str] = (),
+) -> list[dict[str, Any]]:
+    """Rank brands by trigram word-similarity of the query against name/domain/website."""
+    needle = literal(query.text)
+    score = func.word_similarity(needle, Brand.search_text)
+    stmt = (
+        select(
+            Brand.id,
+            Brand.canonical_name,
+            Brand.primary_domain,
+            Brand.primary_website_url,
+            score.label("score"),
+        )
+        .where(
+            Brand.org_id == org_id,
+            # Both operators are served by the gin_trgm_ops index.
+            or_(needle.op("<%")(Brand.search_text), Brand.search_text.contains(query.text, autoescape=True)),
+        )
+        .order_by(score.desc(), Brand.canonical_name.asc())
+        .limit(limit)
+    )
+    if exclude_brand_ids:
+        stmt = stmt.where(~Brand.id.in_(list(exclude_brand_ids)))
+    return [
+        {
+            "brand_id": str(row.id),
+            "brand_name": row.canonical_name,
+            "primary_domain": row.primary_domain,
+            "primary_website_url": row.primary_website_url,
+            "score": round(float(row.score or 0.0), 4),
+        }
+        for row in session.execute(stmt).all()
+    ]
+
+
+def search_ads(
+    session: Session,
+    *,
+    org_id: str,
+    query: SearchQuery,
+    limit: int,
+    channels: Sequence[AdChannelEnum] = (),
+    brand_ids: Sequence[str] = (),
+    exclude_brand_ids: Sequence[str] = (),
+) -> list[dict[str, Any]]:
+    """Rank ads by full-text match over copy (ts_rank_cd on the weighted tsvector) with highlighted snippets."""
+    tsquery = func.to_tsquery(_TS_CONFIG, query.prefix_tsquery)
+    rank = func.ts_rank_cd(Ad.search_tsv, tsquery)
+    ranked = (
+        select(
+            Ad.id.label("ad_id"),
+            Ad.brand_id.label("brand_id"),
+            Ad.channel.label("channel"),
+            Ad.headline.label("headline"),
+            Ad.body_text.label("body_text"),
+            Ad.destination_domain.label("destination_domain"),
+            Ad.last_seen_at.label("last_seen_at"),
+            rank.label("score"),
+        )
+        .join(Brand, Brand.id == Ad.brand_id)
+        .where(Brand.org_id == org_id, Ad.search_tsv.op("@@")(tsquery))
+        .order_by(rank.desc(), Ad.last_seen_at.desc().nulls_last(), Ad.id)
+        .limit(limit)
+    )
+    if channels:
+        ranked = ranked.where(Ad.channel.in_(list(channels)))
+    if brand_ids:
+        ranked = ranked.where(Ad.brand_id.in_(list(brand_ids)))
+    if exclude_brand_ids:
+        ranked = ranked.where(~Ad.brand_id.in_(list(exclude_brand_ids)))
+    top = ranked.subquery()
+
+    # Snippets are only generated for the page of winners, not every matching row.
+    snippet_source = func.concat_ws(" ", top.c.headline, top.c.body_text)
+    stmt = (
+        select(
+            top,
+            Brand.canonical_name.label("brand_name"),
+            func.ts_headline(
+                _TS_CONFIG,
+                snippet_source,
+                func.to_tsquery(_TS_CONFIG, query.prefix_tsquery),
+                _SNIPPET_OPTIONS,
+            ).label("snippet"),
+        )
+        .join(Brand, Brand.id == top.c.brand_id)
+        .order_by(top.c.score.desc(), top.c.last_seen_at.desc().nulls_last(), top.c.ad_id)
+    )
+    return [
+        {
+            "ad_id": str(row.ad_id),
+            "brand_id": str(row.brand_id),
+            "brand_name": row.brand_name,
+            "channel": getattr(row.channel, "value", str(row.channel)),
+            "headline": row.headline,
+            "destination_domain": row.destination_domain,
+            "snippet": row.snippet,
+            "last_seen_at": row.last_seen_at.isoformat() if row.last_seen_at else None,
+            "score": round(float(row.score or 0.0), 6),
+        }
+        for row in session.execute(stmt).all()
+    ]
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import concurrent.futures
 import hashlib
 import ipaddress
 import logging
 import mimetypes
+import os
 import socket
 import subprocess
 import shutil
@@ -11,9 +13,8 @@ import tempfile
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from io import BytesIO
-from pathlib import Path
-from typing import Optional, Sequence, Tuple
-from urllib.parse import urlparse
+from typing import Any, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
 import httpx
 from PIL import Image
@@ -22,26 +23,96 @@ from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
+from app.ads.near_duplicates import image_hashes
 from app.config import settings
 from app.db.enums import MediaAssetTypeEnum, MediaMirrorStatusEnum
-from app.db.models import AdAssetLink, MediaAsset
+from app.db.models import AdAssetLink, AdCreative, MediaAsset
+from app.db.repositories.ads import sync_ad_media_counts
 from app.services.media_storage import IMMUTABLE_CACHE_CONTROL, MediaStorage
 
 logger = logging.getLogger(__name__)
 
 
+# Network reads are copied to the spool file in chunks of this size.
+_DOWNLOAD_CHUNK_BYTES = 256 * 1024
+
+# Query params that only carry signatures/expiry; the same object is served regardless of them.
+_VOLATILE_QUERY_PARAMS = {
+    "oh",
+    "oe",
+    "ccb",
+    "efg",
+    "expires",
+    "signature",
+    "key-pair-id",
+    "policy",
+}
+_VOLATILE_QUERY_PREFIXES = ("_nc_", "x-amz-")
+
+# Facebook CDN occasionally rejects atypical UAs; use a common browser UA to reduce 403s.
+_REQUEST_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/123.0.0.0 Safari/537.36"
+    ),
+    "Accept": "*/*",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+def normalize_media_source_url(url: str) -> str:
+    """
+    Canonical form of a media URL for dedupe lookups.
+
+    Lowercases scheme/host, drops the fragment and signature/expiry params (Meta CDN `oh`/`oe`/`_nc_*`,
+    S3/CloudFront signing params) and sorts what remains, so re-signed links to the same object match.
+    """
+    parsed = urlparse(url.strip())
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key.lower() not in _VOLATILE_QUERY_PARAMS and not key.lower().startswith(_VOLATILE_QUERY_PREFIXES)
+    )
+    netloc = (parsed.hostname or "").lower()
+    if parsed.port:
+        netloc = f"{netloc}:{parsed.port}"
+    return urlunparse((parsed.scheme.lower(), netloc, parsed.path or "/", "", urlencode(query), ""))
+
+
+def _strong_etag(value: Optional[str]) -> Optional[str]:
+    # Weak validators only promise semantic equivalence, not identical bytes.
+    if not value or value.startswith("W/"):
+        return None
+    return value.strip() or None
+
+
 @dataclass
 class DownloadResult:
-    content: bytes
+    """A downloaded object spooled to a local temp file; callers must call `cleanup()`."""
+
+    path: str
     sha256: str
     content_type: Optional[str]
     size_bytes: int
     url: str
+    etag: Optional[str] = None
+
+    def cleanup(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
 
 
 class MediaMirrorService:
     """
     Download external media, push to Hetzner S3 (no delete), and persist keys on MediaAsset rows.
+
+    Media is streamed to a temp file while hashing and uploaded from disk, so memory stays
+    bounded by the chunk sizes rather than MEDIA_MIRROR_MAX_BYTES. Before downloading, the
+    asset is matched against already-mirrored rows by normalized source URL and (optionally)
+    by a HEAD request's ETag + content-length, so reused creatives are linked without a re-fetch.
     """
 
     def __init__(self, session: Session, storage: Optional[MediaStorage] = None) -> None:
@@ -50,6 +121,7 @@ class MediaMirrorService:
         self.max_bytes = int(settings.MEDIA_MIRROR_MAX_BYTES or 50 * 1024 * 1024)
         self.timeout_seconds = float(settings.MEDIA_MIRROR_TIMEOUT_SECONDS or 15.0)
         self.preview_dim = int(settings.MEDIA_MIRROR_PREVIEW_MAX_DIMENSION or 512)
+        self.head_dedupe = bool(settings.MEDIA_MIRROR_HEAD_DEDUPE)
 
     def mirror_assets(self, media_assets: Sequence[MediaAsset]) -> None:
         for asset in media_assets:
@@ -79,7 +151,15 @@ class MediaMirrorService:
             self.session.execute(stmt)
 
         self.session.execute(delete(AdAssetLink).where(AdAssetLink.media_asset_id == media.id))
+        # The FK is ON DELETE SET NULL; re-point creatives so clustering still finds their pHash.
+        self.session.execute(
+            update(AdCreative)
+            .where(AdCreative.primary_media_asset_id == media.id)
+            .values(primary_media_asset_id=existing.id)
+        )
         self.session.execute(delete(MediaAsset).where(MediaAsset.id == media.id))
+        # An ad linked to both rows just lost one link.
+        sync_ad_media_counts(self.session, [ad_id for ad_id, _ in link_rows])
         self.session.flush()
 
         if source_url and not existing.source_url:
@@ -102,7 +182,14 @@ class MediaMirrorService:
             self.session.flush()
             return media
 
+        normalized_url = normalize_media_source_url(media.source_url)
+        download: Optional[DownloadResult] = None
+        upload_future: Optional[concurrent.futures.Future[Any]] = None
         try:
+            known = self._find_mirrored_duplicate(media, normalized_url=normalized_url)
+            if known is not None:
+                return self._dedupe_media_asset(media, known)
+
             download = self._download(media.source_url)
             mime = download.content_type or self._guess_mime(media.source_url, media.asset_type)
             ext = self._guess_extension(mime)
@@ -120,24 +207,31 @@ class MediaMirrorService:
                     return media
 
             storage_key = self.storage.build_key(sha256=download.sha256, ext=ext, kind="orig")
-            if not self.storage.object_exists(bucket=self.storage.bucket, key=storage_key):
-                self.storage.upload_bytes(
+            preview_ext = "jpg"
+            candidate_preview_key = self.storage.build_key(sha256=download.sha256, ext=preview_ext, kind="prev")
+            orig_ref = (self.storage.bucket, storage_key)
+            preview_ref = (self.storage.preview_bucket, candidate_preview_key)
+            # One batched existence check for both objects instead of two sequential HEADs.
+            existing_objects = self.storage.objects_exist([orig_ref, preview_ref])
+            if not existing_objects[orig_ref]:
+                # Upload the original in the background while the preview is generated.
+                upload_future = self.storage.submit(
+                    self.storage.upload_file,
                     bucket=self.storage.bucket,
                     key=storage_key,
-                    data=download.content,
+                    path=download.path,
                     content_type=mime,
                     cache_control=IMMUTABLE_CACHE_CONTROL,
                 )
 
             preview_bytes: Optional[bytes] = None
-            preview_ext = "jpg"
             preview_size: Tuple[int, int] | None = None
             preview_kind = media.asset_type or MediaAssetTypeEnum.OTHER
 
             if preview_kind in (MediaAssetTypeEnum.IMAGE, MediaAssetTypeEnum.SCREENSHOT):
-                preview_bytes, preview_size = self._build_image_preview(download.content)
+                preview_bytes, preview_size = self._build_image_preview(download.path)
             elif preview_kind == MediaAssetTypeEnum.VIDEO:
-                preview_bytes, preview_size = self._build_video_preview(download.content)
+                preview_bytes, preview_size = self._build_video_preview(download.path)
                 # If ffmpeg isn't available (or fails), fall back to a provider-supplied thumbnail
                 # when present (e.g. Meta Ads Library `preview_url`).
                 if preview_bytes is None:
@@ -149,23 +243,23 @@ class MediaMirrorService:
                             thumb_url = candidate.strip()
                             break
                     if thumb_url:
+                        thumb_download: Optional[DownloadResult] = None
                         try:
                             thumb_download = self._download(thumb_url)
-                            preview_bytes, preview_size = self._build_image_preview(thumb_download.content)
+                            preview_bytes, preview_size = self._build_image_preview(thumb_download.path)
                         except Exception as exc:  # noqa: BLE001
                             logger.warning(
                                 "media_mirror.preview_thumbnail_failed",
                                 extra={"error": str(exc), "thumbnail_url": thumb_url},
                             )
+                        finally:
+                            if thumb_download is not None:
+                                thumb_download.cleanup()
 
             preview_key: Optional[str] = None
             if preview_bytes:
-                preview_key = self.storage.build_key(
-                    sha256=download.sha256,
-                    ext=preview_ext,
-                    kind="prev",
-                )
-                if not self.storage.object_exists(bucket=self.storage.preview_bucket, key=preview_key):
+                preview_key = candidate_preview_key
+                if not existing_objects[preview_ref]:
                     self.storage.upload_bytes(
                         bucket=self.storage.preview_bucket,
                         key=preview_key,
@@ -173,6 +267,9 @@ class MediaMirrorService:
                         content_type="image/jpeg",
                         cache_control=IMMUTABLE_CACHE_CONTROL,
                     )
+            if upload_future is not None:
+                upload_future.result()
+                upload_future = None
 
             status = MediaMirrorStatusEnum.succeeded
             error_msg = None
@@ -186,7 +283,14 @@ class MediaMirrorService:
                     status = MediaMirrorStatusEnum.partial
                     error_msg = "preview_generation_skipped"
 
+            # Perceptual hashes come from the small preview (a video's frame/thumbnail) for clustering.
+            hashes = image_hashes(preview_bytes) if preview_bytes and media.phash is None else None
+            if hashes:
+                media.phash, media.dhash = hashes
+
             media.sha256 = download.sha256
+            media.source_url_normalized = normalized_url
+            media.source_etag = media.source_etag or download.etag
             media.mime_type = media.mime_type or mime
             media.size_bytes = media.size_bytes or download.size_bytes
             if preview_size and not (media.width and media.height):
@@ -203,7 +307,11 @@ class MediaMirrorService:
         except IntegrityError as exc:
             # Handle races on sha256 uniqueness by reusing the existing asset.
             self.session.rollback()
-            existing = self.session.scalar(select(MediaAsset).where(MediaAsset.sha256 == download.sha256))
+            existing = (
+                self.session.scalar(select(MediaAsset).where(MediaAsset.sha256 == download.sha256))
+                if download is not None
+                else None
+            )
             if existing:
                 return self._dedupe_media_asset(media, existing)
             raise
@@ -223,9 +331,65 @@ class MediaMirrorService:
             media.mirrored_at = now
             self.session.add(media)
             self.session.flush()
+        finally:
+            if upload_future is not None:
+                # The upload reads the spooled file; let it finish before the file is removed.
+                concurrent.futures.wait([upload_future])
+            if download is not None:
+                download.cleanup()
         return media
 
-    def _download(self, url: str) -> DownloadResult:
+    def _mirrored_candidates(self, media: MediaAsset, *conditions: Any) -> Optional[MediaAsset]:
+        return self.session.scalar(
+            select(MediaAsset)
+            .where(
+                *conditions,
+                MediaAsset.id != media.id,
+                MediaAsset.sha256.is_not(None),
+                MediaAsset.storage_key.is_not(None),
+                MediaAsset.mirror_status.in_(
+                    [MediaMirrorStatusEnum.succeeded, MediaMirrorStatusEnum.partial]
+                ),
+            )
+            # Prefer rows that also have a preview.
+            .order_by((MediaAsset.mirror_status == MediaMirrorStatusEnum.succeeded).desc(), MediaAsset.created_at)
+            .limit(1)
+        )
+
+    def _find_mirrored_duplicate(self, media: MediaAsset, *, normalized_url: str) -> Optional[MediaAsset]:
+        """Find an already-mirrored asset with the same content without downloading the bytes."""
+        existing = self._mirrored_candidates(media, MediaAsset.source_url_normalized == normalized_url)
+        if existing is not None:
+            logger.info(
+                "media_mirror.dedupe_source_url",
+                extra={"media_asset_id": str(media.id), "existing_media_asset_id": str(existing.id)},
+            )
+            return existing
+        if not self.head_dedupe:
+            return None
+
+        try:
+            etag, content_length = self._head(media.source_url)
+        except Exception as exc:  # noqa: BLE001
+            # HEAD is only an optimisation; fall through to the normal download on any failure.
+            logger.info("media_mirror.head_failed", extra={"source_url": media.source_url, "error": str(exc)})
+            return None
+        if not etag or content_length is None:
+            return None
+        media.source_etag = etag
+        existing = self._mirrored_candidates(
+            media,
+            MediaAsset.source_etag == etag,
+            MediaAsset.size_bytes == content_length,
+        )
+        if existing is not None:
+            logger.info(
+                "media_mirror.dedupe_etag",
+                extra={"media_asset_id": str(media.id), "existing_media_asset_id": str(existing.id)},
+            )
+        return existing
+
+    def _validate_url(self, url: str) -> None:
         parsed = urlparse(url)
         if parsed.scheme not in ("http", "https"):
             raise RuntimeError("unsupported_scheme")
@@ -233,39 +397,57 @@ class MediaMirrorService:
             raise RuntimeError("invalid_url")
         self._assert_public_hostname(parsed.hostname)
 
+    def _head(self, url: str) -> tuple[Optional[str], Optional[int]]:
+        self._validate_url(url)
+        timeout = httpx.Timeout(self.timeout_seconds, read=self.timeout_seconds)
+        resp = httpx.head(url, headers=_REQUEST_HEADERS, follow_redirects=True, timeout=timeout)
+        resp.raise_for_status()
+        declared = resp.headers.get("content-length")
+        content_length = int(declared) if declared and declared.isdigit() else None
+        return _strong_etag(resp.headers.get("etag")), content_length
+
+    def _download(self, url: str) -> DownloadResult:
+        self._validate_url(url)
+
         timeout = httpx.Timeout(self.timeout_seconds, read=self.timeout_seconds)
-        # Facebook CDN occasionally rejects atypical UAs; use a common browser UA to reduce 403s.
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/123.0.0.0 Safari/537.36"
-            ),
-            "Accept": "*/*",
-            "Accept-Language": "en-US,en;q=0.9",
-        }
-        with httpx.stream("GET", url, headers=headers, follow_redirects=True, timeout=timeout) as resp:
-            resp.raise_for_status()
-            hasher = hashlib.sha256()
-            data = bytearray()
-            size = 0
-            for chunk in resp.iter_bytes():
-                size += len(chunk)
-                if size > self.max_bytes:
+        spool = tempfile.NamedTemporaryFile(prefix="media-mirror-", delete=False)
+        try:
+            with spool, httpx.stream(
+                "GET", url, headers=_REQUEST_HEADERS, follow_redirects=True, timeout=timeout
+            ) as resp:
+                resp.raise_for_status()
+                # Reject early when the server announces an oversized body.
+                declared = resp.headers.get("content-length")
+                if declared and declared.isdigit() and int(declared) > self.max_bytes:
                     raise RuntimeError("media_too_large")
-                hasher.update(chunk)
-                data.extend(chunk)
-
-            content_type = resp.headers.get("content-type")
-            if content_type:
-                content_type = content_type.split(";")[0].strip()
-            return DownloadResult(
-                content=bytes(data),
-                sha256=hasher.hexdigest(),
-                content_type=content_type or None,
-                size_bytes=size,
-                url=str(resp.url),
-            )
+                hasher = hashlib.sha256()
+                size = 0
+                for chunk in resp.iter_bytes(chunk_size=_DOWNLOAD_CHUNK_BYTES):
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise RuntimeError("media_too_large")
+                    hasher.update(chunk)
+                    spool.write(chunk)
+
+                content_type = resp.headers.get("content-type")
+                if content_type:
+                    content_type = content_type.split(";")[0].strip()
+                final_url = str(resp.url)
+                etag = _strong_etag(resp.headers.get("etag"))
+        except BaseException:
+            try:
+                os.unlink(spool.name)
+            except FileNotFoundError:
+                pass
+            raise
+        return DownloadResult(
+            path=spool.name,
+            sha256=hasher.hexdigest(),
+            content_type=content_type or None,
+            size_bytes=size,
+            url=final_url,
+            etag=etag,
+        )
 
     def _assert_public_hostname(self, hostname: str) -> None:
         try:
@@ -300,11 +482,13 @@ class MediaMirrorService:
             return mime.split("/", 1)[1]
         return "bin"
 
-    def _build_image_preview(self, data: bytes) -> tuple[Optional[bytes], Optional[tuple[int, int]]]:
+    def _build_image_preview(self, path: str) -> tuple[Optional[bytes], Optional[tuple[int, int]]]:
         try:
-            with Image.open(BytesIO(data)) as img:
-                img = img.convert("RGB")
+            with Image.open(path) as img:
                 orig_size = img.size
+                # JPEG can decode at 1/2..1/8 scale directly, which avoids materialising the full bitmap.
+                img.draft("RGB", (self.preview_dim, self.preview_dim))
+                img = img.convert("RGB")
                 img.thumbnail((self.preview_dim, self.preview_dim), Image.LANCZOS)
                 buf = BytesIO()
                 img.save(buf, format="JPEG", optimize=True, quality=85)
@@ -313,19 +497,17 @@ class MediaMirrorService:
             logger.warning("media_mirror.preview_image_failed", extra={"error": str(exc)})
             return None, None
 
-    def _build_video_preview(self, data: bytes) -> tuple[Optional[bytes], Optional[tuple[int, int]]]:
+    def _build_video_preview(self, path: str) -> tuple[Optional[bytes], Optional[tuple[int, int]]]:
         if not shutil.which("ffmpeg"):
             return None, None
 
-        with tempfile.NamedTemporaryFile(suffix=".mp4") as src, tempfile.NamedTemporaryFile(suffix=".jpg") as dst:
-            src.write(data)
-            src.flush()
+        with tempfile.NamedTemporaryFile(suffix=".jpg") as dst:
             cmd = [
                 "ffmpeg",
                 "-ss",
                 "1.5",
                 "-i",
-                src.name,
+                path,
                 "-frames:v",
                 "1",
                 "-vf",
@@ -335,8 +517,9 @@ class MediaMirrorService:
             ]
             try:
                 subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                preview_bytes = Path(dst.name).read_bytes()
-                with Image.open(dst.name) as img:
+                with open(dst.name, "rb") as fh:
+                    preview_bytes = fh.read()
+                with Image.open(BytesIO(preview_bytes)) as img:
                     return preview_bytes, (img.width, img.height)
             except Exception as exc:  # noqa: BLE001
                 logger.warning("media_mirror.preview_video_failed", extra={"error": str(exc)})
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional, Sequence
+from urllib.parse import urlparse
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.db.base import SessionLocal
+from app.db.enums import MediaMirrorStatusEnum
+from app.db.models import AdAssetLink, MediaAsset
+from app.services.media_mirror import MediaMirrorService
+from app.services.media_storage import MediaStorage
+
+logger = logging.getLogger(__name__)
+
+# Failures that will not change on retry; everything else (timeouts, 5xx, DNS) is retried.
+_PERMANENT_MIRROR_ERRORS = {
+    "missing_source_url",
+    "unsupported_scheme",
+    "invalid_url",
+    "blocked_private_network",
+    "media_too_large",
+}
+
+
+@dataclass
+class _ClaimedAsset:
+    media_asset_id: str
+    host: str
+
+
+@dataclass
+class MirrorDrainStats:
+    claimed: int = 0
+    succeeded: int = 0
+    partial: int = 0
+    failed: int = 0
+    retry_scheduled: int = 0
+    skipped: int = 0
+    hosts: Counter = field(default_factory=Counter)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "claimed": self.claimed,
+            "succeeded": self.succeeded,
+            "partial": self.partial,
+            "failed": self.failed,
+            "retry_scheduled": self.retry_scheduled,
+            "skipped": self.skipped,
+            "top_hosts": dict(self.hosts.most_common(10)),
+        }
+
+
+class MediaMirrorQueue:
+    """
+    Drain pending MediaAsset rows with a bounded worker pool.
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED and leased through
+    mirror_next_attempt_at, so several drainers (Temporal activities, the backfill script)
+    can share the queue. Dispatch is capped per source host so one slow CDN cannot occupy
+    every worker, and failed downloads are rescheduled with exponential backoff until
+    MEDIA_MIRROR_MAX_ATTEMPTS is reached.
+    """
+
+    def __init__(
+        self,
+        *,
+        session_factory: sessionmaker[Session] | Callable[[], Session] = SessionLocal,
+        storage: Optional[MediaStorage] = None,
+        max_workers: Optional[int] = None,
+        per_host_limit: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.storage = storage or MediaStorage()
+        self.max_workers = max(1, int(max_workers or settings.MEDIA_MIRROR_MAX_CONCURRENCY or 3))
+        self.per_host_limit = max(1, int(per_host_limit or settings.MEDIA_MIRROR_PER_HOST_CONCURRENCY or 2))
+        self.max_attempts = max(1, int(max_attempts or settings.MEDIA_MIRROR_MAX_ATTEMPTS or 4))
+        self.retry_base_seconds = float(settings.MEDIA_MIRROR_RETRY_BASE_SECONDS or 30.0)
+        self.retry_max_seconds = float(settings.MEDIA_MIRROR_RETRY_MAX_SECONDS or 900.0)
+        self.lease_seconds = int(settings.MEDIA_MIRROR_CLAIM_LEASE_SECONDS or 600)
+
+    def _pending_filter(self, stmt: Any, *, now: datetime, ad_ids: Optional[Sequence[str]]) -> Any:
+        stmt = stmt.where(
+            MediaAsset.mirror_status == MediaMirrorStatusEnum.pending,
+            or_(MediaAsset.mirror_next_attempt_at.is_(None), MediaAsset.mirror_next_attempt_at <= now),
+        )
+        if ad_ids:
+            stmt = stmt.where(
+                MediaAsset.id.in_(select(AdAssetLink.media_asset_id).where(AdAssetLink.ad_id.in_(list(ad_ids))))
+            )
+        return stmt
+
+    def claim(self, *, limit: int, ad_ids: Optional[Sequence[str]] = None) -> list[_ClaimedAsset]:
+        """Lease up to `limit` due assets; rows locked by another drainer are skipped."""
+        if limit <= 0:
+            return []
+        now = datetime.now(timezone.utc)
+        session = self.session_factory()
+        try:
+            stmt = self._pending_filter(
+                select(MediaAsset.id, MediaAsset.source_url), now=now, ad_ids=ad_ids
+            )
+            stmt = stmt.order_by(MediaAsset.created_at).limit(limit).with_for_update(skip_locked=True)
+            rows = session.execute(stmt).all()
+            if not rows:
+                session.rollback()
+                return []
+            session.execute(
+                update(MediaAsset)
+                .where(MediaAsset.id.in_([row[0] for row in rows]))
+                .values(
+                    mirror_attempts=MediaAsset.mirror_attempts + 1,
+                    mirror_next_attempt_at=now + timedelta(seconds=self.lease_seconds),
+                )
+            )
+            session.commit()
+        finally:
+            session.close()
+        return [
+            _ClaimedAsset(media_asset_id=str(media_id), host=(urlparse(source_url or "").hostname or "").lower())
+            for media_id, source_url in rows
+        ]
+
+    def release(self, claimed: Sequence[_ClaimedAsset]) -> None:
+        """Return leased-but-undispatched assets to the queue without counting an attempt."""
+        if not claimed:
+            return
+        session = self.session_factory()
+        try:
+            session.execute(
+                update(MediaAsset)
+                .where(
+                    MediaAsset.id.in_([item.media_asset_id for item in claimed]),
+                    MediaAsset.mirror_status == MediaMirrorStatusEnum.pending,
+                )
+                .values(
+                    mirror_attempts=MediaAsset.mirror_attempts - 1,
+                    mirror_next_attempt_at=None,
+                )
+            )
+            session.commit()
+        finally:
+            session.close()
+
+    def _next_retry_delay(self, attempts: int) -> float:
+        return min(self.retry_base_seconds * (2 ** max(attempts - 1, 0)), self.retry_max_seconds)
+
+    def _is_retryable(self, error: Optional[str]) -> bool:
+        if not error:
+            return True
+        return error.split(":", 1)[0] not in _PERMANENT_MIRROR_ERRORS
+
+    def mirror_one(self, media_asset_id: str) -> str:
+        """Mirror a claimed asset in its own session and return the resulting outcome label."""
+        session = self.session_factory()
+        try:
+            media = session.get(MediaAsset, media_asset_id)
+            # Another drainer may have deduped this row into an existing asset already.
+            if media is None or media.mirror_status != MediaMirrorStatusEnum.pending:
+                return "skipped"
+            attempts = int(media.mirror_attempts or 1)
+            result = MediaMirrorService(session, storage=self.storage).mirror_asset(media)
+            outcome = result.mirror_status.value
+            if result.mirror_status == MediaMirrorStatusEnum.failed:
+                if attempts < self.max_attempts and self._is_retryable(result.mirror_error):
+                    delay = self._next_retry_delay(attempts)
+                    result.mirror_status = MediaMirrorStatusEnum.pending
+                    result.mirror_next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+                    outcome = "retry_scheduled"
+                else:
+                    result.mirror_next_attempt_at = None
+            else:
+                result.mirror_next_attempt_at = None
+            session.add(result)
+            session.commit()
+            return outcome
+        finally:
+            session.close()
+
+    def _next_retry_due(self, *, ad_ids: Optional[Sequence[str]]) -> Optional[datetime]:
+        session = self.session_factory()
+        try:
+            stmt = select(MediaAsset.mirror_next_attempt_at).where(
+                MediaAsset.mirror_status == MediaMirrorStatusEnum.pending,
+                MediaAsset.mirror_next_attempt_at.is_not(None),
+            )
+            if ad_ids:
+                stmt = stmt.where(
+                    MediaAsset.id.in_(
+                        select(AdAssetLink.media_asset_id).where(AdAssetLink.ad_id.in_(list(ad_ids)))
+                    )
+                )
+            return session.scalar(stmt.order_by(MediaAsset.mirror_next_attempt_at).limit(1))
+        finally:
+            session.close()
+
+    def drain(
+        self,
+        *,
+        ad_ids: Optional[Sequence[str]] = None,
+        max_assets: Optional[int] = None,
+        wait_for_retries: bool = True,
+        on_progress: Callable[[dict[str, Any]], None] | None = None,
+        poll_interval_seconds: float = 5.0,
+    ) -> MirrorDrainStats:
+        """
+        Mirror pending assets until the queue (optionally scoped to `ad_ids`) is empty.
+
+        With `wait_for_retries`, the drain also waits out backoff windows so scoped callers
+        (the ingestion workflow) return only once each asset has succeeded or exhausted its attempts.
+        """
+        stats = MirrorDrainStats()
+        backlog: deque[_ClaimedAsset] = deque()
+        in_flight: dict[concurrent.futures.Future[str], _ClaimedAsset] = {}
+        host_in_flight: Counter = Counter()
+        exhausted = False
+
+        def _emit_progress() -> None:
+            if on_progress is None:
+                return
+            payload = stats.as_dict()
+            payload["in_flight"] = len(in_flight)
+            payload["backlog"] = len(backlog)
+            on_progress(payload)
+
+        def _budget_left() -> Optional[int]:
+            if max_assets is None:
+                return None
+            return max(max_assets - stats.claimed, 0)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                while True:
+                    # Keep roughly two rounds of work locally so host-capped items can be skipped over.
+                    want = self.max_workers * 2 - len(backlog)
+                    budget = _budget_left()
+                    if budget is not None:
+                        want = min(want, budget)
+                    if not exhausted and want > 0:
+                        claimed = self.claim(limit=want, ad_ids=ad_ids)
+                        stats.claimed += len(claimed)
+                        backlog.extend(claimed)
+                        if not claimed:
+                            exhausted = True
+
+                    deferred: deque[_ClaimedAsset] = deque()
+                    while backlog and len(in_flight) < self.max_workers:
+                        item = backlog.popleft()
+                        if host_in_flight[item.host] >= self.per_host_limit:
+                            deferred.append(item)
+                            continue
+                        host_in_flight[item.host] += 1
+                        stats.hosts[item.host] += 1
+                        in_flight[executor.submit(self.mirror_one, item.media_asset_id)] = item
+                    backlog.extendleft(reversed(deferred))
+
+                    if not in_flight:
+                        if backlog:
+                            continue
+                        if _budget_left() == 0:
+                            break
+                        next_due = self._next_retry_due(ad_ids=ad_ids) if wait_for_retries else None
+                        if next_due is None:
+                            break
+                        _emit_progress()
+                        wait_seconds = (next_due - datetime.now(timezone.utc)).total_seconds()
+                        time.sleep(max(min(wait_seconds, poll_interval_seconds), 0.1))
+                        exhausted = False
+                        continue
+
+                    done, _ = concurrent.futures.wait(
+                        set(in_flight),
+                        timeout=poll_interval_seconds,
+                        return_when=concurrent.futures.FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        item = in_flight.pop(future)
+                        host_in_flight[item.host] -= 1
+                        try:
+                            outcome = future.result()
+                        except Exception as exc:  # noqa: BLE001
+                            # mirror_asset records download/upload failures itself; this is a DB-level error.
+                            logger.exception(
+                                "media_mirror_queue.worker_failed",
+                                extra={"media_asset_id": item.media_asset_id, "error": str(exc)},
+                            )
+                            outcome = MediaMirrorStatusEnum.failed.value
+                        if outcome == MediaMirrorStatusEnum.succeeded.value:
+                            stats.succeeded += 1
+                        elif outcome == MediaMirrorStatusEnum.partial.value:
+                            stats.partial += 1
+                        elif outcome == "retry_scheduled":
+                            stats.retry_scheduled += 1
+                            exhausted = False
+                        elif outcome == "skipped":
+                            stats.skipped += 1
+                        else:
+                            stats.failed += 1
+                    if not done and backlog:
+                        # Everything runnable is blocked on host caps; new claims could unblock the pool.
+                        exhausted = False
+                    _emit_progress()
+            finally:
+                if backlog:
+                    self.release(list(backlog))
+                    stats.claimed -= len(backlog)
+                    backlog.clear()
+
+        logger.info("media_mirror_queue.drained", extra=stats.as_dict())
+        return stats
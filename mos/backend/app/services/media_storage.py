@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import concurrent.futures
 import logging
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Optional, Sequence
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
@@ -13,6 +18,55 @@ logger = logging.getLogger(__name__)
 
 IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
+# (bucket, key) pair identifying a stored object.
+ObjectRef = tuple[str, str]
+
+
+class _KnownKeyCache:
+    """Thread-safe LRU of objects known to exist. Keys are content-addressed and never deleted."""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max(0, max_size)
+        self._items: OrderedDict[ObjectRef, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, ref: ObjectRef) -> bool:
+        with self._lock:
+            if ref not in self._items:
+                return False
+            self._items.move_to_end(ref)
+            return True
+
+    def add(self, ref: ObjectRef) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._items[ref] = None
+            self._items.move_to_end(ref)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+
+# Shared across MediaStorage instances: most call sites construct a fresh MediaStorage per request,
+# so per-instance clients would throw away warm connections and the known-key cache every time.
+_shared_lock = threading.Lock()
+_shared_clients: dict[tuple[Any, ...], Any] = {}
+_known_keys = _KnownKeyCache(int(settings.MEDIA_STORAGE_KNOWN_KEYS_CACHE_SIZE or 0))
+_io_executor: concurrent.futures.ThreadPoolExecutor | None = None
+_presign_lock = threading.Lock()
+_presign_cache: OrderedDict[tuple[str, str, int, int], str] = OrderedDict()
+
+
+def _shared_io_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _io_executor
+    with _shared_lock:
+        if _io_executor is None:
+            _io_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(1, int(settings.MEDIA_STORAGE_IO_CONCURRENCY or 8)),
+                thread_name_prefix="media-storage-io",
+            )
+        return _io_executor
+
 
 class MediaStorageConfigurationError(RuntimeError):
     """
@@ -46,23 +100,51 @@ class MediaStorage:
         self.prefix = (settings.MEDIA_STORAGE_PREFIX or "").strip("/")
         self.presign_ttl = int(settings.MEDIA_STORAGE_PRESIGN_TTL_SECONDS or 900)
 
-        session = boto3.session.Session()
-        self.client = session.client(
-            "s3",
-            endpoint_url=settings.MEDIA_STORAGE_ENDPOINT,
-            aws_access_key_id=settings.MEDIA_STORAGE_ACCESS_KEY,
-            aws_secret_access_key=settings.MEDIA_STORAGE_SECRET_KEY,
-            region_name=settings.MEDIA_STORAGE_REGION or "us-east-1",
-            use_ssl=bool(settings.MEDIA_STORAGE_USE_SSL),
-            config=Config(
-                s3={"addressing_style": addressing_style},
-                signature_version="s3v4",
-                # Avoid flaky generation runs due to transient object-store latency.
-                connect_timeout=10,
-                read_timeout=300,
-                retries={"max_attempts": 5, "mode": "standard"},
-            ),
+        self.client = self._shared_client(addressing_style=addressing_style)
+        self.transfer_config = TransferConfig(
+            multipart_threshold=int(settings.MEDIA_STORAGE_MULTIPART_THRESHOLD_BYTES or 8 * 1024 * 1024),
+            multipart_chunksize=int(settings.MEDIA_STORAGE_MULTIPART_CHUNK_BYTES or 8 * 1024 * 1024),
+            max_concurrency=max(1, int(settings.MEDIA_STORAGE_MULTIPART_MAX_CONCURRENCY or 2)),
+            use_threads=True,
+        )
+
+    @staticmethod
+    def _shared_client(*, addressing_style: str) -> Any:
+        cache_key = (
+            settings.MEDIA_STORAGE_ENDPOINT,
+            settings.MEDIA_STORAGE_ACCESS_KEY,
+            settings.MEDIA_STORAGE_SECRET_KEY,
+            settings.MEDIA_STORAGE_REGION,
+            bool(settings.MEDIA_STORAGE_USE_SSL),
+            addressing_style,
         )
+        with _shared_lock:
+            client = _shared_clients.get(cache_key)
+            if client is not None:
+                return client
+            # boto3 clients are thread-safe; sessions are not, so only the client is shared.
+            session = boto3.session.Session()
+            client = session.client(
+                "s3",
+                endpoint_url=settings.MEDIA_STORAGE_ENDPOINT,
+                aws_access_key_id=settings.MEDIA_STORAGE_ACCESS_KEY,
+                aws_secret_access_key=settings.MEDIA_STORAGE_SECRET_KEY,
+                region_name=settings.MEDIA_STORAGE_REGION or "us-east-1",
+                use_ssl=bool(settings.MEDIA_STORAGE_USE_SSL),
+                config=Config(
+                    s3={"addressing_style": addressing_style},
+                    signature_version="s3v4",
+                    # Avoid flaky generation runs due to transient object-store latency.
+                    connect_timeout=10,
+                    read_timeout=300,
+                    retries={"max_attempts": 5, "mode": "standard"},
+                    # Sized for the shared IO pool plus multipart transfer threads.
+                    max_pool_connections=max(10, int(settings.MEDIA_STORAGE_MAX_POOL_CONNECTIONS or 50)),
+                    tcp_keepalive=True,
+                ),
+            )
+            _shared_clients[cache_key] = client
+            return client
 
     def build_key(self, *, sha256: str, ext: str, kind: str = "orig") -> str:
         """
@@ -75,14 +157,69 @@ class MediaStorage:
         return "/".join(parts + [filename])
 
     def object_exists(self, *, bucket: str, key: str) -> bool:
+        if (bucket, key) in _known_keys:
+            return True
         try:
             self.client.head_object(Bucket=bucket, Key=key)
-            return True
         except ClientError as exc:  # noqa: PERF203
             code = exc.response.get("Error", {}).get("Code") if hasattr(exc, "response") else None
             if code in ("404", "NoSuchKey", "NotFound"):
                 return False
             raise
+        _known_keys.add((bucket, key))
+        return True
+
+    def objects_exist(self, refs: Sequence[ObjectRef]) -> dict[ObjectRef, bool]:
+        """
+        Check existence for many (bucket, key) pairs at once.
+
+        Known keys are answered from the process-wide LRU. Remaining keys are grouped by
+        their `<kind>/<sha[:2]>/` shard: shards with at least MEDIA_STORAGE_SHARD_LIST_MIN_KEYS
+        pending keys are resolved with one paginated prefix listing (which also warms the LRU
+        with the shard's other keys), the rest with concurrent HEADs on the shared IO pool.
+        """
+        result: dict[ObjectRef, bool] = {}
+        shards: dict[tuple[str, str], list[ObjectRef]] = defaultdict(list)
+        for ref in dict.fromkeys(refs):
+            if ref in _known_keys:
+                result[ref] = True
+                continue
+            bucket, key = ref
+            shard_prefix = key.rsplit("/", 1)[0] + "/" if "/" in key else ""
+            shards[(bucket, shard_prefix)].append(ref)
+
+        min_list_keys = max(1, int(settings.MEDIA_STORAGE_SHARD_LIST_MIN_KEYS or 3))
+        head_refs: list[ObjectRef] = []
+        for (bucket, shard_prefix), pending in shards.items():
+            if not shard_prefix or len(pending) < min_list_keys:
+                head_refs.extend(pending)
+                continue
+            listed = self._list_shard(bucket=bucket, prefix=shard_prefix)
+            for ref in pending:
+                result[ref] = ref[1] in listed
+
+        if len(head_refs) == 1:
+            bucket, key = head_refs[0]
+            result[head_refs[0]] = self.object_exists(bucket=bucket, key=key)
+        elif head_refs:
+            executor = _shared_io_executor()
+            futures = {
+                ref: executor.submit(self.object_exists, bucket=ref[0], key=ref[1]) for ref in head_refs
+            }
+            for ref, future in futures.items():
+                result[ref] = future.result()
+        return result
+
+    def _list_shard(self, *, bucket: str, prefix: str) -> set[str]:
+        keys: set[str] = set()
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            for obj in page.get("Contents") or []:
+                key = obj.get("Key")
+                if key:
+                    keys.add(key)
+                    _known_keys.add((bucket, key))
+        return keys
 
     def upload_bytes(
         self,
@@ -106,6 +243,48 @@ class MediaStorage:
         if extra_metadata:
             kwargs["Metadata"] = extra_metadata
         self.client.put_object(**kwargs)
+        _known_keys.add((bucket, key))
+
+    def upload_file(
+        self,
+        *,
+        bucket: str,
+        key: str,
+        path: str,
+        content_type: Optional[str],
+        cache_control: Optional[str] = None,
+        extra_metadata: Optional[dict[str, str]] = None,
+    ) -> None:
+        """
+        Upload a local file without reading it into memory.
+
+        Files larger than MEDIA_STORAGE_MULTIPART_THRESHOLD_BYTES go through S3 multipart
+        upload, so peak memory is bounded by chunk size x concurrency rather than file size.
+        """
+        extra_args: dict[str, object] = {}
+        if content_type:
+            extra_args["ContentType"] = content_type
+        if cache_control:
+            extra_args["CacheControl"] = cache_control
+        if extra_metadata:
+            extra_args["Metadata"] = extra_metadata
+        self.client.upload_file(
+            Filename=path,
+            Bucket=bucket,
+            Key=key,
+            ExtraArgs=extra_args or None,
+            Config=self.transfer_config,
+        )
+        _known_keys.add((bucket, key))
+
+    def submit(self, fn: Callable[..., Any], /, **kwargs: Any) -> concurrent.futures.Future[Any]:
+        """
+        Run a storage call (e.g. `upload_file`, `upload_bytes`) on the shared IO pool.
+
+        Lets callers overlap uploads with CPU work such as preview generation; the caller
+        owns the returned future and must wait on it before releasing any inputs (temp files).
+        """
+        return _shared_io_executor().submit(fn, **kwargs)
 
     def presign_get(self, *, bucket: str, key: str, expires_in: Optional[int] = None) -> str:
         ttl = int(expires_in or self.presign_ttl or 900)
@@ -115,6 +294,46 @@ class MediaStorage:
             ExpiresIn=ttl,
         )
 
+    def presign_get_cached(self, *, bucket: str, key: str, expires_in: Optional[int] = None) -> str:
+        """
+        Presigned GET reused across requests until it nears expiry.
+
+        Signatures are cached per (bucket, key, ttl, ttl bucket); the bucket width is
+        MEDIA_STORAGE_PRESIGN_CACHE_REUSE_FRACTION of the TTL, so a returned URL always has at
+        least (1 - fraction) x ttl of validity left. Stable URLs also let browsers cache the media.
+        """
+        ttl = int(expires_in or self.presign_ttl or 900)
+        reuse_fraction = min(max(float(settings.MEDIA_STORAGE_PRESIGN_CACHE_REUSE_FRACTION or 0.0), 0.0), 0.9)
+        max_entries = int(settings.MEDIA_STORAGE_PRESIGN_CACHE_SIZE or 0)
+        window = int(ttl * reuse_fraction)
+        if window <= 0 or max_entries <= 0:
+            return self.presign_get(bucket=bucket, key=key, expires_in=ttl)
+
+        cache_key = (bucket, key, ttl, int(time.time()) // window)
+        with _presign_lock:
+            url = _presign_cache.get(cache_key)
+            if url is not None:
+                _presign_cache.move_to_end(cache_key)
+                return url
+        url = self.presign_get(bucket=bucket, key=key, expires_in=ttl)
+        with _presign_lock:
+            _presign_cache[cache_key] = url
+            while len(_presign_cache) > max_entries:
+                _presign_cache.popitem(last=False)
+        return url
+
+    def public_preview_url(self, *, bucket: str, key: str) -> Optional[str]:
+        """
+        Unsigned CDN/public URL for a content-addressed preview, when one is configured.
+
+        Only the preview bucket is served this way; preview keys embed the content sha and are
+        uploaded with IMMUTABLE_CACHE_CONTROL, so the URL never needs to change or expire.
+        """
+        base_url = (settings.MEDIA_STORAGE_PREVIEW_PUBLIC_BASE_URL or "").rstrip("/")
+        if not base_url or bucket != self.preview_bucket:
+            return None
+        return f"{base_url}/{key.lstrip('/')}"
+
     def download_bytes(self, *, key: str, bucket: Optional[str] = None) -> tuple[bytes, Optional[str]]:
         bucket_name = bucket or self.bucket
         obj = self.client.get_object(Bucket=bucket_name, Key=key)
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
-import concurrent.futures
 from collections import Counter
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import json
 import os
-import queue
 import re
 from typing import Any, Callable, Mapping
 from urllib.parse import parse_qsl, unquote, urlsplit, urlunsplit
 
 from app.ads.apify_client import ApifyClient
+from app.services.apify_run_completion import completion_webhooks, wait_for_run_completion
+from app.services.media_storage import MediaStorage
+from app.strategy_v2.apify_result_cache import ApifyResultCache
+from app.strategy_v2.apify_run_scheduler import ApifyRunScheduler, ScheduledApifyRun
 from app.strategy_v2.contracts import (
     CandidateAssetMetrics,
     CompetitorAssetCandidate,
@@ -52,6 +54,24 @@ _DEFAULT_ALLOWED_ACTOR_IDS = {
 
 _TRUE_VALUES = {"1", "true", "yes", "on"}
 
+# Scheduling priority (lower starts first) in critical-path order: base runs can spawn fan-out and
+# comment runs, fan-out runs can spawn comment runs, comment runs spawn nothing.
+_RUN_PRIORITY_BY_STAGE: dict[str, int] = {"base": 0, "discovery_fanout": 1, "comment_enrichment": 2}
+
+# Result-cache freshness per actor (seconds); STRATEGY_V2_APIFY_RESULT_CACHE_TTL_BY_ACTOR overrides.
+# Engagement metrics on social profiles and ad libraries drift within hours; landing pages and
+# forum threads much more slowly.
+_DEFAULT_RESULT_CACHE_TTL_BY_ACTOR: dict[str, int] = {
+    "curious_coder~facebook-ads-library-scraper": 6 * 3600,
+    "clockworks~tiktok-scraper": 12 * 3600,
+    "apify~instagram-scraper": 12 * 3600,
+    "streamers~youtube-scraper": 12 * 3600,
+    "streamers~youtube-comments-scraper": 24 * 3600,
+    "practicaltools~apify-reddit-api": 24 * 3600,
+    "apify~google-search-scraper": 24 * 3600,
+    "apify~web-scraper": 7 * 24 * 3600,
+}
+
 _VIDEO_PLATFORMS = {"TIKTOK", "INSTAGRAM", "YOUTUBE"}
 
 _SOURCE_TYPE_BY_PLATFORM: dict[str, str] = {
@@ -173,6 +193,11 @@ class StrategyV2ApifyConfig:
     youtube_comments_actor_id: str
     reddit_actor_id: str
     web_actor_id: str
+    max_parallel_runs_per_actor: int = 4
+    max_parallel_runs_per_platform: int = 6
+    result_cache_enabled: bool = False
+    result_cache_ttl_seconds: int = 24 * 3600
+    result_cache_ttl_by_actor: Mapping[str, int] = field(default_factory=dict)
 
 
 def _parse_bool(value: str | None, *, default: bool) -> bool:
@@ -226,6 +251,31 @@ def _parse_allowed_actor_ids() -> frozenset[str]:
     return frozenset(parsed)
 
 
+def _parse_result_cache_ttl_by_actor() -> dict[str, int]:
+    ttl_by_actor = dict(_DEFAULT_RESULT_CACHE_TTL_BY_ACTOR)
+    raw = os.getenv("STRATEGY_V2_APIFY_RESULT_CACHE_TTL_BY_ACTOR")
+    if raw is None or not raw.strip():
+        return ttl_by_actor
+    try:
+        payload = json.loads(raw)
+    except json.JSONDecodeError as exc:
+        raise RuntimeError(
+            "STRATEGY_V2_APIFY_RESULT_CACHE_TTL_BY_ACTOR must be a JSON object of actor id -> TTL seconds."
+        ) from exc
+    if not isinstance(payload, dict):
+        raise RuntimeError(
+            "STRATEGY_V2_APIFY_RESULT_CACHE_TTL_BY_ACTOR must be a JSON object of actor id -> TTL seconds."
+        )
+    for actor_id, ttl in payload.items():
+        if isinstance(ttl, bool) or not isinstance(ttl, int) or ttl < 0:
+            raise RuntimeError(
+                f"STRATEGY_V2_APIFY_RESULT_CACHE_TTL_BY_ACTOR[{actor_id!r}] must be an integer >= 0 "
+                f"(0 disables caching for the actor), got {ttl!r}."
+            )
+        ttl_by_actor[_normalize_actor_id(str(actor_id))] = ttl
+    return ttl_by_actor
+
+
 def _resolve_actor_max_items(
     *,
     input_payload: Mapping[str, Any],
@@ -415,6 +465,17 @@ def load_strategy_v2_apify_config() -> StrategyV2ApifyConfig:
         ),
         reddit_actor_id=os.getenv("STRATEGY_V2_APIFY_REDDIT_ACTOR_ID", "practicaltools/apify-reddit-api"),
         web_actor_id=os.getenv("STRATEGY_V2_APIFY_WEB_ACTOR_ID", "apify/web-scraper"),
+        max_parallel_runs_per_actor=_parse_positive_int_env(
+            "STRATEGY_V2_APIFY_MAX_PARALLEL_RUNS_PER_ACTOR",
+            4,
+        ),
+        max_parallel_runs_per_platform=_parse_positive_int_env(
+            "STRATEGY_V2_APIFY_MAX_PARALLEL_RUNS_PER_PLATFORM",
+            6,
+        ),
+        result_cache_enabled=_parse_bool(os.getenv("STRATEGY_V2_APIFY_RESULT_CACHE_ENABLED"), default=False),
+        result_cache_ttl_seconds=_parse_positive_int_env("STRATEGY_V2_APIFY_RESULT_CACHE_TTL_SECONDS", 24 * 3600),
+        result_cache_ttl_by_actor=_parse_result_cache_ttl_by_actor(),
     )
 
 
@@ -1196,6 +1257,14 @@ def _build_youtube_comments_actor_input(*, urls: list[str], max_comments_per_vid
     }
 
 
+_COMMENT_ENRICHMENT_PLATFORMS: dict[str, tuple[str, str]] = {
+    # platform -> (habitat_type, habitat_name)
+    "TIKTOK": ("TikTok", "comments://tiktok"),
+    "INSTAGRAM": ("Instagram", "comments://instagram"),
+    "YOUTUBE": ("YouTube", "comments://youtube"),
+}
+
+
 def _build_comment_enrichment_runs(
     *,
     candidate_assets: list[dict[str, Any]],
@@ -1204,7 +1273,7 @@ def _build_comment_enrichment_runs(
     if not config.comment_enrichment_enabled:
         return []
 
-    top_urls_by_platform: dict[str, list[str]] = {"TIKTOK": [], "INSTAGRAM": [], "YOUTUBE": []}
+    top_urls_by_platform: dict[str, list[str]] = {platform: [] for platform in _COMMENT_ENRICHMENT_PLATFORMS}
     seen_urls: set[str] = set()
     ranked = sorted(
         [row for row in candidate_assets if isinstance(row, Mapping)],
@@ -1236,54 +1305,39 @@ def _build_comment_enrichment_runs(
         seen_urls.add(canonical_url)
 
     runs: list[tuple[str, dict[str, Any], str | None, Mapping[str, Any] | None]] = []
-    if top_urls_by_platform["TIKTOK"]:
-        runs.append(
-            (
-                config.tiktok_actor_id,
-                _build_tiktok_actor_input(
-                    urls=top_urls_by_platform["TIKTOK"],
-                    max_items=config.comment_enrichment_max_comments_per_video,
-                ),
-                "COMMENT_ENRICHMENT_TIKTOK",
-                {
-                    "source_stage": "comment_enrichment",
-                    "target_id": "COMMENT_ENRICHMENT_TIKTOK",
-                    "habitat_type": "TikTok",
-                    "habitat_name": "comments://tiktok",
-                },
+    for platform, (habitat_type, habitat_name) in _COMMENT_ENRICHMENT_PLATFORMS.items():
+        urls = top_urls_by_platform[platform]
+        if not urls:
+            continue
+        if platform == "TIKTOK":
+            actor_id = config.tiktok_actor_id
+            input_payload = _build_tiktok_actor_input(
+                urls=urls,
+                max_items=config.comment_enrichment_max_comments_per_video,
             )
-        )
-    if top_urls_by_platform["INSTAGRAM"]:
-        runs.append(
-            (
-                config.instagram_actor_id,
-                _build_instagram_actor_input(
-                    urls=top_urls_by_platform["INSTAGRAM"],
-                    max_items=config.comment_enrichment_max_comments_per_video,
-                ),
-                "COMMENT_ENRICHMENT_INSTAGRAM",
-                {
-                    "source_stage": "comment_enrichment",
-                    "target_id": "COMMENT_ENRICHMENT_INSTAGRAM",
-                    "habitat_type": "Instagram",
-                    "habitat_name": "comments://instagram",
-                },
+        elif platform == "INSTAGRAM":
+            actor_id = config.instagram_actor_id
+            input_payload = _build_instagram_actor_input(
+                urls=urls,
+                max_items=config.comment_enrichment_max_comments_per_video,
             )
-        )
-    if top_urls_by_platform["YOUTUBE"]:
+        else:
+            actor_id = config.youtube_comments_actor_id
+            input_payload = _build_youtube_comments_actor_input(
+                urls=urls,
+                max_comments_per_video=config.comment_enrichment_max_comments_per_video,
+            )
+        target_id = f"COMMENT_ENRICHMENT_{platform}"
         runs.append(
             (
-                config.youtube_comments_actor_id,
-                _build_youtube_comments_actor_input(
-                    urls=top_urls_by_platform["YOUTUBE"],
-                    max_comments_per_video=config.comment_enrichment_max_comments_per_video,
-                ),
-                "COMMENT_ENRICHMENT_YOUTUBE",
+                actor_id,
+                input_payload,
+                target_id,
                 {
                     "source_stage": "comment_enrichment",
-                    "target_id": "COMMENT_ENRICHMENT_YOUTUBE",
-                    "habitat_type": "YouTube",
-                    "habitat_name": "comments://youtube",
+                    "target_id": target_id,
+                    "habitat_type": habitat_type,
+                    "habitat_name": habitat_name,
                 },
             )
         )
@@ -1373,7 +1427,11 @@ def _execute_actor(
     run_index: int | None = None,
     planned_run_count: int | None = None,
 ) -> dict[str, Any]:
-    run_data = client.start_actor_run(actor_id, input_payload=input_payload)
+    webhooks = completion_webhooks()
+    if webhooks:
+        run_data = client.start_actor_run(actor_id, input_payload=input_payload, webhooks=webhooks)
+    else:
+        run_data = client.start_actor_run(actor_id, input_payload=input_payload)
     run_id = str(run_data.get("id") or run_data.get("runId") or "").strip()
     if not run_id:
         raise RuntimeError(f"Apify actor '{actor_id}' did not return run id.")
@@ -1404,11 +1462,19 @@ def _execute_actor(
             },
         )
 
-    final = client.poll_run_until_terminal(
-        run_id,
-        max_wait_seconds=max_wait_seconds,
-        on_poll=_on_poll if progress_callback is not None else None,
-    )
+    if webhooks:
+        # The run's completion webhook signals a Temporal workflow; no polling while it runs.
+        final = wait_for_run_completion(
+            run_id,
+            max_wait_seconds=max_wait_seconds,
+            on_wait=_on_poll if progress_callback is not None else None,
+        )
+    else:
+        final = client.poll_run_until_terminal(
+            run_id,
+            max_wait_seconds=max_wait_seconds,
+            on_poll=_on_poll if progress_callback is not None else None,
+        )
     status = str(final.get("status") or "").upper()
     _emit_apify_progress(
         callback=progress_callback,
@@ -1448,138 +1514,157 @@ def _execute_actor(
     }
 
 
-def _execute_planned_runs_parallel(
+def _actor_platform(
+    *,
+    actor_id: str,
+    config: StrategyV2ApifyConfig,
+    config_metadata: Mapping[str, Any] | None,
+) -> str:
+    actor_key = _normalize_actor_id(actor_id)
+    for platform, configured_actor_id in (
+        ("META", config.meta_actor_id),
+        ("TIKTOK", config.tiktok_actor_id),
+        ("INSTAGRAM", config.instagram_actor_id),
+        ("YOUTUBE", config.youtube_actor_id),
+        ("YOUTUBE", config.youtube_comments_actor_id),
+        ("REDDIT", config.reddit_actor_id),
+        ("WEB", config.web_actor_id),
+    ):
+        if actor_key == _normalize_actor_id(configured_actor_id):
+            return platform
+    metadata_platform = str((config_metadata or {}).get("platform") or "").strip().upper()
+    return metadata_platform or "OTHER"
+
+
+def _execute_scheduled_run(
+    run: ScheduledApifyRun,
     *,
     client: ApifyClient,
-    planned_runs: list[tuple[str, dict[str, Any], str | None, Mapping[str, Any] | None]],
-    allowlist: frozenset[str],
+    scheduler: ApifyRunScheduler,
     max_wait_seconds: int,
     max_items_per_dataset: int,
-    max_parallel_actor_runs: int,
-    progress_callback: ApifyProgressCallback | None,
-    run_index_offset: int,
-    planned_run_count: int,
-) -> list[dict[str, Any]]:
-    if not planned_runs:
-        return []
-
-    indexed_runs: list[tuple[int, str, dict[str, Any], str | None, Mapping[str, Any] | None]] = []
-    for index, (actor_id, payload, config_id, config_metadata) in enumerate(planned_runs, start=1):
-        run_index = run_index_offset + index
-        _ensure_actor_allowed(actor_id=actor_id, allowlist=allowlist)
-        indexed_runs.append((run_index, actor_id, payload, config_id, config_metadata))
+    result_cache: ApifyResultCache | None,
+) -> dict[str, Any]:
+    progress_callback = scheduler.emit if scheduler.progress_enabled else None
+    try:
+        result = _execute_actor(
+            client=client,
+            actor_id=run.actor_id,
+            input_payload=run.input_payload,
+            max_wait_seconds=max_wait_seconds,
+            max_items_per_dataset=max_items_per_dataset,
+            config_id=run.config_id,
+            config_metadata=run.config_metadata,
+            progress_callback=progress_callback,
+            run_index=run.run_index,
+            planned_run_count=scheduler.scheduled_count,
+        )
+    except Exception as exc:
+        _emit_apify_progress(
+            callback=progress_callback,
+            event={
+                "event": "actor_run_failed",
+                "actor_id": run.actor_id,
+                "config_id": run.config_id,
+                "run_index": run.run_index,
+                "planned_run_count": scheduler.scheduled_count,
+                "error": str(exc),
+                "status": "FAILED",
+            },
+        )
+        return {
+            "config_id": run.config_id,
+            "config_metadata": dict(run.config_metadata) if isinstance(run.config_metadata, Mapping) else {},
+            "actor_id": run.actor_id,
+            "run_id": "",
+            "status": "FAILED",
+            "dataset_id": "",
+            "input_payload": run.input_payload,
+            "items": [],
+            "error": str(exc),
+        }
+    if result_cache is not None and result["items"]:
+        result_cache.store(
+            actor_id=run.actor_key,
+            input_payload=run.input_payload,
+            max_items=max_items_per_dataset,
+            run_id=result["run_id"],
+            dataset_id=result["dataset_id"],
+            items=result["items"],
+        )
+    return result
 
-    progress_events: queue.SimpleQueue[dict[str, Any]] | None = (
-        queue.SimpleQueue() if progress_callback is not None else None
-    )
 
-    def _enqueue_progress(event: Mapping[str, Any]) -> None:
-        if progress_events is None:
-            return
-        progress_events.put(dict(event))
+def _schedule_planned_runs(
+    *,
+    scheduler: ApifyRunScheduler,
+    planned_runs: list[tuple[str, dict[str, Any], str | None, Mapping[str, Any] | None]],
+    stage: str,
+    config: StrategyV2ApifyConfig,
+    result_cache: ApifyResultCache | None,
+) -> None:
+    for actor_id, _payload, _config_id, _config_metadata in planned_runs:
+        _ensure_actor_allowed(actor_id=actor_id, allowlist=config.allowed_actor_ids)
+    runs = [
+        ScheduledApifyRun(
+            run_index=scheduler.next_run_index(),
+            actor_id=actor_id,
+            actor_key=_normalize_actor_id(actor_id),
+            platform=_actor_platform(actor_id=actor_id, config=config, config_metadata=config_metadata),
+            priority=_RUN_PRIORITY_BY_STAGE[stage],
+            input_payload=payload,
+            config_id=config_id,
+            config_metadata=config_metadata,
+            stage=stage,
+        )
+        for actor_id, payload, config_id, config_metadata in planned_runs
+    ]
 
-    def _flush_progress_events() -> None:
-        if progress_callback is None or progress_events is None:
-            return
-        while True:
-            try:
-                payload = progress_events.get_nowait()
-            except queue.Empty:
-                break
-            _emit_apify_progress(callback=progress_callback, event=payload)
-
-    def _execute_indexed_run(
-        run_index: int,
-        actor_id: str,
-        payload: dict[str, Any],
-        run_config_id: str | None,
-        run_config_metadata: Mapping[str, Any] | None,
-    ) -> tuple[int, dict[str, Any]]:
-        try:
-            result = _execute_actor(
-                client=client,
-                actor_id=actor_id,
-                input_payload=payload,
-                max_wait_seconds=max_wait_seconds,
-                max_items_per_dataset=max_items_per_dataset,
-                config_id=run_config_id,
-                config_metadata=run_config_metadata,
-                progress_callback=_enqueue_progress if progress_events is not None else None,
-                run_index=run_index,
-                planned_run_count=planned_run_count,
+    cached_results = (
+        result_cache.lookup_many(
+            [(run.actor_key, run.input_payload, config.max_items_per_dataset) for run in runs]
+        )
+        if result_cache is not None
+        else [None] * len(runs)
+    )
+    for run, cached in zip(runs, cached_results, strict=True):
+        if cached is not None:
+            # Serve fresh cached outputs immediately; only misses are dispatched to Apify.
+            scheduler.emit(
+                {
+                    "event": "actor_run_cache_hit",
+                    "actor_id": run.actor_id,
+                    "config_id": run.config_id,
+                    "run_id": cached.run_id,
+                    "run_index": run.run_index,
+                    "planned_run_count": scheduler.scheduled_count,
+                }
             )
-        except Exception as exc:
-            _emit_apify_progress(
-                callback=_enqueue_progress if progress_events is not None else None,
-                event={
-                    "event": "actor_run_failed",
-                    "actor_id": actor_id,
-                    "config_id": run_config_id,
-                    "run_index": run_index,
-                    "planned_run_count": planned_run_count,
-                    "error": str(exc),
-                    "status": "FAILED",
+            scheduler.complete(
+                run,
+                {
+                    "config_id": run.config_id,
+                    "config_metadata": dict(run.config_metadata) if isinstance(run.config_metadata, Mapping) else {},
+                    "actor_id": run.actor_id,
+                    "run_id": cached.run_id,
+                    "status": "SUCCEEDED",
+                    "dataset_id": cached.dataset_id,
+                    "input_payload": run.input_payload,
+                    "items": cached.items,
+                    "cache": {"hit": True, "key": cached.key, "cached_at": cached.cached_at.isoformat()},
                 },
             )
-            result = {
-                "config_id": run_config_id,
-                "config_metadata": dict(run_config_metadata) if isinstance(run_config_metadata, Mapping) else {},
-                "actor_id": actor_id,
-                "run_id": "",
-                "status": "FAILED",
-                "dataset_id": "",
-                "input_payload": payload,
-                "items": [],
-                "error": str(exc),
-            }
-        return run_index, result
-
-    for run_index, actor_id, _payload, config_id, _config_metadata in indexed_runs:
-        _emit_apify_progress(
-            callback=progress_callback,
-            event={
+            continue
+        scheduler.emit(
+            {
                 "event": "actor_run_dispatch",
-                "actor_id": actor_id,
-                "config_id": config_id,
-                "run_index": run_index,
-                "planned_run_count": planned_run_count,
-            },
+                "actor_id": run.actor_id,
+                "config_id": run.config_id,
+                "run_index": run.run_index,
+                "planned_run_count": scheduler.scheduled_count,
+            }
         )
-
-    results_by_index: dict[int, dict[str, Any]] = {}
-    pending_futures: set[concurrent.futures.Future[tuple[int, dict[str, Any]]]] = set()
-    max_workers = max(1, min(max_parallel_actor_runs, len(indexed_runs)))
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for run_index, actor_id, payload, config_id, config_metadata in indexed_runs:
-            future = executor.submit(
-                _execute_indexed_run,
-                run_index,
-                actor_id,
-                payload,
-                config_id,
-                config_metadata,
-            )
-            pending_futures.add(future)
-        try:
-            while pending_futures:
-                done_futures, pending_futures = concurrent.futures.wait(
-                    pending_futures,
-                    timeout=2.0,
-                    return_when=concurrent.futures.FIRST_COMPLETED,
-                )
-                _flush_progress_events()
-                for done_future in done_futures:
-                    run_index, result = done_future.result()
-                    results_by_index[run_index] = result
-        except Exception:
-            for pending_future in pending_futures:
-                pending_future.cancel()
-            _flush_progress_events()
-            raise
-        finally:
-            _flush_progress_events()
-
-    return [results_by_index[idx] for idx in sorted(results_by_index)]
+        scheduler.submit(run)
 
 
 def _normalize_candidate_assets(*, raw_runs: list[dict[str, Any]], seed_urls: list[str]) -> list[dict[str, Any]]:
@@ -2017,6 +2102,15 @@ def run_strategy_v2_apify_ingestion(
         )
 
     apify = ApifyClient()
+    result_cache = (
+        ApifyResultCache(
+            storage=MediaStorage(),
+            default_ttl_seconds=config.result_cache_ttl_seconds,
+            ttl_by_actor=config.result_cache_ttl_by_actor,
+        )
+        if config.result_cache_enabled
+        else None
+    )
     raw_runs: list[dict[str, Any]] = []
 
     urls_by_platform: dict[str, list[str]] = {}
@@ -2120,62 +2214,73 @@ def run_strategy_v2_apify_ingestion(
         )
 
     strategy_config_run_count = len(normalized_strategy_configs) if normalized_strategy_configs else len(planned_runs)
-    raw_runs = _execute_planned_runs_parallel(
-        client=apify,
-        planned_runs=planned_runs,
-        allowlist=config.allowed_actor_ids,
-        max_wait_seconds=config.max_wait_seconds,
-        max_items_per_dataset=config.max_items_per_dataset,
-        max_parallel_actor_runs=config.max_parallel_actor_runs,
+    scheduler = ApifyRunScheduler(
+        execute=lambda run: _execute_scheduled_run(
+            run,
+            client=apify,
+            scheduler=scheduler,
+            max_wait_seconds=config.max_wait_seconds,
+            max_items_per_dataset=config.max_items_per_dataset,
+            result_cache=result_cache,
+        ),
+        max_parallel_runs=config.max_parallel_actor_runs,
+        max_parallel_runs_per_actor=config.max_parallel_runs_per_actor,
+        max_parallel_runs_per_platform=config.max_parallel_runs_per_platform,
         progress_callback=progress_callback,
-        run_index_offset=0,
-        planned_run_count=len(planned_runs),
     )
-
     fanout_runs: list[tuple[str, dict[str, Any], str | None, Mapping[str, Any] | None]] = []
-    if config.discovery_fanout_enabled:
-        fanout_runs = _build_discovery_destination_runs(raw_runs=raw_runs, config=config)
+    base_results: dict[int, dict[str, Any]] = {}
+
+    def _schedule(
+        runs: list[tuple[str, dict[str, Any], str | None, Mapping[str, Any] | None]],
+        *,
+        stage: str,
+    ) -> None:
+        _schedule_planned_runs(
+            scheduler=scheduler,
+            planned_runs=runs,
+            stage=stage,
+            config=config,
+            result_cache=result_cache,
+        )
+
+    def _on_result(run: ScheduledApifyRun, result: dict[str, Any]) -> None:
+        if run.stage != "base":
+            return
+        base_results[run.run_index] = result
+        if len(base_results) < len(planned_runs) or not config.discovery_fanout_enabled:
+            return
+        # Fan-out caps URLs per query/domain across all discovery results, so it waits for every base run.
+        fanout_runs.extend(
+            _build_discovery_destination_runs(
+                raw_runs=[base_results[index] for index in sorted(base_results)],
+                config=config,
+            )
+        )
         if len(planned_runs) + len(fanout_runs) > config.max_actor_runs:
             raise RuntimeError(
                 "Strategy V2 Apify ingestion planned actor runs exceed STRATEGY_V2_APIFY_MAX_ACTOR_RUNS "
                 f"after discovery fan-out (base={len(planned_runs)}, fanout={len(fanout_runs)}, "
                 f"max={config.max_actor_runs})."
             )
-        if fanout_runs:
-            fanout_results = _execute_planned_runs_parallel(
-                client=apify,
-                planned_runs=fanout_runs,
-                allowlist=config.allowed_actor_ids,
-                max_wait_seconds=config.max_wait_seconds,
-                max_items_per_dataset=config.max_items_per_dataset,
-                max_parallel_actor_runs=config.max_parallel_actor_runs,
-                progress_callback=progress_callback,
-                run_index_offset=len(raw_runs),
-                planned_run_count=len(planned_runs) + len(fanout_runs),
-            )
-            raw_runs.extend(fanout_results)
-
-    candidate_assets_for_comments = _normalize_candidate_assets(raw_runs=raw_runs, seed_urls=canonical_refs)
-    comment_runs = _build_comment_enrichment_runs(candidate_assets=candidate_assets_for_comments, config=config)
+        _schedule(fanout_runs, stage="discovery_fanout")
+
+    _schedule(planned_runs, stage="base")
+    parent_runs = scheduler.run(on_result=_on_result)
+    # Comment enrichment ranks every base, fan-out and seed video together and takes the top N per
+    # platform in one run each, so it starts once all parent runs have returned.
+    comment_runs = _build_comment_enrichment_runs(
+        candidate_assets=_normalize_candidate_assets(raw_runs=parent_runs, seed_urls=canonical_refs),
+        config=config,
+    )
     if len(planned_runs) + len(fanout_runs) + len(comment_runs) > config.max_actor_runs:
         raise RuntimeError(
             "Strategy V2 Apify ingestion planned actor runs exceed STRATEGY_V2_APIFY_MAX_ACTOR_RUNS "
             f"after comment enrichment (base={len(planned_runs)}, fanout={len(fanout_runs)}, "
             f"comment_runs={len(comment_runs)}, max={config.max_actor_runs})."
         )
-    if comment_runs:
-        comment_results = _execute_planned_runs_parallel(
-            client=apify,
-            planned_runs=comment_runs,
-            allowlist=config.allowed_actor_ids,
-            max_wait_seconds=config.max_wait_seconds,
-            max_items_per_dataset=config.max_items_per_dataset,
-            max_parallel_actor_runs=config.max_parallel_actor_runs,
-            progress_callback=progress_callback,
-            run_index_offset=len(raw_runs),
-            planned_run_count=len(planned_runs) + len(fanout_runs) + len(comment_runs),
-        )
-        raw_runs.extend(comment_results)
+    _schedule(comment_runs, stage="comment_enrichment")
+    raw_runs = scheduler.run()
 
     if normalized_strategy_configs:
         quality_report = _validate_ingestion_quality(raw_runs=raw_runs)
@@ -2214,6 +2319,7 @@ def run_strategy_v2_apify_ingestion(
             "discovery_fanout_run_count": len(fanout_runs),
             "comment_enrichment_run_count": len(comment_runs),
             "planned_actor_run_count": len(planned_runs) + len(fanout_runs) + len(comment_runs),
+            "cache_hit_count": sum(1 for run in raw_runs if (run.get("cache") or {}).get("hit")),
             "quality_report": quality_report,
             "run_count": len(raw_runs),
             "candidate_asset_count": len(candidate_assets),
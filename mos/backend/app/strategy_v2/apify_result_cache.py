@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Mapping, Sequence
+from urllib.parse import quote
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+_CACHE_KEY_VERSION = "v1"
+_MISSING_OBJECT_CODES = {"404", "NoSuchKey", "NotFound"}
+
+
+def actor_input_hash(actor_id: str, input_payload: Mapping[str, Any]) -> str:
+    """
+    sha256 of the actor id and its canonical input (sorted keys, compact separators).
+
+    Callers pass the output of `_canonicalize_strategy_actor_input`/the payload builders, so
+    equivalent configs for the same URLs hash identically across strategy runs.
+    """
+    canonical = json.dumps(
+        {"v": _CACHE_KEY_VERSION, "actor_id": actor_id, "input": input_payload},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class ApifyCachedResult:
+    key: str
+    run_id: str
+    dataset_id: str
+    cached_at: datetime
+    items: list[dict[str, Any]]
+
+
+class ApifyResultCache:
+    """
+    Content-addressed cache of actor dataset items, keyed by (actor_id, canonical input hash).
+
+    Entries are gzipped JSON objects in media storage under `<prefix>/apify-cache/`. Freshness is
+    per actor: an entry older than the actor's TTL is a miss and is overwritten by the next run;
+    a TTL of 0 disables caching for that actor. Entries are never deleted (media storage has no
+    delete path); a bucket lifecycle rule on the prefix can expire them.
+    """
+
+    def __init__(
+        self,
+        *,
+        storage: Any,
+        default_ttl_seconds: int,
+        ttl_by_actor: Mapping[str, int] | None = None,
+        clock: Callable[[], datetime] | None = None,
+    ) -> None:
+        self.storage = storage
+        self.default_ttl_seconds = max(0, int(default_ttl_seconds))
+        self.ttl_by_actor = dict(ttl_by_actor or {})
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+
+    def ttl_seconds(self, actor_id: str) -> int:
+        return max(0, int(self.ttl_by_actor.get(actor_id, self.default_ttl_seconds)))
+
+    def object_key(self, actor_id: str, input_hash: str) -> str:
+        parts = [p for p in [self.storage.prefix, "apify-cache", quote(actor_id, safe="~-._")] if p]
+        parts.append(input_hash[:2])
+        return "/".join(parts + [f"{input_hash}.json.gz"])
+
+    def lookup(
+        self,
+        *,
+        actor_id: str,
+        input_payload: Mapping[str, Any],
+        max_items: int,
+    ) -> ApifyCachedResult | None:
+        ttl = self.ttl_seconds(actor_id)
+        if ttl <= 0:
+            return None
+        key = self.object_key(actor_id, actor_input_hash(actor_id, input_payload))
+        try:
+            data, _content_type = self.storage.download_bytes(key=key, bucket=self.storage.bucket)
+        except ClientError as exc:
+            code = exc.response.get("Error", {}).get("Code") if hasattr(exc, "response") else None
+            if code in _MISSING_OBJECT_CODES:
+                return None
+            self._log_lookup_failure("strategy_v2.apify_cache.lookup_failed", actor_id=actor_id, key=key)
+            return None
+        except Exception:  # noqa: BLE001
+            self._log_lookup_failure("strategy_v2.apify_cache.lookup_failed", actor_id=actor_id, key=key)
+            return None
+        try:
+            entry = json.loads(gzip.decompress(data))
+            cached_at = datetime.fromisoformat(str(entry["cached_at"]))
+            age_seconds = (self._clock() - cached_at).total_seconds()
+            items = [item for item in entry.get("items") or [] if isinstance(item, dict)]
+            fetched_limit = int(entry.get("max_items") or 0)
+        except Exception:  # noqa: BLE001
+            # Truncated or foreign objects are a miss; the next successful run overwrites them.
+            self._log_lookup_failure("strategy_v2.apify_cache.corrupt_entry", actor_id=actor_id, key=key)
+            return None
+        if age_seconds > ttl:
+            return None
+        # An entry fetched with a smaller limit only answers larger requests if it drained the dataset.
+        if fetched_limit < max_items and len(items) >= fetched_limit:
+            return None
+        return ApifyCachedResult(
+            key=key,
+            run_id=str(entry.get("run_id") or ""),
+            dataset_id=str(entry.get("dataset_id") or ""),
+            cached_at=cached_at,
+            items=items[:max_items],
+        )
+
+    @staticmethod
+    def _log_lookup_failure(event: str, *, actor_id: str, key: str) -> None:
+        # A cache that cannot be read must not fail the ingestion; the actor is run instead.
+        logger.warning(event, extra={"actor_id": actor_id, "key": key}, exc_info=True)
+
+    def lookup_many(
+        self, requests: Sequence[tuple[str, Mapping[str, Any], int]]
+    ) -> list[ApifyCachedResult | None]:
+        """Look up (actor_id, input_payload, max_items) requests concurrently on the storage IO pool."""
+        futures = [
+            self.storage.submit(self.lookup, actor_id=actor_id, input_payload=payload, max_items=max_items)
+            for actor_id, payload, max_items in requests
+        ]
+        return [future.result() for future in futures]
+
+    def store(
+        self,
+        *,
+        actor_id: str,
+        input_payload: Mapping[str, Any],
+        max_items: int,
+        run_id: str,
+        dataset_id: str,
+        items: list[dict[str, Any]],
+    ) -> str | None:
+        if self.ttl_seconds(actor_id) <= 0:
+            return None
+        input_hash = actor_input_hash(actor_id, input_payload)
+        key = self.object_key(actor_id, input_hash)
+        entry = {
+            "actor_id": actor_id,
+            "input_hash": input_hash,
+            "cached_at": self._clock().isoformat(),
+            "run_id": run_id,
+            "dataset_id": dataset_id,
+            "max_items": max_items,
+            "items": items,
+        }
+        try:
+            self.storage.upload_bytes(
+                bucket=self.storage.bucket,
+                key=key,
+                data=gzip.compress(json.dumps(entry, ensure_ascii=False, default=str).encode("utf-8")),
+                content_type="application/gzip",
+            )
+        except Exception:  # noqa: BLE001
+            # The run already succeeded and is paid for; losing the cache write must not lose the result.
+            logger.warning(
+                "strategy_v2.apify_cache.store_failed",
+                extra={"actor_id": actor_id, "key": key},
+                exc_info=True,
+            )
+            return None
+        return key
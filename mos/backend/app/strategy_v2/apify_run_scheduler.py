@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import concurrent.futures
+import heapq
+import queue
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+
+@dataclass(frozen=True)
+class ScheduledApifyRun:
+    run_index: int
+    actor_id: str
+    actor_key: str
+    platform: str
+    priority: int
+    input_payload: dict[str, Any]
+    config_id: str | None = None
+    config_metadata: Mapping[str, Any] | None = None
+    stage: str = "base"
+
+
+class ApifyRunScheduler:
+    """
+    Runs Apify actor runs on a thread pool under global, per-actor and per-platform caps.
+
+    Ready runs start in (priority, run_index) order; a run whose actor or platform is at its cap
+    waits without blocking lower-priority runs of other actors. Workers report completions and
+    progress events through one queue that `run` blocks on, so follow-up runs submitted from
+    `on_result` start as soon as their parent returns, and every callback runs on the caller thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        execute: Callable[[ScheduledApifyRun], dict[str, Any]],
+        max_parallel_runs: int,
+        max_parallel_runs_per_actor: int,
+        max_parallel_runs_per_platform: int,
+        progress_callback: Callable[[dict[str, Any]], None] | None = None,
+    ) -> None:
+        self._execute = execute
+        self.max_parallel_runs = max(1, int(max_parallel_runs))
+        self.max_parallel_runs_per_actor = max(1, int(max_parallel_runs_per_actor))
+        self.max_parallel_runs_per_platform = max(1, int(max_parallel_runs_per_platform))
+        self._progress_callback = progress_callback
+        self._events: queue.SimpleQueue[tuple[Any, ...]] = queue.SimpleQueue()
+        self._ready: list[tuple[int, int, ScheduledApifyRun]] = []
+        self._running_by_actor: Counter[str] = Counter()
+        self._running_by_platform: Counter[str] = Counter()
+        self._running = 0
+        self._outstanding = 0
+        self.scheduled_count = 0
+        self.results: dict[int, dict[str, Any]] = {}
+
+    @property
+    def progress_enabled(self) -> bool:
+        return self._progress_callback is not None
+
+    def next_run_index(self) -> int:
+        self.scheduled_count += 1
+        return self.scheduled_count
+
+    def submit(self, run: ScheduledApifyRun) -> None:
+        heapq.heappush(self._ready, (run.priority, run.run_index, run))
+        self._outstanding += 1
+
+    def complete(self, run: ScheduledApifyRun, result: dict[str, Any]) -> None:
+        """Record a run resolved without executing it (a cache hit); `on_result` still sees it."""
+        self._outstanding += 1
+        self._events.put(("done", run, result, None, False))
+
+    def emit(self, event: Mapping[str, Any]) -> None:
+        """Thread-safe progress hook for workers; delivered to the callback on the caller thread."""
+        if self._progress_callback is not None:
+            self._events.put(("progress", dict(event)))
+
+    def run(
+        self,
+        on_result: Callable[[ScheduledApifyRun, dict[str, Any]], None] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Drain all submitted runs, including ones `on_result` adds; results in run_index order."""
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_parallel_runs)
+        try:
+            with executor:
+                try:
+                    while self._outstanding:
+                        self._start_ready(executor)
+                        event = self._events.get()
+                        if event[0] == "progress":
+                            self._progress_callback(event[1])
+                            continue
+                        _kind, run, result, error, started = event
+                        self._outstanding -= 1
+                        if started:
+                            self._running -= 1
+                            self._running_by_actor[run.actor_key] -= 1
+                            self._running_by_platform[run.platform] -= 1
+                        if error is not None:
+                            raise error
+                        self.results[run.run_index] = result
+                        if on_result is not None:
+                            on_result(run, result)
+                except BaseException:
+                    # Runs not yet started are dropped; in-flight ones finish before the pool exits.
+                    self._ready.clear()
+                    raise
+        finally:
+            self._flush_progress()
+        return [self.results[index] for index in sorted(self.results)]
+
+    def _start_ready(self, executor: concurrent.futures.Executor) -> None:
+        deferred: list[tuple[int, int, ScheduledApifyRun]] = []
+        while self._ready and self._running < self.max_parallel_runs:
+            entry = heapq.heappop(self._ready)
+            run = entry[2]
+            if (
+                self._running_by_actor[run.actor_key] >= self.max_parallel_runs_per_actor
+                or self._running_by_platform[run.platform] >= self.max_parallel_runs_per_platform
+            ):
+                deferred.append(entry)
+                continue
+            self._running += 1
+            self._running_by_actor[run.actor_key] += 1
+            self._running_by_platform[run.platform] += 1
+            executor.submit(self._work, run)
+        for entry in deferred:
+            heapq.heappush(self._ready, entry)
+
+    def _work(self, run: ScheduledApifyRun) -> None:
+        try:
+            result = self._execute(run)
+        except BaseException as exc:  # noqa: BLE001
+            self._events.put(("done", run, None, exc, True))
+            return
+        self._events.put(("done", run, result, None, True))
+
+    def _flush_progress(self) -> None:
+        while True:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                return
+            if event[0] == "progress" and self._progress_callback is not None:
+                self._progress_callback(event[1])
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import concurrent.futures
 import os
+import threading
 from collections import Counter
 from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
@@ -11,9 +15,11 @@ from temporalio import activity
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.ads.incremental import KnownAdState, ad_needs_upsert, needs_full_refresh
 from app.ads.ingestors.registry import IngestorRegistry
 from app.ads.normalization import derive_primary_domain, normalize_facebook_page_url, normalize_url
-from app.ads.types import NormalizeContext
+from app.ads.types import NormalizeContext, NormalizedAdWithAssets
+from app.config import settings
 from app.db.enums import (
     AdChannelEnum,
     AdIngestStatusEnum,
@@ -29,6 +35,7 @@ from app.ads.apify_client import ApifyClient
 from app.db.models import Ad, AdFacts, AdScore, Brand, Job, ResearchRun, ResearchRunBrand
 from app.services.ad_breakdown import extract_teardown_header_fields
 from app.services.media_mirror import MediaMirrorService
+from app.services.media_mirror_queue import MediaMirrorQueue
 
 
 @contextmanager
@@ -117,15 +124,312 @@ def upsert_brands_and_identities_activity(params: Dict[str, Any]) -> Dict[str, A
         }
 
 
+@dataclass
+class _IdentityIngestPlan:
+    """Requests for one identity, resolved up front so workers never share a session."""
+
+    index: int
+    identity_id: str
+    brand_id: str
+    channel: AdChannelEnum
+    requests: List[Any]
+
+
+def _failed_ingest_run_entry(*, ingest_run_id: str, identity_id: str, error: str) -> Dict[str, Any]:
+    return {
+        "ad_ingest_run_id": ingest_run_id,
+        "brand_channel_identity_id": identity_id,
+        "items_count": 0,
+        "provider_run_id": None,
+        "provider_dataset_id": None,
+        "requested_url": None,
+        "actor_input": None,
+        "status": AdIngestStatusEnum.FAILED.value,
+        "error": error,
+    }
+
+
+def _heartbeat_ingest_progress(progress: Dict[str, Dict[str, Any]], *, identity_count: int) -> None:
+    completed = [
+        identity_id
+        for identity_id, state in progress.items()
+        if state.get("status") in {AdIngestStatusEnum.SUCCEEDED.value, AdIngestStatusEnum.FAILED.value}
+    ]
+    try:
+        activity.heartbeat(
+            {
+                "phase": "ads_ingestion",
+                "identity_count": identity_count,
+                "completed_identities": len(completed),
+                "identities": {identity_id: dict(state) for identity_id, state in progress.items()},
+            }
+        )
+    except RuntimeError:
+        return
+
+
+def _ingest_identity(
+    plan: _IdentityIngestPlan,
+    *,
+    research_run_id: str,
+    results_limit: Optional[int],
+    upsert_batch_size: int,
+    mirror_inline: bool,
+    incremental: bool,
+    full_refresh_after: timedelta,
+    registry: IngestorRegistry,
+    progress: Dict[str, Dict[str, Any]],
+    progress_lock: threading.Lock,
+) -> Dict[str, Any]:
+    """
+    Run every request for one identity with its own session and AdIngestRun bookkeeping.
+
+    In incremental mode, once the identity has a recent full pass (see AdIngestWatermark), items whose
+    change key matches the stored ad skip normalization and upsert and only get last_seen_at bumped.
+    The brand's brand_ad_stats row is refreshed once when the identity finishes, not per batch.
+    """
+
+    def _set_progress(**fields: Any) -> None:
+        with progress_lock:
+            progress[plan.identity_id].update(fields)
+
+    requests = plan.requests
+    ingestor = registry.get(plan.channel)
+    ad_ids: List[str] = []
+    with _repo() as repo:
+        mirror_service = MediaMirrorService(repo.session) if mirror_inline else None
+        ingest_run = repo.start_ingest_run(
+            research_run_id=research_run_id,
+            brand_channel_identity_id=plan.identity_id,
+            channel=plan.channel,
+            requested_url=requests[0].url if requests else None,
+            provider="APIFY",
+            results_limit=results_limit,
+        )
+        items_count = 0
+        unchanged_count = 0
+        upserted_count = 0
+        max_ad_last_seen_at: Optional[datetime] = None
+        known_ads: Optional[Dict[str, KnownAdState]] = None
+        full_refresh = True
+        if incremental:
+            watermark = repo.ingest_watermark(plan.identity_id)
+            full_refresh = needs_full_refresh(
+                watermark.last_full_refresh_at if watermark else None,
+                now=datetime.now(timezone.utc),
+                max_age=full_refresh_after,
+            )
+            if not full_refresh:
+                known_ads = repo.known_ad_states(brand_channel_identity_id=plan.identity_id, channel=plan.channel)
+        provider_run_id: Optional[str] = None
+        provider_dataset_id: Optional[str] = None
+        actor_input: Optional[Dict[str, Any]] = None
+        _set_progress(status=AdIngestStatusEnum.RUNNING.value, ad_ingest_run_id=str(ingest_run.id))
+        activity.logger.info(
+            "ads_ingestion.ingest.start",
+            extra={
+                "research_run_id": research_run_id,
+                "brand_channel_identity_id": plan.identity_id,
+                "channel": plan.channel.value,
+                "mode": "full" if full_refresh else "incremental",
+            },
+        )
+        pending: List[NormalizedAdWithAssets] = []
+        pending_touch: Dict[str, Optional[datetime]] = {}
+
+        def _note_last_seen(value: Optional[datetime]) -> None:
+            nonlocal max_ad_last_seen_at
+            if value is not None and (max_ad_last_seen_at is None or value > max_ad_last_seen_at):
+                max_ad_last_seen_at = value
+
+        def _flush_touch() -> None:
+            nonlocal items_count, unchanged_count
+            if not pending_touch:
+                return
+            ad_ids.extend(
+                repo.touch_ads_last_seen(
+                    channel=plan.channel,
+                    last_seen_by_external_id=pending_touch,
+                )
+            )
+            items_count += len(pending_touch)
+            unchanged_count += len(pending_touch)
+            pending_touch.clear()
+            _set_progress(items_count=items_count, unchanged_count=unchanged_count)
+
+        def _flush_pending() -> None:
+            nonlocal items_count, upserted_count
+            if not pending:
+                return
+            upserted = repo.upsert_ads_batch(
+                brand_id=plan.brand_id,
+                brand_channel_identity_id=plan.identity_id,
+                channel=plan.channel,
+                normalized=pending,
+                chunk_size=upsert_batch_size,
+            )
+            for ad_row, media_assets in upserted:
+                # New media rows are left `pending` for the mirror queue unless inline mirroring was requested.
+                if media_assets and mirror_service is not None:
+                    try:
+                        mirror_service.mirror_assets(media_assets)
+                    except Exception:
+                        repo.session.rollback()
+                        raise
+                ad_ids.append(str(ad_row.id))
+            items_count += len(pending)
+            upserted_count += len(pending)
+            pending.clear()
+            _set_progress(items_count=items_count)
+
+        try:
+            for request in requests:
+                # Items stream page by page, so upserts start before the dataset is fully downloaded.
+                for raw in ingestor.iter_items(request):
+                    meta = raw.metadata or {}
+                    provider_run_id = provider_run_id or meta.get("provider_run_id")
+                    provider_dataset_id = provider_dataset_id or meta.get("dataset_id")
+                    actor_input = actor_input or meta.get("actor_input")
+                    if known_ads is not None:
+                        change_key = ingestor.change_key(raw)
+                        if change_key is not None and not ad_needs_upsert(
+                            change_key, known_ads.get(change_key.external_ad_id)
+                        ):
+                            _note_last_seen(change_key.last_seen_at)
+                            pending_touch[change_key.external_ad_id] = change_key.last_seen_at
+                            if len(pending_touch) >= upsert_batch_size:
+                                _flush_touch()
+                            continue
+                    ctx = NormalizeContext(
+                        brand_id=plan.brand_id,
+                        brand_channel_identity_id=plan.identity_id,
+                        research_run_id=research_run_id,
+                        ingest_run_id=ingest_run.id,
+                    )
+                    normalized = ingestor.normalize(raw, ctx)
+                    if not normalized:
+                        continue
+                    _note_last_seen(normalized.last_seen_at)
+                    pending.append(normalized)
+                    if len(pending) >= upsert_batch_size:
+                        _flush_pending()
+                _flush_pending()
+                _flush_touch()
+            if ad_ids:
+                repo.refresh_brand_ad_stats(brand_ids=[plan.brand_id])
+            repo.mark_ingest_success(
+                ingest_run.id,
+                items_count=items_count,
+                provider_run_id=provider_run_id,
+                provider_dataset_id=provider_dataset_id,
+                is_partial=bool(results_limit and items_count >= results_limit),
+            )
+            repo.record_ingest_watermark(
+                brand_channel_identity_id=plan.identity_id,
+                channel=plan.channel,
+                ingest_run_id=ingest_run.id,
+                full_refresh=full_refresh,
+                seen_count=items_count,
+                upserted_count=upserted_count,
+                max_ad_last_seen_at=max_ad_last_seen_at,
+            )
+            _set_progress(status=AdIngestStatusEnum.SUCCEEDED.value, items_count=items_count)
+            return {
+                "ingest_run": {
+                    "ad_ingest_run_id": ingest_run.id,
+                    "brand_channel_identity_id": plan.identity_id,
+                    "items_count": items_count,
+                    "unchanged_count": unchanged_count,
+                    "provider_run_id": provider_run_id,
+                    "provider_dataset_id": provider_dataset_id,
+                    "requested_url": requests[0].url if requests else None,
+                    "actor_input": actor_input,
+                    "status": AdIngestStatusEnum.SUCCEEDED.value,
+                    "error": None,
+                },
+                "ad_ids": ad_ids,
+            }
+        except Exception as exc:  # noqa: BLE001
+            repo.session.rollback()
+            if ad_ids:
+                # Batches flushed before the failure are committed; keep the brand rollup in step with them.
+                repo.refresh_brand_ad_stats(brand_ids=[plan.brand_id])
+            repo.mark_ingest_failure(
+                ingest_run.id,
+                error=str(exc),
+                provider_run_id=provider_run_id,
+                provider_dataset_id=provider_dataset_id,
+                items_count=items_count,
+            )
+            _set_progress(status=AdIngestStatusEnum.FAILED.value, items_count=items_count)
+            activity.logger.error(
+                "ads_ingestion.ingest.error",
+                extra={
+                    "research_run_id": research_run_id,
+                    "brand_channel_identity_id": plan.identity_id,
+                    "error": str(exc),
+                },
+            )
+            return {
+                "ingest_run": {
+                    "ad_ingest_run_id": ingest_run.id,
+                    "brand_channel_identity_id": plan.identity_id,
+                    "items_count": items_count,
+                    "unchanged_count": unchanged_count,
+                    "provider_run_id": provider_run_id,
+                    "provider_dataset_id": provider_dataset_id,
+                    "requested_url": requests[0].url if requests else None,
+                    "actor_input": actor_input,
+                    "status": AdIngestStatusEnum.FAILED.value,
+                    "error": str(exc),
+                },
+                # Ads committed before the failure are still ingested rows.
+                "ad_ids": ad_ids,
+            }
+
+
 @activity.defn
 def ingest_ads_for_identities_activity(params: Dict[str, Any]) -> Dict[str, Any]:
     research_run_id = params["research_run_id"]
     identity_ids = params.get("brand_channel_identity_ids")
     results_limit = params.get("results_limit")
+    concurrency_raw = params.get("identity_concurrency") or os.getenv("ADS_INGEST_IDENTITY_CONCURRENCY", "4")
+    try:
+        identity_concurrency = int(concurrency_raw)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"identity_concurrency must be an integer, got {concurrency_raw!r}.") from exc
+    if identity_concurrency <= 0:
+        raise ValueError(f"identity_concurrency must be > 0, got {identity_concurrency}.")
+    batch_size_raw = params.get("upsert_batch_size") or os.getenv("ADS_INGEST_UPSERT_BATCH_SIZE", "200")
+    try:
+        upsert_batch_size = int(batch_size_raw)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"upsert_batch_size must be an integer, got {batch_size_raw!r}.") from exc
+    if upsert_batch_size <= 0:
+        raise ValueError(f"upsert_batch_size must be > 0, got {upsert_batch_size}.")
+    mirror_inline = bool(params.get("mirror_inline", False))
+    incremental_raw = params.get("incremental")
+    if incremental_raw is None:
+        incremental_raw = os.getenv("ADS_INGEST_INCREMENTAL", "true").strip().lower() in {"1", "true", "yes", "on"}
+    incremental = bool(incremental_raw)
+    full_refresh_days_raw = params.get("full_refresh_after_days") or os.getenv("ADS_INGEST_FULL_REFRESH_DAYS", "7")
+    try:
+        full_refresh_after_days = float(full_refresh_days_raw)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"full_refresh_after_days must be a number, got {full_refresh_days_raw!r}.") from exc
+    if full_refresh_after_days <= 0:
+        raise ValueError(f"full_refresh_after_days must be > 0, got {full_refresh_after_days}.")
 
     apify_client = ApifyClient()
     registry = IngestorRegistry(apify_client)
 
+    # Results are keyed by identity position so the output order matches the serial implementation.
+    ingest_runs_by_index: Dict[int, Dict[str, Any]] = {}
+    ingested_ad_ids: set[str] = set()
+    seen_page_urls: set[str] = set()
+    skipped_duplicates: List[Dict[str, Any]] = []
+    plans: List[_IdentityIngestPlan] = []
+
     with _repo() as repo:
         run = repo.session.get(ResearchRun, research_run_id)
         if not run:
@@ -136,7 +440,6 @@ def ingest_ads_for_identities_activity(params: Dict[str, Any]) -> Dict[str, Any]
                 "cannot link brands to a product."
             )
 
-        mirror_service = MediaMirrorService(repo.session)
         identities = repo.identities_for_run(research_run_id) if not identity_ids else []
         if identity_ids:
             identity_strs = {str(i) for i in identity_ids}
@@ -149,11 +452,8 @@ def ingest_ads_for_identities_activity(params: Dict[str, Any]) -> Dict[str, Any]
             )
             raise RuntimeError(f"No brand channel identities found for research run {research_run_id}")
 
-        ingest_runs: List[Dict[str, Any]] = []
-        ingested_ad_ids: set[str] = set()
-        seen_page_urls: set[str] = set()
-        skipped_duplicates: List[Dict[str, Any]] = []
-        for identity in identities:
+        # Plan serially: request building is local, and seen_page_urls dedupe must follow identity order.
+        for index, identity in enumerate(identities):
             repo.ensure_product_brand_relationship(
                 org_id=str(run.org_id),
                 client_id=str(run.client_id),
@@ -181,18 +481,10 @@ def ingest_ads_for_identities_activity(params: Dict[str, Any]) -> Dict[str, Any]
                     error=f"build_requests_failed: {exc}",
                     items_count=0,
                 )
-                ingest_runs.append(
-                    {
-                        "ad_ingest_run_id": ingest_run.id,
-                        "brand_channel_identity_id": identity.id,
-                        "items_count": 0,
-                        "provider_run_id": None,
-                        "provider_dataset_id": None,
-                        "requested_url": None,
-                        "actor_input": None,
-                        "status": AdIngestStatusEnum.FAILED.value,
-                        "error": f"build_requests_failed: {exc}",
-                    }
+                ingest_runs_by_index[index] = _failed_ingest_run_entry(
+                    ingest_run_id=ingest_run.id,
+                    identity_id=identity.id,
+                    error=f"build_requests_failed: {exc}",
                 )
                 activity.logger.warning(
                     "ads_ingestion.ingest.requests_missing",
@@ -238,18 +530,10 @@ def ingest_ads_for_identities_activity(params: Dict[str, Any]) -> Dict[str, Any]
                     error="build_requests_empty",
                     items_count=0,
                 )
-                ingest_runs.append(
-                    {
-                        "ad_ingest_run_id": ingest_run.id,
-                        "brand_channel_identity_id": identity.id,
-                        "items_count": 0,
-                        "provider_run_id": None,
-                        "provider_dataset_id": None,
-                        "requested_url": None,
-                        "actor_input": None,
-                        "status": AdIngestStatusEnum.FAILED.value,
-                        "error": "build_requests_empty",
-                    }
+                ingest_runs_by_index[index] = _failed_ingest_run_entry(
+                    ingest_run_id=ingest_run.id,
+                    identity_id=identity.id,
+                    error="build_requests_empty",
                 )
                 activity.logger.warning(
                     "ads_ingestion.ingest.requests_empty",
@@ -260,145 +544,226 @@ def ingest_ads_for_identities_activity(params: Dict[str, Any]) -> Dict[str, Any]
                     },
                 )
                 continue
-            ingest_run = repo.start_ingest_run(
-                research_run_id=research_run_id,
-                brand_channel_identity_id=identity.id,
-                channel=identity.channel,
-                requested_url=requests[0].url if requests else None,
-                provider="APIFY",
-                results_limit=results_limit,
-            )
-            items_count = 0
-            provider_run_id: Optional[str] = None
-            provider_dataset_id: Optional[str] = None
-            actor_input: Optional[Dict[str, Any]] = None
-            activity.logger.info(
-                "ads_ingestion.ingest.start",
-                extra={
-                    "research_run_id": research_run_id,
-                    "brand_channel_identity_id": identity.id,
-                    "channel": identity.channel.value,
-                },
-            )
-            try:
-                for request in requests:
-                    raw_items = ingestor.run(request)
-                    for raw in raw_items:
-                        meta = raw.metadata or {}
-                        provider_run_id = provider_run_id or meta.get("provider_run_id")
-                        provider_dataset_id = provider_dataset_id or meta.get("dataset_id")
-                        actor_input = actor_input or meta.get("actor_input")
-                        ctx = NormalizeContext(
-                            brand_id=identity.brand_id,
-                            brand_channel_identity_id=identity.id,
-                            research_run_id=research_run_id,
-                            ingest_run_id=ingest_run.id,
-                        )
-                        normalized = ingestor.normalize(raw, ctx)
-                        if not normalized:
-                            continue
-                        ad_row, media_assets = repo.upsert_ad_with_assets(
-                            brand_id=identity.brand_id,
-                            brand_channel_identity_id=identity.id,
-                            channel=identity.channel,
-                            normalized=normalized,
-                        )
-                        if media_assets:
-                            try:
-                                mirror_service.mirror_assets(media_assets)
-                            except Exception:
-                                repo.session.rollback()
-                                raise
-                        ingested_ad_ids.add(str(ad_row.id))
-                        items_count += 1
-                repo.mark_ingest_success(
-                    ingest_run.id,
-                    items_count=items_count,
-                    provider_run_id=provider_run_id,
-                    provider_dataset_id=provider_dataset_id,
-                    is_partial=bool(results_limit and items_count >= results_limit),
-                )
-                ingest_runs.append(
-                    {
-                        "ad_ingest_run_id": ingest_run.id,
-                        "brand_channel_identity_id": identity.id,
-                        "items_count": items_count,
-                        "provider_run_id": provider_run_id,
-                        "provider_dataset_id": provider_dataset_id,
-                        "requested_url": requests[0].url if requests else None,
-                        "actor_input": actor_input,
-                        "status": AdIngestStatusEnum.SUCCEEDED.value,
-                        "error": None,
-                    }
-                )
-            except Exception as exc:  # noqa: BLE001
-                repo.session.rollback()
-                repo.mark_ingest_failure(
-                    ingest_run.id,
-                    error=str(exc),
-                    provider_run_id=provider_run_id,
-                    provider_dataset_id=provider_dataset_id,
-                    items_count=items_count,
-                )
-                ingest_runs.append(
-                    {
-                        "ad_ingest_run_id": ingest_run.id,
-                        "brand_channel_identity_id": identity.id,
-                        "items_count": items_count,
-                        "provider_run_id": provider_run_id,
-                        "provider_dataset_id": provider_dataset_id,
-                        "requested_url": requests[0].url if requests else None,
-                        "actor_input": actor_input,
-                        "status": AdIngestStatusEnum.FAILED.value,
-                        "error": str(exc),
-                    }
+            plans.append(
+                _IdentityIngestPlan(
+                    index=index,
+                    identity_id=str(identity.id),
+                    brand_id=str(identity.brand_id),
+                    channel=identity.channel,
+                    requests=requests,
                 )
-                activity.logger.error(
-                    "ads_ingestion.ingest.error",
-                    extra={
-                        "research_run_id": research_run_id,
-                        "brand_channel_identity_id": identity.id,
-                        "error": str(exc),
-                    },
+            )
+        identity_count = len(identities)
+
+    progress: Dict[str, Dict[str, Any]] = {
+        plan.identity_id: {"status": "QUEUED", "items_count": 0} for plan in plans
+    }
+    progress_lock = threading.Lock()
+    if plans:
+        max_workers = max(1, min(identity_concurrency, len(plans)))
+        activity.logger.info(
+            "ads_ingestion.ingest.dispatch",
+            extra={
+                "research_run_id": research_run_id,
+                "planned_identities": len(plans),
+                "max_workers": max_workers,
+            },
+        )
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_plan = {
+                executor.submit(
+                    _ingest_identity,
+                    plan,
+                    research_run_id=research_run_id,
+                    results_limit=results_limit,
+                    upsert_batch_size=upsert_batch_size,
+                    mirror_inline=mirror_inline,
+                    incremental=incremental,
+                    full_refresh_after=timedelta(days=full_refresh_after_days),
+                    registry=registry,
+                    progress=progress,
+                    progress_lock=progress_lock,
+                ): plan
+                for plan in plans
+            }
+            pending_futures = set(future_to_plan)
+            # Heartbeat from the activity thread; worker threads have no activity context.
+            while pending_futures:
+                done_futures, pending_futures = concurrent.futures.wait(
+                    pending_futures,
+                    timeout=5.0,
+                    return_when=concurrent.futures.FIRST_COMPLETED,
                 )
-                continue
+                for done_future in done_futures:
+                    plan = future_to_plan[done_future]
+                    outcome = done_future.result()
+                    ingest_runs_by_index[plan.index] = outcome["ingest_run"]
+                    ingested_ad_ids.update(outcome["ad_ids"])
+                with progress_lock:
+                    snapshot = {identity_id: dict(state) for identity_id, state in progress.items()}
+                _heartbeat_ingest_progress(snapshot, identity_count=identity_count)
+
+    ingest_runs = [ingest_runs_by_index[idx] for idx in sorted(ingest_runs_by_index)]
+    succeeded_runs = [r for r in ingest_runs if r.get("status") == AdIngestStatusEnum.SUCCEEDED.value]
+    failed_runs = [r for r in ingest_runs if r.get("status") == AdIngestStatusEnum.FAILED.value]
+    total_items = sum(run.get("items_count", 0) for run in succeeded_runs)
+    unchanged_items = sum(run.get("unchanged_count", 0) for run in succeeded_runs)
+    status = "ok"
+    reason = None
+    if failed_runs and not succeeded_runs:
+        status = "failed"
+        reason = "all_identities_failed"
+    elif failed_runs:
+        status = "partial"
+        reason = "some_identities_failed"
+    elif total_items == 0:
+        status = "empty"
+        reason = "no_ads_returned"
+        activity.logger.warning(
+            "ads_ingestion.ingest.no_ads",
+            extra={
+                "research_run_id": research_run_id,
+                "identity_count": identity_count,
+                "skipped_duplicates": len(skipped_duplicates),
+            },
+        )
 
-        succeeded_runs = [r for r in ingest_runs if r.get("status") == AdIngestStatusEnum.SUCCEEDED.value]
-        failed_runs = [r for r in ingest_runs if r.get("status") == AdIngestStatusEnum.FAILED.value]
-        total_items = sum(run.get("items_count", 0) for run in succeeded_runs)
-        status = "ok"
-        reason = None
-        if failed_runs and not succeeded_runs:
-            status = "failed"
-            reason = "all_identities_failed"
-        elif failed_runs:
-            status = "partial"
-            reason = "some_identities_failed"
-        elif total_items == 0:
-            status = "empty"
-            reason = "no_ads_returned"
-            activity.logger.warning(
-                "ads_ingestion.ingest.no_ads",
-                extra={
-                    "research_run_id": research_run_id,
-                    "identity_count": len(identities),
-                    "skipped_duplicates": len(skipped_duplicates),
-                },
+    return {
+        "ad_ingest_runs": ingest_runs,
+        "ad_ids": sorted(ingested_ad_ids),
+        "status": status,
+        "reason": reason,
+        "skipped_duplicates": skipped_duplicates,
+        "summary": {
+            "identity_count": identity_count,
+            "succeeded_runs": len(succeeded_runs),
+            "failed_runs": len(failed_runs),
+            "total_items": total_items,
+            "unchanged_items": unchanged_items,
+        },
+    }
+
+
+@activity.defn
+def mirror_pending_media_assets_activity(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Drain the media mirror queue, optionally scoped to the assets of `ad_ids`."""
+    ad_ids = [str(ad_id) for ad_id in params.get("ad_ids") or []]
+    max_assets = params.get("max_assets")
+    queue = MediaMirrorQueue(
+        max_workers=params.get("concurrency"),
+        per_host_limit=params.get("per_host_concurrency"),
+    )
+
+    def _on_progress(payload: Dict[str, Any]) -> None:
+        try:
+            activity.heartbeat({"phase": "media_mirror", **payload})
+        except RuntimeError:
+            return
+
+    activity.logger.info(
+        "ads_ingestion.mirror_media.start",
+        extra={"ad_count": len(ad_ids), "max_workers": queue.max_workers, "per_host_limit": queue.per_host_limit},
+    )
+    stats = queue.drain(
+        ad_ids=ad_ids or None,
+        max_assets=int(max_assets) if max_assets else None,
+        wait_for_retries=bool(params.get("wait_for_retries", True)),
+        on_progress=_on_progress,
+    )
+    result = stats.as_dict()
+    if ad_ids:
+        # Media pHashes exist only once previews are mirrored, so near-duplicate clustering runs here.
+        with _repo() as repo:
+            clustering = repo.cluster_creatives(creative_ids=repo.creative_ids_for_ads(ad_ids))
+            if clustering["matched"]:
+                brand_ids = repo.session.execute(select(Ad.brand_id).where(Ad.id.in_(ad_ids)).distinct()).scalars()
+                repo.refresh_brand_ad_stats(brand_ids=[str(brand_id) for brand_id in brand_ids])
+        result["creative_clustering"] = clustering
+    activity.logger.info("ads_ingestion.mirror_media.done", extra=result)
+    return result
+
+
+@activity.defn
+def refresh_brand_ad_stats_activity(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Recompute brand_ad_stats rows for `brand_ids` (or every brand of `org_id`, or all brands).
+
+    Ingestion refreshes the brands it touches; this activity is the periodic full refresh.
+    """
+    brand_ids = params.get("brand_ids")
+    org_id = params.get("org_id")
+    with _repo() as repo:
+        refreshed = repo.refresh_brand_ad_stats(
+            brand_ids=[str(brand_id) for brand_id in brand_ids] if brand_ids is not None else None,
+            org_id=str(org_id) if org_id else None,
+        )
+    activity.logger.info(
+        "ads_ingestion.refresh_brand_ad_stats.done",
+        extra={
+            "org_id": org_id,
+            "brand_count": len(brand_ids) if brand_ids is not None else None,
+            "refreshed": refreshed,
+        },
+    )
+    return {"refreshed": refreshed}
+
+
+@activity.defn
+def rescore_ad_scores_activity(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rescore every stored ad_scores row (optionally one `org_id`) so recency decay reflects today.
+
+    Runs nightly from AdScoreRescoreWorkflow; ads are not re-ingested. Every committed batch is
+    heartbeated with its last ad id, so a retried attempt resumes after it instead of starting over.
+    """
+    org_id = params.get("org_id")
+    batch_size = int(params.get("batch_size") or 5000)
+    resume = _rescore_resume_point()
+    resumed_rescored = int(resume.get("rescored") or 0)
+
+    def _on_progress(payload: Dict[str, Any]) -> None:
+        try:
+            activity.heartbeat(
+                {
+                    "phase": "ad_score_rescore",
+                    **payload,
+                    "rescored": resumed_rescored + int(payload.get("rescored") or 0),
+                }
             )
+        except RuntimeError:
+            return
 
-        return {
-            "ad_ingest_runs": ingest_runs,
-            "ad_ids": sorted(ingested_ad_ids),
-            "status": status,
-            "reason": reason,
-            "skipped_duplicates": skipped_duplicates,
-            "summary": {
-                "identity_count": len(identities),
-                "succeeded_runs": len(succeeded_runs),
-                "failed_runs": len(failed_runs),
-                "total_items": total_items,
-            },
-        }
+    with _repo() as repo:
+        result = repo.rescore_ad_scores(
+            org_id=str(org_id) if org_id else None,
+            version=params.get("score_version"),
+            batch_size=batch_size,
+            after_ad_id=resume.get("last_ad_id"),
+            on_progress=_on_progress,
+        )
+    result["scores_rescored"] += resumed_rescored
+    activity.logger.info(
+        "ads_ingestion.rescore_ad_scores.done",
+        extra={
+            "org_id": org_id,
+            "batch_size": batch_size,
+            "resumed_after_ad_id": resume.get("last_ad_id"),
+            **result,
+        },
+    )
+    return result
+
+
+def _rescore_resume_point() -> Dict[str, Any]:
+    """The last rescore heartbeat of a previous attempt of this activity, if any."""
+    try:
+        details = list(activity.info().heartbeat_details or [])
+    except RuntimeError:
+        return {}
+    last_payload = details[-1] if details else None
+    if not isinstance(last_payload, dict) or last_payload.get("phase") != "ad_score_rescore":
+        return {}
+    return last_payload
 
 
 @activity.defn
@@ -752,7 +1117,10 @@ def select_ads_for_context_activity(params: Dict[str, Any]) -> Dict[str, Any]:
             )
             .join(ResearchRunBrand, ResearchRunBrand.brand_id == Ad.brand_id)
             .join(AdFacts, AdFacts.ad_id == Ad.id)
-            .outerjoin(AdScore, AdScore.ad_id == Ad.id)
+            .outerjoin(
+                AdScore,
+                (AdScore.ad_id == Ad.id) & (AdScore.score_version == settings.AD_SCORE_LIVE_VERSION),
+            )
             .where(ResearchRunBrand.research_run_id == research_run_id)
             .where(Ad.brand_id.in_(brand_order))
         )
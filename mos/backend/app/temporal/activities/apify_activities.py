@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from temporalio import activity
+
+from app.ads.apify_client import ApifyClient
+
+
+@activity.defn
+async def fetch_apify_run_activity(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Read one Apify run; the fallback when its completion webhook never arrives.
+
+    Async so the read runs on the worker's event loop instead of taking an activity-executor thread.
+    """
+    run_id = str(params["run_id"])
+    async with ApifyClient() as client:
+        run = await client.afetch_run(run_id)
+    activity.logger.info("apify.fetch_run.done", extra={"run_id": run_id, "status": run.get("status")})
+    return run
@@ -35,6 +35,7 @@ from app.db.repositories.products import (
 from app.db.repositories.research_artifacts import ResearchArtifactsRepository
 from app.db.repositories.workflows import WorkflowsRepository
 from app.llm import LLMClient, LLMGenerationParams
+from app.llm.prompt_cache import anthropic_user_blocks
 from app.services.product_types import canonical_product_type
 from app.strategy_v2 import (
     AngleSelectionDecision,
@@ -4099,6 +4100,7 @@ def _llm_generate_text(
     claude_messages: list[dict[str, Any]] | None = None,
     heartbeat_context: dict[str, Any] | None = None,
     progress_sink: dict[str, Any] | None = None,
+    cacheable_prompt_prefix: str | None = None,
 ) -> str:
     progress_callback: Callable[[dict[str, Any]], None] | None = None
     if heartbeat_context is not None or progress_sink is not None:
@@ -4151,7 +4153,7 @@ def _llm_generate_text(
                 )
             structured_kwargs["messages"] = claude_messages
         else:
-            structured_kwargs["user_content"] = [{"type": "text", "text": prompt}]
+            structured_kwargs["user_content"] = anthropic_user_blocks(prompt, cacheable_prefix=cacheable_prompt_prefix)
 
         structured_response = call_claude_structured_message(**structured_kwargs)
         parsed = structured_response.get("parsed")
@@ -4203,6 +4205,7 @@ def _llm_generate_text(
         openai_context_management=openai_context_management,
         progress_callback=progress_callback,
         existing_openai_response_id=resumed_response_id,
+        cacheable_prompt_prefix=cacheable_prompt_prefix,
     )
     output = llm.generate_text(prompt, params)
     cleaned = output.strip()
@@ -5049,6 +5052,8 @@ def _run_prompt_json_object(
             claude_messages=claude_messages,
             heartbeat_context=heartbeat_context,
             progress_sink=llm_progress,
+            # The rendered prompt asset (with VOC evidence / brand context) repeats across retries and passes.
+            cacheable_prompt_prefix=rendered,
         )
     except Exception as exc:
         if workflow_run_id and activity_step:
@@ -5212,6 +5217,8 @@ def _run_prompt_json_array(
             claude_messages=claude_messages,
             heartbeat_context=heartbeat_context,
             progress_sink=llm_progress,
+            # The rendered prompt asset (with VOC evidence / brand context) repeats across retries and passes.
+            cacheable_prompt_prefix=rendered,
         )
     except Exception as exc:
         if workflow_run_id and activity_step:
@@ -8417,6 +8424,7 @@ def _run_tagged_foundational_step(
         use_reasoning=use_reasoning,
         use_web_search=use_web_search,
         max_tokens=max_tokens,
+        cacheable_prompt_prefix=prompt_text.rstrip(),
         heartbeat_context={
             "activity": "strategy_v2.run_voc_angle_pipeline",
             "phase": "foundational",
@@ -22,8 +22,13 @@ from app.temporal.workflows.experiment_cycle import ExperimentCycleWorkflow
 from app.temporal.workflows.playbook_update import PlaybookUpdateWorkflow
 from app.temporal.workflows.test_campaign import TestCampaignWorkflow
 from app.temporal.workflows.precanon_market_research import PreCanonMarketResearchWorkflow
-from app.temporal.workflows.ads_ingestion import AdsIngestionWorkflow, AdsIngestionRetryWorkflow
+from app.temporal.workflows.ads_ingestion import (
+    AdScoreRescoreWorkflow,
+    AdsIngestionRetryWorkflow,
+    AdsIngestionWorkflow,
+)
 from app.temporal.workflows.ad_creative_analysis import AdsCreativeAnalysisWorkflow
+from app.temporal.workflows.apify_runs import ApifyRunCompletionWorkflow
 from app.temporal.workflows.strategy_v2 import StrategyV2Workflow
 from app.temporal.workflows.strategy_v2_launch import (
     StrategyV2AngleCampaignLaunchWorkflow,
@@ -79,10 +84,14 @@ from app.temporal.activities.ads_ingestion_activities import (
     upsert_brands_and_identities_activity,
     fetch_ad_library_page_totals_activity,
     ingest_ads_for_identities_activity,
+    mirror_pending_media_assets_activity,
+    refresh_brand_ad_stats_activity,
+    rescore_ad_scores_activity,
     select_ads_for_context_activity,
     build_ads_context_activity,
     list_ads_for_run_activity,
 )
+from app.temporal.activities.apify_activities import fetch_apify_run_activity
 from app.temporal.activities.ad_breakdown_activities import (
     generate_ad_breakdown_activity,
     persist_teardown_from_breakdown_activity,
@@ -142,7 +151,9 @@ async def main() -> None:
             PlaybookUpdateWorkflow,
             AdsIngestionWorkflow,
             AdsIngestionRetryWorkflow,
+            AdScoreRescoreWorkflow,
             AdsCreativeAnalysisWorkflow,
+            ApifyRunCompletionWorkflow,
             TestCampaignWorkflow,
             StrategyV2Workflow,
             StrategyV2AngleCampaignLaunchWorkflow,
@@ -188,9 +199,13 @@ async def main() -> None:
             upsert_brands_and_identities_activity,
             fetch_ad_library_page_totals_activity,
             ingest_ads_for_identities_activity,
+            mirror_pending_media_assets_activity,
+            refresh_brand_ad_stats_activity,
+            rescore_ad_scores_activity,
             select_ads_for_context_activity,
             build_ads_context_activity,
             list_ads_for_run_activity,
+            fetch_apify_run_activity,
             generate_ad_breakdown_activity,
             persist_teardown_from_breakdown_activity,
             generate_swipe_image_ad_activity,
@@ -13,6 +13,8 @@ with workflow.unsafe.imports_passed_through():
         upsert_brands_and_identities_activity,
         fetch_ad_library_page_totals_activity,
         ingest_ads_for_identities_activity,
+        mirror_pending_media_assets_activity,
+        rescore_ad_scores_activity,
         select_ads_for_context_activity,
         build_ads_context_activity,
     )
@@ -23,6 +25,35 @@ with workflow.unsafe.imports_passed_through():
 
 INGEST_ACTIVITY_START_TO_CLOSE_HOURS = int(os.getenv("ADS_INGEST_START_TO_CLOSE_HOURS", "6"))
 INGEST_ACTIVITY_SCHEDULE_TO_CLOSE_HOURS = int(os.getenv("ADS_INGEST_SCHEDULE_TO_CLOSE_HOURS", "6"))
+INGEST_ACTIVITY_HEARTBEAT_TIMEOUT_MINUTES = int(os.getenv("ADS_INGEST_HEARTBEAT_TIMEOUT_MINUTES", "10"))
+MIRROR_ACTIVITY_START_TO_CLOSE_MINUTES = int(os.getenv("ADS_MIRROR_START_TO_CLOSE_MINUTES", "120"))
+RESCORE_ACTIVITY_START_TO_CLOSE_MINUTES = int(os.getenv("AD_SCORE_RESCORE_START_TO_CLOSE_MINUTES", "60"))
+
+
+async def _mirror_ingested_media(*, research_run_id: Optional[str], ad_ids: Optional[list[str]]) -> Dict[str, Any] | None:
+    """Mirror media for freshly ingested ads; ingestion itself only leaves them `pending`."""
+    if not ad_ids or not workflow.patched("ads_ingestion_mirror_queue_v1"):
+        return None
+    try:
+        return await workflow.execute_activity(
+            mirror_pending_media_assets_activity,
+            {"ad_ids": ad_ids},
+            start_to_close_timeout=timedelta(minutes=MIRROR_ACTIVITY_START_TO_CLOSE_MINUTES),
+            heartbeat_timeout=timedelta(minutes=5),
+            retry_policy=RetryPolicy(maximum_attempts=2),
+        )
+    except Exception as exc:  # noqa: BLE001
+        # Unmirrored assets stay `pending` and are picked up by the next drain.
+        workflow.logger.error(
+            "ads_ingestion.mirror_media_failed",
+            extra={
+                "workflow_id": workflow.info().workflow_id,
+                "run_id": workflow.info().run_id,
+                "research_run_id": research_run_id,
+                "error": str(exc),
+            },
+        )
+        return {"status": "failed", "error": str(exc)}
 
 
 @dataclass
@@ -36,6 +67,8 @@ class AdsIngestionInput:
     run_creative_analysis: bool = False
     creative_analysis_max_ads: Optional[int] = None
     creative_analysis_concurrency: Optional[int] = None
+    # None defers to ADS_INGEST_INCREMENTAL on the worker.
+    incremental: Optional[bool] = None
 
 
 @dataclass
@@ -48,6 +81,7 @@ class AdsIngestionRetryInput:
     creative_analysis_concurrency: Optional[int] = None
     org_id: Optional[str] = None
     client_id: Optional[str] = None
+    incremental: Optional[bool] = None
 
 
 @workflow.defn
@@ -153,9 +187,11 @@ class AdsIngestionWorkflow:
                     "research_run_id": upsert_result["research_run_id"],
                     "brand_channel_identity_ids": upsert_result.get("brand_channel_identity_ids"),
                     "results_limit": input.results_limit,
+                    "incremental": input.incremental,
                 },
                 start_to_close_timeout=timedelta(hours=INGEST_ACTIVITY_START_TO_CLOSE_HOURS),
                 schedule_to_close_timeout=timedelta(hours=INGEST_ACTIVITY_SCHEDULE_TO_CLOSE_HOURS),
+                heartbeat_timeout=timedelta(minutes=INGEST_ACTIVITY_HEARTBEAT_TIMEOUT_MINUTES),
                 retry_policy=RetryPolicy(maximum_attempts=1),
             )
             if isinstance(ingest_result, dict):
@@ -176,6 +212,11 @@ class AdsIngestionWorkflow:
                 },
             )
 
+        media_mirror = await _mirror_ingested_media(
+            research_run_id=upsert_result.get("research_run_id"),
+            ad_ids=ad_ids,
+        )
+
         selection_result: Dict[str, Any] | None = None
         selected_ad_ids = None
         selection_meta = None
@@ -288,6 +329,7 @@ class AdsIngestionWorkflow:
             "ingest_error": ingest_error,
             "ad_library_totals": ad_library_totals if isinstance(ad_library_totals, dict) else {},
             "ad_selection": selection_result if isinstance(selection_result, dict) else {},
+            "media_mirror": media_mirror,
             "creative_analysis": creative_analysis,
         }
 
@@ -312,9 +354,11 @@ class AdsIngestionRetryWorkflow:
                     "research_run_id": input.research_run_id,
                     "brand_channel_identity_ids": input.brand_channel_identity_ids,
                     "results_limit": input.results_limit,
+                    "incremental": input.incremental,
                 },
                 start_to_close_timeout=timedelta(hours=INGEST_ACTIVITY_START_TO_CLOSE_HOURS),
                 schedule_to_close_timeout=timedelta(hours=INGEST_ACTIVITY_SCHEDULE_TO_CLOSE_HOURS),
+                heartbeat_timeout=timedelta(minutes=INGEST_ACTIVITY_HEARTBEAT_TIMEOUT_MINUTES),
                 retry_policy=RetryPolicy(maximum_attempts=1),
             )
         except Exception as exc:  # noqa: BLE001
@@ -331,6 +375,8 @@ class AdsIngestionRetryWorkflow:
             ingest_status = ingest_result.get("status")
             ingest_reason = ingest_result.get("reason")
 
+        media_mirror = await _mirror_ingested_media(research_run_id=input.research_run_id, ad_ids=ad_ids)
+
         ad_library_totals: Dict[str, Any] | None = None
         if ingest_status != "skipped":
             try:
@@ -482,5 +528,27 @@ class AdsIngestionRetryWorkflow:
             "ingest_error": ingest_error,
             "ad_library_totals": ad_library_totals if isinstance(ad_library_totals, dict) else {},
             "ad_selection": selection_result if isinstance(selection_result, dict) else {},
+            "media_mirror": media_mirror,
             "creative_analysis": creative_analysis,
         }
+
+
+@dataclass
+class AdScoreRescoreInput:
+    org_id: Optional[str] = None
+    batch_size: int = 5000
+
+
+@workflow.defn
+class AdScoreRescoreWorkflow:
+    """Nightly rescoring of stored ad scores; start it with a cron schedule (see scripts/rescore_ad_scores.py)."""
+
+    @workflow.run
+    async def run(self, input: AdScoreRescoreInput) -> Dict[str, Any]:
+        return await workflow.execute_activity(
+            rescore_ad_scores_activity,
+            {"org_id": input.org_id, "batch_size": input.batch_size},
+            start_to_close_timeout=timedelta(minutes=RESCORE_ACTIVITY_START_TO_CLOSE_MINUTES),
+            heartbeat_timeout=timedelta(minutes=5),
+            retry_policy=RetryPolicy(maximum_attempts=3, backoff_coefficient=2.0),
+        )
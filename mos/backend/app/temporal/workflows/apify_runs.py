@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from temporalio import workflow
+from temporalio.common import RetryPolicy
+
+with workflow.unsafe.imports_passed_through():
+    from app.temporal.activities.apify_activities import fetch_apify_run_activity
+
+APIFY_RUN_FINISHED_SIGNAL = "apify_run_finished"
+
+
+def apify_run_workflow_id(run_id: str) -> str:
+    return f"apify-run-{run_id}"
+
+
+@dataclass
+class ApifyRunCompletionInput:
+    run_id: str
+    max_wait_seconds: int = 900
+
+
+@workflow.defn
+class ApifyRunCompletionWorkflow:
+    """
+    Completes when the Apify webhook for one actor run arrives (as a signal from /api/apify/webhook)
+    and returns the run. Keyed by run id, so whichever side starts it first — the waiter or the
+    webhook via signal-with-start — the other joins the same execution.
+    """
+
+    def __init__(self) -> None:
+        self._run: Optional[Dict[str, Any]] = None
+
+    @workflow.signal(name=APIFY_RUN_FINISHED_SIGNAL)
+    def apify_run_finished(self, payload: Dict[str, Any]) -> None:
+        resource = payload.get("resource")
+        if isinstance(resource, dict):
+            self._run = resource
+
+    @workflow.run
+    async def run(self, input: ApifyRunCompletionInput) -> Dict[str, Any]:
+        try:
+            await workflow.wait_condition(
+                lambda: self._run is not None,
+                timeout=timedelta(seconds=input.max_wait_seconds),
+            )
+        except asyncio.TimeoutError:
+            # Webhook lost or never sent: read the run once instead of failing outright.
+            return await workflow.execute_activity(
+                fetch_apify_run_activity,
+                {"run_id": input.run_id},
+                start_to_close_timeout=timedelta(minutes=2),
+                retry_policy=RetryPolicy(maximum_attempts=3, backoff_coefficient=2.0),
+            )
+        return self._run or {}
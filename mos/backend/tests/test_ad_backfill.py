@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.ads.fingerprints import FINGERPRINT_ALGO
+from app.db.models import Ad
+from app.db.repositories.ads import AdsRepository
+from app.services.ad_backfill import backfill_job_key
+
+
+class _FakeSession:
+    def __init__(self, checkpoint=None) -> None:
+        self.checkpoint = checkpoint
+        self.commits = 0
+
+    def get(self, _model, _key):
+        return self.checkpoint
+
+    def commit(self) -> None:
+        self.commits += 1
+
+
+def _paged_repo(session: _FakeSession, ad_ids: list[str], monkeypatch: pytest.MonkeyPatch):
+    repo = AdsRepository(session)
+    pages: list[tuple[object, object]] = []
+    chunks: list[list[str]] = []
+
+    def fake_page(*, after_ad_id, through_ad_id, batch_size, **_kwargs):
+        pages.append((after_ad_id, through_ad_id))
+        remaining = [ad_id for ad_id in ad_ids if after_ad_id is None or ad_id > after_ad_id]
+        return remaining[:batch_size]
+
+    def fake_chunk(chunk, *, steps):
+        chunks.append(list(chunk))
+        return len(chunk)
+
+    monkeypatch.setattr(repo, "_backfill_ad_id_page", fake_page)
+    monkeypatch.setattr(repo, "_backfill_ads_chunk", fake_chunk)
+    return repo, pages, chunks
+
+
+def test_backfill_job_key_tracks_algo_and_rejects_unknown_steps() -> None:
+    key = backfill_job_key(["scores", "creatives", "scores"], org_id="org-1")
+
+    assert key.startswith("ads:creatives+scores:missing:")
+    assert FINGERPRINT_ALGO in key and key.endswith(":org-1")
+    assert backfill_job_key(["facts"], only_missing=False).split(":")[2] == "all"
+    with pytest.raises(ValueError):
+        backfill_job_key(["thumbnails"])
+    with pytest.raises(ValueError):
+        backfill_job_key([])
+
+
+def test_pending_filter_targets_missing_outputs_and_old_fingerprints() -> None:
+    stmt = select(Ad.id).where(AdsRepository._backfill_pending_filter(["creatives", "scores"]))
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    assert f"ad_creatives.fingerprint_algo = '{FINGERPRINT_ALGO}'" in sql
+    assert "FROM ad_facts" in sql
+    assert "ad_scores.score_version = 'v1'" in sql
+    assert " OR " in sql
+
+
+def test_backfill_ads_pages_by_ad_id_and_commits_each_chunk(monkeypatch: pytest.MonkeyPatch) -> None:
+    session = _FakeSession()
+    repo, pages, chunks = _paged_repo(session, ["a1", "a2", "a3", "a4", "a5"], monkeypatch)
+
+    stats = repo.backfill_ads(steps=("creatives",), batch_size=2)
+
+    assert stats == {"processed": 5}
+    assert chunks == [["a1", "a2"], ["a3", "a4"], ["a5"]]
+    assert [after for after, _ in pages] == [None, "a2", "a4", "a5"]
+    assert session.commits == 3
+
+
+def test_backfill_partition_resumes_from_checkpoint(monkeypatch: pytest.MonkeyPatch) -> None:
+    checkpoint = SimpleNamespace(
+        after_ad_id="a0",
+        through_ad_id="a9",
+        last_ad_id="a2",
+        processed=2,
+        completed_at=None,
+        updated_at=None,
+    )
+    session = _FakeSession(checkpoint)
+    repo, pages, chunks = _paged_repo(session, ["a1", "a2", "a3", "a4", "a5"], monkeypatch)
+
+    stats = repo.backfill_partition(job_key="job", partition=0, steps=("facts",), batch_size=2)
+
+    assert chunks == [["a3", "a4"], ["a5"]]
+    assert pages[0] == ("a2", "a9")
+    assert checkpoint.last_ad_id == "a5"
+    assert checkpoint.completed_at is not None
+    assert stats == {"partition": 0, "processed": 3, "total_processed": 5}
+    # Two chunks plus the completion mark, each committed with the checkpoint.
+    assert session.commits == 3
+
+    # A completed partition is a no-op.
+    assert repo.backfill_partition(job_key="job", partition=0, steps=("facts",))["processed"] == 0
+
+
+def test_start_backfill_job_resumes_unfinished_and_reruns_finished_jobs(db_session) -> None:
+    repo = AdsRepository(db_session)
+    job_key = f"test:{uuid.uuid4()}"
+
+    first = repo.start_backfill_job(job_key=job_key, partition_size=50_000)
+    assert [(checkpoint.after_ad_id, checkpoint.through_ad_id) for checkpoint in first] == [(None, None)]
+
+    last_ad_id = uuid.uuid4()
+    first[0].last_ad_id = last_ad_id
+    db_session.commit()
+    resumed = repo.start_backfill_job(job_key=job_key, partition_size=50_000)
+    assert [checkpoint.last_ad_id for checkpoint in resumed] == [last_ad_id]
+
+    resumed[0].completed_at = datetime.now(timezone.utc)
+    db_session.commit()
+    # Ads ingested after a finished job can sit anywhere in the id space, so it runs again from scratch.
+    rerun = repo.start_backfill_job(job_key=job_key, partition_size=50_000)
+    assert [(checkpoint.last_ad_id, checkpoint.completed_at) for checkpoint in rerun] == [(None, None)]
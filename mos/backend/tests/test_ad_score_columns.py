@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.ads.score import compute_ad_score, compute_ad_score_columns
+from app.db.enums import AdStatusEnum
+from app.db.repositories.ads import _score_column_params
+
+
+def _date(value: datetime | None):  # noqa: ANN202
+    return value.date() if value else None
+
+
+def _cases() -> list[tuple[SimpleNamespace, dict, int]]:
+    now = datetime.now(timezone.utc)
+    return [
+        (SimpleNamespace(started_running_at=now - timedelta(days=40), first_seen_at=None, last_seen_at=now, ad_status=AdStatusEnum.active), {"days_active": 41}, 2),
+        (SimpleNamespace(started_running_at=None, first_seen_at=now - timedelta(days=300), last_seen_at=now - timedelta(days=9), ad_status=AdStatusEnum.inactive), {}, 0),
+        (SimpleNamespace(started_running_at=None, first_seen_at=None, last_seen_at=None, ad_status="unknown"), {}, 1),
+        (SimpleNamespace(started_running_at=now - timedelta(days=3), first_seen_at=now, last_seen_at=None, ad_status=AdStatusEnum.unknown), {"days_active": None}, 0),
+        (SimpleNamespace(started_running_at=None, first_seen_at=now, last_seen_at=now + timedelta(days=2), ad_status=AdStatusEnum.active), {"days_active": 0}, 5),
+    ]
+
+
+def test_columns_match_scalar_scores() -> None:
+    cases = _cases()
+    as_of = datetime.now(timezone.utc).date()
+    columns = compute_ad_score_columns(
+        as_of=as_of,
+        days_active=[facts.get("days_active") for _, facts, _ in cases],
+        start_dates=[_date(ad.started_running_at or ad.first_seen_at) for ad, _, _ in cases],
+        last_seen_dates=[_date(ad.last_seen_at) for ad, _, _ in cases],
+        media_counts=[media_count for _, _, media_count in cases],
+        statuses=[ad.ad_status for ad, _, _ in cases],
+    )
+
+    for idx, (ad, facts, media_count) in enumerate(cases):
+        expected = compute_ad_score(ad=ad, facts=facts, media_count=media_count)
+        assert columns["performance_score"][idx] == expected["performance_score"]
+        assert columns["performance_stars"][idx] == expected["performance_stars"]
+        assert columns["winning_score"][idx] == expected["winning_score"]
+        assert columns["confidence"][idx] == pytest.approx(expected["confidence"])
+        breakdown = columns["score_breakdown"][idx]["components"]
+        for name, component in expected["score_breakdown"]["components"].items():
+            assert columns[name][idx] == pytest.approx(component["value"])
+            assert breakdown[name]["value"] == pytest.approx(component["value"])
+            assert breakdown[name]["weight"] == component["weight"]
+            assert breakdown[name]["raw"] == component["raw"]
+
+
+def test_recency_decays_with_as_of_and_unknowns_become_null() -> None:
+    last_seen = datetime(2026, 1, 1, tzinfo=timezone.utc).date()
+    kwargs = dict(days_active=[30, None], start_dates=[None, None], last_seen_dates=[last_seen, None], media_counts=[1, 0], statuses=["active", "inactive"])
+
+    fresh = compute_ad_score_columns(as_of=last_seen, **kwargs)
+    stale = compute_ad_score_columns(as_of=last_seen + timedelta(days=42), **kwargs)
+
+    assert fresh["recency"][0] == pytest.approx(1.0)
+    assert stale["recency"][0] < fresh["recency"][0]
+    assert stale["performance_score"][0] < fresh["performance_score"][0]
+
+    params = _score_column_params("v1", ["a", "b"], stale)
+    assert params["score_version"] == "v1"
+    raw = [json.loads(breakdown)["components"] for breakdown in params["score_breakdown"]]
+    assert [item["longevity"]["raw"]["days_active"] for item in raw] == [30, None]
+    assert [item["recency"]["raw"]["days_since_last_seen"] for item in raw] == [42, None]
+    assert [item["status"]["raw"]["status"] for item in raw] == ["active", "inactive"]
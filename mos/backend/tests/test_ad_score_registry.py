@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from app.ads import score as score_module
+from app.ads.partitions import partition_ranges
+from app.ads.score import WeightedAdScorer, compute_ad_score, compute_ad_score_columns, get_scorer, register_scorer
+from app.db.enums import AdStatusEnum
+
+
+def test_registry_resolves_live_and_candidate_versions(monkeypatch) -> None:  # noqa: ANN001
+    monkeypatch.setattr(score_module, "_SCORERS", dict(score_module._SCORERS))
+    candidate = register_scorer(WeightedAdScorer(version="v2-test", recency_decay_days=7))
+    ad = SimpleNamespace(started_running_at=None, first_seen_at=None, last_seen_at=None, ad_status=AdStatusEnum.active)
+
+    assert get_scorer().version == "v1"
+    assert get_scorer("v2-test") is candidate
+    assert compute_ad_score(ad=ad, facts={}, media_count=1)["score_version"] == "v1"
+    assert compute_ad_score(ad=ad, facts={}, media_count=1, version="v2-test")["score_version"] == "v2-test"
+    with pytest.raises(ValueError):
+        register_scorer(WeightedAdScorer(version="v2-test"))
+    with pytest.raises(ValueError):
+        get_scorer("missing")
+
+
+def test_candidate_weights_change_batch_scores_only_for_that_version(monkeypatch) -> None:  # noqa: ANN001
+    monkeypatch.setattr(score_module, "_SCORERS", dict(score_module._SCORERS))
+    register_scorer(WeightedAdScorer(version="v2-test", recency_decay_days=7))
+    kwargs = dict(
+        as_of=date(2026, 3, 1),
+        days_active=[30],
+        start_dates=[None],
+        last_seen_dates=[date(2026, 2, 15)],
+        media_counts=[1],
+        statuses=["active"],
+    )
+
+    live = compute_ad_score_columns(**kwargs)
+    candidate = compute_ad_score_columns(version="v2-test", **kwargs)
+
+    assert candidate["recency"][0] < live["recency"][0]
+    assert candidate["performance_score"][0] < live["performance_score"][0]
+
+
+def test_partition_ranges_cover_ad_id_space_without_overlap() -> None:
+    assert partition_ranges([]) == [(None, None)]
+    assert partition_ranges(["b", "d"]) == [(None, "b"), ("b", "d"), ("d", None)]
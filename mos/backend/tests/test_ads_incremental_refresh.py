@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from app.ads.incremental import KnownAdState, ad_needs_upsert, needs_full_refresh
+from app.ads.ingestors.meta_ads_library import MetaAdsLibraryIngestor
+from app.ads.types import NormalizeContext, NormalizedAdWithAssets, RawAdItem
+from app.db.enums import AdChannelEnum, AdStatusEnum
+from app.db.models import AdFacts, AdScore, Brand, BrandChannelIdentity
+from app.db.repositories.ads import AdsRepository
+from tests.conftest import TEST_ORG_ID
+
+
+def _meta_item(**overrides: object) -> RawAdItem:
+    payload = {
+        "adArchiveId": "1234",
+        "is_active": True,
+        "endDate": "2026-10-01T00:00:00",
+        "snapshot": {"body": {"text": "Sleep better tonight."}},
+    }
+    payload.update(overrides)
+    return RawAdItem(payload=payload)
+
+
+def test_meta_change_key_matches_normalize() -> None:
+    ingestor = MetaAdsLibraryIngestor(apify_client=None)  # type: ignore[arg-type]
+    raw = _meta_item()
+    key = ingestor.change_key(raw)
+    normalized = ingestor.normalize(
+        raw,
+        NormalizeContext(brand_id="brand", brand_channel_identity_id="identity", research_run_id="run"),
+    )
+
+    assert key is not None and normalized is not None
+    assert key.external_ad_id == normalized.external_ad_id == "1234"
+    assert key.ad_status == normalized.ad_status == AdStatusEnum.active
+    assert key.ended_running_at == normalized.ended_running_at
+    assert key.last_seen_at == normalized.last_seen_at
+    assert ingestor.change_key(RawAdItem(payload={"error": "no_items_returned"})) is None
+
+
+def test_ad_needs_upsert_only_for_new_or_changed_ads() -> None:
+    ingestor = MetaAdsLibraryIngestor(apify_client=None)  # type: ignore[arg-type]
+    key = ingestor.change_key(_meta_item())
+    assert key is not None
+    known = KnownAdState(
+        ad_id="ad-1",
+        ad_status=AdStatusEnum.active,
+        ended_running_at=key.ended_running_at,
+        last_seen_at=key.last_seen_at,
+    )
+
+    assert ad_needs_upsert(key, None)
+    assert not ad_needs_upsert(key, known)
+
+    stopped = ingestor.change_key(_meta_item(is_active=False))
+    assert stopped is not None and ad_needs_upsert(stopped, known)
+
+    extended = ingestor.change_key(_meta_item(endDate="2026-10-09T00:00:00"))
+    assert extended is not None and ad_needs_upsert(extended, known)
+
+    # A scrape without dates keeps the stored end date, so it is not a change.
+    undated = ingestor.change_key(_meta_item(endDate=None))
+    assert undated is not None and not ad_needs_upsert(undated, known)
+
+
+def test_needs_full_refresh_without_or_with_stale_watermark() -> None:
+    now = datetime(2026, 10, 16, tzinfo=timezone.utc)
+    week = timedelta(days=7)
+
+    assert needs_full_refresh(None, now=now, max_age=week)
+    assert needs_full_refresh(now - timedelta(days=8), now=now, max_age=week)
+    assert not needs_full_refresh(now - timedelta(days=1), now=now, max_age=week)
+
+
+def test_touch_ads_last_seen_advances_days_active_and_rescores(db_session) -> None:
+    brand = Brand(org_id=TEST_ORG_ID, canonical_name="Sleep Co", normalized_name="sleep co")
+    db_session.add(brand)
+    db_session.flush()
+    identity = BrandChannelIdentity(brand_id=brand.id, channel=AdChannelEnum.META_ADS_LIBRARY)
+    db_session.add(identity)
+    db_session.commit()
+
+    now = datetime.now(timezone.utc)
+    repo = AdsRepository(db_session)
+    [(ad, _)] = repo.upsert_ads_batch(
+        brand_id=str(brand.id),
+        brand_channel_identity_id=str(identity.id),
+        channel=AdChannelEnum.META_ADS_LIBRARY,
+        normalized=[
+            NormalizedAdWithAssets(
+                external_ad_id="1234",
+                body_text="Sleep better tonight.",
+                started_running_at=now - timedelta(days=119),
+                last_seen_at=now - timedelta(days=90),
+            )
+        ],
+    )
+    ad_id = ad.id
+
+    def _stored() -> tuple[int | None, dict]:
+        db_session.expire_all()
+        facts = db_session.get(AdFacts, ad_id)
+        score = db_session.query(AdScore).filter(AdScore.ad_id == ad_id).one()
+        return facts.days_active, score.score_breakdown["components"]
+
+    days_active, components = _stored()
+    assert days_active == 30
+    assert components["longevity"]["raw"]["days_active"] == 30
+    assert components["recency"]["raw"]["days_since_last_seen"] == 90
+
+    touched = repo.touch_ads_last_seen(
+        channel=AdChannelEnum.META_ADS_LIBRARY,
+        last_seen_by_external_id={"1234": None},
+    )
+
+    assert touched == [str(ad_id)]
+    days_active, components = _stored()
+    assert days_active == 120
+    assert components["longevity"]["raw"]["days_active"] == 120
+    assert components["recency"]["raw"]["days_since_last_seen"] == 0
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from app.ads.types import NormalizedAdWithAssets
+from app.db.enums import AdChannelEnum, AdStatusEnum
+from app.db.models import Ad, Brand, BrandChannelIdentity
+from app.db.repositories.ads import AdsRepository
+from tests.conftest import TEST_ORG_ID
+
+
+def test_batch_upsert_keeps_known_status_when_scrape_has_none(db_session) -> None:
+    brand = Brand(org_id=TEST_ORG_ID, canonical_name="Status Co", normalized_name="status co")
+    db_session.add(brand)
+    db_session.flush()
+    identity = BrandChannelIdentity(brand_id=brand.id, channel=AdChannelEnum.META_ADS_LIBRARY)
+    db_session.add(identity)
+    db_session.commit()
+
+    repo = AdsRepository(db_session)
+
+    def _upsert(**statuses: AdStatusEnum) -> dict[str, AdStatusEnum]:
+        upserted = repo.upsert_ads_batch(
+            brand_id=str(brand.id),
+            brand_channel_identity_id=str(identity.id),
+            channel=AdChannelEnum.META_ADS_LIBRARY,
+            normalized=[
+                NormalizedAdWithAssets(external_ad_id=external_ad_id, ad_status=status)
+                for external_ad_id, status in statuses.items()
+            ],
+        )
+        db_session.expire_all()
+        return {ad.external_ad_id: db_session.get(Ad, ad.id).ad_status for ad, _ in upserted}
+
+    assert _upsert(kept=AdStatusEnum.active, stopped=AdStatusEnum.active, new=AdStatusEnum.unknown) == {
+        "kept": AdStatusEnum.active,
+        "stopped": AdStatusEnum.active,
+        "new": AdStatusEnum.unknown,
+    }
+    assert _upsert(kept=AdStatusEnum.unknown, stopped=AdStatusEnum.inactive) == {
+        "kept": AdStatusEnum.active,
+        "stopped": AdStatusEnum.inactive,
+    }
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+from types import SimpleNamespace
+
 import httpx
 import pytest
 
 from app.ads.apify_client import ApifyClient
+from app.ads.ingestors.meta_ads_library import MetaAdsLibraryIngestor
+from app.ads.types import IngestRequest
 
 
 def _response(method: str, url: str, status_code: int, payload: object) -> httpx.Response:
@@ -11,6 +16,12 @@ def _response(method: str, url: str, status_code: int, payload: object) -> httpx
     return httpx.Response(status_code=status_code, request=request, json=payload)
 
 
+def _patch_http(monkeypatch: pytest.MonkeyPatch, fake_request) -> None:  # noqa: ANN001
+    monkeypatch.setattr(
+        "app.ads.apify_client._get_shared_http_client", lambda: SimpleNamespace(request=fake_request)
+    )
+
+
 def test_fetch_run_retries_transient_502(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("APIFY_API_TOKEN", "test-token")
     monkeypatch.setenv("APIFY_HTTP_MAX_ATTEMPTS", "3")
@@ -35,7 +46,7 @@ def test_fetch_run_retries_transient_502(monkeypatch: pytest.MonkeyPatch) -> Non
         call_count["value"] += 1
         return responses[idx]
 
-    monkeypatch.setattr("app.ads.apify_client.httpx.request", _fake_request)
+    _patch_http(monkeypatch, _fake_request)
     monkeypatch.setattr("app.ads.apify_client.time.sleep", lambda seconds: sleep_calls.append(seconds))
 
     client = ApifyClient()
@@ -61,7 +72,7 @@ def test_fetch_run_fails_after_max_attempts(monkeypatch: pytest.MonkeyPatch) ->
         call_count["value"] += 1
         return response
 
-    monkeypatch.setattr("app.ads.apify_client.httpx.request", _fake_request)
+    _patch_http(monkeypatch, _fake_request)
     monkeypatch.setattr("app.ads.apify_client.time.sleep", lambda seconds: sleep_calls.append(seconds))
 
     client = ApifyClient()
@@ -96,7 +107,7 @@ def test_fetch_dataset_items_retries_transient_502(monkeypatch: pytest.MonkeyPat
         call_count["value"] += 1
         return responses[idx]
 
-    monkeypatch.setattr("app.ads.apify_client.httpx.request", _fake_request)
+    _patch_http(monkeypatch, _fake_request)
     monkeypatch.setattr("app.ads.apify_client.time.sleep", lambda seconds: sleep_calls.append(seconds))
 
     client = ApifyClient()
@@ -106,3 +117,150 @@ def test_fetch_dataset_items_retries_transient_502(monkeypatch: pytest.MonkeyPat
     assert rows[0]["url"] == "https://example.com/a"
     assert call_count["value"] == 2
     assert sleep_calls == [1.0]
+
+
+def test_iter_dataset_items_pages_with_offset_and_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("APIFY_API_TOKEN", "test-token")
+    dataset = [{"n": idx} for idx in range(7)]
+    page_params: list[tuple[int, int]] = []
+
+    def _fake_request(method, url, **kwargs):  # noqa: ANN001, ANN003
+        params = kwargs["params"]
+        page_params.append((params["offset"], params["limit"]))
+        page = dataset[params["offset"] : params["offset"] + params["limit"]]
+        return _response(method, url, 200, page)
+
+    _patch_http(monkeypatch, _fake_request)
+
+    client = ApifyClient()
+    rows = list(client.iter_dataset_items("dataset-1", page_size=3))
+
+    assert [row["n"] for row in rows] == list(range(7))
+    # The short third page ends the dataset without an extra empty request.
+    assert page_params == [(0, 3), (3, 3), (6, 3)]
+
+    page_params.clear()
+    limited = list(client.iter_dataset_items("dataset-1", page_size=3, limit=5, prefetch=False))
+    assert [row["n"] for row in limited] == [0, 1, 2, 3, 4]
+    assert page_params == [(0, 3), (3, 2)]
+
+
+def test_meta_ingestor_streams_items_and_falls_back_to_all_statuses(monkeypatch: pytest.MonkeyPatch) -> None:
+    datasets = {
+        "active": [{"error": "no ads"}],
+        "all": [{"adArchiveId": "1"}, {"adArchiveId": "2"}, {"adArchiveId": "3"}],
+    }
+    consumed: list[str] = []
+
+    class _FakeApify:
+        def __init__(self) -> None:
+            self.statuses: list[str] = []
+
+        def start_actor_run(self, actor_id, *, input_payload):  # noqa: ANN001
+            self.statuses.append(input_payload["scrapePageAds.activeStatus"])
+            return {"id": f"run-{len(self.statuses)}"}
+
+        def poll_run_until_terminal(self, run_id, *, max_wait_seconds=None):  # noqa: ANN001
+            return {"defaultDatasetId": self.statuses[-1]}
+
+        def iter_dataset_items(self, dataset_id, *, limit=None):  # noqa: ANN001
+            for item in datasets[dataset_id]:
+                consumed.append(f"{dataset_id}:{item.get('adArchiveId', 'x')}")
+                yield item
+
+    apify = _FakeApify()
+    ingestor = MetaAdsLibraryIngestor(apify)  # type: ignore[arg-type]
+    stream = ingestor.iter_items(IngestRequest(url="https://www.facebook.com/brand", limit=None, metadata={}))
+
+    first = next(stream)
+    assert apify.statuses == ["active", "all"]
+    assert first.payload == {"adArchiveId": "1"}
+    assert first.metadata["active_status"] == "all"
+    assert first.metadata["provider_run_id"] == "run-2"
+    # Only the rows needed to detect an ad have been read so far.
+    assert consumed == ["active:x", "all:1"]
+    assert [item.payload["adArchiveId"] for item in stream] == ["2", "3"]
+
+
+def test_meta_ingestor_waits_on_completion_webhook_when_configured(monkeypatch: pytest.MonkeyPatch) -> None:
+    webhooks = [{"eventTypes": ["ACTOR.RUN.SUCCEEDED"], "requestUrl": "https://api.example.com/apify/webhook"}]
+    waits: list[tuple[str, int]] = []
+
+    class _FakeApify:
+        def __init__(self) -> None:
+            self.started: list[dict] = []
+
+        def start_actor_run(self, actor_id, *, input_payload, webhooks):  # noqa: ANN001
+            self.started.append({"status": input_payload["scrapePageAds.activeStatus"], "webhooks": webhooks})
+            return {"id": "run-1"}
+
+        def poll_run_until_terminal(self, run_id, *, max_wait_seconds=None):  # noqa: ANN001
+            raise AssertionError("webhook runs must not be polled")
+
+        def iter_dataset_items(self, dataset_id, *, limit=None):  # noqa: ANN001
+            yield {"adArchiveId": "1", "dataset": dataset_id}
+
+    def _wait(run_id: str, *, max_wait_seconds: int) -> dict:
+        waits.append((run_id, max_wait_seconds))
+        return {"id": run_id, "status": "SUCCEEDED", "defaultDatasetId": "ds-1"}
+
+    monkeypatch.setattr("app.ads.ingestors.meta_ads_library.completion_webhooks", lambda: webhooks)
+    monkeypatch.setattr("app.ads.ingestors.meta_ads_library.wait_for_run_completion", _wait)
+    monkeypatch.setattr("app.ads.ingestors.meta_ads_library.settings.APIFY_META_MAX_WAIT_SECONDS", 42)
+
+    apify = _FakeApify()
+    ingestor = MetaAdsLibraryIngestor(apify)  # type: ignore[arg-type]
+    items = list(ingestor.iter_items(IngestRequest(url="https://www.facebook.com/brand", limit=None, metadata={})))
+
+    assert apify.started == [{"status": "active", "webhooks": webhooks}]
+    assert waits == [("run-1", 42)]
+    assert [item.payload for item in items] == [{"adArchiveId": "1", "dataset": "ds-1"}]
+    assert items[0].metadata["provider_run_id"] == "run-1"
+
+
+def test_sync_requests_reuse_one_pooled_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("APIFY_API_TOKEN", "test-token")
+    monkeypatch.setattr("app.ads.apify_client._shared_http_client", None)
+
+    first, second = ApifyClient(), ApifyClient()
+    try:
+        assert first.http_client is second.http_client
+    finally:
+        first.http_client.close()
+
+
+def test_async_start_poll_and_fetch_share_one_event_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("APIFY_API_TOKEN", "test-token")
+    polls = {"run-1": 0, "run-2": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method == "POST":
+            actor = path.split("/")[-2]
+            return httpx.Response(201, json={"data": {"id": "run-1" if actor == "actor~one" else "run-2"}})
+        if "/actor-runs/" in path:
+            run_id = path.rsplit("/", 1)[-1]
+            polls[run_id] += 1
+            status = "SUCCEEDED" if polls[run_id] >= 2 else "RUNNING"
+            return httpx.Response(200, json={"data": {"status": status, "defaultDatasetId": f"ds-{run_id}"}})
+        offset = int(request.url.params["offset"])
+        items = [{"n": n} for n in range(3)][offset : offset + int(request.url.params["limit"])]
+        return httpx.Response(200, json=items)
+
+    async def run_both() -> list[list[dict]]:
+        async_http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with ApifyClient(async_http_client=async_http) as client:
+
+            async def run_actor(actor_id: str) -> list[dict]:
+                run = await client.astart_actor_run(actor_id, input_payload={})
+                final = await client.apoll_run_until_terminal(run["id"], poll_interval_seconds=0)
+                return [item async for item in client.aiter_dataset_items(final["defaultDatasetId"], page_size=2)]
+
+            results = await asyncio.gather(run_actor("actor~one"), run_actor("actor~two"))
+        await async_http.aclose()
+        return results
+
+    results = asyncio.run(run_both())
+
+    assert results == [[{"n": 0}, {"n": 1}, {"n": 2}]] * 2
+    assert polls == {"run-1": 2, "run-2": 2}
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+
+from app.strategy_v2.apify_run_scheduler import ApifyRunScheduler, ScheduledApifyRun
+
+
+def _run(scheduler: ApifyRunScheduler, actor: str, *, priority: int = 0, stage: str = "base") -> ScheduledApifyRun:
+    return ScheduledApifyRun(
+        run_index=scheduler.next_run_index(),
+        actor_id=actor,
+        actor_key=actor,
+        platform="WEB",
+        priority=priority,
+        input_payload={},
+        stage=stage,
+    )
+
+
+def test_scheduler_respects_per_actor_cap_and_priority() -> None:
+    lock = threading.Lock()
+    running: Counter[str] = Counter()
+    peak: Counter[str] = Counter()
+    started: list[int] = []
+
+    def execute(run: ScheduledApifyRun) -> dict:
+        with lock:
+            started.append(run.run_index)
+            running[run.actor_key] += 1
+            peak[run.actor_key] = max(peak[run.actor_key], running[run.actor_key])
+        time.sleep(0.02)
+        with lock:
+            running[run.actor_key] -= 1
+        return {"run_index": run.run_index}
+
+    scheduler = ApifyRunScheduler(
+        execute=execute,
+        max_parallel_runs=4,
+        max_parallel_runs_per_actor=1,
+        max_parallel_runs_per_platform=4,
+    )
+    for actor in ("a", "a", "a", "b", "b"):
+        scheduler.submit(_run(scheduler, actor))
+    results = scheduler.run()
+
+    assert [row["run_index"] for row in results] == [1, 2, 3, 4, 5]
+    assert peak == {"a": 1, "b": 1}
+
+    serial = ApifyRunScheduler(
+        execute=execute,
+        max_parallel_runs=1,
+        max_parallel_runs_per_actor=1,
+        max_parallel_runs_per_platform=1,
+    )
+    started.clear()
+    for priority in (2, 0, 1):
+        serial.submit(_run(serial, f"actor-{priority}", priority=priority))
+    serial.run()
+    assert started == [2, 3, 1]
+
+
+def test_scheduler_starts_follow_up_runs_while_siblings_are_in_flight() -> None:
+    child_started = threading.Event()
+    events: list[tuple[str, int]] = []
+    callback_threads: set[int] = set()
+
+    def record_progress(event: dict) -> None:
+        callback_threads.add(threading.get_ident())
+        events.append((str(event["event"]), int(event["run_index"])))
+
+    def execute(run: ScheduledApifyRun) -> dict:
+        if run.stage == "child":
+            child_started.set()
+        elif run.actor_key == "slow":
+            # Only finishes once the follow-up of its sibling is running.
+            assert child_started.wait(timeout=5)
+        scheduler.emit({"event": "ran", "run_index": run.run_index})
+        return {"actor": run.actor_key, "stage": run.stage}
+
+    scheduler = ApifyRunScheduler(
+        execute=execute,
+        max_parallel_runs=2,
+        max_parallel_runs_per_actor=2,
+        max_parallel_runs_per_platform=2,
+        progress_callback=record_progress,
+    )
+
+    def on_result(run: ScheduledApifyRun, result: dict) -> None:
+        if run.actor_key == "fast":
+            scheduler.submit(_run(scheduler, "child-actor", stage="child"))
+
+    scheduler.submit(_run(scheduler, "slow"))
+    scheduler.submit(_run(scheduler, "fast"))
+    results = scheduler.run(on_result=on_result)
+
+    assert [row["stage"] for row in results] == ["base", "base", "child"]
+    assert sorted(index for _event, index in events) == [1, 2, 3]
+    assert callback_threads == {threading.get_ident()}
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import threading
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.ads.apify_client import ApifyClient
+from app.config import settings
+from app.routers import apify_webhooks
+from app.services import apify_run_completion
+from app.services.apify_run_completion import completion_webhooks, wait_for_run_completion
+from app.temporal.workflows.apify_runs import APIFY_RUN_FINISHED_SIGNAL, ApifyRunCompletionWorkflow
+
+
+class _FakeTemporalClient:
+    def __init__(self) -> None:
+        self.started: list[tuple[tuple[Any, ...], dict[str, Any]]] = []
+
+    async def start_workflow(self, *args: Any, **kwargs: Any) -> SimpleNamespace:
+        self.started.append((args, kwargs))
+        return SimpleNamespace(id=kwargs.get("id"))
+
+
+@pytest.fixture
+def webhook_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "APIFY_WEBHOOK_BASE_URL", "https://mos.example.com/")
+    monkeypatch.setattr(settings, "APIFY_WEBHOOK_SECRET", "s3cret")
+
+
+@pytest.fixture
+def temporal_client(monkeypatch: pytest.MonkeyPatch) -> _FakeTemporalClient:
+    client = _FakeTemporalClient()
+
+    async def _get_client() -> _FakeTemporalClient:
+        return client
+
+    monkeypatch.setattr(apify_webhooks, "get_temporal_client", _get_client)
+    return client
+
+
+def _deliver(http: TestClient, webhook: dict[str, Any], run: dict[str, Any]) -> httpx.Response:
+    # Stand-in for Apify: render the ad-hoc webhook the way the platform does on a terminal run.
+    path = httpx.URL(webhook["requestUrl"]).path
+    headers = json.loads(webhook["headersTemplate"])
+    payload = {
+        "userId": "user-1",
+        "createdAt": "2026-10-16T00:00:00.000Z",
+        "eventType": f"ACTOR.RUN.{run['status']}",
+        "eventData": {"actorId": "actor-1", "actorRunId": run["id"]},
+        "resource": run,
+    }
+    return http.post(path, json=payload, headers=headers)
+
+
+def _http() -> TestClient:
+    app = FastAPI()
+    app.include_router(apify_webhooks.router)
+    return TestClient(app)
+
+
+def test_webhook_signals_completion_workflow_keyed_by_run(
+    webhook_settings: None, temporal_client: _FakeTemporalClient
+) -> None:
+    webhooks = completion_webhooks()
+    assert webhooks is not None
+    assert webhooks[0]["requestUrl"] == "https://mos.example.com/api/apify/webhook"
+    assert "ACTOR.RUN.SUCCEEDED" in webhooks[0]["eventTypes"]
+
+    run = {"id": "run-42", "status": "SUCCEEDED", "defaultDatasetId": "dataset-42"}
+    response = _deliver(_http(), webhooks[0], run)
+
+    assert response.status_code == 200
+    assert response.json()["run_id"] == "run-42"
+    (args, kwargs), = temporal_client.started
+    assert args[0] == ApifyRunCompletionWorkflow.run
+    assert args[1].run_id == "run-42"
+    assert kwargs["id"] == "apify-run-run-42"
+    assert kwargs["start_signal"] == APIFY_RUN_FINISHED_SIGNAL
+    assert kwargs["start_signal_args"][0]["resource"] == run
+
+
+def test_webhook_rejects_bad_secret_and_missing_run_id(
+    webhook_settings: None, temporal_client: _FakeTemporalClient
+) -> None:
+    http = _http()
+    webhook = completion_webhooks()[0]
+
+    forged = dict(webhook, headersTemplate=json.dumps({"X-Apify-Webhook-Secret": "nope"}))
+    assert _deliver(http, forged, {"id": "run-1", "status": "SUCCEEDED"}).status_code == 401
+    missing_run = http.post("/api/apify/webhook", json={"resource": {}}, headers={"X-Apify-Webhook-Secret": "s3cret"})
+    assert missing_run.status_code == 400
+    assert temporal_client.started == []
+
+
+def test_completion_webhooks_disabled_without_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "APIFY_WEBHOOK_BASE_URL", None)
+    monkeypatch.setattr(settings, "APIFY_WEBHOOK_SECRET", "s3cret")
+
+    assert completion_webhooks() is None
+
+
+def test_start_actor_run_encodes_webhooks(monkeypatch: pytest.MonkeyPatch, webhook_settings: None) -> None:
+    monkeypatch.setenv("APIFY_API_TOKEN", "test-token")
+    calls: list[dict[str, Any]] = []
+
+    def _fake_request(method, url, **kwargs):  # noqa: ANN001, ANN003
+        calls.append(kwargs)
+        return httpx.Response(201, json={"data": {"id": "run-1"}}, request=httpx.Request(method, url))
+
+    monkeypatch.setattr(
+        "app.ads.apify_client._get_shared_http_client", lambda: SimpleNamespace(request=_fake_request)
+    )
+
+    webhooks = completion_webhooks()
+    run = ApifyClient().start_actor_run("actor~one", input_payload={"q": 1}, webhooks=webhooks)
+
+    assert run["id"] == "run-1"
+    assert json.loads(base64.b64decode(calls[0]["params"]["webhooks"])) == webhooks
+
+
+def test_blocking_waiters_share_one_temporal_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    connects: list[str] = []
+    loops: set[int] = set()
+
+    async def _connect(address: str, **_kwargs: Any) -> SimpleNamespace:
+        connects.append(address)
+        return SimpleNamespace(address=address)
+
+    async def _await_run(client: Any, run_id: str, *, max_wait_seconds: int) -> dict[str, Any]:
+        loops.add(threading.get_ident())
+        return {"id": run_id, "status": "SUCCEEDED", "max_wait_seconds": max_wait_seconds}
+
+    monkeypatch.setattr(apify_run_completion, "_waiter_client", None)
+    monkeypatch.setattr(apify_run_completion.Client, "connect", _connect)
+    monkeypatch.setattr(apify_run_completion, "await_run_completion", _await_run)
+
+    results: list[dict[str, Any]] = []
+
+    def _wait(idx: int) -> None:
+        results.append(wait_for_run_completion(f"run-{idx}", max_wait_seconds=5))
+
+    threads = [threading.Thread(target=_wait, args=(idx,)) for idx in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert sorted(run["id"] for run in results) == ["run-0", "run-1", "run-2", "run-3"]
+    assert connects == [settings.TEMPORAL_ADDRESS]
+    # Every wait ran on the one completion-loop thread, not the caller's.
+    assert len(loops) == 1 and threading.get_ident() not in loops
+
+
+def test_blocking_wait_reports_progress_while_the_run_is_in_flight(monkeypatch: pytest.MonkeyPatch) -> None:
+    waits: list[dict[str, Any]] = []
+
+    async def _connect(address: str, **_kwargs: Any) -> SimpleNamespace:
+        return SimpleNamespace(address=address)
+
+    async def _await_run(client: Any, run_id: str, *, max_wait_seconds: int) -> dict[str, Any]:
+        while len(waits) < 2:
+            await asyncio.sleep(0.01)
+        return {"id": run_id, "status": "SUCCEEDED"}
+
+    monkeypatch.setattr(apify_run_completion, "_waiter_client", None)
+    monkeypatch.setattr(apify_run_completion.Client, "connect", _connect)
+    monkeypatch.setattr(apify_run_completion, "await_run_completion", _await_run)
+
+    run = wait_for_run_completion("run-1", max_wait_seconds=5, on_wait=waits.append, wait_interval_seconds=0.05)
+
+    assert run == {"id": "run-1", "status": "SUCCEEDED"}
+    assert len(waits) >= 2
+    assert {(payload["run_id"], payload["status"]) for payload in waits} == {("run-1", "RUNNING")}
+    assert waits[1]["elapsed_seconds"] >= waits[0]["elapsed_seconds"]
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from app.ads.fingerprints import compute_creative_fingerprint
+from app.ads.types import NormalizedAdWithAssets, NormalizedAsset
+from app.ads.near_duplicates import (
+    MINHASH_BANDS,
+    MINHASH_PERMUTATIONS,
+    CreativeSignature,
+    connected_components,
+    hamming_distance,
+    image_hashes,
+    is_near_duplicate,
+    minhash_bands,
+    minhash_signature,
+    minhash_similarity,
+    phash_bands,
+)
+from app.db.enums import AdChannelEnum, MediaAssetTypeEnum
+from app.db.models import AdCreative, Brand, BrandChannelIdentity, MediaAsset
+from app.db.repositories.ads import AdsRepository
+from app.services.media_mirror import MediaMirrorService
+from tests.conftest import TEST_ORG_ID
+
+
+def _gradient_image(size: int, *, flip: bool = False) -> Image.Image:
+    x = np.linspace(0, 255, size)
+    pixels = np.add.outer(x, x) / 2
+    pixels = pixels + 60 * np.sin(np.linspace(0, 3 * np.pi, size))[None, :]
+    if flip:
+        pixels = pixels[::-1, ::-1].T
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).convert("RGB")
+
+
+def _encode(img: Image.Image, fmt: str, **kwargs) -> bytes:
+    buffer = BytesIO()
+    img.save(buffer, format=fmt, **kwargs)
+    return buffer.getvalue()
+
+
+def test_image_hashes_survive_resize_and_reencode_but_separate_other_images() -> None:
+    original = image_hashes(_encode(_gradient_image(256), "PNG"))
+    resized = image_hashes(_encode(_gradient_image(256).resize((180, 180)), "JPEG", quality=60))
+    other = image_hashes(_encode(_gradient_image(256, flip=True), "PNG"))
+
+    assert original is not None and resized is not None and other is not None
+    assert hamming_distance(original[0], resized[0]) <= 6
+    assert hamming_distance(original[1], resized[1]) <= 6
+    assert hamming_distance(original[0], other[0]) > 16
+    # Hashes are stored as signed BIGINT.
+    assert all(-(1 << 63) <= value < (1 << 63) for value in (*original, *other))
+    assert image_hashes(b"not an image") is None
+
+
+def test_phash_bands_share_a_bucket_when_within_seven_bits() -> None:
+    base = 0x0123456789ABCDEF
+    # Flip one bit in 7 of the 8 bands: at least one band is untouched.
+    flipped = base
+    for band in range(7):
+        flipped ^= 1 << (band * 8)
+
+    assert hamming_distance(base, flipped) == 7
+    assert any(left == right for left, right in zip(phash_bands(base), phash_bands(flipped), strict=True))
+    assert phash_bands(-1) == [0xFF] * 8
+
+
+def test_minhash_similarity_tracks_copy_overlap() -> None:
+    copy = "glow serum with vitamin c brightens dull skin in seven days shop the summer sale today"
+    near = copy + " only"
+    different = "protein powder for athletes with twenty grams per scoop and zero sugar added"
+
+    signature = minhash_signature(copy)
+    assert signature is not None and len(signature) == MINHASH_PERMUTATIONS
+    assert signature == minhash_signature(copy)
+    assert minhash_similarity(signature, minhash_signature(near)) >= 0.8
+    assert minhash_similarity(signature, minhash_signature(different)) < 0.2
+    assert minhash_signature("   ") is None
+    assert len(minhash_bands(signature)) == MINHASH_BANDS
+
+
+def test_is_near_duplicate_requires_matching_media_and_copy() -> None:
+    copy = minhash_signature("new drop limited stock free shipping on every order this week")
+    other_copy = minhash_signature("book a demo to see how our crm saves your team ten hours")
+
+    def check(left: CreativeSignature, right: CreativeSignature) -> bool:
+        return is_near_duplicate(left, right, max_phash_distance=6, min_copy_similarity=0.8)
+
+    assert check(CreativeSignature("a", 0b1111, copy), CreativeSignature("b", 0b0111, copy))
+    assert not check(CreativeSignature("a", 0, copy), CreativeSignature("b", 0xFF, copy))
+    assert not check(CreativeSignature("a", 0, copy), CreativeSignature("b", 0, other_copy))
+    # Media-only and copy-only creatives match on what they have; mixed pairs never match.
+    assert check(CreativeSignature("a", 7, None), CreativeSignature("b", 7, copy))
+    assert check(CreativeSignature("a", None, copy), CreativeSignature("b", None, copy))
+    assert not check(CreativeSignature("a", 7, copy), CreativeSignature("b", None, copy))
+    assert not check(CreativeSignature("a", None, None), CreativeSignature("b", None, None))
+
+
+def test_connected_components_merges_transitively() -> None:
+    components = connected_components(["a", "b", "c", "d"], [("a", "b"), ("b", "c"), ("x", "d")])
+
+    assert sorted(sorted(component) for component in components) == [["a", "b", "c"], ["d", "x"]]
+
+
+def test_creative_fingerprint_carries_copy_minhash() -> None:
+    result = compute_creative_fingerprint(
+        copy_fields={"headline": "Summer  SALE", "primary_text": "Glow serum, 20% off", "description": None},
+        assets=[],
+    )
+    same_copy = compute_creative_fingerprint(
+        copy_fields={"headline": "summer sale", "primary_text": "glow serum, 20% off"},
+        assets=[],
+    )
+
+    assert result.copy_minhash == minhash_signature("summer sale glow serum, 20% off")
+    assert result.copy_minhash == same_copy.copy_minhash
+    assert compute_creative_fingerprint(copy_fields={}, assets=[]).copy_minhash is None
+
+
+def test_deduped_media_keeps_creative_phash_for_clustering(db_session) -> None:
+    brand = Brand(org_id=TEST_ORG_ID, canonical_name="Glow Co", normalized_name="glow co")
+    db_session.add(brand)
+    db_session.flush()
+    identity = BrandChannelIdentity(brand_id=brand.id, channel=AdChannelEnum.META_ADS_LIBRARY)
+    db_session.add(identity)
+    db_session.commit()
+
+    copy = "glow serum with vitamin c brightens dull skin in seven days shop the summer sale today"
+    repo = AdsRepository(db_session)
+    upserted = repo.upsert_ads_batch(
+        brand_id=str(brand.id),
+        brand_channel_identity_id=str(identity.id),
+        channel=AdChannelEnum.META_ADS_LIBRARY,
+        normalized=[
+            NormalizedAdWithAssets(
+                external_ad_id=f"ad-{idx}",
+                body_text=copy,
+                assets=[
+                    NormalizedAsset(
+                        asset_type=MediaAssetTypeEnum.IMAGE,
+                        source_url=f"https://cdn{idx}.example.com/serum.jpg",
+                        role="primary",
+                    )
+                ],
+            )
+            for idx in (1, 2)
+        ],
+    )
+    (_, [existing]), (_, [duplicate]) = upserted
+    existing.phash = 0x0123456789ABCDEF
+    db_session.flush()
+    duplicate_id = duplicate.id
+
+    # Mirroring found the second CDN URL to be the same bytes as the first asset.
+    service = MediaMirrorService(db_session, storage=object())  # type: ignore[arg-type]
+    service._dedupe_media_asset(duplicate, existing)
+    db_session.commit()
+
+    creative_ids = repo.creative_ids_for_ads([str(ad.id) for ad, _ in upserted])
+    assert len(creative_ids) == 2
+    result = repo.cluster_creatives(creative_ids=creative_ids)
+
+    creatives = db_session.query(AdCreative).filter(AdCreative.id.in_(creative_ids)).all()
+    assert {creative.primary_media_asset_id for creative in creatives} == {existing.id}
+    assert {creative.media_phash for creative in creatives} == {existing.phash}
+    assert result["matched"] >= 1
+    assert len({creative.cluster_id for creative in creatives}) == 1
+    assert db_session.get(MediaAsset, duplicate_id) is None
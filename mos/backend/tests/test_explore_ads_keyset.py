@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+import sqlalchemy as sa
+from fastapi import HTTPException
+
+from app.routers.explore import _decode_cursor, _encode_cursor, _keyset_after, _sort_keys
+
+
+def test_cursor_round_trips_typed_values() -> None:
+    values = [3, datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc), date(2026, 1, 1), Decimal("0.75"), uuid4(), None]
+    cursor = _encode_cursor(sort="last_seen", direction="desc", values=values)
+
+    assert _decode_cursor(cursor, sort="last_seen", direction="desc", key_count=len(values)) == values
+    with pytest.raises(HTTPException) as exc_info:
+        _decode_cursor(cursor, sort="days_active", direction="desc", key_count=len(values))
+    assert exc_info.value.status_code == 400
+    with pytest.raises(HTTPException):
+        _decode_cursor("not-a-cursor", sort="last_seen", direction="desc", key_count=len(values))
+
+
+def test_keyset_pages_cover_every_row_once_with_nulls_last() -> None:
+    metadata = sa.MetaData()
+    table = sa.Table(
+        "ranked",
+        metadata,
+        sa.Column("ad_id", sa.Integer, primary_key=True),
+        sa.Column("media_count", sa.Integer),
+        sa.Column("score", sa.Integer, nullable=True),
+    )
+    engine = sa.create_engine("sqlite://")
+    metadata.create_all(engine)
+    rows = [
+        {"ad_id": idx, "media_count": idx % 2, "score": None if idx % 3 == 0 else idx % 4}
+        for idx in range(1, 23)
+    ]
+    keys = [(table.c.media_count, True), (table.c.score, False), (table.c.ad_id, False)]
+    order_by = [col.desc().nulls_last() if descending else col.asc().nulls_last() for col, descending in keys]
+
+    with engine.begin() as conn:
+        conn.execute(table.insert(), rows)
+        expected = [row[0] for row in conn.execute(sa.select(table.c.ad_id).order_by(*order_by))]
+
+        seen: list[int] = []
+        last_values = None
+        while True:
+            query = sa.select(table.c.ad_id, *[col for col, _ in keys]).order_by(*order_by).limit(5)
+            if last_values is not None:
+                query = query.where(_keyset_after(keys, last_values))
+            page = conn.execute(query).all()
+            if not page:
+                break
+            seen.extend(row[0] for row in page)
+            last_values = list(page[-1][1:])
+
+    assert seen == expected
+
+
+def test_default_sort_keys_match_the_stored_index_and_bound_the_leading_column() -> None:
+    metadata = sa.MetaData()
+    ads = sa.Table(
+        "ads",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("media_count", sa.Integer, nullable=False),
+        sa.Column("last_seen_at", sa.DateTime, nullable=True),
+        sa.Column("started_running_at", sa.DateTime, nullable=True),
+    )
+    columns = dict(
+        last_seen_col=ads.c.last_seen_at,
+        start_date_col=ads.c.started_running_at,
+        days_active_col=ads.c.started_running_at,
+        started_col=ads.c.started_running_at,
+        ad_id_col=ads.c.id,
+        has_media_col=ads.c.media_count,
+    )
+
+    keys = _sort_keys("last_seen", "desc", **columns)
+    assert [col.name for col, _ in keys] == ["media_count", "last_seen_at", "id"]
+    started_keys = _sort_keys("started", "desc", **columns)
+    assert [col.name for col, _ in started_keys] == ["media_count", "started_running_at", "last_seen_at", "id"]
+
+    predicate = _keyset_after(keys, [2, datetime(2026, 1, 1), 7])
+    assert str(predicate).startswith("ads.media_count <= :media_count_1 AND")
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.explore_search import ad_copy_matches, parse_search_query
+
+
+def test_parse_search_query_builds_prefix_tsquery_from_word_tokens() -> None:
+    query = parse_search_query("  Glow   SERUM & glow!! 'drop table' ")
+
+    assert query is not None
+    assert query.text == "glow serum & glow!! 'drop table'"
+    # Operators and quotes never reach to_tsquery; duplicate tokens collapse.
+    assert query.prefix_tsquery == "glow:* & serum:* & drop:* & table:*"
+    assert parse_search_query("  !!  ") is None
+    assert parse_search_query(None) is None
+
+
+def test_ad_copy_matches_uses_indexed_search_columns() -> None:
+    query = parse_search_query("vitamin c")
+    assert query is not None
+
+    sql = str(ad_copy_matches(query).compile(dialect=postgresql.dialect()))
+
+    assert "ads.search_tsv @@ to_tsquery('simple'::regconfig" in sql
+    assert "brands.search_text LIKE" in sql
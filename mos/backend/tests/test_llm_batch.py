@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import io
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from app.llm.batch import LLMBatchRequestError, heartbeat_llm_batch
+from app.llm.client import LLMClient, LLMGenerationParams
+
+
+class _StandInBatchServer:
+    """In-memory stand-in for the provider batch endpoints; a batch ends after `polls_until_done` polls."""
+
+    def __init__(self, *, polls_until_done: int = 2) -> None:
+        self.polls_until_done = polls_until_done
+        self.batches: dict[str, dict[str, Any]] = {}
+        self.files: dict[str, bytes] = {}
+
+    def create(self, requests: list[dict[str, Any]], **extra: Any) -> str:
+        batch_id = f"batch_{len(self.batches) + 1}"
+        self.batches[batch_id] = {"requests": requests, "polls": 0, **extra}
+        return batch_id
+
+    def poll(self, batch_id: str) -> bool:
+        batch = self.batches[batch_id]
+        batch["polls"] += 1
+        return batch["polls"] >= self.polls_until_done
+
+
+class _FakeAnthropicBatches:
+    def __init__(self, server: _StandInBatchServer) -> None:
+        self.server = server
+
+    def create(self, *, requests):  # noqa: ANN001
+        return SimpleNamespace(id=self.server.create(requests))
+
+    def retrieve(self, batch_id):  # noqa: ANN001
+        ended = self.server.poll(batch_id)
+        return SimpleNamespace(id=batch_id, processing_status="ended" if ended else "in_progress")
+
+    def results(self, batch_id):  # noqa: ANN001
+        for request in self.server.batches[batch_id]["requests"]:
+            prompt = "".join(block["text"] for block in request["params"]["messages"][0]["content"])
+            if prompt == "fail":
+                result = SimpleNamespace(type="errored", error={"type": "invalid_request_error"})
+            else:
+                message = SimpleNamespace(content=[SimpleNamespace(type="text", text=prompt.upper())])
+                result = SimpleNamespace(type="succeeded", message=message)
+            yield SimpleNamespace(custom_id=request["custom_id"], result=result)
+
+
+class _FakeOpenAIFiles:
+    def __init__(self, server: _StandInBatchServer) -> None:
+        self.server = server
+
+    def create(self, *, file, purpose):  # noqa: ANN001
+        assert purpose == "batch"
+        file_id = f"file_{len(self.server.files) + 1}"
+        self.server.files[file_id] = file.read()
+        return SimpleNamespace(id=file_id)
+
+    def content(self, file_id):  # noqa: ANN001
+        return SimpleNamespace(text=self.server.files[file_id].decode("utf-8"))
+
+
+class _FakeOpenAIBatches:
+    def __init__(self, server: _StandInBatchServer) -> None:
+        self.server = server
+
+    def create(self, *, input_file_id, endpoint, completion_window):  # noqa: ANN001
+        lines = [json.loads(line) for line in io.StringIO(self.server.files[input_file_id].decode("utf-8"))]
+        assert all(line["url"] == endpoint for line in lines)
+        return SimpleNamespace(id=self.server.create(lines, endpoint=endpoint))
+
+    def retrieve(self, batch_id):  # noqa: ANN001
+        if not self.server.poll(batch_id):
+            return SimpleNamespace(id=batch_id, status="in_progress", output_file_id=None, error_file_id=None)
+        batch = self.server.batches[batch_id]
+        output_lines = []
+        for line in batch["requests"]:
+            body = line["body"]
+            if batch["endpoint"] == "/v1/responses":
+                text = body["input"][::-1]
+                response_body = {"output": [{"type": "message", "content": [{"type": "output_text", "text": text}]}]}
+            else:
+                text = body["messages"][0]["content"][::-1]
+                response_body = {"choices": [{"message": {"role": "assistant", "content": text}}]}
+            output_lines.append(
+                json.dumps({"custom_id": line["custom_id"], "response": {"status_code": 200, "body": response_body}})
+            )
+        output_file_id = f"file_{len(self.server.files) + 1}"
+        self.server.files[output_file_id] = "\n".join(output_lines).encode("utf-8")
+        return SimpleNamespace(id=batch_id, status="completed", output_file_id=output_file_id, error_file_id=None)
+
+
+@pytest.fixture
+def batch_server(monkeypatch) -> _StandInBatchServer:
+    server = _StandInBatchServer()
+
+    class _FakeAnthropic:
+        def __init__(self, **_kwargs):  # noqa: ANN003
+            self.messages = SimpleNamespace(batches=_FakeAnthropicBatches(server))
+
+    class _FakeOpenAI:
+        def __init__(self, **_kwargs):  # noqa: ANN003
+            self.files = _FakeOpenAIFiles(server)
+            self.batches = _FakeOpenAIBatches(server)
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr("app.llm.client.Anthropic", _FakeAnthropic)
+    monkeypatch.setattr("app.llm.client.get_openai_client_class", lambda: _FakeOpenAI)
+    return server
+
+
+def test_anthropic_batch_resolves_futures_and_reports_progress(batch_server) -> None:
+    llm = LLMClient(default_model="claude-sonnet-4-5")
+    batch = llm.batch(poll_interval_seconds=0)
+    params = LLMGenerationParams(model="claude-sonnet-4-5", max_tokens=64)
+    ok_future = batch.add("score this", params)
+    failed_future = batch.add("fail", params)
+
+    progress: list[dict[str, Any]] = []
+    batch_ids = batch.run(on_poll=progress.append)
+
+    assert batch_ids == {"anthropic:messages:claude-sonnet-4-5": "batch_1"}
+    assert ok_future.result(timeout=0) == "SCORE THIS"
+    with pytest.raises(LLMBatchRequestError, match="errored"):
+        failed_future.result(timeout=0)
+    assert [payload["status"] for payload in progress] == ["in_progress", "in_progress", "completed"]
+    assert progress[0]["batch_ids"] == batch_ids
+    request = batch_server.batches["batch_1"]["requests"][0]
+    assert request["params"]["max_tokens"] == 64
+
+
+def test_openai_batch_groups_by_endpoint_and_uploads_jsonl(batch_server) -> None:
+    llm = LLMClient(default_model="gpt-4o")
+    batch = llm.batch(poll_interval_seconds=0)
+    chat_future = batch.add("abc", LLMGenerationParams(model="gpt-4o", temperature=0))
+    reasoning_future = batch.add(
+        "xyz",
+        LLMGenerationParams(model="gpt-4o", use_reasoning=True, reasoning_effort="low"),
+    )
+
+    batch.run()
+
+    assert chat_future.result(timeout=0) == "cba"
+    assert reasoning_future.result(timeout=0) == "zyx"
+    endpoints = sorted(batch_server.batches[batch_id]["endpoint"] for batch_id in batch.batch_ids.values())
+    assert endpoints == ["/v1/chat/completions", "/v1/responses"]
+    reasoning_batch = batch.batch_ids["openai:/v1/responses:gpt-4o"]
+    assert batch_server.batches[reasoning_batch]["requests"][0]["body"]["reasoning"] == {"effort": "low"}
+
+
+def test_batch_resumes_existing_batch_ids_without_resubmitting(batch_server) -> None:
+    llm = LLMClient(default_model="claude-sonnet-4-5")
+    params = LLMGenerationParams(model="claude-sonnet-4-5")
+    first = llm.batch(poll_interval_seconds=0)
+    first.add("hello", params)
+    batch_ids = first.submit()
+
+    retried = llm.batch(poll_interval_seconds=0)
+    future = retried.add("hello", params)
+    retried.run(existing_batch_ids=batch_ids)
+
+    assert future.result(timeout=0) == "HELLO"
+    assert list(batch_server.batches) == ["batch_1"]
+
+
+def test_batch_rejects_unsupported_requests_and_heartbeat_is_noop_outside_activity(batch_server) -> None:
+    batch = LLMClient(default_model="claude-sonnet-4-5").batch()
+
+    with pytest.raises(RuntimeError, match="web search"):
+        batch.add("x", LLMGenerationParams(model="gpt-4o", use_web_search=True))
+    with pytest.raises(Exception, match="no Batch API support"):
+        batch.add("x", LLMGenerationParams(model="gemini-2.5-pro"))
+    heartbeat_llm_batch({"status": "in_progress"})
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import httpx
+
+from app.llm.client import LLMClient
+from app.llm.client_pool import close_pooled_clients
+
+
+def test_llm_clients_share_one_pooled_sdk_client_per_key(monkeypatch) -> None:
+    created: list[dict[str, object]] = []
+
+    class _DummyAnthropic:
+        def __init__(self, **kwargs):  # noqa: ANN003
+            created.append(kwargs)
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "key-a")
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", "")
+    monkeypatch.setenv("ANTHROPIC_API_BASE_URL", "")
+    monkeypatch.setattr("app.llm.client.Anthropic", _DummyAnthropic)
+    close_pooled_clients()
+    try:
+        first = LLMClient(default_model="claude-sonnet-4-5")
+        second = LLMClient(default_model="claude-sonnet-4-5")
+        first._ensure_anthropic_client()
+        second._ensure_anthropic_client()
+
+        assert first._anthropic_client is second._anthropic_client
+        assert len(created) == 1
+        assert isinstance(created[0]["http_client"], httpx.Client)
+
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "key-b")
+        third = LLMClient(default_model="claude-sonnet-4-5")
+        third._ensure_anthropic_client()
+        assert third._anthropic_client is not first._anthropic_client
+        assert len(created) == 2
+    finally:
+        close_pooled_clients()
+
+    assert created[0]["http_client"].is_closed  # type: ignore[union-attr]
+    fresh = LLMClient(default_model="claude-sonnet-4-5")
+    fresh._ensure_anthropic_client()
+    assert len(created) == 3
+    close_pooled_clients()
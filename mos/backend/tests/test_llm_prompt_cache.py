@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from app.llm.client import LLMClient, LLMGenerationParams
+from app.llm.prompt_cache import anthropic_cache_usage, anthropic_system, anthropic_user_blocks
+
+
+def test_system_prompt_is_cached_only_above_threshold(monkeypatch) -> None:
+    monkeypatch.setenv("ANTHROPIC_PROMPT_CACHE_MIN_CHARS", "100")
+
+    assert anthropic_system(None) is None
+    assert anthropic_system("short instructions") == "short instructions"
+    long_system = "x" * 100
+    assert anthropic_system(long_system) == [
+        {"type": "text", "text": long_system, "cache_control": {"type": "ephemeral"}}
+    ]
+
+    monkeypatch.setenv("ANTHROPIC_PROMPT_CACHE_ENABLED", "false")
+    assert anthropic_system(long_system) == long_system
+
+
+def test_user_blocks_mark_the_stable_prefix(monkeypatch) -> None:
+    monkeypatch.setenv("ANTHROPIC_PROMPT_CACHE_MIN_CHARS", "10")
+    prefix = "PROMPT ASSET + VOC EVIDENCE"
+    prompt = prefix + "\n\nReturn JSON."
+
+    blocks = anthropic_user_blocks(prompt, cacheable_prefix=prefix)
+    assert blocks == [
+        {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "\n\nReturn JSON."},
+    ]
+    assert anthropic_user_blocks(prompt) == [{"type": "text", "text": prompt}]
+    assert anthropic_user_blocks(prompt, cacheable_prefix="PROMPT") == [{"type": "text", "text": prompt}]
+    with pytest.raises(ValueError, match="leading substring"):
+        anthropic_user_blocks(prompt, cacheable_prefix="not the start of the prompt")
+
+
+def test_anthropic_generation_sends_breakpoints_and_reports_cache_tokens(monkeypatch) -> None:
+    captured: dict[str, Any] = {}
+
+    class _DummyAnthropic:
+        def __init__(self, **_kwargs):  # noqa: ANN003
+            self.messages = self
+
+        def create(self, **kwargs):  # noqa: ANN003
+            captured.update(kwargs)
+            return SimpleNamespace(
+                content=[SimpleNamespace(type="text", text="OK")],
+                usage=SimpleNamespace(
+                    input_tokens=12,
+                    output_tokens=3,
+                    cache_read_input_tokens=2048,
+                    cache_creation_input_tokens=0,
+                ),
+            )
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setenv("ANTHROPIC_PROMPT_CACHE_MIN_CHARS", "10")
+    monkeypatch.setattr("app.llm.client.Anthropic", _DummyAnthropic)
+    progress: list[dict[str, Any]] = []
+
+    llm = LLMClient(default_model="claude-sonnet-4-5")
+    text = llm.generate_text(
+        "Brand context block. Score this angle.",
+        params=LLMGenerationParams(
+            model="claude-sonnet-4-5",
+            max_tokens=32,
+            system_prompt="You are a direct-response strategist.",
+            cacheable_prompt_prefix="Brand context block.",
+            progress_callback=progress.append,
+        ),
+    )
+
+    assert text == "OK"
+    assert captured["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert captured["messages"][0]["content"][0] == {
+        "type": "text",
+        "text": "Brand context block.",
+        "cache_control": {"type": "ephemeral"},
+    }
+    completed = progress[-1]
+    assert completed["status"] == "completed"
+    assert completed["cache_read_input_tokens"] == 2048
+    assert completed["cache_creation_input_tokens"] == 0
+    assert anthropic_cache_usage({"cache_read_input_tokens": 5}) == {"cache_read_input_tokens": 5}
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+
+from app.llm.rate_limiter import (
+    LLMRateLimiter,
+    RateLimit,
+    estimate_tokens,
+    observe_rate_limit_response,
+    parse_rate_limit_headers,
+)
+
+
+class _FakeProvider:
+    """Stands in for an HTTP provider: answers with a status and rate-limit headers per call."""
+
+    def __init__(self, responses: list[tuple[int, dict[str, str]]]) -> None:
+        self._responses = list(responses)
+        self.calls = 0
+
+    def call(self) -> int:
+        status, headers = self._responses[min(self.calls, len(self._responses) - 1)]
+        self.calls += 1
+        observe_rate_limit_response(status, headers)
+        return status
+
+
+def test_parse_rate_limit_headers_for_openai_and_anthropic() -> None:
+    openai = parse_rate_limit_headers(
+        {
+            "x-ratelimit-limit-requests": "500",
+            "x-ratelimit-remaining-requests": "499",
+            "x-ratelimit-reset-requests": "120ms",
+            "x-ratelimit-limit-tokens": "30000",
+            "x-ratelimit-remaining-tokens": "29000",
+            "x-ratelimit-reset-tokens": "1m0.5s",
+        }
+    )
+    assert (openai.requests_limit, openai.requests_remaining) == (500, 499)
+    assert openai.requests_reset_seconds == 0.12
+    assert (openai.tokens_limit, openai.tokens_remaining) == (30000, 29000)
+    assert openai.tokens_reset_seconds == 60.5
+
+    now = datetime(2026, 10, 16, 12, 0, 0, tzinfo=timezone.utc)
+    anthropic = parse_rate_limit_headers(
+        {
+            "anthropic-ratelimit-requests-limit": "50",
+            "anthropic-ratelimit-requests-remaining": "0",
+            "anthropic-ratelimit-requests-reset": "2026-10-16T12:00:03Z",
+            "retry-after": "3",
+        },
+        now=now,
+    )
+    assert anthropic.requests_limit == 50
+    assert anthropic.requests_remaining == 0
+    assert anthropic.requests_reset_seconds == 3.0
+    assert anthropic.retry_after_seconds == 3.0
+    assert estimate_tokens("x" * 400, max_output_tokens=50) == 150
+
+
+def test_rate_limiter_enforces_requests_per_minute_with_fake_clock() -> None:
+    now = [0.0]
+    limiter = LLMRateLimiter({"fake": RateLimit(requests_per_minute=60)}, clock=lambda: now[0])
+
+    with limiter.acquire("fake", "m", estimated_tokens=1):
+        pass
+    bucket = limiter._buckets[("fake", "m")]
+    assert bucket.seconds_until_ready(1, now[0]) == 0.0
+    bucket.requests.level = 0.0
+    assert bucket.seconds_until_ready(1, now[0]) == 1.0
+    now[0] = 0.5
+    assert bucket.seconds_until_ready(1, now[0]) == 0.5
+
+
+def test_rate_limiter_learns_from_headers_and_pauses_on_429() -> None:
+    limiter = LLMRateLimiter()
+    provider = _FakeProvider(
+        [
+            (200, {"x-ratelimit-limit-requests": "600", "x-ratelimit-limit-tokens": "90000"}),
+            (429, {"retry-after-ms": "300"}),
+        ]
+    )
+
+    with limiter.acquire("fake", "m", estimated_tokens=100) as lease:
+        provider.call()
+        lease.record_usage(40)
+    bucket = limiter._buckets[("fake", "m")]
+    assert bucket.requests.capacity == 600
+    assert bucket.tokens.capacity == 90000
+
+    with limiter.acquire("fake", "m", estimated_tokens=100):
+        provider.call()
+    started = time.monotonic()
+    with limiter.acquire("fake", "m", estimated_tokens=100) as lease:
+        pass
+    assert time.monotonic() - started >= 0.25
+    assert lease.waited_seconds >= 0.25
+
+
+def test_rate_limiter_admits_waiters_in_priority_order() -> None:
+    limiter = LLMRateLimiter()
+    with limiter.acquire("fake", "m", estimated_tokens=1):
+        observe_rate_limit_response(429, {"retry-after-ms": "200"})
+
+    order: list[int] = []
+    order_lock = threading.Lock()
+
+    def _call(priority: int) -> None:
+        with limiter.acquire("fake", "m", estimated_tokens=1, priority=priority):
+            with order_lock:
+                order.append(priority)
+
+    threads = [threading.Thread(target=_call, args=(priority,)) for priority in (5, 1, 3)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 2
+    while limiter.waiting("fake", "m") < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert order == [1, 3, 5]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.llm.client import LLMClient, LLMGenerationParams
+from app.llm.response_cache import (
+    DiskLLMCacheBackend,
+    LLMResponseCache,
+    llm_request_hash,
+    set_llm_response_cache,
+)
+
+
+@pytest.fixture
+def response_cache(tmp_path):
+    cache = LLMResponseCache(DiskLLMCacheBackend(tmp_path))
+    set_llm_response_cache(cache)
+    yield cache
+    set_llm_response_cache(None)
+
+
+@pytest.fixture
+def anthropic_calls(monkeypatch) -> list[dict[str, object]]:
+    calls: list[dict[str, object]] = []
+
+    class _DummyResponse:
+        def __init__(self, text: str) -> None:
+            self.content = [type("TextBlock", (), {"text": text, "type": "text"})()]
+            self.usage = None
+
+    class _DummyAnthropic:
+        def __init__(self, **_kwargs):  # noqa: ANN003
+            self.messages = self
+
+        def create(self, **kwargs):  # noqa: ANN003
+            calls.append(kwargs)
+            return _DummyResponse(f"answer-{len(calls)}")
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr("app.llm.client.Anthropic", _DummyAnthropic)
+    return calls
+
+
+def test_llm_request_hash_covers_output_affecting_params() -> None:
+    base = {"provider": "anthropic", "model": "claude-sonnet-4-5", "prompt": "Hi"}
+    key = llm_request_hash(**base, request={"temperature": 0, "max_tokens": 32})
+
+    assert key == llm_request_hash(**base, request={"max_tokens": 32, "temperature": 0})
+    assert key != llm_request_hash(**base, request={"temperature": 0, "max_tokens": 64})
+    assert key != llm_request_hash(**{**base, "prompt": "Hi!"}, request={"temperature": 0, "max_tokens": 32})
+
+
+def test_identical_deterministic_call_is_served_from_cache(response_cache, anthropic_calls) -> None:
+    llm = LLMClient(default_model="claude-sonnet-4-5")
+    params = LLMGenerationParams(model="claude-sonnet-4-5", temperature=0, max_tokens=32)
+
+    assert llm.generate_text("Summarize", params=params) == "answer-1"
+    assert llm.generate_text("Summarize", params=params) == "answer-1"
+    assert len(anthropic_calls) == 1
+    assert response_cache.stats() == {"hits": 1, "misses": 1, "stores": 1, "errors": 0}
+
+    longer = LLMGenerationParams(model="claude-sonnet-4-5", temperature=0, max_tokens=64)
+    assert llm.generate_text("Summarize", params=longer) == "answer-2"
+    assert len(anthropic_calls) == 2
+
+
+def test_sampling_and_opt_out_bypass_cache(response_cache, anthropic_calls) -> None:
+    llm = LLMClient(default_model="claude-sonnet-4-5")
+    sampled = LLMGenerationParams(model="claude-sonnet-4-5", temperature=0.7, max_tokens=32)
+    opted_out = LLMGenerationParams(model="claude-sonnet-4-5", temperature=0, max_tokens=32, cache=False)
+
+    llm.generate_text("Brainstorm", params=sampled)
+    llm.generate_text("Brainstorm", params=sampled)
+    llm.generate_text("Brainstorm", params=opted_out)
+    llm.generate_text("Brainstorm", params=opted_out)
+
+    assert len(anthropic_calls) == 4
+    assert response_cache.stats() == {"hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+    forced = LLMGenerationParams(model="claude-sonnet-4-5", temperature=0.7, max_tokens=32, cache=True)
+    assert llm.generate_text("Brainstorm", params=forced) == llm.generate_text("Brainstorm", params=forced)
+    assert len(anthropic_calls) == 5
+
+
+def test_expired_and_unreadable_entries_are_misses(tmp_path) -> None:
+    now = [datetime(2026, 10, 16, tzinfo=timezone.utc)]
+    backend = DiskLLMCacheBackend(tmp_path)
+    cache = LLMResponseCache(backend, ttl_seconds=60, clock=lambda: now[0])
+    key = llm_request_hash(provider="anthropic", model="m", prompt="p", request={})
+
+    cache.put(key, provider="anthropic", model="m", text="cached")
+    assert cache.get(key).text == "cached"
+
+    now[0] += timedelta(seconds=61)
+    assert cache.get(key) is None
+
+    backend.path(key).write_bytes(b"not gzip")
+    assert cache.get(key) is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "stores": 1, "errors": 1}
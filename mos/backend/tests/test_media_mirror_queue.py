@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+
+from app.services import media_mirror_queue as queue_module
+from app.services.media_mirror_queue import MediaMirrorQueue, _ClaimedAsset
+
+
+def _queue_with_backlog(items: list[_ClaimedAsset], *, max_workers: int, per_host_limit: int) -> MediaMirrorQueue:
+    queue = MediaMirrorQueue(storage=object(), max_workers=max_workers, per_host_limit=per_host_limit)
+    pending = list(items)
+
+    def _claim(*, limit: int, ad_ids=None):  # noqa: ANN001, ANN202
+        _ = ad_ids
+        batch = pending[:limit]
+        del pending[:limit]
+        return batch
+
+    queue.claim = _claim  # type: ignore[method-assign]
+    queue.release = lambda claimed: None  # type: ignore[method-assign]
+    queue._next_retry_due = lambda *, ad_ids: None  # type: ignore[method-assign]
+    return queue
+
+
+def test_drain_caps_concurrency_per_host() -> None:
+    items = [_ClaimedAsset(media_asset_id=f"slow-{idx}", host="video.fbcdn.net") for idx in range(6)]
+    items += [_ClaimedAsset(media_asset_id=f"fast-{idx}", host="scontent.xx.fbcdn.net") for idx in range(4)]
+    queue = _queue_with_backlog(items, max_workers=4, per_host_limit=2)
+
+    lock = threading.Lock()
+    active: Counter = Counter()
+    peak: Counter = Counter()
+
+    def _mirror_one(media_asset_id: str) -> str:
+        host = "video.fbcdn.net" if media_asset_id.startswith("slow") else "scontent.xx.fbcdn.net"
+        with lock:
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+        time.sleep(0.02)
+        with lock:
+            active[host] -= 1
+        return "succeeded"
+
+    queue.mirror_one = _mirror_one  # type: ignore[method-assign]
+    stats = queue.drain(poll_interval_seconds=0.01)
+
+    assert stats.claimed == 10
+    assert stats.succeeded == 10
+    assert peak["video.fbcdn.net"] <= 2
+    assert peak["scontent.xx.fbcdn.net"] <= 2
+
+
+def test_drain_counts_retries_and_failures() -> None:
+    items = [_ClaimedAsset(media_asset_id=str(idx), host="cdn.example.com") for idx in range(3)]
+    queue = _queue_with_backlog(items, max_workers=2, per_host_limit=2)
+    outcomes = {"0": "succeeded", "1": "retry_scheduled", "2": "failed"}
+    queue.mirror_one = lambda media_asset_id: outcomes[media_asset_id]  # type: ignore[method-assign]
+
+    stats = queue.drain(poll_interval_seconds=0.01)
+
+    assert (stats.succeeded, stats.retry_scheduled, stats.failed) == (1, 1, 1)
+
+
+def test_retry_delay_is_exponential_and_capped(monkeypatch) -> None:  # noqa: ANN001
+    monkeypatch.setattr(queue_module.settings, "MEDIA_MIRROR_RETRY_BASE_SECONDS", 10.0)
+    monkeypatch.setattr(queue_module.settings, "MEDIA_MIRROR_RETRY_MAX_SECONDS", 60.0)
+    queue = MediaMirrorQueue(storage=object())
+
+    assert [queue._next_retry_delay(attempt) for attempt in (1, 2, 3, 4, 5)] == [10.0, 20.0, 40.0, 60.0, 60.0]
+    assert queue._is_retryable("dns_lookup_failed:video.fbcdn.net")
+    assert not queue._is_retryable("media_too_large")
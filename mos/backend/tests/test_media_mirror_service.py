@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+from io import BytesIO
+
+import httpx
+import pytest
+from PIL import Image
+
+from app.services import media_mirror as media_mirror_module
+from app.services.media_mirror import MediaMirrorService, _strong_etag, normalize_media_source_url
+
+
+def _service(monkeypatch, *, max_bytes: int = 1024 * 1024) -> MediaMirrorService:  # noqa: ANN001
+    monkeypatch.setattr(media_mirror_module.settings, "MEDIA_MIRROR_MAX_BYTES", max_bytes)
+    service = MediaMirrorService(session=None, storage=object())  # type: ignore[arg-type]
+    service._assert_public_hostname = lambda hostname: None  # type: ignore[method-assign]
+    return service
+
+
+def _fake_stream(body: bytes, *, content_type: str = "image/png"):  # noqa: ANN202
+    @contextlib.contextmanager
+    def _stream(method: str, url: str, **kwargs):  # noqa: ANN001, ANN003, ANN202
+        _ = kwargs
+        yield httpx.Response(
+            200,
+            content=body,
+            headers={"content-type": f"{content_type}; charset=binary"},
+            request=httpx.Request(method, url),
+        )
+
+    return _stream
+
+
+def _png_bytes(size: tuple[int, int]) -> bytes:
+    buf = BytesIO()
+    Image.new("RGB", size, color=(200, 10, 10)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_download_spools_to_disk_and_hashes(monkeypatch) -> None:  # noqa: ANN001
+    body = _png_bytes((1200, 800))
+    service = _service(monkeypatch)
+    monkeypatch.setattr(media_mirror_module.httpx, "stream", _fake_stream(body))
+
+    download = service._download("https://cdn.example.com/a.png")
+    try:
+        assert download.sha256 == hashlib.sha256(body).hexdigest()
+        assert download.size_bytes == len(body)
+        assert download.content_type == "image/png"
+        with open(download.path, "rb") as fh:
+            assert fh.read() == body
+
+        preview, size = service._build_image_preview(download.path)
+        assert size == (1200, 800)
+        assert preview is not None
+        with Image.open(BytesIO(preview)) as img:
+            assert max(img.size) <= service.preview_dim
+    finally:
+        download.cleanup()
+    assert not os.path.exists(download.path)
+
+
+def test_download_removes_spool_when_too_large(monkeypatch, tmp_path) -> None:  # noqa: ANN001
+    service = _service(monkeypatch, max_bytes=16)
+    monkeypatch.setattr(media_mirror_module.httpx, "stream", _fake_stream(b"x" * 64))
+    monkeypatch.setattr(media_mirror_module.tempfile, "tempdir", str(tmp_path))
+
+    with pytest.raises(RuntimeError, match="media_too_large"):
+        service._download("https://cdn.example.com/big.bin")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_normalize_media_source_url_drops_cdn_signatures() -> None:
+    first = (
+        "https://Scontent.xx.fbcdn.net/v/t39.35426-6/123_n.jpg"
+        "?stp=dst-jpg_s600x600&_nc_cat=1&_nc_ohc=abc&oh=00_AAA&oe=66AA0000#frag"
+    )
+    resigned = (
+        "https://scontent.xx.fbcdn.net/v/t39.35426-6/123_n.jpg"
+        "?_nc_ohc=xyz&oe=66BB0000&oh=00_BBB&stp=dst-jpg_s600x600&_nc_cat=7"
+    )
+    other_size = "https://scontent.xx.fbcdn.net/v/t39.35426-6/123_n.jpg?stp=dst-jpg_s60x60&oh=00_AAA"
+
+    assert normalize_media_source_url(first) == normalize_media_source_url(resigned)
+    assert normalize_media_source_url(first) == (
+        "https://scontent.xx.fbcdn.net/v/t39.35426-6/123_n.jpg?stp=dst-jpg_s600x600"
+    )
+    assert normalize_media_source_url(first) != normalize_media_source_url(other_size)
+
+
+def test_strong_etag_ignores_weak_validators() -> None:
+    assert _strong_etag('"abc123"') == '"abc123"'
+    assert _strong_etag('W/"abc123"') is None
+    assert _strong_etag(None) is None
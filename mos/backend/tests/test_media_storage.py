@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from botocore.exceptions import ClientError
+
+from app.services import media_storage as media_storage_module
+from app.services.media_storage import MediaStorage, _KnownKeyCache
+
+
+class _FakePaginator:
+    def __init__(self, client: "_FakeS3Client") -> None:
+        self.client = client
+
+    def paginate(self, *, Bucket: str, Prefix: str):  # noqa: N803, ANN201
+        self.client.list_calls.append((Bucket, Prefix))
+        keys = sorted(key for bucket, key in self.client.objects if bucket == Bucket and key.startswith(Prefix))
+        # Two pages to exercise pagination.
+        midpoint = len(keys) // 2
+        yield {"Contents": [{"Key": key} for key in keys[:midpoint]]}
+        yield {"Contents": [{"Key": key} for key in keys[midpoint:]]}
+
+
+class _FakeS3Client:
+    def __init__(self, objects: set[tuple[str, str]]) -> None:
+        self.objects = objects
+        self.head_calls: list[tuple[str, str]] = []
+        self.list_calls: list[tuple[str, str]] = []
+
+    def head_object(self, *, Bucket: str, Key: str) -> dict:  # noqa: N803
+        self.head_calls.append((Bucket, Key))
+        if (Bucket, Key) not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {}
+
+    def get_paginator(self, name: str) -> _FakePaginator:
+        assert name == "list_objects_v2"
+        return _FakePaginator(self)
+
+
+def _storage(monkeypatch, objects: set[tuple[str, str]]) -> tuple[MediaStorage, _FakeS3Client]:  # noqa: ANN001
+    monkeypatch.setattr(media_storage_module, "_known_keys", _KnownKeyCache(100))
+    monkeypatch.setattr(media_storage_module.settings, "MEDIA_STORAGE_SHARD_LIST_MIN_KEYS", 3)
+    storage = MediaStorage.__new__(MediaStorage)
+    storage.bucket = "media"
+    storage.preview_bucket = "media"
+    storage.prefix = "dev"
+    client = _FakeS3Client(objects)
+    storage.client = client
+    return storage, client
+
+
+def test_objects_exist_lists_dense_shards_and_heads_sparse_keys(monkeypatch) -> None:  # noqa: ANN001
+    existing = {("media", f"dev/orig/aa/aa{idx}.jpg") for idx in range(4)} | {("media", "dev/prev/bb/bb1.jpg")}
+    storage, client = _storage(monkeypatch, existing)
+
+    dense = [("media", f"dev/orig/aa/aa{idx}.jpg") for idx in (0, 1, 2, 9)]
+    sparse = [("media", "dev/prev/bb/bb1.jpg"), ("media", "dev/prev/cc/cc1.jpg")]
+    result = storage.objects_exist(dense + sparse)
+
+    assert result == {
+        ("media", "dev/orig/aa/aa0.jpg"): True,
+        ("media", "dev/orig/aa/aa1.jpg"): True,
+        ("media", "dev/orig/aa/aa2.jpg"): True,
+        ("media", "dev/orig/aa/aa9.jpg"): False,
+        ("media", "dev/prev/bb/bb1.jpg"): True,
+        ("media", "dev/prev/cc/cc1.jpg"): False,
+    }
+    assert client.list_calls == [("media", "dev/orig/aa/")]
+    assert sorted(client.head_calls) == sorted(sparse)
+
+    # The listing warmed the LRU with the shard's other keys; known keys need no round trip.
+    client.head_calls.clear()
+    assert storage.object_exists(bucket="media", key="dev/orig/aa/aa3.jpg")
+    assert storage.objects_exist([("media", "dev/prev/bb/bb1.jpg")]) == {("media", "dev/prev/bb/bb1.jpg"): True}
+    assert client.head_calls == []
+
+
+def test_known_key_cache_evicts_least_recently_used() -> None:
+    cache = _KnownKeyCache(2)
+    cache.add(("b", "one"))
+    cache.add(("b", "two"))
+    assert ("b", "one") in cache
+    cache.add(("b", "three"))
+
+    assert ("b", "two") not in cache
+    assert ("b", "one") in cache
+    assert ("b", "three") in cache
+
+
+def test_presign_get_cached_reuses_signature_within_ttl_bucket(monkeypatch) -> None:  # noqa: ANN001
+    storage, _ = _storage(monkeypatch, set())
+    storage.presign_ttl = 1000
+    monkeypatch.setattr(media_storage_module, "_presign_cache", media_storage_module.OrderedDict())
+    monkeypatch.setattr(media_storage_module.settings, "MEDIA_STORAGE_PRESIGN_CACHE_REUSE_FRACTION", 0.5)
+    monkeypatch.setattr(media_storage_module.settings, "MEDIA_STORAGE_PRESIGN_CACHE_SIZE", 10)
+    signed: list[str] = []
+
+    def _presign_get(*, bucket: str, key: str, expires_in=None) -> str:  # noqa: ANN001
+        signed.append(key)
+        return f"https://s3/{bucket}/{key}?sig={len(signed)}&ttl={expires_in}"
+
+    storage.presign_get = _presign_get  # type: ignore[method-assign]
+    now = {"value": 10_000.0}
+    monkeypatch.setattr(media_storage_module.time, "time", lambda: now["value"])
+
+    first = storage.presign_get_cached(bucket="media", key="dev/prev/aa/aa.jpg")
+    now["value"] += 400
+    assert storage.presign_get_cached(bucket="media", key="dev/prev/aa/aa.jpg") == first
+    now["value"] += 200  # crosses into the next 500s bucket
+    assert storage.presign_get_cached(bucket="media", key="dev/prev/aa/aa.jpg") != first
+    assert signed == ["dev/prev/aa/aa.jpg", "dev/prev/aa/aa.jpg"]
+
+
+def test_public_preview_url_only_for_preview_bucket(monkeypatch) -> None:  # noqa: ANN001
+    storage, _ = _storage(monkeypatch, set())
+    storage.preview_bucket = "media-previews"
+    monkeypatch.setattr(
+        media_storage_module.settings, "MEDIA_STORAGE_PREVIEW_PUBLIC_BASE_URL", "https://cdn.example.com/"
+    )
+
+    assert (
+        storage.public_preview_url(bucket="media-previews", key="dev/prev/aa/aa.jpg")
+        == "https://cdn.example.com/dev/prev/aa/aa.jpg"
+    )
+    assert storage.public_preview_url(bucket="media", key="dev/orig/aa/aa.mp4") is None
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import concurrent.futures
 import threading
+from datetime import datetime, timedelta, timezone
 
 import pytest
+from botocore.exceptions import ClientError
 
 from app.strategy_v2 import apify_ingestion as ingestion
 from app.strategy_v2.apify_ingestion import run_strategy_v2_apify_ingestion
+from app.strategy_v2.apify_result_cache import ApifyResultCache
 from app.strategy_v2.errors import StrategyV2SchemaValidationError
 from app.temporal.activities import strategy_v2_activities
 
@@ -359,6 +363,220 @@ def test_run_strategy_v2_apify_ingestion_executes_apify_configs(
     )
 
 
+class _FakeCacheStorage:
+    bucket = "media"
+    prefix = "mos"
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+
+    def upload_bytes(self, *, bucket: str, key: str, data: bytes, content_type: str | None) -> None:
+        _ = bucket, content_type
+        self.objects[key] = data
+
+    def download_bytes(self, *, key: str, bucket: str | None = None) -> tuple[bytes, str | None]:
+        _ = bucket
+        if key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        return self.objects[key], "application/gzip"
+
+    def submit(self, fn, /, **kwargs):  # noqa: ANN001, ANN003
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        future.set_result(fn(**kwargs))
+        return future
+
+
+def test_apify_result_cache_honors_actor_ttl_and_item_limit() -> None:
+    now = [datetime(2026, 10, 16, tzinfo=timezone.utc)]
+    storage = _FakeCacheStorage()
+    cache = ApifyResultCache(
+        storage=storage,
+        default_ttl_seconds=3600,
+        ttl_by_actor={"apify~web-scraper": 0},
+        clock=lambda: now[0],
+    )
+    payload = {"startUrls": [{"url": "https://example.com"}], "maxItems": 2}
+    items = [{"url": "https://example.com/a"}, {"url": "https://example.com/b"}]
+
+    key = cache.store(
+        actor_id="clockworks~tiktok-scraper",
+        input_payload=payload,
+        max_items=2,
+        run_id="run-1",
+        dataset_id="dataset-1",
+        items=items,
+    )
+    assert key is not None and key.startswith("mos/apify-cache/clockworks~tiktok-scraper/")
+    # Key order does not matter: the hash is over the canonical JSON.
+    reordered = {"maxItems": 2, "startUrls": [{"url": "https://example.com"}]}
+    hit = cache.lookup(actor_id="clockworks~tiktok-scraper", input_payload=reordered, max_items=1)
+    assert hit is not None and hit.run_id == "run-1" and hit.items == items[:1]
+    # The entry was capped at 2 items, so it cannot answer a request for more.
+    assert cache.lookup(actor_id="clockworks~tiktok-scraper", input_payload=payload, max_items=5) is None
+
+    now[0] += timedelta(hours=2)
+    assert cache.lookup(actor_id="clockworks~tiktok-scraper", input_payload=payload, max_items=2) is None
+    # A zero TTL turns caching off for the actor.
+    disabled = cache.store(
+        actor_id="apify~web-scraper", input_payload=payload, max_items=2, run_id="r", dataset_id="d", items=items
+    )
+    assert disabled is None
+
+
+def test_apify_result_cache_treats_unreadable_entries_as_misses() -> None:
+    storage = _FakeCacheStorage()
+    cache = ApifyResultCache(storage=storage, default_ttl_seconds=3600)
+    payloads = [{"startUrls": [{"url": f"https://example.com/{idx}"}]} for idx in range(3)]
+    keys = [
+        cache.store(
+            actor_id="clockworks~tiktok-scraper",
+            input_payload=payload,
+            max_items=5,
+            run_id="run-1",
+            dataset_id="dataset-1",
+            items=[{"url": "https://example.com/a"}],
+        )
+        for payload in payloads
+    ]
+    storage.objects[keys[0]] = b"not gzip"
+    storage.objects[keys[1]] = storage.objects[keys[1]][:20]
+
+    def _download(*, key: str, bucket: str | None = None) -> tuple[bytes, str | None]:
+        if key == keys[2]:
+            raise ClientError({"Error": {"Code": "AccessDenied"}}, "GetObject")
+        return _FakeCacheStorage.download_bytes(storage, key=key, bucket=bucket)
+
+    storage.download_bytes = _download  # type: ignore[method-assign]
+
+    requests = [("clockworks~tiktok-scraper", payload, 5) for payload in payloads]
+    assert cache.lookup_many(requests) == [None, None, None]
+
+
+def test_run_strategy_v2_apify_ingestion_serves_cached_actor_runs(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("STRATEGY_V2_APIFY_ENABLED", "true")
+    monkeypatch.setenv("STRATEGY_V2_APIFY_DISCOVERY_FANOUT_ENABLED", "false")
+    monkeypatch.setenv("STRATEGY_V2_APIFY_COMMENT_ENRICHMENT_ENABLED", "false")
+    monkeypatch.setenv("STRATEGY_V2_APIFY_RESULT_CACHE_ENABLED", "true")
+    monkeypatch.setenv("STRATEGY_V2_APIFY_RESULT_CACHE_TTL_BY_ACTOR", '{"practicaltools/apify-reddit-api": 0}')
+    monkeypatch.setenv(
+        "STRATEGY_V2_APIFY_ALLOWED_ACTOR_IDS",
+        "clockworks/tiktok-scraper,practicaltools/apify-reddit-api",
+    )
+    started: list[str] = []
+
+    class _FakeApifyClient:
+        def start_actor_run(self, actor_id: str, *, input_payload: dict) -> dict:
+            _ = input_payload
+            started.append(actor_id)
+            return {"id": f"run-{len(started)}"}
+
+        def poll_run_until_terminal(self, run_id: str, **kwargs) -> dict:  # noqa: ANN003
+            _ = kwargs
+            return {"status": "SUCCEEDED", "defaultDatasetId": f"dataset-{run_id}"}
+
+        def fetch_dataset_items(self, dataset_id: str, *, limit: int | None = None) -> list[dict]:
+            _ = limit
+            return [{"url": f"https://www.tiktok.com/@duolingo/video/{dataset_id}", "caption": "Sleep timing."}]
+
+    storage = _FakeCacheStorage()
+    monkeypatch.setattr("app.strategy_v2.apify_ingestion.ApifyClient", _FakeApifyClient)
+    monkeypatch.setattr("app.strategy_v2.apify_ingestion.MediaStorage", lambda: storage)
+    configs = [
+        {
+            "config_id": "cfg_tiktok_01",
+            "actor_id": "clockworks/tiktok-scraper",
+            "input": {"profiles": ["https://www.tiktok.com/@duolingo"], "maxItems": 1},
+            "metadata": {"platform": "TIKTOK", "target_id": "HT-TIKTOK-01"},
+        },
+        {
+            "config_id": "cfg_reddit_01",
+            "actor_id": "practicaltools/apify-reddit-api",
+            "input": {"startUrls": [{"url": "https://www.reddit.com/r/sleep"}], "maxItems": 1},
+            "metadata": {"platform": "REDDIT", "target_id": "HT-REDDIT-01"},
+        },
+    ]
+
+    first = run_strategy_v2_apify_ingestion(apify_configs=configs)
+    second = run_strategy_v2_apify_ingestion(apify_configs=configs)
+
+    # Reddit opts out via its zero TTL, so only the TikTok run is served from cache the second time.
+    assert sorted(started) == [
+        "clockworks/tiktok-scraper",
+        "practicaltools/apify-reddit-api",
+        "practicaltools/apify-reddit-api",
+    ]
+    assert first["summary"]["cache_hit_count"] == 0
+    assert second["summary"]["cache_hit_count"] == 1
+    cached_run = next(run for run in second["raw_runs"] if run["config_id"] == "cfg_tiktok_01")
+    fresh_run = next(run for run in first["raw_runs"] if run["config_id"] == "cfg_tiktok_01")
+    assert cached_run["cache"]["hit"] is True
+    assert cached_run["items"] == fresh_run["items"]
+    assert cached_run["run_id"] == fresh_run["run_id"]
+
+
+def test_run_strategy_v2_apify_ingestion_ranks_comment_enrichment_across_all_parent_runs(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("STRATEGY_V2_APIFY_ENABLED", "true")
+    monkeypatch.setenv("STRATEGY_V2_APIFY_DISCOVERY_FANOUT_ENABLED", "false")
+    monkeypatch.setenv("STRATEGY_V2_APIFY_MAX_PARALLEL_RUNS", "2")
+    monkeypatch.setenv("STRATEGY_V2_APIFY_COMMENT_ENRICHMENT_MAX_VIDEOS_PER_PLATFORM", "1")
+    monkeypatch.setenv("STRATEGY_V2_APIFY_ALLOWED_ACTOR_IDS", "clockworks/tiktok-scraper")
+    videos_by_profile = {
+        "https://www.tiktok.com/@quiet": {"url": "https://www.tiktok.com/@quiet/video/1", "views": 100, "comments": 2},
+        "https://www.tiktok.com/@loud": {"url": "https://www.tiktok.com/@loud/video/2", "views": 9000, "comments": 80},
+    }
+    quiet_run_done = threading.Event()
+
+    class _FakeApifyClient:
+        def __init__(self) -> None:
+            self._lock = threading.Lock()
+            self._inputs: dict[str, dict] = {}
+
+        def start_actor_run(self, actor_id: str, *, input_payload: dict) -> dict:
+            _ = actor_id
+            with self._lock:
+                run_id = f"run-{len(self._inputs) + 1}"
+                self._inputs[run_id] = input_payload
+            return {"id": run_id}
+
+        def poll_run_until_terminal(self, run_id: str, **kwargs) -> dict:  # noqa: ANN003
+            _ = kwargs
+            if self._inputs[run_id].get("profiles") == ["https://www.tiktok.com/@loud"]:
+                # The low-engagement parent returns first.
+                assert quiet_run_done.wait(timeout=5)
+            return {"status": "SUCCEEDED", "defaultDatasetId": f"dataset-{run_id}"}
+
+        def fetch_dataset_items(self, dataset_id: str, *, limit: int | None = None) -> list[dict]:
+            _ = limit
+            payload = self._inputs[dataset_id.replace("dataset-", "")]
+            if "postURLs" in payload:
+                return [{"url": url, "text": "Comment text"} for url in payload["postURLs"]]
+            [profile] = payload["profiles"]
+            if profile == "https://www.tiktok.com/@quiet":
+                quiet_run_done.set()
+            return [{**videos_by_profile[profile], "caption": "Bedtime routine"}]
+
+    monkeypatch.setattr("app.strategy_v2.apify_ingestion.ApifyClient", _FakeApifyClient)
+
+    payload = run_strategy_v2_apify_ingestion(
+        apify_configs=[
+            {
+                "config_id": f"cfg_tiktok_{name}",
+                "actor_id": "clockworks/tiktok-scraper",
+                "input": {"profiles": [f"https://www.tiktok.com/@{name}"], "maxItems": 1},
+                "metadata": {"platform": "TIKTOK", "target_id": f"HT-TIKTOK-{name.upper()}"},
+            }
+            for name in ("loud", "quiet")
+        ],
+    )
+
+    assert payload["summary"]["comment_enrichment_run_count"] == 1
+    comment_runs = [run for run in payload["raw_runs"] if str(run["config_id"]).startswith("COMMENT_ENRICHMENT")]
+    assert [run["config_id"] for run in comment_runs] == ["COMMENT_ENRICHMENT_TIKTOK"]
+    assert comment_runs[0]["input_payload"]["postURLs"] == ["https://www.tiktok.com/@loud/video/2"]
+
+
 def test_run_strategy_v2_apify_ingestion_continues_when_single_actor_fails(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -765,6 +983,74 @@ def test_run_strategy_v2_apify_ingestion_emits_progress_events(
     assert "actor_run_terminal" in event_types
 
 
+def test_run_strategy_v2_apify_ingestion_reports_progress_while_awaiting_webhook(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("STRATEGY_V2_APIFY_ENABLED", "true")
+    monkeypatch.setenv(
+        "STRATEGY_V2_APIFY_ALLOWED_ACTOR_IDS",
+        "practicaltools/apify-reddit-api",
+    )
+    monkeypatch.setenv("APIFY_API_TOKEN", "test-token")
+
+    progress_events: list[dict[str, object]] = []
+
+    class _FakeApifyClient:
+        def __init__(self, *args, **kwargs) -> None:  # noqa: ANN002, ANN003
+            _ = args
+            _ = kwargs
+
+        def start_actor_run(self, actor_id: str, *, input_payload: dict, webhooks: list) -> dict:  # noqa: ANN001
+            _ = actor_id
+            _ = input_payload
+            _ = webhooks
+            return {"id": "run-1"}
+
+        def poll_run_until_terminal(self, run_id: str, **kwargs) -> dict:  # noqa: ANN003
+            raise AssertionError("webhook runs must not be polled")
+
+        def fetch_dataset_items(self, dataset_id: str, *, limit: int | None = None) -> list[dict]:
+            _ = dataset_id
+            _ = limit
+            return [
+                {
+                    "source_url": "https://www.reddit.com/r/sleep/comments/xyz222",
+                    "quote": "Sample quote for ingestion quality gate.",
+                    "body": "Sample body text for ingestion quality gate.",
+                }
+            ]
+
+    def _wait_for_run_completion(run_id: str, *, max_wait_seconds: int, on_wait=None) -> dict:  # noqa: ANN001
+        _ = max_wait_seconds
+        assert callable(on_wait)
+        on_wait({"run_id": run_id, "status": "RUNNING", "elapsed_seconds": 5.0})
+        return {"status": "SUCCEEDED", "defaultDatasetId": "dataset-1"}
+
+    monkeypatch.setattr("app.strategy_v2.apify_ingestion.ApifyClient", _FakeApifyClient)
+    monkeypatch.setattr(
+        "app.strategy_v2.apify_ingestion.completion_webhooks", lambda: [{"eventTypes": ["ACTOR.RUN.SUCCEEDED"]}]
+    )
+    monkeypatch.setattr("app.strategy_v2.apify_ingestion.wait_for_run_completion", _wait_for_run_completion)
+
+    run_strategy_v2_apify_ingestion(
+        apify_configs=[
+            {
+                "config_id": "cfg_reddit_01",
+                "actor_id": "practicaltools/apify-reddit-api",
+                "input": {"startUrls": [{"url": "https://www.reddit.com/r/sleep"}], "maxItems": 1},
+                "metadata": {"platform": "REDDIT", "mode": "VOC_MINING", "target_id": "HT-REDDIT-04"},
+            }
+        ],
+        include_ads_context=False,
+        include_social_video=False,
+        include_external_voc=True,
+        progress_callback=lambda event: progress_events.append(dict(event)),
+    )
+
+    polls = [row for row in progress_events if row.get("event") == "actor_run_poll"]
+    assert [(row["run_id"], row["status"], row["elapsed_seconds"]) for row in polls] == [("run-1", "RUNNING", 5.0)]
+
+
 def test_run_strategy_v2_apify_ingestion_progress_callbacks_run_on_caller_thread(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -21,15 +21,20 @@ export type ExploreAdsParams = {
   limitPerBrand?: number;
   limit?: number;
   offset?: number;
+  cursor?: string;
+  includeCount?: boolean;
+  scoreVersion?: string;
   sort?: string;
   direction?: string;
 };
 
 export type ExploreAdsResponse = {
   items: any[];
-  count: number;
+  count: number | null;
   limit: number;
   offset: number;
+  next_cursor?: string | null;
+  has_more?: boolean;
 };
 
 export type ExploreBrand = {
@@ -41,6 +46,7 @@ export type ExploreBrand = {
   active_count: number;
   inactive_count: number;
   unknown_count: number;
+  creative_count: number;
   channels: string[];
   first_seen_at?: string | null;
   last_seen_at?: string | null;
@@ -91,6 +97,9 @@ export function useExploreApi() {
       if (params?.limitPerBrand !== undefined) search.set("limit_per_brand", params.limitPerBrand.toString());
       if (params?.limit !== undefined) search.set("limit", params.limit.toString());
       if (params?.offset !== undefined) search.set("offset", params.offset.toString());
+      if (params?.cursor) search.set("cursor", params.cursor);
+      if (params?.includeCount === false) search.set("includeCount", "false");
+      if (params?.scoreVersion) search.set("scoreVersion", params.scoreVersion);
       if (params?.sort) search.set("sort", params.sort);
       if (params?.direction) search.set("direction", params.direction);
 
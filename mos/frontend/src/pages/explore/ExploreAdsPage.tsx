@@ -78,6 +78,7 @@ export function ExploreAdsPage() {
   );
   const [hasMore, setHasMore] = useState(false);
   const [nextOffset, setNextOffset] = useState(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const loadMoreRef = useRef<HTMLDivElement | null>(null);
   const filtersKeyRef = useRef<string>("");
 
@@ -169,6 +170,7 @@ export function ExploreAdsPage() {
     setCount(0);
     setHasMore(false);
     setNextOffset(0);
+    setNextCursor(null);
     setLoading(true);
     setError(null);
     setLoadingMore(false);
@@ -184,8 +186,9 @@ export function ExploreAdsPage() {
         const totalCount = resp?.count ?? normalized.length;
         setItems(normalized);
         setCount(totalCount);
-        setHasMore(normalized.length < totalCount);
+        setHasMore(resp?.has_more ?? normalized.length < totalCount);
         setNextOffset(normalized.length);
+        setNextCursor(resp?.next_cursor ?? null);
       })
       .catch((err) => {
         if (cancelled || filtersKeyRef.current !== filtersKey) return;
@@ -212,6 +215,8 @@ export function ExploreAdsPage() {
       ...baseParams,
       limit: PAGE_SIZE,
       offset: nextOffset,
+      // Later pages use the keyset cursor and skip the total count query.
+      ...(nextCursor ? { cursor: nextCursor, includeCount: false } : {}),
     })
       .then((resp) => {
         if (filtersKeyRef.current !== currentKey) return;
@@ -221,10 +226,11 @@ export function ExploreAdsPage() {
           const nextItems = [...prev, ...normalized];
           const resolvedCount = totalCount ?? nextItems.length;
           setCount(resolvedCount);
-          setHasMore(normalized.length > 0 && nextItems.length < resolvedCount);
+          setHasMore(resp?.has_more ?? (normalized.length > 0 && nextItems.length < resolvedCount));
           setNextOffset(nextItems.length);
           return nextItems;
         });
+        setNextCursor(resp?.next_cursor ?? null);
         setError(null);
       })
       .catch((err) => {
@@ -235,7 +241,7 @@ export function ExploreAdsPage() {
         if (filtersKeyRef.current !== currentKey) return;
         setLoadingMore(false);
       });
-  }, [baseParams, count, hasMore, listAds, loading, loadingMore, nextOffset]);
+  }, [baseParams, count, hasMore, listAds, loading, loadingMore, nextCursor, nextOffset]);
 
   useEffect(() => {
     const node = loadMoreRef.current;
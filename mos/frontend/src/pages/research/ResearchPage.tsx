@@ -111,6 +111,7 @@ function ResearchAdsTab() {
   const [count, setCount] = useState(0);
   const [hasMore, setHasMore] = useState(false);
   const [nextOffset, setNextOffset] = useState(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const loadMoreRef = useRef<HTMLDivElement | null>(null);
   const filtersKeyRef = useRef<string>("");
 
@@ -202,6 +203,7 @@ function ResearchAdsTab() {
     setCount(0);
     setHasMore(false);
     setNextOffset(0);
+    setNextCursor(null);
     setLoading(true);
     setError(null);
     setLoadingMore(false);
@@ -217,8 +219,9 @@ function ResearchAdsTab() {
         const totalCount = resp?.count ?? normalized.length;
         setItems(normalized);
         setCount(totalCount);
-        setHasMore(normalized.length < totalCount);
+        setHasMore(resp?.has_more ?? normalized.length < totalCount);
         setNextOffset(normalized.length);
+        setNextCursor(resp?.next_cursor ?? null);
       })
       .catch((err) => {
         if (cancelled || filtersKeyRef.current !== filtersKey) return;
@@ -245,6 +248,8 @@ function ResearchAdsTab() {
       ...baseParams,
       limit: PAGE_SIZE,
       offset: nextOffset,
+      // Later pages use the keyset cursor and skip the total count query.
+      ...(nextCursor ? { cursor: nextCursor, includeCount: false } : {}),
     })
       .then((resp) => {
         if (filtersKeyRef.current !== currentKey) return;
@@ -254,10 +259,11 @@ function ResearchAdsTab() {
           const nextItems = [...prev, ...normalized];
           const resolvedCount = totalCount ?? nextItems.length;
           setCount(resolvedCount);
-          setHasMore(normalized.length > 0 && nextItems.length < resolvedCount);
+          setHasMore(resp?.has_more ?? (normalized.length > 0 && nextItems.length < resolvedCount));
           setNextOffset(nextItems.length);
           return nextItems;
         });
+        setNextCursor(resp?.next_cursor ?? null);
         setError(null);
       })
       .catch((err) => {
@@ -268,7 +274,7 @@ function ResearchAdsTab() {
         if (filtersKeyRef.current !== currentKey) return;
         setLoadingMore(false);
       });
-  }, [baseParams, count, errorMessage, hasMore, listAds, loading, loadingMore, nextOffset]);
+  }, [baseParams, count, errorMessage, hasMore, listAds, loading, loadingMore, nextCursor, nextOffset]);
 
   useEffect(() => {
     const node = loadMoreRef.current;
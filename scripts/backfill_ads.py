@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "mos" / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.append(str(BACKEND_DIR))
+
+from app.db.repositories.ads import BACKFILL_STEPS  # noqa: E402
+from app.services.ad_backfill import run_backfill  # noqa: E402
+
+
+def main(
+    *,
+    steps: list[str],
+    org_id: str | None,
+    workers: int | None,
+    partition_size: int,
+    batch_size: int,
+    only_missing: bool,
+    restart: bool,
+) -> None:
+    stats = run_backfill(
+        steps=steps,
+        org_id=org_id,
+        workers=workers,
+        partition_size=partition_size,
+        batch_size=batch_size,
+        only_missing=only_missing,
+        restart=restart,
+        on_progress=lambda payload: print(f"Progress: {payload}", flush=True),
+    )
+    print(f"Backfill complete: {stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Set-based, resumable backfill of ad creatives/memberships, facts and scores in parallel worker "
+            "processes. Re-running the same command after an interruption resumes from the last committed "
+            "chunk; re-running it after the job finished starts a new pass over every ad."
+        )
+    )
+    parser.add_argument(
+        "--steps",
+        nargs="+",
+        choices=BACKFILL_STEPS,
+        default=list(BACKFILL_STEPS),
+        help="Outputs to build (default: all).",
+    )
+    parser.add_argument("--org-id", type=str, default=None, help="Limit the backfill to a single org_id.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default AD_BACKFILL_WORKERS).")
+    parser.add_argument("--partition-size", type=int, default=50_000, help="Ads per checkpointed partition.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Ads per set-based chunk.")
+    parser.add_argument(
+        "--all",
+        dest="only_missing",
+        action="store_false",
+        help="Rebuild every ad, not only those missing an output (or fingerprinted by an older algo).",
+    )
+    parser.add_argument("--restart", action="store_true", help="Discard an unfinished job's checkpoints and start over.")
+    args = parser.parse_args()
+    main(
+        steps=args.steps,
+        org_id=args.org_id,
+        workers=args.workers,
+        partition_size=args.partition_size,
+        batch_size=args.batch_size,
+        only_missing=args.only_missing,
+        restart=args.restart,
+    )
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "mos" / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.append(str(BACKEND_DIR))
+
+from app.db.base import SessionLocal  # noqa: E402
+from app.db.repositories.ads import AdsRepository  # noqa: E402
+
+
+def main(org_id: str | None, batch_size: int, recluster: bool) -> None:
+    session = SessionLocal()
+    try:
+        stats = AdsRepository(session).cluster_pending_creatives(
+            org_id=org_id,
+            batch_size=batch_size,
+            recluster=recluster,
+        )
+    finally:
+        session.close()
+    print(f"Clustered ad creatives: {stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Assign near-duplicate clusters to ad creatives (run after media mirroring backfills pHashes)."
+    )
+    parser.add_argument("--org-id", default=None, help="Only cluster creatives of this org.")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--recluster",
+        action="store_true",
+        help="Re-run every creative, not only those never clustered (e.g. after changing thresholds).",
+    )
+    args = parser.parse_args()
+    main(args.org_id, args.batch_size, args.recluster)
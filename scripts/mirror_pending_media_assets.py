@@ -9,35 +9,46 @@ BACKEND_DIR = ROOT / "mos" / "backend"
 if str(BACKEND_DIR) not in sys.path:
     sys.path.append(str(BACKEND_DIR))
 
-from app.db.base import SessionLocal  # noqa: E402
-from app.db.enums import MediaMirrorStatusEnum  # noqa: E402
-from app.db.models import MediaAsset  # noqa: E402
-from app.services.media_mirror import MediaMirrorService  # noqa: E402
-
-
-def main(batch_size: int) -> None:
-    session = SessionLocal()
-    mirror = MediaMirrorService(session)
-    total = 0
-
-    while True:
-        batch = (
-            session.query(MediaAsset)
-            .filter(MediaAsset.mirror_status == MediaMirrorStatusEnum.pending)
-            .limit(batch_size)
-            .all()
+from app.services.media_mirror_queue import MediaMirrorQueue  # noqa: E402
+
+
+def main(batch_size: int | None, concurrency: int | None, per_host_concurrency: int | None, wait_for_retries: bool) -> None:
+    queue = MediaMirrorQueue(max_workers=concurrency, per_host_limit=per_host_concurrency)
+
+    def _print_progress(payload: dict) -> None:
+        print(
+            "claimed={claimed} succeeded={succeeded} partial={partial} failed={failed} "
+            "retry_scheduled={retry_scheduled} in_flight={in_flight}".format(**payload)
         )
-        if not batch:
-            break
-        mirror.mirror_assets(batch)
-        total += len(batch)
-        print(f"Mirrored batch of {len(batch)} (total: {total})")
 
-    print(f"Done. Total assets mirrored: {total}")
+    stats = queue.drain(max_assets=batch_size, wait_for_retries=wait_for_retries, on_progress=_print_progress)
+    print(f"Done. {stats.as_dict()}")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Mirror pending media assets to object storage.")
-    parser.add_argument("--batch-size", type=int, default=50, help="Batch size to process per loop.")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Stop after claiming this many assets (default: drain the whole queue).",
+    )
+    parser.add_argument("--concurrency", type=int, default=None, help="Worker threads (MEDIA_MIRROR_MAX_CONCURRENCY).")
+    parser.add_argument(
+        "--per-host-concurrency",
+        type=int,
+        default=None,
+        help="Concurrent downloads per source host (MEDIA_MIRROR_PER_HOST_CONCURRENCY).",
+    )
+    parser.add_argument(
+        "--no-wait-for-retries",
+        action="store_true",
+        help="Exit once nothing is due instead of waiting out retry backoff.",
+    )
     args = parser.parse_args()
-    main(batch_size=args.batch_size)
+    main(
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        per_host_concurrency=args.per_host_concurrency,
+        wait_for_retries=not args.no_wait_for_retries,
+    )
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "mos" / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.append(str(BACKEND_DIR))
+
+from app.db.base import SessionLocal  # noqa: E402
+from app.db.repositories.ads import AdsRepository  # noqa: E402
+
+
+def main(org_id: str | None) -> None:
+    session = SessionLocal()
+    try:
+        refreshed = AdsRepository(session).refresh_brand_ad_stats(org_id=org_id)
+    finally:
+        session.close()
+    print(f"Refreshed brand_ad_stats rows: {refreshed}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute the brand_ad_stats rollup from ads (safe to run on a cron).")
+    parser.add_argument("--org-id", type=str, default=None, help="Limit the refresh to a single org_id.")
+    args = parser.parse_args()
+    main(org_id=args.org_id)
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "mos" / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.append(str(BACKEND_DIR))
+
+from app.config import settings  # noqa: E402
+from app.db.base import SessionLocal  # noqa: E402
+from app.db.repositories.ads import AdsRepository  # noqa: E402
+from app.temporal.client import get_temporal_client  # noqa: E402
+from app.temporal.workflows.ads_ingestion import AdScoreRescoreInput, AdScoreRescoreWorkflow  # noqa: E402
+
+SCHEDULE_WORKFLOW_ID = "ad-score-rescore-nightly"
+
+
+def main(org_id: str | None, batch_size: int) -> None:
+    session = SessionLocal()
+    try:
+        stats = AdsRepository(session).rescore_ad_scores(org_id=org_id, batch_size=batch_size)
+    finally:
+        session.close()
+    print(f"Rescored ad scores: {stats}")
+
+
+async def schedule(org_id: str | None, batch_size: int, cron: str) -> None:
+    client = await get_temporal_client()
+    handle = await client.start_workflow(
+        AdScoreRescoreWorkflow.run,
+        AdScoreRescoreInput(org_id=org_id, batch_size=batch_size),
+        id=SCHEDULE_WORKFLOW_ID if not org_id else f"{SCHEDULE_WORKFLOW_ID}-{org_id}",
+        task_queue=settings.TEMPORAL_TASK_QUEUE,
+        cron_schedule=cron,
+    )
+    print(f"Scheduled {handle.id} with cron '{cron}'")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rescore stored ad scores so recency decay stays current.")
+    parser.add_argument("--org-id", type=str, default=None, help="Limit rescoring to a single org_id.")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument(
+        "--schedule",
+        nargs="?",
+        const="0 3 * * *",
+        default=None,
+        metavar="CRON",
+        help="Start the nightly Temporal cron workflow instead of rescoring in-process (default: 03:00 UTC).",
+    )
+    args = parser.parse_args()
+    if args.schedule:
+        asyncio.run(schedule(org_id=args.org_id, batch_size=args.batch_size, cron=args.schedule))
+    else:
+        main(org_id=args.org_id, batch_size=args.batch_size)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT / "mos" / "backend"
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.append(str(BACKEND_DIR))
+
+from app.ads.score import score_versions  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.db.base import SessionLocal  # noqa: E402
+from app.db.repositories.ads import AdsRepository  # noqa: E402
+from app.services.ad_score_shadow import run_shadow_scoring  # noqa: E402
+
+
+def main(
+    *,
+    version: str,
+    org_id: str | None,
+    workers: int | None,
+    partition_size: int,
+    batch_size: int,
+    compare_to: str | None,
+) -> None:
+    stats = run_shadow_scoring(
+        version=version,
+        org_id=org_id,
+        workers=workers,
+        partition_size=partition_size,
+        batch_size=batch_size,
+        on_progress=lambda payload: print(f"Progress: {payload}", flush=True),
+    )
+    print(f"Shadow scoring complete: {stats}")
+    if compare_to:
+        session = SessionLocal()
+        try:
+            comparison = AdsRepository(session).compare_score_versions(
+                baseline=compare_to, candidate=version, org_id=org_id
+            )
+        finally:
+            session.close()
+        print(json.dumps(comparison, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compute a non-live ad score version over the corpus in parallel worker processes."
+    )
+    parser.add_argument("--version", required=True, help=f"Registered score version ({', '.join(score_versions())}).")
+    parser.add_argument("--org-id", type=str, default=None, help="Limit scoring to a single org_id.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default AD_SCORE_SHADOW_WORKERS).")
+    parser.add_argument("--partition-size", type=int, default=50_000, help="Ads per worker partition.")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Ads per upsert batch within a partition.")
+    parser.add_argument(
+        "--compare-to",
+        nargs="?",
+        const=settings.AD_SCORE_LIVE_VERSION,
+        default=None,
+        help="Print a side-by-side comparison against this version (default: the live version).",
+    )
+    args = parser.parse_args()
+    main(
+        version=args.version,
+        org_id=args.org_id,
+        workers=args.workers,
+        partition_size=args.partition_size,
+        batch_size=args.batch_size,
+        compare_to=args.compare_to,
+    )